@@ -1,23 +1,42 @@
 # chatbot/chains.py (목적에 맞게 재구성)
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferWindowMemory
 from langchain.chains import ConversationChain
-from .models import ChatSession, ChatMessage
+from .router import RouteDecision, create_question_router
+from .intent_model import create_intent_model
+from .http_client import post_json, stream_post
+from .transcript_writer import transcript_writer
+from .history_store import CONTEXT_MESSAGES
+from collections import OrderedDict
 from django.utils import timezone
+from mafather.lifespan import on_shutdown
 import os
-import httpx
+import atexit
+import asyncio
 import json
 import logging
+import time
 import uuid
 
 logger = logging.getLogger(__name__)
 
 # 환경 변수에서 API 키 가져오기
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-EXTERNAL_SERVER_URL = os.getenv("EXTERNAL_SERVER_URL", "http://127.0.0.1:8080")
+# 답변 생성 LLM 호출 제한 시간(초): 넘으면 요청을 취소하고 안내 메시지로 응답
+ANSWER_TIMEOUT_SECONDS = float(os.getenv("ANSWER_TIMEOUT_SECONDS", "30"))
+# 스트리밍 답변의 조각 사이 최대 대기 시간(초) (스트림 전체는 ANSWER_TIMEOUT_SECONDS 안에 끝나야 함)
+STREAM_IDLE_TIMEOUT_SECONDS = float(os.getenv("STREAM_IDLE_TIMEOUT_SECONDS", "15"))
+ANSWER_TIMEOUT_MESSAGE = "죄송합니다. 답변 생성 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요."
+# 메모리 세션 설정: 최대 세션 수 / 유휴 세션 만료 시간(초) / 스위퍼 실행 주기(초) / 프롬프트에 넣을 최근 대화 턴 수
+MAX_SESSIONS = int(os.getenv("CHAT_SESSION_MAX", "1000"))
+SESSION_IDLE_TTL_SECONDS = float(os.getenv("CHAT_SESSION_IDLE_TTL_SECONDS", "1800"))
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("CHAT_SESSION_SWEEP_INTERVAL_SECONDS", "60"))
+MEMORY_WINDOW = int(os.getenv("CHAT_MEMORY_WINDOW", "4"))
+# 수면/발달 전문(Exaone) 서버가 답변하는 카테고리
+STREAMING_CATEGORIES = ("sleep", "development")
 
 # 기본 LLM 설정
 llm = ChatOpenAI(
@@ -28,44 +47,34 @@ llm = ChatOpenAI(
     request_timeout=20
 )
 
-# 1단계: 육아 관련성 판단 프롬프트
-parenting_classifier_prompt = ChatPromptTemplate.from_messages([
+# 1단계: 라우팅 프롬프트 (육아 관련성 + 세부 카테고리를 한 번에 판단)
+# 로컬 키워드 분류기 / 의도 분류 모델이 확신하지 못한 질문만 LLM으로 판단 (chatbot/router.py)
+routing_prompt = ChatPromptTemplate.from_messages([
     ("system", """당신은 질문의 주제를 분류하는 전문가입니다.
-    주어진 질문이 육아와 관련된 것인지 판단해주세요.
+    주어진 질문이 육아와 관련된 것인지, 육아 질문이라면 어떤 세부 카테고리인지 판단해주세요.
     
     육아 관련 주제: 아기, 신생아, 유아, 수유, 이유식, 기저귀, 수면, 발달, 성장, 놀이, 교육, 건강, 안전, 예방접종 등
     
-    응답은 반드시 다음 JSON 형식으로 해주세요:
-    {{"is_parenting": true}} 또는 {{"is_parenting": false}}"""),
-    ("human", "{question}")
-])
-
-parenting_classifier_chain = (
-    parenting_classifier_prompt 
-    | llm 
-    | StrOutputParser()
-)
-
-# 2단계: 육아 질문의 세부 카테고리 판단 프롬프트
-category_classifier_prompt = ChatPromptTemplate.from_messages([
-    ("system", """당신은 육아 관련 질문을 세부 카테고리로 분류하는 전문가입니다.
-    주어진 질문이 다음 중 어떤 카테고리에 속하는지 판단해주세요:
-    
+    세부 카테고리:
     - sleep: 수면, 잠, 밤잠, 낮잠, 수면패턴, 잠투정 관련
     - development: 발달, 성장, 월령, 언어발달, 운동발달, 인지발달 관련
     - other: 그 외 육아 관련 (수유, 이유식, 건강, 놀이, 교육 등)
     
     응답은 반드시 다음 JSON 형식으로 해주세요:
-    {{"category": "sleep"}} 또는 {{"category": "development"}} 또는 {{"category": "other"}}"""),
+    {{"is_parenting": true, "category": "sleep"}} (category는 "sleep", "development", "other" 중 하나)
+    또는 육아와 관련 없는 질문이면 {{"is_parenting": false, "category": null}}"""),
     ("human", "{question}")
 ])
 
-category_classifier_chain = (
-    category_classifier_prompt 
-    | llm 
+routing_chain = (
+    routing_prompt
+    | llm.bind(response_format={"type": "json_object"}, max_tokens=30, temperature=0)
     | StrOutputParser()
 )
 
+# 의도 분류 모델은 시작 시 한 번 로드 (chatbot/data/router_models/CURRENT)
+question_router = create_question_router(routing_chain, create_intent_model())
+
 # 3단계: 일반 육아 상담 프롬프트
 parenting_expert_prompt = ChatPromptTemplate.from_messages([
     ("system", """당신은 전문적인 육아 상담 AI 어시스턴트입니다.
@@ -101,7 +110,10 @@ parenting_expert_prompt = ChatPromptTemplate.from_messages([
 class ChatSession:
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.memory = ConversationBufferMemory(
+        # 최근 MEMORY_WINDOW턴만 프롬프트에 넣어 대화가 길어져도 프롬프트 토큰이 늘지 않도록 제한
+        # (요약 메모리는 매 턴 동기 LLM 호출이 추가되므로 사용하지 않음)
+        self.memory = ConversationBufferWindowMemory(
+            k=MEMORY_WINDOW,
             memory_key="chat_history",
             return_messages=True
         )
@@ -109,9 +121,14 @@ class ChatSession:
             llm=llm,
             memory=self.memory,
             prompt=parenting_expert_prompt,
-            verbose=True
+            verbose=False
         )
-        self.messages = []  # 대화 내역 저장용 리스트
+        self.messages = []  # 아직 저장 대기열에 넘기지 않은 대화 내역
+        self.persisted = False
+        self.last_active = time.monotonic()
+
+    def touch(self):
+        self.last_active = time.monotonic()
 
     def add_message(self, role: str, content: str, category: str = None, is_parenting_related: bool = True):
         self.messages.append({
@@ -121,56 +138,162 @@ class ChatSession:
             'is_parenting_related': is_parenting_related,
             'created_at': timezone.now()
         })
+        # 윈도 밖의 메시지는 프롬프트에 쓰이지 않으므로 버퍼에서도 제거
+        buffer = self.memory.chat_memory.messages
+        if len(buffer) > MEMORY_WINDOW * 2:
+            del buffer[:-MEMORY_WINDOW * 2]
+
+    def remember(self, question: str, answer: str):
+        """체인 밖에서 만든 답변(수면/발달 서버)도 다음 질문의 윈도 메모리에 들어가도록 기록"""
+        self.memory.save_context({"input": question}, {"response": answer})
+
+    def memory_bytes(self) -> int:
+        """세션이 들고 있는 텍스트의 대략적인 크기 (UTF-8 바이트)"""
+        size = sum(len(msg['content'].encode('utf-8')) for msg in self.messages)
+        size += sum(len(str(msg.content).encode('utf-8')) for msg in self.memory.chat_memory.messages)
+        return size
 
 # 세션 관리를 위한 클래스
 class SessionManager:
-    def __init__(self):
-        self.sessions = {}
+    """메모리 세션 관리 (LRU + 유휴 TTL)
+
+    웹소켓 컨슈머는 연결 / 해제 시 attach / detach를 호출해 연결 중인 세션을 알려줍니다.
+    - 최대 max_sessions개까지 유지하고 넘으면 연결이 끊긴 세션 중 가장 오래 사용하지 않은 세션을 저장 후 제거
+      (모두 연결 중이면 가장 오래된 세션의 메모리만 비우고 DB 세션은 닫지 않음)
+    - 백그라운드 스위퍼가 sweep_interval마다 idle_ttl 동안 사용되지 않은, 연결이 끊긴 세션을 저장 후 제거
+    - 서버 종료 시 남은 세션을 모두 저장 (mafather/lifespan.py, 이벤트 루프 밖 종료는 atexit)
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_ttl: float = SESSION_IDLE_TTL_SECONDS,
+                 sweep_interval: float = SESSION_SWEEP_INTERVAL_SECONDS):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self.sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        # 세션 ID -> 연결 중인 웹소켓 수
+        self.connections: Dict[str, int] = {}
+        self.evicted = 0
+        self.expired = 0
+        self.memory_dropped = 0
+        self._sweeper = None
+
+    def attach(self, session_id: str):
+        """웹소켓이 세션에 연결됨 (연결 중에는 LRU / TTL로 세션을 닫지 않음)"""
+        self.connections[session_id] = self.connections.get(session_id, 0) + 1
+
+    def detach(self, session_id: str):
+        """웹소켓 연결 해제 (세션은 idle_ttl이 지나면 스위퍼가 저장 후 제거)"""
+        remaining = self.connections.get(session_id, 0) - 1
+        if remaining > 0:
+            self.connections[session_id] = remaining
+        else:
+            self.connections.pop(session_id, None)
+
+    def is_connected(self, session_id: str) -> bool:
+        return session_id in self.connections
     
     def get_session(self, session_id: str) -> ChatSession:
-        if session_id not in self.sessions:
-            self.sessions[session_id] = ChatSession(session_id)
-        return self.sessions[session_id]
+        chat_session = self.sessions.get(session_id)
+        if chat_session is None:
+            chat_session = self.sessions[session_id] = ChatSession(session_id)
+            self._ensure_sweeper()
+            while len(self.sessions) > self.max_sessions:
+                self._evict_one(keep=session_id)
+        else:
+            self.sessions.move_to_end(session_id)
+        chat_session.touch()
+        return chat_session
+
+    def _evict_one(self, keep: str):
+        """연결이 끊긴 세션 중 가장 오래된 것을 저장 후 제거, 없으면 가장 오래된 연결 중 세션의 메모리만 비움"""
+        for session_id in self.sessions:
+            if session_id != keep and not self.is_connected(session_id):
+                self.evicted += 1
+                self.persist(self.sessions.pop(session_id))
+                return
+        oldest_id = next(session_id for session_id in self.sessions if session_id != keep)
+        # 새 메시지만 저장 대기열에 넘기고 DB 세션은 열어 둠 (다음 메시지에서 빈 메모리로 다시 만들어짐)
+        self.memory_dropped += 1
+        self.persist(self.sessions.pop(oldest_id), close=False)
     
     async def save_session(self, session_id: str):
-        """세션의 대화 내역을 데이터베이스에 저장"""
-        if session_id not in self.sessions:
+        """세션의 대화 내역을 저장 대기열에 넘기고 메모리에서 제거"""
+        chat_session = self.sessions.pop(session_id, None)
+        if chat_session is None:
             return
+        self.persist(chat_session)
 
-        chat_session = self.sessions[session_id]
-        
-        try:
-            # ChatSession 모델 저장
-            db_session, created = ChatSession.objects.get_or_create(
-                session_id=session_id,
-                defaults={'is_active': True}
-            )
-            
-            # ChatMessage 모델에 메시지 저장
-            for msg in chat_session.messages:
-                ChatMessage.objects.create(
-                    session=db_session,
-                    role=msg['role'],
-                    content=msg['content'],
-                    category=msg.get('category'),
-                    is_parenting_related=msg.get('is_parenting_related', True)
-                )
-            
-            # 세션 비활성화
-            db_session.is_active = False
-            db_session.save()
-            
-            # 메모리에서 세션 제거
-            del self.sessions[session_id]
-            
-            logger.info(f"세션 {session_id}의 대화 내역이 저장되었습니다.")
-            
-        except Exception as e:
-            logger.error(f"세션 저장 중 오류 발생: {str(e)}")
-            raise
+    def checkpoint(self, chat_session: ChatSession):
+        """진행 중인 세션의 새 메시지를 저장 대기열에 넘김 (세션은 계속 활성 상태)"""
+        self.persist(chat_session, close=False)
+
+    def persist(self, chat_session: ChatSession, close: bool = True):
+        """아직 저장하지 않은 메시지를 write-behind 저장 대기열에 추가 (chatbot/transcript_writer.py)"""
+        if not chat_session.messages and not (close and chat_session.persisted):
+            return
+        messages, chat_session.messages = chat_session.messages, []
+        transcript_writer.enqueue(chat_session.session_id, messages, close=close)
+        chat_session.persisted = True
+
+    def _ensure_sweeper(self):
+        loop = asyncio.get_running_loop()
+        if self._sweeper is None or self._sweeper.done() or self._sweeper.get_loop() is not loop:
+            self._sweeper = loop.create_task(self._sweep_forever())
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+
+    def sweep(self) -> int:
+        """idle_ttl 동안 사용되지 않은, 연결이 끊긴 세션을 저장 후 제거하고 제거한 수를 반환"""
+        deadline = time.monotonic() - self.idle_ttl
+        idle = []
+        # LRU 순서이므로 앞에서부터 유휴 세션만 꺼냄 (연결 중인 세션은 유휴 상태여도 유지)
+        for session_id, chat_session in self.sessions.items():
+            if chat_session.last_active > deadline:
+                break
+            if not self.is_connected(session_id):
+                idle.append(session_id)
+        for session_id in idle:
+            chat_session = self.sessions.pop(session_id)
+            self.expired += 1
+            self.persist(chat_session)
+        if idle:
+            logger.info(f"유휴 세션 {len(idle)}개를 저장 후 제거했습니다. (남은 세션 {len(self.sessions)}개)")
+        return len(idle)
+
+    async def aclose(self):
+        """스위퍼를 멈추고 남은 세션을 모두 저장 (서버 종료 시 mafather.lifespan에서 호출)"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        self.persist_all()
+        # 대기열은 transcript_writer.aclose가 이어서 저장 (on_shutdown 콜백은 등록 역순으로 실행)
+
+    def persist_all(self):
+        """남은 세션을 모두 저장 대기열에 넘기고 닫음 (atexit에서도 호출, 이미 비어 있으면 아무것도 하지 않음)"""
+        while self.sessions:
+            _, chat_session = self.sessions.popitem(last=False)
+            self.persist(chat_session)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "live_sessions": len(self.sessions),
+            "connected_sessions": len(self.connections),
+            "max_sessions": self.max_sessions,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "memory_dropped": self.memory_dropped,
+            "unsaved_messages": sum(len(chat_session.messages) for chat_session in self.sessions.values()),
+            "memory_bytes": sum(chat_session.memory_bytes() for chat_session in self.sessions.values()),
+        }
 
 # 세션 매니저 인스턴스 생성
 session_manager = SessionManager()
+on_shutdown(session_manager.aclose)
+# transcript_writer의 atexit flush보다 나중에 등록했으므로 먼저 실행됨 (atexit은 등록 역순)
+atexit.register(session_manager.persist_all)
 
 # 4단계: 비육아 질문 안내 프롬프트
 non_parenting_prompt = ChatPromptTemplate.from_messages([
@@ -191,36 +314,52 @@ non_parenting_chain = (
 async def call_sleep_development_server(question: str, chat_history: List[Dict[str, str]], category: str) -> str:
     """수면/발달 전문 서버에 요청"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{EXTERNAL_SERVER_URL}/tuning",
-                json={
-                    "message": question
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result.get("response", "외부 서버에서 응답을 받지 못했습니다.")
+        response = await post_json("/tuning", {"message": question})
+        result = response.json()
+        return result.get("response", "외부 서버에서 응답을 받지 못했습니다.")
     except Exception as e:
         logger.error(f"수면/발달 서버 통신 오류: {str(e)}")
         return "죄송합니다. 수면/발달 전문 상담 서비스가 일시적으로 이용 불가합니다."
 
-async def call_doc_server(question: str, chat_history: List[Dict[str, str]]) -> Dict[str, Any]:
-    """문서 기반 벡터 DB 서버에 요청"""
+async def stream_sleep_development_server(question: str) -> AsyncIterator[str]:
+    """수면/발달 전문 서버의 토큰 스트림(SSE)을 받아 텍스트 조각 단위로 반환
+
+    다음 줄이 STREAM_IDLE_TIMEOUT_SECONDS 안에 오지 않거나 스트림이 ANSWER_TIMEOUT_SECONDS 안에 끝나지 않으면
+    연결을 닫고 asyncio.TimeoutError를 냅니다 (멈춘 스트림이 같은 웹소켓의 다음 메시지를 막지 않도록).
+    """
+    deadline = time.monotonic() + ANSWER_TIMEOUT_SECONDS
+    async with stream_post("/tuning/stream", json={"message": question}) as response:
+        lines = response.aiter_lines()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                line = await asyncio.wait_for(lines.__anext__(), min(STREAM_IDLE_TIMEOUT_SECONDS, remaining))
+            except StopAsyncIteration:
+                return
+            if not line.startswith("data:"):
+                continue
+            event = json.loads(line[len("data:"):].strip())
+            if event.get("type") == "token":
+                yield event.get("content", "")
+            elif event.get("type") == "error":
+                raise RuntimeError(event.get("content", "스트리밍 응답 생성 실패"))
+            elif event.get("type") == "done":
+                return
+
+async def call_doc_server(question: str, chat_history: List[Dict[str, str]], session_id: str = None) -> Dict[str, Any]:
+    """문서 기반 벡터 DB 서버에 요청 (session_id 단위로 서버 측 대화 기록 유지)"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{EXTERNAL_SERVER_URL}/vector",
-                json={
-                    "message": question
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            return {
-                "answer": result.get("response", "문서 검색 결과를 찾을 수 없습니다."),
-                "sources": []
-            }
+        response = await post_json("/vector", {
+            "message": question,
+            "session_id": session_id
+        })
+        result = response.json()
+        return {
+            "answer": result.get("response", "문서 검색 결과를 찾을 수 없습니다."),
+            "sources": []
+        }
     except Exception as e:
         logger.error(f"문서 서버 통신 오류: {str(e)}")
         return {
@@ -238,16 +377,9 @@ async def call_openai_server(question: str, chat_history: List[Dict[str, str]])
             "chat_history": formatted_history
         })
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{EXTERNAL_SERVER_URL}/openai",
-                json={
-                    "message": formatted_question
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result.get("response", "외부 서버에서 응답을 받지 못했습니다.")
+        response = await post_json("/openai", {"message": formatted_question})
+        result = response.json()
+        return result.get("response", "외부 서버에서 응답을 받지 못했습니다.")
     except Exception as e:
         logger.error(f"일반 육아 상담 서버 통신 오류: {str(e)}")
         return "죄송합니다. 일반 육아 상담 서비스가 일시적으로 이용 불가합니다."
@@ -259,7 +391,7 @@ def format_chat_history(chat_history: List[Dict[str, str]]) -> str:
     
     formatted_history = []
     # 최근 4개 대화만 사용 (너무 길면 응답 품질 저하)
-    recent_history = chat_history[-8:] if len(chat_history) > 8 else chat_history
+    recent_history = chat_history[-CONTEXT_MESSAGES:]
     
     for i, msg in enumerate(recent_history):
         if msg.get("type") == "user":
@@ -274,28 +406,25 @@ def format_chat_history(chat_history: List[Dict[str, str]]) -> str:
     
     return "\n".join(formatted_history)
 
-def parse_llm_json_response(response_text: str) -> Dict[str, Any]:
-    """LLM의 JSON 응답을 안전하게 파싱"""
-    try:
-        # JSON 블록 추출 시도
-        import re
-        json_match = re.search(r'\{[^}]*\}', response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        else:
-            # JSON이 없으면 기본값 반환
-            return {}
-    except:
-        return {}
-
 # 메인 처리 함수
+def record_turn(session_id: str, question: str, answer: str, category: Optional[str] = None,
+                is_parenting_related: bool = True):
+    """process_question을 거치지 않고 만든 답변(스트리밍)을 같은 세션 메모리 / 대화 저장 대기열에 기록"""
+    chat_session = session_manager.get_session(session_id)
+    chat_session.add_message('user', question)
+    chat_session.add_message('ai', answer, category, is_parenting_related=is_parenting_related)
+    chat_session.remember(question, answer)
+    session_manager.checkpoint(chat_session)
+
+
 async def process_question(
     question: str, 
     chat_history: List[Dict[str, str]] = None, 
     websocket_type: str = "ai_expert",
     session_id: str = None,
+    route: Optional[RouteDecision] = None,
 ) -> Dict[str, Any]:
-    """질문 처리 메인 함수"""
+    """질문 처리 메인 함수 (route를 넘기면 라우팅 단계를 건너뜀)"""
     
     if not session_id:
         raise ValueError("session_id는 필수값입니다.")
@@ -303,7 +432,7 @@ async def process_question(
     # doc 타입인 경우 세션 관리 없이 직접 처리
     if websocket_type == "doc":
         try:
-            result = await call_doc_server(question, [])  # 빈 chat_history 전달
+            result = await call_doc_server(question, [], session_id)  # 빈 chat_history 전달
             return {
                 "answer": result.get("answer", "문서 검색 결과를 찾을 수 없습니다."),
                 "sources": result.get("sources", []),
@@ -325,17 +454,18 @@ async def process_question(
     chat_session.add_message('user', question)
     
     try:
-        # 1단계: 육아 관련성 판단
-        logger.info("1단계: 육아 관련성 판단 중...")
-        parenting_result = parenting_classifier_chain.invoke({"question": question})
-        parenting_data = parse_llm_json_response(parenting_result)
-        is_parenting = parenting_data.get("is_parenting", False)
-        logger.info(f"육아 관련성 판단 결과: {is_parenting}")
+        # 1단계: 육아 관련성 + 세부 카테고리 판단 (로컬 분류로 확신하면 LLM 호출 생략)
+        logger.info("1단계: 질문 라우팅 중...")
+        if route is None:
+            route = await question_router.aroute(question)
+        is_parenting = route.is_parenting
         
         if not is_parenting:
             # 비육아 질문 - 안내 메시지
             logger.info("비육아 질문으로 판단 - 안내 메시지 생성")
-            answer = non_parenting_chain.invoke({"question": question})
+            answer = await asyncio.wait_for(
+                non_parenting_chain.ainvoke({"question": question}), ANSWER_TIMEOUT_SECONDS
+            )
             chat_session.add_message('ai', answer, is_parenting_related=False)
             return {
                 "answer": answer,
@@ -344,22 +474,19 @@ async def process_question(
                 "session_id": session_id
             }
         
-        # 2단계: 육아 질문의 세부 카테고리 판단
-        logger.info("2단계: 세부 카테고리 판단 중...")
-        category_result = category_classifier_chain.invoke({"question": question})
-        category_data = parse_llm_json_response(category_result)
-        category = category_data.get("category", "other")
-        logger.info(f"카테고리 판단 결과: {category}")
+        category = route.category
         
-        if category in ["sleep", "development"]:
+        if category in STREAMING_CATEGORIES:
             # 3-1단계: 수면/발달 전문 서버로 요청
             logger.info(f"{category} 전문 서버로 요청 중...")
             answer = await call_sleep_development_server(question, chat_history, category)
+            chat_session.remember(question, answer)
         else:
             # 3-2단계: 일반 육아 상담 (메모리를 사용한 체인)
             logger.info("일반 육아 상담으로 처리 중...")
-            response = chat_session.chain.predict(input=question)
-            answer = response
+            answer = await asyncio.wait_for(
+                chat_session.chain.apredict(input=question), ANSWER_TIMEOUT_SECONDS
+            )
         
         # AI 응답 저장
         chat_session.add_message('ai', answer, category, is_parenting_related=True)
@@ -372,6 +499,16 @@ async def process_question(
             "session_id": session_id
         }
     
+    except asyncio.TimeoutError:
+        error_message = ANSWER_TIMEOUT_MESSAGE
+        chat_session.add_message('ai', error_message, is_parenting_related=True)
+        logger.error(f"답변 생성 시간 초과 ({ANSWER_TIMEOUT_SECONDS}s)")
+        return {
+            "answer": error_message,
+            "sources": [],
+            "is_parenting_related": True,
+            "session_id": session_id
+        }
     except Exception as e:
         error_message = "죄송합니다. 일시적인 오류가 발생했습니다. 다시 시도해 주세요."
         chat_session.add_message('ai', error_message, is_parenting_related=True)
@@ -382,3 +519,6 @@ async def process_question(
             "is_parenting_related": True,
             "session_id": session_id
         }
+    finally:
+        # 이번 턴의 메시지를 write-behind 저장 대기열로 넘김
+        session_manager.checkpoint(chat_session)
@@ -1,3 +1,4 @@
+import os
 import json
 import uuid
 import asyncio
@@ -6,17 +7,78 @@ from channels.db import database_sync_to_async
 from django.core.cache import cache
 from django.utils import timezone
 import logging
-from .chains import EXTERNAL_SERVER_URL, process_question
-import httpx
+from .chains import (
+    ANSWER_TIMEOUT_MESSAGE, ANSWER_TIMEOUT_SECONDS, STREAM_IDLE_TIMEOUT_SECONDS, STREAMING_CATEGORIES,
+    process_question, question_router, record_turn, session_manager, stream_sleep_development_server,
+)
+from .http_client import post_json
+from .session_index import remove_user_sessions
+from . import history_store
 
 logger = logging.getLogger(__name__)
 
+# 연결당 처리 대기 중인 메시지 최대 수 (넘으면 새 메시지는 거절)
+MAX_PENDING_MESSAGES = int(os.getenv("WEBSOCKET_MAX_PENDING_MESSAGES", "4"))
 
-class ChatbotConsumer(AsyncWebsocketConsumer):
+
+class MessageTaskMixin:
+    """메시지 처리를 별도 작업으로 실행하고 연결이 끊기면 취소
+
+    Channels는 receive 핸들러가 끝날 때까지 같은 연결의 disconnect 이벤트를 처리하지 않으므로
+    LLM / 외부 서버 응답을 기다리는 동안에도 연결 해제를 바로 알아채려면 처리를 작업으로 분리해야 합니다.
+    같은 연결의 메시지는 도착한 순서대로 하나씩 처리합니다.
+    연결 중인 세션은 attach_session으로 session_manager에 알려 LRU / 유휴 TTL 정리 대상에서 뺍니다.
+    """
+
+    def init_message_tasks(self):
+        self._message_tasks = set()
+        self._attached_session = None
+        self._message_lock = asyncio.Lock()
+
+    def start_message_task(self, handler, *args) -> bool:
+        """handler(*args)를 순서대로 실행하도록 예약 (대기 중인 메시지가 너무 많으면 False)"""
+        if len(self._message_tasks) >= MAX_PENDING_MESSAGES:
+            return False
+        task = asyncio.ensure_future(self._run_in_order(handler, *args))
+        self._message_tasks.add(task)
+        task.add_done_callback(self._message_tasks.discard)
+        return True
+
+    def attach_session(self, session_id: str):
+        """연결 중인 동안 session_manager가 이 세션을 LRU / TTL로 닫지 않도록 등록"""
+        self._attached_session = session_id
+        session_manager.attach(session_id)
+
+    def detach_session(self):
+        if self._attached_session is not None:
+            session_manager.detach(self._attached_session)
+            self._attached_session = None
+
+    async def _run_in_order(self, handler, *args):
+        async with self._message_lock:
+            try:
+                await handler(*args)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[WebSocket] Message task error: {str(e)}", exc_info=True)
+
+    async def cancel_message_tasks(self):
+        """처리 중 / 대기 중인 메시지 작업 취소 (진행 중인 LLM / 외부 서버 요청도 함께 취소됨)"""
+        tasks = list(self._message_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"[WebSocket] Cancelled {len(tasks)} message task(s) on disconnect")
+
+
+class ChatbotConsumer(MessageTaskMixin, AsyncWebsocketConsumer):
     """웹소켓 기반 챗봇 컨슈머"""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.init_message_tasks()
         self.room_name = None
         self.room_group_name = None
         self.session_id = None
@@ -36,22 +98,12 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
                 await self.close(code=4000)
                 return
             
-            # 세션 메타데이터 가져오기 (최대 3번 시도)
+            # 세션 메타데이터 가져오기 (공유 캐시라 세션 생성 API가 쓴 값을 어느 워커에서든 바로 읽음)
             cache_key = f"websocket_session_{self.session_id}"
-            session_data = None
-            max_retries = 3
-            retry_delay = 0.1  # 100ms
-            
-            for attempt in range(max_retries):
-                session_data = cache.get(cache_key)
-                logger.info(f"[WebSocket] Cache lookup attempt {attempt + 1}: {session_data}")
-                if session_data:
-                    break
-                logger.warning(f"[WebSocket] Session data not found, attempt {attempt + 1}/{max_retries}")
-                await asyncio.sleep(retry_delay)
+            session_data = await cache.aget(cache_key)
             
             if not session_data:
-                logger.error(f"[WebSocket] No session data found for session_id: {self.session_id} after {max_retries} attempts")
+                logger.error(f"[WebSocket] No session data found for session_id: {self.session_id}")
                 await self.close(code=4001)
                 return
             
@@ -124,7 +176,7 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
             try:
                 session_data['status'] = 'connected'
                 session_data['last_activity'] = timezone.now().isoformat()
-                cache.set(cache_key, session_data, timeout=3600)
+                await cache.aset(cache_key, session_data, timeout=3600)
                 logger.info("[WebSocket] Session status updated to connected")
             except Exception as cache_error:
                 logger.error(f"[WebSocket] Failed to update session status: {str(cache_error)}")
@@ -133,6 +185,7 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
             
             # 연결 수락
             await self.accept()
+            self.attach_session(self.session_id)
             logger.info("[WebSocket] Connection accepted")
             
             # 환영 메시지 전송
@@ -156,6 +209,9 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         """웹소켓 연결 해제"""
+        # 응답을 받을 클라이언트가 없으므로 진행 중인 처리 취소
+        await self.cancel_message_tasks()
+        self.detach_session()
         try:
             # 그룹에서 채널 제거
             if self.room_group_name:
@@ -172,6 +228,10 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
                     session_metadata['status'] = 'disconnected'
                     session_metadata['disconnected_at'] = timezone.now().isoformat()
                     await database_sync_to_async(cache.set)(cache_key, session_metadata, timeout=3600)
+                    if session_metadata.get('user_id'):
+                        await database_sync_to_async(remove_user_sessions)(
+                            session_metadata['user_id'], self.session_id
+                        )
             
         except Exception as e:
             logger.error(f"WebSocket disconnect error: {str(e)}")
@@ -187,15 +247,16 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
         try:
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type', 'chat')
+            handlers = {
+                'chat': self.handle_chat_message,
+                'clear_history': self.handle_clear_history,
+                'get_history': self.handle_get_history,
+            }
             
-            if message_type == 'chat':
-                await self.handle_chat_message(text_data_json)
-            elif message_type == 'clear_history':
-                await self.handle_clear_history(text_data_json)
-            elif message_type == 'get_history':
-                await self.handle_get_history(text_data_json)
-            else:
+            if message_type not in handlers:
                 await self.send_error('알 수 없는 메시지 타입입니다.')
+            elif not self.start_message_task(handlers[message_type], text_data_json):
+                await self.send_error('이전 메시지를 처리하는 중입니다. 잠시 후 다시 시도해 주세요.')
                 
         except json.JSONDecodeError:
             await self.send_error('잘못된 JSON 형식입니다.')
@@ -218,9 +279,10 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
                 'is_typing': True
             }))
 
-            # 채팅 히스토리 가져오기
-            history_key = f"chat_history_{self.session_id}"
-            chat_history = await database_sync_to_async(cache.get)(history_key, [])
+            # 채팅 히스토리 가져오기 (프롬프트에 쓰이는 최근 메시지만)
+            chat_history = history_store.as_chat_messages(
+                await database_sync_to_async(history_store.recent)(self.session_id, history_store.CONTEXT_MESSAGES)
+            )
 
             # 타입별 메시지 처리
             if self.session_type == 'ai_expert':
@@ -238,24 +300,10 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
                 # 자료실 검색 처리
                 result = await self.process_doc_search(message, chat_history)
 
-            # 채팅 히스토리 업데이트
-            chat_history.append({
-                'type': 'user',
-                'message': message,
-                'timestamp': timezone.now().isoformat()
-            })
-            
-            chat_history.append({
-                'type': 'ai',
-                'message': result['answer'],
-                'timestamp': timezone.now().isoformat()
-            })
-            
-            # 히스토리 저장 (최대 50개 메시지 유지)
-            if len(chat_history) > 50:
-                chat_history = chat_history[-50:]
-            
-            await database_sync_to_async(cache.set)(history_key, chat_history, timeout=3600)
+            # 히스토리에 이번 턴만 추가 (최대 50개 메시지 유지)
+            await database_sync_to_async(history_store.append)(
+                self.session_id, ('user', message), ('assistant', result['answer'])
+            )
 
             # 응답 전송
             await self.send(text_data=json.dumps({
@@ -281,20 +329,16 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
     async def process_doc_search(self, message, history):
         """자료실 검색 처리"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{EXTERNAL_SERVER_URL}/vector",
-                    json={
-                        "message": message
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                return {
-                    'answer': result.get('response', '문서 검색 결과를 찾을 수 없습니다.'),
-                    'sources': result.get('sources', [])
-                }
+            response = await post_json("/vector", {
+                "message": message,
+                "session_id": self.session_id
+            })
+            result = response.json()
+            
+            return {
+                'answer': result.get('response', '문서 검색 결과를 찾을 수 없습니다.'),
+                'sources': result.get('sources', [])
+            }
         except Exception as e:
             logger.error(f"문서 서버 통신 오류: {str(e)}")
             return {
@@ -305,8 +349,7 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
     async def handle_clear_history(self, data):
         """채팅 히스토리 초기화"""
         try:
-            history_key = f"chat_history_{self.session_id}"
-            await database_sync_to_async(cache.delete)(history_key)
+            await database_sync_to_async(history_store.clear)(self.session_id)
             await self.send(text_data=json.dumps({
                 'type': 'history_cleared',
                 'message': '채팅 히스토리가 초기화되었습니다.'
@@ -318,11 +361,10 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
     async def handle_get_history(self, data):
         """채팅 히스토리 조회"""
         try:
-            history_key = f"chat_history_{self.session_id}"
-            chat_history = await database_sync_to_async(cache.get)(history_key, [])
+            chat_history = await database_sync_to_async(history_store.recent)(self.session_id)
             await self.send(text_data=json.dumps({
                 'type': 'chat_history',
-                'history': chat_history
+                'history': history_store.as_chat_messages(chat_history)
             }))
         except Exception as e:
             logger.error(f"Get history error: {str(e)}")
@@ -336,13 +378,13 @@ class ChatbotConsumer(AsyncWebsocketConsumer):
         }))
 
 
-class ChatbotStreamConsumer(AsyncWebsocketConsumer):
+class ChatbotStreamConsumer(MessageTaskMixin, AsyncWebsocketConsumer):
     """스트리밍 응답을 위한 챗봇 컨슈머"""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.init_message_tasks()
         self.session_id = None
-        self.chatbot_service = None
 
     async def connect(self):
         """웹소켓 연결"""
@@ -354,6 +396,7 @@ class ChatbotStreamConsumer(AsyncWebsocketConsumer):
         session_metadata = await database_sync_to_async(cache.get)(f"websocket_session_{self.session_id}")
         
         await self.accept()
+        self.attach_session(self.session_id)
         
         # 카테고리 메시지 생성
         category_message = ""
@@ -380,8 +423,9 @@ class ChatbotStreamConsumer(AsyncWebsocketConsumer):
         }))
 
     async def disconnect(self, close_code):
-        """웹소켓 연결 해제"""
-        pass
+        """웹소켓 연결 해제 (진행 중인 스트림을 닫아 Exaone 서버의 생성도 중단)"""
+        await self.cancel_message_tasks()
+        self.detach_session()
 
     async def receive(self, text_data):
         """클라이언트로부터 메시지 수신"""
@@ -393,60 +437,90 @@ class ChatbotStreamConsumer(AsyncWebsocketConsumer):
                 await self.send_error('메시지 내용이 없습니다.')
                 return
             
-            # 스트리밍 응답 시작
-            await self.send(text_data=json.dumps({
-                'type': 'stream_start',
-                'message': message
-            }))
-            
-            # 챗봇 서비스 초기화
-            if not self.chatbot_service:
-                self.chatbot_service = await self.create_chatbot_service()
-            
-            # 스트리밍 방식으로 AI 응답 생성
-            await self.generate_streaming_response(message)
+            if not self.start_message_task(self.handle_stream_message, message):
+                await self.send_error('이전 메시지를 처리하는 중입니다. 잠시 후 다시 시도해 주세요.')
             
         except Exception as e:
             await self.send_error(f'오류가 발생했습니다: {str(e)}')
 
+    async def handle_stream_message(self, message):
+        """스트리밍 응답 시작 알림 후 AI 응답 생성"""
+        await self.send(text_data=json.dumps({
+            'type': 'stream_start',
+            'message': message
+        }))
+        await self.generate_streaming_response(message)
+
     async def generate_streaming_response(self, message):
-        """스트리밍 방식으로 AI 응답 생성"""
+        """질문을 라우팅한 뒤 수면/발달 질문은 Exaone 서버가 디코딩하는 토큰을 받는 즉시 전달
+
+        비육아 / 일반 육아 질문은 ChatbotConsumer와 같은 process_question 경로로 답변을 만들어
+        한 조각으로 보냅니다. 스트림이 멈추거나 너무 오래 걸리면 받은 데까지에 시간 초과 안내를 붙여 마칩니다.
+        스트리밍한 답변도 process_question과 같이 세션 메모리 / 대화 저장 대기열(record_turn)에 기록합니다.
+        """
+        chunks = []
         try:
-            # 여기서는 실제 스트리밍 대신 청크로 나누어 전송하는 시뮬레이션
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.chatbot_service.chat,
-                message,
-                self.session_id
-            )
-            
-            answer = response['answer']
-            
-            # 응답을 청크로 나누어 전송
-            chunk_size = 50  # 50자씩 전송
-            for i in range(0, len(answer), chunk_size):
-                chunk = answer[i:i + chunk_size]
-                
+            route = await question_router.aroute(message)
+            sources = []
+            if route.is_parenting and route.category in STREAMING_CATEGORIES:
+                try:
+                    async for chunk in stream_sleep_development_server(message):
+                        chunks.append(chunk)
+                        await self.send(text_data=json.dumps({
+                            'type': 'stream_chunk',
+                            'chunk': chunk,
+                            'is_complete': False
+                        }))
+                except asyncio.TimeoutError:
+                    logger.error(
+                        f"스트리밍 답변 시간 초과 (조각 사이 {STREAM_IDLE_TIMEOUT_SECONDS}s / 전체 {ANSWER_TIMEOUT_SECONDS}s)"
+                    )
+                    chunk = f"\n\n{ANSWER_TIMEOUT_MESSAGE}" if chunks else ANSWER_TIMEOUT_MESSAGE
+                    chunks.append(chunk)
+                    await self.send(text_data=json.dumps({
+                        'type': 'stream_chunk',
+                        'chunk': chunk,
+                        'is_complete': False
+                    }))
+                record_turn(self.session_id, message, ''.join(chunks).strip(), route.category)
+            else:
+                chat_history = history_store.as_chat_messages(
+                    await database_sync_to_async(history_store.recent)(self.session_id, history_store.CONTEXT_MESSAGES)
+                )
+                result = await process_question(
+                    question=message,
+                    chat_history=chat_history,
+                    session_id=self.session_id,
+                    route=route
+                )
+                sources = result.get('sources', [])
+                chunks.append(result['answer'])
                 await self.send(text_data=json.dumps({
                     'type': 'stream_chunk',
-                    'chunk': chunk,
-                    'is_complete': i + chunk_size >= len(answer)
+                    'chunk': result['answer'],
+                    'is_complete': False
                 }))
-                
-                # 스트리밍 효과를 위한 약간의 지연
-                await asyncio.sleep(0.1)
+            
+            answer = ''.join(chunks).strip()
             
             # 스트리밍 완료
+            await self.send(text_data=json.dumps({
+                'type': 'stream_chunk',
+                'chunk': '',
+                'is_complete': True
+            }))
             await self.send(text_data=json.dumps({
                 'type': 'stream_complete',
-                'sources': await self.format_sources(response.get('source_documents', [])),
-                'is_parenting_related': response.get('is_parenting_related', True)
+                'sources': sources,
+                'is_parenting_related': route.is_parenting,
+                'category': route.category
             }))
             
             # 히스토리 저장
             await self.save_chat_history(message, answer)
             
         except Exception as e:
+            logger.error(f"스트리밍 응답 생성 중 오류: {str(e)}")
             await self.send_error(f'스트리밍 응답 생성 중 오류: {str(e)}')
 
     async def send_error(self, error_message):
@@ -456,38 +530,7 @@ class ChatbotStreamConsumer(AsyncWebsocketConsumer):
             'error': error_message
         }))
 
-    @database_sync_to_async
-    def create_chatbot_service(self):
-        """챗봇 서비스 생성"""
-        chatbot_service = RAGChatbotService()
-        cache_key = f"chat_history_{self.session_id}"
-        history = cache.get(cache_key, [])
-        if history:
-            chatbot_service.set_memory_from_history(history)
-        return chatbot_service
-
     @database_sync_to_async
     def save_chat_history(self, user_message, ai_response):
         """채팅 히스토리 저장"""
-        cache_key = f"chat_history_{self.session_id}"
-        current_history = cache.get(cache_key, [])
-        
-        current_history.append({"role": "user", "content": user_message})
-        current_history.append({"role": "assistant", "content": ai_response})
-        
-        if len(current_history) > 50:
-            current_history = current_history[-50:]
-        
-        cache.set(cache_key, current_history, timeout=3600)
-
-    async def format_sources(self, source_docs):
-        """소스 문서 포맷팅"""
-        sources = []
-        for doc in source_docs[:3]:
-            if hasattr(doc, 'metadata'):
-                sources.append({
-                    'category': doc.metadata.get('category_name', ''),
-                    'section': doc.metadata.get('section_title', ''),
-                    'content_preview': doc.page_content[:100] + '...'
-                })
-        return sources
\ No newline at end of file
+        history_store.append(self.session_id, ("user", user_message), ("assistant", ai_response))
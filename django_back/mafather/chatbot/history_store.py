@@ -0,0 +1,132 @@
+"""
+채팅 히스토리 저장소
+
+세션별 최근 대화를 리스트로 저장합니다. 매 턴 전체 리스트를 cache.get → append → cache.set 하지 않고
+새 메시지만 원자적으로 추가하고 오래된 메시지를 잘라냅니다.
+- Redis 캐시(REDIS_URL): MULTI 안에서 RPUSH + LTRIM + EXPIRE, 읽기는 LRANGE로 필요한 만큼만
+- 로컬 메모리 캐시: 프로세스 락 안에서 리스트를 읽고 써서 동시 append가 서로 덮어쓰지 않게 함
+- 메시지는 짧은 키를 쓴 msgpack으로 인코딩 ({"r": "u" | "a", "c": 내용, "t": epoch 초})
+
+    append(session_id, ("user", question), ("assistant", answer))
+    recent(session_id, CONTEXT_MESSAGES)   # [{"role", "content", "timestamp"}, ...]
+
+환경 변수:
+    CHAT_HISTORY_MAX_MESSAGES  세션당 보관할 최대 메시지 수 (기본 50)
+"""
+
+import os
+import time
+import threading
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import msgpack
+from django.core.cache import caches
+
+from mafather.cache import get_redis_client
+
+MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", "50"))
+HISTORY_TIMEOUT = 3600
+# chains.format_chat_history가 프롬프트에 넣는 최근 메시지 수
+CONTEXT_MESSAGES = 8
+
+# 'ai'는 ChatbotConsumer가 쓰던 역할 이름
+ROLE_CODES = {'user': 'u', 'assistant': 'a', 'ai': 'a'}
+CODE_ROLES = {'u': 'user', 'a': 'assistant'}
+
+_lock = threading.Lock()
+
+
+def _key(session_id: str) -> str:
+    return f"chat_history:{session_id}"
+
+
+def _pack(role: str, content: str) -> bytes:
+    return msgpack.packb({'r': ROLE_CODES.get(role, role), 'c': content, 't': round(time.time(), 3)})
+
+
+def _unpack(data: bytes) -> Dict[str, Any]:
+    entry = msgpack.unpackb(data)
+    return {
+        'role': CODE_ROLES.get(entry['r'], entry['r']),
+        'content': entry['c'],
+        'timestamp': datetime.fromtimestamp(entry['t'], tz=dt_timezone.utc).isoformat(),
+    }
+
+
+def append(session_id: str, *messages: Tuple[str, str]):
+    """(role, content) 메시지들을 추가하고 최근 MAX_MESSAGES개만 남김"""
+    packed = [_pack(role, content) for role, content in messages]
+    if not packed:
+        return
+    key = _key(session_id)
+    client = get_redis_client()
+    if client is not None:
+        redis_key = caches['default'].make_key(key)
+        pipeline = client.pipeline(transaction=True)
+        pipeline.rpush(redis_key, *packed)
+        pipeline.ltrim(redis_key, -MAX_MESSAGES, -1)
+        pipeline.expire(redis_key, HISTORY_TIMEOUT)
+        pipeline.execute()
+        return
+    backend = caches['default']
+    with _lock:
+        entries = backend.get(key, [])
+        entries.extend(packed)
+        backend.set(key, entries[-MAX_MESSAGES:], timeout=HISTORY_TIMEOUT)
+
+
+def replace(session_id: str, messages: Iterable[Tuple[str, str]]):
+    """히스토리 전체를 주어진 메시지로 교체 (DB에서 복원할 때)"""
+    packed = [_pack(role, content) for role, content in messages][-MAX_MESSAGES:]
+    key = _key(session_id)
+    client = get_redis_client()
+    if client is not None:
+        redis_key = caches['default'].make_key(key)
+        pipeline = client.pipeline(transaction=True)
+        pipeline.delete(redis_key)
+        if packed:
+            pipeline.rpush(redis_key, *packed)
+            pipeline.expire(redis_key, HISTORY_TIMEOUT)
+        pipeline.execute()
+        return
+    backend = caches['default']
+    with _lock:
+        backend.set(key, packed, timeout=HISTORY_TIMEOUT)
+
+
+def recent(session_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """최근 limit개 메시지 (limit이 없으면 보관 중인 전체), 오래된 것부터"""
+    start = -limit if limit else 0
+    key = _key(session_id)
+    client = get_redis_client(write=False)
+    if client is not None:
+        entries = client.lrange(caches['default'].make_key(key), start, -1)
+    else:
+        entries = caches['default'].get(key, [])[start:]
+    return [_unpack(entry) for entry in entries]
+
+
+def count(session_id: str) -> int:
+    key = _key(session_id)
+    client = get_redis_client(write=False)
+    if client is not None:
+        return client.llen(caches['default'].make_key(key))
+    return len(caches['default'].get(key, []))
+
+
+def clear(session_id: str):
+    # Redis에서도 make_key로 만든 같은 키이므로 캐시 API로 지움
+    caches['default'].delete(_key(session_id))
+
+
+def as_chat_messages(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """ChatbotConsumer / format_chat_history 형식 ({"type": "user" | "ai", "message", "timestamp"})"""
+    return [
+        {
+            'type': 'user' if entry['role'] == 'user' else 'ai',
+            'message': entry['content'],
+            'timestamp': entry['timestamp'],
+        }
+        for entry in entries
+    ]
@@ -0,0 +1,186 @@
+"""
+Django → FastAPI(EXTERNAL_SERVER_URL) 호출용 공유 HTTP 클라이언트
+
+채팅 메시지마다 httpx.AsyncClient를 새로 만들면 매번 TCP 연결을 새로 맺고 keep-alive도 쓰지 못하므로
+프로세스(이벤트 루프)당 하나의 AsyncClient를 만들어 연결 풀을 재사용합니다.
+- 엔드포인트별 타임아웃 / 재시도 횟수 (ENDPOINT_POLICIES, 환경 변수로 덮어쓰기 가능)
+- 재시도는 요청이 서버에 도달하지 못한 연결 오류와 502/503/504 응답에만 적용하며
+  지수 백오프에 full jitter를 섞어 대기합니다 (생성 도중 읽기 타임아웃은 재시도하지 않음)
+- 서버 종료 시 연결 풀을 닫습니다 (Daphne reactor 종료 트리거 / ASGI lifespan.shutdown, mafather/lifespan.py)
+
+    response = await post_json("/vector", {"message": question, "session_id": session_id})
+    async with stream_post("/tuning/stream", json={"message": question}) as response:
+        async for line in response.aiter_lines(): ...
+
+환경 변수:
+    EXTERNAL_SERVER_URL              FastAPI 서버 주소 (기본 http://127.0.0.1:8080)
+    EXTERNAL_HTTP_MAX_CONNECTIONS    최대 동시 연결 수 (기본 100)
+    EXTERNAL_HTTP_MAX_KEEPALIVE      유지할 유휴 연결 수 (기본 20)
+    EXTERNAL_HTTP_KEEPALIVE_EXPIRY   유휴 연결 유지 시간(초) (기본 30)
+    EXTERNAL_HTTP_POOL_TIMEOUT       풀에서 연결을 기다리는 최대 시간(초) (기본 5)
+    EXTERNAL_HTTP2                   1이면 HTTP/2 사용 (h2 패키지 필요, TLS 주소에서만 협상됨)
+    EXTERNAL_HTTP_BACKOFF_BASE       재시도 백오프 기준(초) (기본 0.2)
+    EXTERNAL_HTTP_BACKOFF_MAX        재시도 백오프 상한(초) (기본 2)
+    EXTERNAL_<NAME>_TIMEOUT          엔드포인트별 읽기 타임아웃(초) (NAME: TUNING, TUNING_STREAM, VECTOR, OPENAI)
+    EXTERNAL_<NAME>_RETRIES          엔드포인트별 재시도 횟수
+"""
+
+import os
+import random
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from mafather.lifespan import on_shutdown
+
+logger = logging.getLogger(__name__)
+
+EXTERNAL_SERVER_URL = os.getenv("EXTERNAL_SERVER_URL", "http://127.0.0.1:8080")
+
+MAX_CONNECTIONS = int(os.getenv("EXTERNAL_HTTP_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("EXTERNAL_HTTP_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("EXTERNAL_HTTP_KEEPALIVE_EXPIRY", "30"))
+POOL_TIMEOUT = float(os.getenv("EXTERNAL_HTTP_POOL_TIMEOUT", "5"))
+HTTP2_ENABLED = os.getenv("EXTERNAL_HTTP2", "0") == "1"
+BACKOFF_BASE = float(os.getenv("EXTERNAL_HTTP_BACKOFF_BASE", "0.2"))
+BACKOFF_MAX = float(os.getenv("EXTERNAL_HTTP_BACKOFF_MAX", "2"))
+CONNECT_TIMEOUT = 5.0
+
+# 요청이 서버에서 처리되지 않았다고 볼 수 있는 오류 (재시도해도 생성이 중복되지 않음)
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    """엔드포인트별 타임아웃 / 재시도 정책"""
+    timeout: httpx.Timeout
+    retries: int
+
+
+def _policy(name: str, read_timeout: Optional[float], retries: int) -> EndpointPolicy:
+    env_timeout = os.getenv(f"EXTERNAL_{name}_TIMEOUT")
+    if env_timeout is not None:
+        read_timeout = float(env_timeout) if float(env_timeout) > 0 else None
+    retries = int(os.getenv(f"EXTERNAL_{name}_RETRIES", str(retries)))
+    return EndpointPolicy(
+        timeout=httpx.Timeout(read_timeout, connect=CONNECT_TIMEOUT, pool=POOL_TIMEOUT),
+        retries=retries,
+    )
+
+
+ENDPOINT_POLICIES: Dict[str, EndpointPolicy] = {
+    "/tuning": _policy("TUNING", 30.0, 2),
+    # 스트림 전체 / 조각 사이 제한 시간은 chains.stream_sleep_development_server에서 적용
+    # (ANSWER_TIMEOUT_SECONDS / STREAM_IDLE_TIMEOUT_SECONDS)
+    "/tuning/stream": _policy("TUNING_STREAM", None, 1),
+    "/vector": _policy("VECTOR", 30.0, 2),
+    "/openai": _policy("OPENAI", 30.0, 2),
+}
+DEFAULT_POLICY = _policy("DEFAULT", 30.0, 1)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("[HTTP] EXTERNAL_HTTP2=1 이지만 h2 패키지가 없어 HTTP/1.1을 사용합니다 (pip install httpx[http2])")
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공유 AsyncClient (없거나 다른 루프에서 만들어졌으면 새로 생성)
+
+    AsyncClient의 연결은 만든 이벤트 루프에 묶이므로 테스트 / 관리 명령처럼 루프가 바뀌면 다시 만듭니다.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=EXTERNAL_SERVER_URL,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=DEFAULT_POLICY.timeout,
+        )
+        _client_loop = loop
+        logger.info(f"[HTTP] Shared client created for {EXTERNAL_SERVER_URL}")
+    return _client
+
+
+@on_shutdown
+async def aclose_http_client():
+    """공유 클라이언트의 연결 풀 종료 (서버 종료 시 mafather.lifespan에서 호출)"""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.info("[HTTP] Shared client closed")
+
+
+def get_policy(path: str) -> EndpointPolicy:
+    return ENDPOINT_POLICIES.get(path, DEFAULT_POLICY)
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt번째 재시도 전 대기 시간 (지수 백오프 + full jitter)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+async def post_json(path: str, payload: Dict[str, Any]) -> httpx.Response:
+    """공유 클라이언트로 JSON POST (정책에 따라 재시도, 실패 응답은 HTTPStatusError)"""
+    policy = get_policy(path)
+    client = get_http_client()
+    for attempt in range(policy.retries + 1):
+        try:
+            response = await client.post(path, json=payload, timeout=policy.timeout)
+        except RETRYABLE_ERRORS as e:
+            if attempt >= policy.retries:
+                raise
+            logger.warning(f"[HTTP] {path} 연결 오류, 재시도 {attempt + 1}/{policy.retries}: {str(e)}")
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= policy.retries:
+                response.raise_for_status()
+                return response
+            logger.warning(f"[HTTP] {path} {response.status_code} 응답, 재시도 {attempt + 1}/{policy.retries}")
+        await asyncio.sleep(backoff_delay(attempt))
+
+
+@asynccontextmanager
+async def stream_post(path: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """공유 클라이언트로 스트리밍 POST (응답 헤더를 받기 전의 실패만 재시도)"""
+    policy = get_policy(path)
+    client = get_http_client()
+    for attempt in range(policy.retries + 1):
+        request = client.build_request("POST", path, timeout=policy.timeout, **kwargs)
+        try:
+            response = await client.send(request, stream=True)
+        except RETRYABLE_ERRORS as e:
+            if attempt >= policy.retries:
+                raise
+            logger.warning(f"[HTTP] {path} 연결 오류, 재시도 {attempt + 1}/{policy.retries}: {str(e)}")
+        else:
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < policy.retries:
+                await response.aclose()
+                logger.warning(f"[HTTP] {path} {response.status_code} 응답, 재시도 {attempt + 1}/{policy.retries}")
+            else:
+                try:
+                    response.raise_for_status()
+                    yield response
+                finally:
+                    await response.aclose()
+                return
+        await asyncio.sleep(backoff_delay(attempt))
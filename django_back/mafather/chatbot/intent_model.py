@@ -0,0 +1,361 @@
+"""
+로컬 의도 분류 모델 (질문 → sleep / development / other / non_parenting)
+
+질문 라우터(router.py)에서 키워드 분류기가 확신하지 못한 질문을 LLM에 보내기 전에 사용합니다.
+네트워크 없이 CPU에서 1ms 안에 분류할 수 있도록 질문 임베딩은 OpenAI API 대신
+글자 n-gram 해싱 벡터(TF-IDF 가중, L2 정규화)를 쓰고, 카테고리별 중심(centroid)과의
+코사인 유사도를 softmax로 바꿔 확신도로 사용합니다.
+
+학습 데이터:
+- chatbot/data/router_examples.json: 라벨링된 질문 (is_parenting, category)
+- data/vector_db_final.json: 문서 메타데이터(section_title, page_name)로 카테고리를 붙인 문서 앞부분
+
+모델 파일은 버전별로 저장하고 CURRENT 파일이 서비스할 버전을 가리킵니다.
+모델 메타데이터의 training_sha256은 학습 데이터(질문 + 문서 + 가중치) 해시이며, 불러올 때 현재 학습 데이터의
+해시와 다르면(데이터나 document_label을 바꾸고 다시 학습하지 않은 경우) 경고를 남깁니다.
+
+    chatbot/data/router_models/
+        CURRENT                  현재 사용할 모델 버전 (한 줄)
+        <version>.npz            중심 벡터, IDF, 메타데이터(JSON)
+
+환경 변수:
+    ROUTER_MODEL_DIR         모델 디렉토리 (기본 chatbot/data/router_models)
+    ROUTER_MODEL_ENABLED     0 이면 로컬 모델을 쓰지 않음 (기본 1)
+    ROUTER_MODEL_THRESHOLD   이 확신도 미만이면 LLM으로 판단 (기본값은 모델 파일에 저장된 값)
+"""
+
+import os
+import re
+import json
+import time
+import random
+import zlib
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .router import category_scores
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+NON_PARENTING = "non_parenting"
+LABELS = ("sleep", "development", "other", NON_PARENTING)
+CURRENT_FILE = "CURRENT"
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+EXAMPLES_PATH = os.path.join(APP_DIR, "data", "router_examples.json")
+SOURCE_PATH = os.path.join(os.path.dirname(APP_DIR), "data", "vector_db_final.json")
+MODEL_DIR = os.path.join(APP_DIR, "data", "router_models")
+
+_CLEAN_RE = re.compile(r"[^0-9a-z가-힣]+")
+
+# 문서 페이지 이름 → 카테고리 (섹션 제목에 카테고리 키워드가 없을 때 사용)
+_PAGE_CATEGORIES = {"수면": "sleep", "발달": "development", "성장발달": "development", "행동": "development"}
+
+
+def featurize(text: str, dim: int, ngram_range: Tuple[int, int] = (1, 3)) -> Dict[int, float]:
+    """어절 단위 글자 n-gram을 해싱한 희소 벡터 {차원: 빈도}"""
+    counts: Dict[int, float] = {}
+    low, high = ngram_range
+    for word in _CLEAN_RE.sub(" ", text.lower()).split():
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram.strip() == "":
+                    continue
+                index = zlib.crc32(gram.encode("utf-8")) % dim
+                counts[index] = counts.get(index, 0.0) + 1.0
+    return counts
+
+
+def label_of(row: Dict) -> str:
+    """라벨링 질문 → 모델 라벨"""
+    if not row["is_parenting"]:
+        return NON_PARENTING
+    return row["category"] or "other"
+
+
+def document_label(metadata: Dict) -> str:
+    """문서 메타데이터로 카테고리 추정 (섹션 제목 키워드 → 페이지 이름 → other)"""
+    scores = category_scores(metadata.get("section_title", ""))
+    best = max(scores, key=scores.get)
+    if scores[best] > 0:
+        return best
+    return _PAGE_CATEGORIES.get(metadata.get("page_name", ""), "other")
+
+
+def load_examples(path: str = EXAMPLES_PATH) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def document_examples(path: str = SOURCE_PATH, max_chars: int = 120) -> List[Tuple[str, str]]:
+    """vector_db_final.json 문서 → (섹션 제목 + 본문 앞부분, 카테고리)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    return [
+        (f"{record['metadata'].get('section_title', '')} {record['text'][:max_chars]}",
+         document_label(record["metadata"]))
+        for record in records
+    ]
+
+
+class IntentModel:
+    """글자 n-gram 해싱 벡터 + 카테고리 중심 분류기"""
+
+    def __init__(self, labels: List[str], centroids: np.ndarray, idf: np.ndarray, metadata: Dict):
+        self.labels = list(labels)
+        self.centroids = centroids.astype(np.float32)  # (라벨 수, dim)
+        self.idf = idf.astype(np.float32)
+        self.metadata = metadata
+        self.dim = int(metadata["dim"])
+        self.ngram_range = tuple(metadata["ngram_range"])
+        self.scale = float(metadata["scale"])
+        self.threshold = float(metadata["threshold"])
+        self.version = metadata["version"]
+
+    def _vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        counts = featurize(text, self.dim, self.ngram_range)
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * self.idf[indices]
+        norm = float(np.linalg.norm(weights))
+        return indices, (weights / norm) if norm else weights
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """라벨별 확률 (중심과의 코사인 유사도 × scale의 softmax)"""
+        indices, weights = self._vector(text)
+        similarities = self.centroids[:, indices] @ weights if len(indices) else np.zeros(len(self.labels))
+        logits = similarities * self.scale
+        exp = np.exp(logits - logits.max())
+        probabilities = exp / exp.sum()
+        return dict(zip(self.labels, probabilities.tolist()))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """(라벨, 확신도)"""
+        probabilities = self.predict_proba(text)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                labels=np.array(self.labels),
+                centroids=self.centroids,
+                idf=self.idf,
+                metadata=np.array(json.dumps(self.metadata, ensure_ascii=False))
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IntentModel":
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            if metadata.get("format_version") != FORMAT_VERSION:
+                raise ValueError(
+                    f"지원하지 않는 모델 형식입니다: {metadata.get('format_version')} (필요: {FORMAT_VERSION})"
+                )
+            return cls([str(label) for label in data["labels"]], data["centroids"], data["idf"], metadata)
+
+
+def training_data_sha256(samples: Iterable[Tuple[str, str]], documents: Iterable[Tuple[str, str]] = (),
+                          document_weight: float = 0.3) -> str:
+    """학습 데이터 해시 (모델 메타데이터의 training_sha256)"""
+    rows = [(text, label, 1.0) for text, label in samples]
+    rows += [(text, label, document_weight) for text, label in documents]
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def current_training_sha256(document_weight: float, examples_path: str = EXAMPLES_PATH,
+                            source_path: str = SOURCE_PATH) -> str:
+    """지금의 라벨링 질문 / 문서로 학습한다면 나올 training_sha256"""
+    samples = [(row["question"], label_of(row)) for row in load_examples(examples_path)]
+    documents = document_examples(source_path) if source_path else []
+    return training_data_sha256(samples, documents, document_weight)
+
+
+def is_stale(model: "IntentModel", examples_path: str = EXAMPLES_PATH, source_path: str = SOURCE_PATH) -> bool:
+    """모델이 현재 학습 데이터로 학습되지 않았는지 (training_sha256 비교)"""
+    expected = current_training_sha256(float(model.metadata["document_weight"]), examples_path, source_path)
+    return model.metadata.get("training_sha256") != expected
+
+
+def train_intent_model(samples: Iterable[Tuple[str, str]], dim: int = 1 << 14,
+                       ngram_range: Tuple[int, int] = (1, 2), scale: float = 20.0,
+                       threshold: float = 0.7, document_weight: float = 0.3,
+                       documents: Iterable[Tuple[str, str]] = ()) -> IntentModel:
+    """라벨링 질문(+ 문서)으로 중심 분류기 학습
+
+    문서는 질문과 문체가 달라 중심이 문서 쪽으로 쏠리지 않도록 document_weight만큼 가중합니다.
+    """
+    rows = [(text, label, 1.0) for text, label in samples]
+    rows += [(text, label, document_weight) for text, label in documents]
+    features = [featurize(text, dim, ngram_range) for text, _, _ in rows]
+
+    # IDF: 학습 텍스트 중 해당 n-gram이 나온 텍스트 수 기준
+    document_frequency = np.zeros(dim, dtype=np.float32)
+    for counts in features:
+        document_frequency[list(counts.keys())] += 1
+    idf = np.log((1 + len(rows)) / (1 + document_frequency)) + 1
+
+    labels = [label for label in LABELS if any(row_label == label for _, row_label, _ in rows)]
+    centroids = np.zeros((len(labels), dim), dtype=np.float32)
+    for counts, (_, label, weight) in zip(features, rows):
+        if not counts:
+            continue
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * idf[indices]
+        centroids[labels.index(label), indices] += weight * values / np.linalg.norm(values)
+    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+    centroids /= np.where(norms == 0, 1, norms)
+
+    digest = hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
+    counts_by_label = {label: sum(1 for _, row_label, _ in rows if row_label == label) for label in labels}
+    metadata = {
+        "format_version": FORMAT_VERSION,
+        "version": f"{time.strftime('%Y%m%d-%H%M%S')}-{digest[:8]}",
+        "dim": dim,
+        "ngram_range": list(ngram_range),
+        "scale": scale,
+        "threshold": threshold,
+        "document_weight": document_weight,
+        "training_sha256": digest,
+        "examples": counts_by_label,
+    }
+    return IntentModel(labels, centroids, idf, metadata)
+
+
+def cross_validate(examples: List[Dict], documents: List[Tuple[str, str]] = (), folds: int = 5,
+                   seed: int = 0, **params) -> List[Tuple[bool, float]]:
+    """라벨링 질문 k-fold 교차 검증 → 질문별 (정답 여부, 확신도)
+
+    문서는 모든 fold의 학습에 포함하고, 평가는 학습에 쓰지 않은 질문으로만 합니다.
+    """
+    shuffled = list(examples)
+    random.Random(seed).shuffle(shuffled)
+    predictions = []
+    for fold in range(folds):
+        held_out = shuffled[fold::folds]
+        held_out_ids = {id(row) for row in held_out}
+        train = [(row["question"], label_of(row)) for row in shuffled if id(row) not in held_out_ids]
+        model = train_intent_model(train, documents=documents, **params)
+        for row in held_out:
+            label, confidence = model.predict(row["question"])
+            predictions.append((label == label_of(row), confidence))
+    return predictions
+
+
+def threshold_sweep(predictions: List[Tuple[bool, float]],
+                    thresholds: Iterable[float]) -> List[Dict[str, float]]:
+    """확신도 기준별 처리 비율(coverage)과 그 안에서의 정확도"""
+    rows = []
+    for threshold in thresholds:
+        covered = [correct for correct, confidence in predictions if confidence >= threshold]
+        rows.append({
+            "threshold": threshold,
+            "coverage": len(covered) / len(predictions) if predictions else 0.0,
+            "accuracy": (sum(covered) / len(covered)) if covered else 1.0,
+        })
+    return rows
+
+
+def choose_threshold(sweep: List[Dict[str, float]], target_accuracy: float) -> float:
+    """목표 정확도를 만족하는 가장 낮은 확신도 기준 (처리 비율 최대)"""
+    for row in sorted(sweep, key=lambda item: item["threshold"]):
+        if row["coverage"] > 0 and row["accuracy"] >= target_accuracy:
+            return row["threshold"]
+    return max(row["threshold"] for row in sweep)
+
+
+class IntentModelStore:
+    """버전별 모델 파일과 CURRENT 포인터 관리"""
+
+    def __init__(self, root: str = MODEL_DIR, keep: int = 3):
+        self.root = root
+        self.keep = keep
+        self.current_file = os.path.join(root, CURRENT_FILE)
+
+    def model_path(self, version: str) -> str:
+        return os.path.join(self.root, f"{version}.npz")
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self.current_file, "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[:-len(".npz")] for name in os.listdir(self.root) if name.endswith(".npz"))
+
+    def publish(self, model: IntentModel) -> str:
+        """모델 파일 저장 후 CURRENT를 원자적으로 교체"""
+        os.makedirs(self.root, exist_ok=True)
+        model.save(self.model_path(model.version))
+        tmp_current = f"{self.current_file}.tmp"
+        with open(tmp_current, "w", encoding="utf-8") as f:
+            f.write(model.version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_current, self.current_file)
+        self.prune()
+        return model.version
+
+    def prune(self):
+        """현재 버전을 제외하고 최신 keep개만 남기고 이전 모델 파일 삭제"""
+        current = self.current_version()
+        for version in self.list_versions()[:-self.keep]:
+            if version != current:
+                os.remove(self.model_path(version))
+
+    def load_current(self) -> Optional[IntentModel]:
+        version = self.current_version()
+        if version is None:
+            return None
+        return IntentModel.load(self.model_path(version))
+
+
+def create_intent_model_store() -> IntentModelStore:
+    """환경 변수 설정으로 모델 저장소 생성"""
+    return IntentModelStore(os.getenv("ROUTER_MODEL_DIR", MODEL_DIR))
+
+
+def create_intent_model() -> Optional[IntentModel]:
+    """환경 변수 설정으로 현재 버전의 모델 로드 (없거나 읽을 수 없으면 None → 키워드 + LLM만 사용)"""
+    if os.getenv("ROUTER_MODEL_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    store = create_intent_model_store()
+    try:
+        model = store.load_current()
+    except Exception as e:
+        logger.error(f"라우터 모델 로드 실패, LLM으로 판단합니다: {str(e)}")
+        return None
+    if model is None:
+        logger.warning(f"라우터 모델이 없습니다 ({store.root}). python manage.py train_router 로 학습하세요.")
+        return None
+
+    try:
+        if is_stale(model):
+            logger.warning(
+                f"라우터 모델 {model.version}이 현재 학습 데이터({EXAMPLES_PATH})로 학습되지 않았습니다. "
+                f"python manage.py train_router 로 다시 학습하세요."
+            )
+    except Exception as e:
+        logger.warning(f"라우터 모델 학습 데이터 확인 실패: {str(e)}")
+
+    threshold = os.getenv("ROUTER_MODEL_THRESHOLD")
+    if threshold:
+        model.threshold = float(threshold)
+    logger.info(f"라우터 모델 로드: {model.version} (threshold={model.threshold})")
+    return model
@@ -0,0 +1,142 @@
+"""
+Django → FastAPI 호출 클라이언트 벤치마크 (로컬 스텁 서버)
+
+로컬에 keep-alive를 지원하는 HTTP/1.1 스텁 서버를 띄우고 같은 /vector 요청을 두 방식으로 보냅니다.
+- 요청마다 새 클라이언트: 이전처럼 호출할 때마다 httpx.AsyncClient를 만들고 닫음 (매번 TCP 연결)
+- 공유 클라이언트: chatbot.http_client.post_json (연결 풀 재사용)
+
+스텁 서버가 받은 TCP 연결 수도 함께 출력해 실제로 연결이 재사용되는지 확인합니다.
+
+사용법:
+    python manage.py benchmark_http_client --requests 500 --concurrency 1
+    python manage.py benchmark_http_client --requests 2000 --concurrency 32 --server-ms 5
+"""
+
+import json
+import time
+import asyncio
+import statistics
+from typing import Awaitable, Callable, List
+
+import httpx
+from django.core.management.base import BaseCommand
+
+from chatbot import http_client
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class StubServer:
+    """JSON 응답을 돌려주는 최소 HTTP/1.1 keep-alive 서버"""
+
+    def __init__(self, server_ms: float):
+        self.server_ms = server_ms
+        self.connections = 0
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        body = json.dumps({"response": "스텁 응답입니다."}).encode("utf-8")
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", "0")))
+                if self.server_ms:
+                    await asyncio.sleep(self.server_ms / 1000)
+                close = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n".encode()
+                    + (b"Connection: close\r\n" if close else b"Connection: keep-alive\r\n")
+                    + b"\r\n" + body
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+class Command(BaseCommand):
+    help = "요청마다 새 httpx 클라이언트 vs 공유 연결 풀 클라이언트 지연 시간 벤치마크"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="방식별 요청 수")
+        parser.add_argument("--concurrency", type=int, default=1, help="동시 요청 수")
+        parser.add_argument("--server-ms", type=float, default=0.0, help="스텁 서버 처리 지연(ms)")
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options["requests"], options["concurrency"], options["server_ms"]))
+
+    async def _run(self, total: int, concurrency: int, server_ms: float):
+        server = StubServer(server_ms)
+        base_url = await server.start()
+        payload = {"message": "신생아 수면 시간은 얼마나 되나요?", "session_id": "benchmark"}
+
+        async def per_call_client():
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(f"{base_url}/vector", json=payload)
+                response.raise_for_status()
+                response.json()
+
+        async def shared_client():
+            response = await http_client.post_json("/vector", payload)
+            response.json()
+
+        original_url = http_client.EXTERNAL_SERVER_URL
+        http_client.EXTERNAL_SERVER_URL = base_url
+        await http_client.aclose_http_client()
+        try:
+            variants = [("요청마다 새 클라이언트", per_call_client), ("공유 클라이언트", shared_client)]
+            results = {}
+            for name, call in variants:
+                # 워밍업 (공유 클라이언트는 이때 연결을 맺음)
+                await asyncio.gather(*(call() for _ in range(concurrency)))
+                server.connections = 0
+                latencies, elapsed = await self._measure(call, total, concurrency)
+                results[name] = statistics.median(latencies)
+                self.stdout.write(
+                    f"{name}: p50 {results[name]:.3f}ms / p99 {percentile(latencies, 99):.3f}ms / "
+                    f"{total / elapsed:.0f} req/s / 측정 중 새 TCP 연결 {server.connections}개"
+                )
+            saved = results["요청마다 새 클라이언트"] - results["공유 클라이언트"]
+            self.stdout.write(self.style.SUCCESS(f"호출당 p50 절감: {saved:.3f}ms"))
+        finally:
+            await http_client.aclose_http_client()
+            http_client.EXTERNAL_SERVER_URL = original_url
+            await server.stop()
+
+    async def _measure(self, call: Callable[[], Awaitable[None]], total: int, concurrency: int):
+        latencies: List[float] = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed():
+            async with semaphore:
+                start = time.perf_counter()
+                await call()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(timed() for _ in range(total)))
+        return latencies, time.perf_counter() - start
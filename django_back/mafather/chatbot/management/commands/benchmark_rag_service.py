@@ -0,0 +1,167 @@
+"""
+RAGChatbotService 재사용 벤치마크 (로컬 FAISS 인덱스 + 스텁 LLM)
+
+임시 디렉터리에 가짜 임베딩으로 만든 FAISS 인덱스를 저장하고 같은 질문을 두 방식으로 처리합니다.
+- 요청마다 새 서비스: 이전 memory_chat_api처럼 요청마다 RAGChatbotService()를 만들고 chat 호출
+  (FAISS 인덱스 디스크 로드, 임베딩 / LLM 객체 생성, 프롬프트 구성을 매번 반복)
+- 공유 서비스: chatbot.services.get_chatbot_service()의 인스턴스에 히스토리를 넘겨 chat 호출
+
+각 방식은 별도 프로세스에서 실행해 요청 지연 시간과 RSS(상주 메모리, 측정 후 / 최대)를 따로 잽니다.
+동시 요청에서는 요청마다 새 서비스가 인덱스 사본을 동시에 여러 개 올리므로 최대 RSS가 커집니다.
+OpenAI 호출은 하지 않습니다 (임베딩은 DeterministicFakeEmbedding, LLM은 고정 응답 스텁).
+
+사용법:
+    python manage.py benchmark_rag_service --docs 20000 --requests 200
+    python manage.py benchmark_rag_service --docs 20000 --requests 400 --concurrency 8
+"""
+
+import sys
+import json
+import time
+import shutil
+import resource
+import tempfile
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from django.core.management.base import BaseCommand
+from langchain_community.chat_models.fake import FakeListChatModel
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import FAISS
+
+from chatbot import services
+
+QUESTION = "6개월 아기 이유식은 어떻게 시작하나요?"
+HISTORY = [
+    {"role": "user", "content": "아기가 밤에 자주 깨요."},
+    {"role": "assistant", "content": "수면 환경을 먼저 점검해 보세요."},
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS(MB)
+
+    Linux는 VmHWM을 씀 (ru_maxrss는 fork / exec 후에도 부모의 최대값이 남아서 인덱스를 만든 부모 프로세스 값이 섞임)
+    """
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def rss_mb() -> float:
+    """현재 프로세스 RSS(MB), /proc이 없으면 최대 RSS"""
+    current = _proc_status_mb("VmRSS")
+    return current if current is not None else peak_rss_mb()
+
+
+class Command(BaseCommand):
+    help = "요청마다 새 RAGChatbotService vs 공유 서비스 지연 시간 / RSS 벤치마크"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--docs", type=int, default=20000, help="인덱스 문서 수")
+        parser.add_argument("--dim", type=int, default=1536, help="임베딩 차원 (text-embedding-3-small과 같은 1536)")
+        parser.add_argument("--requests", type=int, default=200, help="방식별 요청 수")
+        parser.add_argument("--concurrency", type=int, default=1, help="동시 요청 스레드 수")
+        # 내부용: 한 방식만 현재 프로세스에서 실행하고 결과를 JSON으로 출력
+        parser.add_argument("--mode", choices=["per-request", "shared"], help=None)
+        parser.add_argument("--index-dir", help=None)
+
+    def handle(self, *args, **options):
+        if options["mode"]:
+            result = self._run_mode(options["mode"], options["index_dir"], options["dim"],
+                                    options["requests"], options["concurrency"])
+            self.stdout.write(json.dumps(result))
+            return
+
+        index_dir = tempfile.mkdtemp(prefix="rag_bench_")
+        try:
+            start = time.perf_counter()
+            self._build_index(index_dir, options["docs"], options["dim"])
+            self.stdout.write(f"FAISS 인덱스 생성: 문서 {options['docs']}개 / {options['dim']}차원 "
+                              f"({time.perf_counter() - start:.1f}s)")
+            results = {}
+            for mode, name in (("per-request", "요청마다 새 서비스"), ("shared", "공유 서비스")):
+                results[mode] = self._spawn(mode, index_dir, options)
+                result = results[mode]
+                self.stdout.write(
+                    f"{name}: p50 {result['p50']:.2f}ms / p99 {result['p99']:.2f}ms / "
+                    f"{result['rps']:.0f} req/s / RSS {result['rss_before']:.0f}MB → {result['rss_after']:.0f}MB "
+                    f"(최대 {result['rss_peak']:.0f}MB)"
+                )
+            saved = results["per-request"]["p50"] - results["shared"]["p50"]
+            rss_saved = results["per-request"]["rss_peak"] - results["shared"]["rss_peak"]
+            self.stdout.write(self.style.SUCCESS(f"요청당 p50 절감: {saved:.2f}ms / 최대 RSS 절감: {rss_saved:.0f}MB"))
+        finally:
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+    def _build_index(self, index_dir: str, docs: int, dim: int):
+        texts = [f"육아 참고 문서 {i}: 수면, 수유, 이유식, 발달에 관한 내용입니다." for i in range(docs)]
+        metadatas = [{"category_name": "육아", "section_title": f"섹션 {i}"} for i in range(docs)]
+        FAISS.from_texts(texts, DeterministicFakeEmbedding(size=dim), metadatas=metadatas).save_local(index_dir)
+
+    def _spawn(self, mode: str, index_dir: str, options) -> dict:
+        command = [
+            sys.executable, sys.argv[0], "benchmark_rag_service",
+            "--mode", mode, "--index-dir", index_dir, "--dim", str(options["dim"]),
+            "--requests", str(options["requests"]), "--concurrency", str(options["concurrency"]),
+        ]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def _run_mode(self, mode: str, index_dir: str, dim: int, total: int, concurrency: int) -> dict:
+        # OpenAI 대신 가짜 임베딩 / 고정 응답 LLM, 인덱스는 임시 디렉터리
+        embeddings = DeterministicFakeEmbedding(size=dim)
+        services.FAISS_DIR = index_dir
+        services.create_cached_embeddings = lambda openai_api_key: embeddings
+        services.ChatOpenAI = lambda **kwargs: FakeListChatModel(responses=["스텁 응답입니다."])
+
+        if mode == "per-request":
+            def call():
+                services.RAGChatbotService().chat(QUESTION, HISTORY)
+        else:
+            def call():
+                services.get_chatbot_service().chat(QUESTION, HISTORY)
+
+        rss_before = rss_mb()
+        call()  # 워밍업 (공유 서비스는 이때 초기화)
+        latencies, elapsed = self._measure(call, total, concurrency)
+        return {
+            "p50": statistics.median(latencies),
+            "p99": percentile(latencies, 99),
+            "rps": total / elapsed,
+            "rss_before": rss_before,
+            "rss_after": rss_mb(),
+            "rss_peak": peak_rss_mb(),
+        }
+
+    def _measure(self, call: Callable[[], None], total: int, concurrency: int):
+        def timed(_):
+            start = time.perf_counter()
+            call()
+            return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(timed, range(total)))
+        return latencies, time.perf_counter() - start
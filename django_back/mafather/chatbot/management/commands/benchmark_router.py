@@ -0,0 +1,174 @@
+"""
+질문 라우터 지연 시간 벤치마크
+
+chatbot/data/router_examples.json의 라벨링된 질문으로 라우팅 단계만 따로 측정합니다.
+- 이전 방식: 육아 관련성 판단 LLM → 카테고리 판단 LLM 순차 2회
+- LLM 1회: 한 번의 구조화된 호출로 {is_parenting, category} 판단
+- 키워드 + LLM 1회: 로컬 키워드 분류기가 확신하면 LLM 생략
+- 키워드 + 모델 + LLM 1회: 키워드 다음 로컬 의도 분류 모델(chatbot/data/router_models)까지 확신하면 LLM 생략
+
+기본은 LLM을 고정 지연(--llm-ms) 스텁으로 대체하고, --live를 주면 실제 routing_chain을 호출합니다.
+
+사용법:
+    python manage.py benchmark_router --llm-ms 700 --concurrency 8
+    python manage.py benchmark_router --live
+"""
+
+import os
+import json
+import time
+import asyncio
+import statistics
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand
+from langchain_core.runnables import RunnableLambda
+
+from chatbot.intent_model import create_intent_model
+from chatbot.router import QuestionRouter
+
+EXAMPLES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "router_examples.json"
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def stub_chain(examples: List[Dict], llm_ms: float):
+    """정답을 고정 지연 후 JSON으로 돌려주는 LLM 스텁"""
+    answers = {
+        row["question"]: json.dumps({"is_parenting": row["is_parenting"], "category": row["category"]})
+        for row in examples
+    }
+
+    async def answer(inputs):
+        await asyncio.sleep(llm_ms / 1000)
+        return answers[inputs["question"]]
+
+    return RunnableLambda(lambda inputs: answers[inputs["question"]], afunc=answer)
+
+
+class Command(BaseCommand):
+    help = "질문 라우터(키워드 빠른 경로 + LLM 1회) 지연 시간 벤치마크"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--llm-ms", type=float, default=700.0, help="LLM 스텁 응답 지연(ms)")
+        parser.add_argument("--concurrency", type=int, default=8, help="동시 라우팅 요청 수")
+        parser.add_argument("--repeat", type=int, default=2000, help="로컬 분류기 반복 측정 횟수")
+        parser.add_argument("--live", action="store_true", help="스텁 대신 실제 routing_chain 호출")
+
+    def handle(self, *args, **options):
+        with open(EXAMPLES_PATH, "r", encoding="utf-8") as f:
+            examples = json.load(f)
+
+        if options["live"]:
+            from chatbot.chains import routing_chain
+            chain = routing_chain
+        else:
+            chain = stub_chain(examples, options["llm_ms"])
+
+        llm_label = "실제 호출" if options["live"] else f"스텁 {options['llm_ms']:.0f}ms"
+        self.stdout.write(
+            f"=== 라우터 벤치마크: 라벨링 질문 {len(examples)}개, 동시 {options['concurrency']}개, "
+            f"LLM {llm_label} ==="
+        )
+        self._benchmark_local(examples, options["repeat"])
+        asyncio.run(self._benchmark_routes(examples, chain, options["concurrency"]))
+
+    def _benchmark_local(self, examples: List[Dict], repeat: int):
+        """로컬 키워드 분류기 단독 지연 + 확신 비율 / 정확도"""
+        router = QuestionRouter(None)
+        latencies = []
+        for i in range(repeat):
+            question = examples[i % len(examples)]["question"]
+            started = time.perf_counter()
+            router.classify_keywords(question)
+            latencies.append(time.perf_counter() - started)
+
+        confident = correct = 0
+        for row in examples:
+            decision = router.classify_keywords(row["question"])
+            if decision is None:
+                continue
+            confident += 1
+            correct += decision.is_parenting == row["is_parenting"] and decision.category == row["category"]
+
+        self.stdout.write(
+            f"키워드 분류기   p50={percentile(latencies, 50) * 1e6:>7.1f}us  "
+            f"p99={percentile(latencies, 99) * 1e6:>7.1f}us  "
+            f"확신 {confident}/{len(examples)}  확신한 질문 정확도 {correct / max(confident, 1):.2f}"
+        )
+
+    async def _benchmark_routes(self, examples: List[Dict], chain, concurrency: int):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(route_one) -> Dict:
+            latencies, correct = [], 0
+
+            async def one(row):
+                nonlocal correct
+                async with semaphore:
+                    started = time.perf_counter()
+                    decision = await route_one(row["question"])
+                    latencies.append(time.perf_counter() - started)
+                    correct += decision["is_parenting"] == row["is_parenting"] and (
+                        not row["is_parenting"] or decision["category"] == row["category"]
+                    )
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one(row) for row in examples))
+            return {
+                "elapsed": time.perf_counter() - started,
+                "p50": percentile(latencies, 50),
+                "p99": percentile(latencies, 99),
+                "mean": statistics.mean(latencies),
+                "accuracy": correct / len(examples),
+            }
+
+        async def sequential_two_calls(question: str) -> Dict:
+            # 이전 방식과 같은 왕복 횟수: 관련성 판단 후 카테고리 판단
+            first = json.loads(await chain.ainvoke({"question": question}))
+            if not first["is_parenting"]:
+                return first
+            second = json.loads(await chain.ainvoke({"question": question}))
+            return {"is_parenting": True, "category": second["category"]}
+
+        single = QuestionRouter(chain, fast_path=False)
+        fast = QuestionRouter(chain)
+        model = create_intent_model()
+        full = QuestionRouter(chain, model=model)
+
+        def via(router: QuestionRouter):
+            async def route_one(question: str) -> Dict:
+                return (await router.aroute(question)).as_dict()
+            return route_one
+
+        variants = [
+            ("이전 방식 (LLM 2회)", sequential_two_calls),
+            ("LLM 1회", via(single)),
+            ("키워드 + LLM 1회", via(fast)),
+        ]
+        if model is not None:
+            variants.append(("키워드 + 모델 + LLM", via(full)))
+
+        for label, route_one in variants:
+            result = await run(route_one)
+            self.stdout.write(
+                f"{label:<16} 전체={result['elapsed']:>6.2f}s  mean={result['mean'] * 1000:>7.1f}ms  "
+                f"p50={result['p50'] * 1000:>7.1f}ms  p99={result['p99'] * 1000:>7.1f}ms  "
+                f"정확도={result['accuracy']:.2f}"
+            )
+
+        for label, router in [("키워드 + LLM 1회", fast), ("키워드 + 모델 + LLM", full)]:
+            stats = router.stats()
+            if not stats["total"]:
+                continue
+            self.stdout.write(
+                f"{label}: LLM 생략 {stats['keyword'] + stats['model']}/{stats['total']} "
+                f"({stats['llm_skipped_ratio']:.0%}), LLM 호출 {stats['llm']}회"
+            )
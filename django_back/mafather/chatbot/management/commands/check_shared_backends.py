@@ -0,0 +1,128 @@
+"""
+여러 워커가 채널 레이어 / 캐시를 공유하는지 검증
+
+서로 다른 두 워커를 흉내 내기 위해 연결 풀을 따로 가진 채널 레이어 / 캐시 인스턴스를 두 개씩 만들고
+- 캐시: 워커 A가 웹소켓 세션 메타데이터를 쓰면 워커 B가 재시도 없이 바로 읽는지
+  (create_websocket_session → 다른 워커의 ChatbotConsumer.connect)
+- 채널 레이어: 워커 A에 group_add된 채널이 워커 B의 group_send / send를 받는지
+를 확인하고 지연 시간을 출력합니다.
+
+--redis-url을 주지 않으면 프로세스 안에서 Redis 프로토콜 스탠드인(chatbot/redis_standin.py)을 띄워 검증합니다.
+
+사용법:
+    python manage.py check_shared_backends --rounds 200
+    python manage.py check_shared_backends --redis-url redis://127.0.0.1:6379/0 --layer core
+"""
+
+import time
+import uuid
+import asyncio
+import statistics
+from typing import List
+
+from asgiref.sync import sync_to_async
+from django.core.cache.backends.redis import RedisCache
+from django.core.management.base import BaseCommand, CommandError
+
+from chatbot.redis_standin import RedisStandin
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def create_layer(kind: str, url: str):
+    if kind == "core":
+        from channels_redis.core import RedisChannelLayer
+        return RedisChannelLayer(hosts=[url])
+    from channels_redis.pubsub import RedisPubSubChannelLayer
+    return RedisPubSubChannelLayer(hosts=[url])
+
+
+class Command(BaseCommand):
+    help = "두 워커 사이에서 공유 채널 레이어 / 캐시 동작 검증"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--redis-url", help="검증할 Redis 주소 (없으면 로컬 스탠드인 사용)")
+        parser.add_argument("--layer", choices=["pubsub", "core"], default="pubsub",
+                            help="채널 레이어 종류 (core는 Lua 스크립트를 써서 실제 Redis 필요)")
+        parser.add_argument("--rounds", type=int, default=100)
+
+    def handle(self, *args, **options):
+        if options["layer"] == "core" and not options["redis_url"]:
+            raise CommandError("--layer core는 실제 Redis가 필요합니다. --redis-url을 지정하세요.")
+        asyncio.run(self._run(options["redis_url"], options["layer"], options["rounds"]))
+
+    async def _run(self, redis_url: str, layer_kind: str, rounds: int):
+        standin = None
+        if not redis_url:
+            standin = RedisStandin()
+            redis_url = await standin.start()
+            self.stdout.write(f"로컬 Redis 스탠드인: {redis_url}")
+        try:
+            await self._check_cache(redis_url, rounds)
+            await self._check_layer(redis_url, layer_kind, rounds)
+        finally:
+            if standin is not None:
+                await standin.stop()
+
+    async def _check_cache(self, redis_url: str, rounds: int):
+        worker_a = RedisCache(redis_url, {})
+        worker_b = RedisCache(redis_url, {})
+
+        def create_then_read(key: str, metadata: dict):
+            worker_a.set(key, metadata, timeout=60)
+            return worker_b.get(key)
+
+        misses = 0
+        latencies = []
+        for _ in range(rounds):
+            session_id = str(uuid.uuid4())
+            metadata = {"session_id": session_id, "type": "ai_expert", "status": "pending"}
+            start = time.perf_counter()
+            seen = await sync_to_async(create_then_read)(f"websocket_session_{session_id}", metadata)
+            latencies.append((time.perf_counter() - start) * 1000)
+            misses += seen != metadata
+            await sync_to_async(worker_a.delete)(f"websocket_session_{session_id}")
+
+        self._report("캐시 (A 쓰기 → B 읽기)", latencies, failures=misses, rounds=rounds)
+
+    async def _check_layer(self, redis_url: str, layer_kind: str, rounds: int):
+        worker_a = create_layer(layer_kind, redis_url)
+        worker_b = create_layer(layer_kind, redis_url)
+        channel = await worker_a.new_channel()
+        group = f"session-{uuid.uuid4()}"
+        await worker_a.group_add(group, channel)
+        # pub/sub 구독이 자리 잡을 시간
+        await asyncio.sleep(0.1)
+
+        failures = 0
+        latencies = []
+        try:
+            for index in range(rounds):
+                start = time.perf_counter()
+                if index % 2:
+                    await worker_b.send(channel, {"type": "chat.message", "index": index})
+                else:
+                    await worker_b.group_send(group, {"type": "chat.message", "index": index})
+                try:
+                    message = await asyncio.wait_for(worker_a.receive(channel), 2)
+                    failures += message.get("index") != index
+                except asyncio.TimeoutError:
+                    failures += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            await worker_a.group_discard(group, channel)
+            for layer in (worker_a, worker_b):
+                if hasattr(layer, "flush"):
+                    await layer.flush()
+
+        self._report(f"채널 레이어 {layer_kind} (B send/group_send → A receive)", latencies,
+                     failures=failures, rounds=rounds)
+
+    def _report(self, label: str, latencies: List[float], failures: int, rounds: int):
+        line = (f"{label}: 실패 {failures}/{rounds}  |  p50 {statistics.median(latencies):.2f}ms "
+                f"p99 {percentile(latencies, 99):.2f}ms")
+        self.stdout.write(self.style.SUCCESS(line) if not failures else self.style.ERROR(line))
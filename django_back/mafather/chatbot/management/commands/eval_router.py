@@ -0,0 +1,94 @@
+"""
+질문 라우터 로컬 분류 정확도 / 지연 시간 평가
+
+현재 게시된 의도 분류 모델(chatbot/data/router_models/CURRENT)로 라벨링 질문을 분류해서
+- 모델 단독: 분류 지연 p50 / p99 (벡터화 포함), 전체 정확도, threshold 이상에서의 처리 비율과 정확도
+- 라우터 전체(키워드 → 모델 → LLM): LLM 없이 결정한 비율과 그 결정의 정확도
+를 출력합니다.
+
+기본 평가 파일은 학습에 쓴 라벨링 질문이라 정확도가 실제보다 높게 나옵니다.
+학습에 쓰지 않은 질문 파일(--examples)로 평가하거나 train_router의 교차 검증 결과를 함께 보세요.
+
+사용법:
+    python manage.py eval_router
+    python manage.py eval_router --examples path/to/held_out.json --threshold 0.65
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from chatbot.intent_model import EXAMPLES_PATH, create_intent_model, label_of, load_examples
+from chatbot.router import QuestionRouter
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "질문 라우터 로컬 분류 정확도 / 지연 시간 평가"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--examples", default=EXAMPLES_PATH, help="라벨링 질문 JSON")
+        parser.add_argument("--threshold", type=float, default=None, help="모델 threshold 덮어쓰기")
+        parser.add_argument("--repeat", type=int, default=20, help="지연 측정 반복 횟수(질문당)")
+
+    def handle(self, *args, **options):
+        model = create_intent_model()
+        if model is None:
+            self.stdout.write(self.style.ERROR("❌ 라우터 모델이 없습니다. python manage.py train_router 로 학습하세요."))
+            return
+        if options["threshold"] is not None:
+            model.threshold = options["threshold"]
+
+        examples = load_examples(options["examples"])
+        self.stdout.write(
+            f"=== 라우터 평가: 모델 {model.version}, threshold {model.threshold:.2f}, 질문 {len(examples)}개 ==="
+        )
+
+        # 모델 단독 지연 (벡터화 + 중심 유사도 + softmax)
+        latencies = []
+        for _ in range(options["repeat"]):
+            for row in examples:
+                started = time.perf_counter()
+                model.predict(row["question"])
+                latencies.append(time.perf_counter() - started)
+        self.stdout.write(
+            f"모델 분류 지연  p50={percentile(latencies, 50) * 1e6:>7.1f}us  "
+            f"p99={percentile(latencies, 99) * 1e6:>7.1f}us  max={max(latencies) * 1e6:>7.1f}us"
+        )
+
+        predictions = [(label_of(row), *model.predict(row["question"])) for row in examples]
+        accuracy = sum(expected == label for expected, label, _ in predictions) / len(predictions)
+        confident = [(expected, label) for expected, label, confidence in predictions if confidence >= model.threshold]
+        confident_accuracy = sum(expected == label for expected, label in confident) / max(len(confident), 1)
+        self.stdout.write(
+            f"모델 단독      전체 정확도 {accuracy:.2f}  |  threshold 이상 {len(confident)}/{len(examples)} "
+            f"({len(confident) / len(examples):.0%}) 정확도 {confident_accuracy:.2f}"
+        )
+
+        # 라우터 전체: 로컬에서 결정한 질문만 집계 (나머지는 LLM으로 감)
+        router = QuestionRouter(None, model=model)
+        by_source = {"keyword": [0, 0], "model": [0, 0]}
+        for row in examples:
+            decision = router.classify_local(row["question"])
+            if decision is None:
+                continue
+            correct = decision.is_parenting == row["is_parenting"] and (
+                not row["is_parenting"] or decision.category == row["category"]
+            )
+            by_source[decision.source][0] += 1
+            by_source[decision.source][1] += correct
+
+        local = sum(count for count, _ in by_source.values())
+        local_correct = sum(correct for _, correct in by_source.values())
+        summary = "  ".join(
+            f"{source} {count}개(정확도 {correct / max(count, 1):.2f})" for source, (count, correct) in by_source.items()
+        )
+        self.stdout.write(
+            f"라우터 전체    LLM 생략 {local}/{len(examples)} ({local / len(examples):.0%}) "
+            f"정확도 {local_correct / max(local, 1):.2f}  |  {summary}  |  LLM {len(examples) - local}개"
+        )
@@ -0,0 +1,39 @@
+"""
+로컬 Redis 프로토콜 스탠드인 서버 실행 (chatbot/redis_standin.py)
+
+Redis를 설치하지 않고 여러 Daphne 워커가 채널 레이어 / 캐시를 공유하는 구성을 띄울 때 사용합니다.
+
+사용법:
+    python manage.py redis_standin --port 6379
+    REDIS_URL=redis://127.0.0.1:6379/0 CHANNEL_LAYER_BACKEND=pubsub daphne -p 8001 mafather.asgi:application
+    REDIS_URL=redis://127.0.0.1:6379/0 CHANNEL_LAYER_BACKEND=pubsub daphne -p 8002 mafather.asgi:application
+"""
+
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from chatbot.redis_standin import RedisStandin
+
+
+class Command(BaseCommand):
+    help = "로컬 Redis 프로토콜 스탠드인 서버 실행 (개발 / 검증용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=6379)
+
+    def handle(self, *args, **options):
+        try:
+            asyncio.run(self._serve(options["host"], options["port"]))
+        except KeyboardInterrupt:
+            pass
+
+    async def _serve(self, host: str, port: int):
+        server = RedisStandin()
+        url = await server.start(host, port)
+        self.stdout.write(self.style.SUCCESS(f"Redis 스탠드인 실행 중: REDIS_URL={url} CHANNEL_LAYER_BACKEND=pubsub"))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
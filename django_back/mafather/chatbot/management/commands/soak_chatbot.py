@@ -0,0 +1,214 @@
+"""
+WebSocket 챗봇 소크 테스트 (LLM 스텁)
+
+많은 WebSocket 클라이언트가 ChatbotConsumer(ai_expert)에 동시에 질문을 보내는 동안
+이벤트 루프 지연(10ms 타이머가 얼마나 늦게 깨어나는지)과 응답 지연을 측정합니다.
+
+- LLM(라우팅 / 비육아 안내 / 일반 상담)은 고정 지연 스텁으로 바꾸고
+  수면/발달 서버 호출도 같은 지연의 스텁으로 바꿉니다.
+- --blocking: 스텁 LLM이 이벤트 루프를 막으며 응답 (이전처럼 async 함수 안에서 .invoke를 호출한 경우)
+- --disconnect-ratio: 일부 클라이언트는 질문을 보내자마자 연결을 끊어 진행 중인 LLM 호출이 취소되는지 확인
+
+사용법:
+    python manage.py soak_chatbot --clients 100 --messages 3 --llm-ms 500
+    python manage.py soak_chatbot --clients 100 --messages 3 --llm-ms 500 --blocking
+"""
+
+import io
+import json
+import time
+import uuid
+import random
+import asyncio
+import contextlib
+from typing import Any, List, Optional
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from chatbot import chains, routing
+from chatbot.intent_model import load_examples
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class StubCounters:
+    def __init__(self):
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+
+
+class StubChatModel(BaseChatModel):
+    """고정 지연 후 답하는 LLM 스텁 (라우팅 프롬프트에는 JSON으로 응답)"""
+
+    latency: float = 0.5
+    blocking: bool = False
+    counters: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "soak-stub"
+
+    def _answer(self, messages) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        if '"is_parenting"' in prompt:
+            content = json.dumps({"is_parenting": True, "category": random.choice(["sleep", "development", "other"])})
+        else:
+            content = "## 스텁 답변\n육아 상담 스텁 응답입니다."
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._answer(messages)
+
+    async def _agenerate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        self.counters.started += 1
+        try:
+            if self.blocking:
+                time.sleep(self.latency)
+            else:
+                await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.counters.cancelled += 1
+            raise
+        self.counters.completed += 1
+        return self._answer(messages)
+
+
+class Command(BaseCommand):
+    help = "WebSocket 챗봇 소크 테스트 (이벤트 루프 지연 / 응답 지연 / 연결 해제 시 취소)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=100, help="동시 WebSocket 클라이언트 수")
+        parser.add_argument("--messages", type=int, default=3, help="클라이언트당 질문 수")
+        parser.add_argument("--llm-ms", type=float, default=500.0, help="LLM / 외부 서버 스텁 지연(ms)")
+        parser.add_argument("--blocking", action="store_true", help="스텁 LLM이 이벤트 루프를 막으며 응답")
+        parser.add_argument("--disconnect-ratio", type=float, default=0.2, help="질문 직후 연결을 끊는 클라이언트 비율")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        latency = options["llm_ms"] / 1000
+        counters = StubCounters()
+        self._install_stubs(latency, options["blocking"], counters)
+        questions = [row["question"] for row in load_examples()]
+
+        self.stdout.write(
+            f"=== WebSocket 소크 테스트: 클라이언트 {options['clients']}개 × 질문 {options['messages']}개, "
+            f"LLM 스텁 {options['llm_ms']:.0f}ms ({'루프 차단' if options['blocking'] else '비동기'}), "
+            f"중간 연결 해제 {options['disconnect_ratio']:.0%} ==="
+        )
+        # ConversationChain(verbose=True)의 프롬프트 출력은 결과와 섞이지 않도록 버림
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = asyncio.run(self._soak(options, questions))
+
+        lags, latencies = result["lags"], result["latencies"]
+        self.stdout.write(
+            f"응답 {len(latencies)}개 / 실패 {result['failures']}개  |  소요 {result['elapsed']:.2f}s  |  "
+            f"응답 지연 p50={percentile(latencies, 50) * 1000:.0f}ms p99={percentile(latencies, 99) * 1000:.0f}ms"
+        )
+        self.stdout.write(
+            f"이벤트 루프 지연  p50={percentile(lags, 50) * 1000:.1f}ms  p99={percentile(lags, 99) * 1000:.1f}ms  "
+            f"max={max(lags, default=0) * 1000:.1f}ms"
+        )
+        self.stdout.write(
+            f"스텁 LLM 호출  시작 {counters.started} / 완료 {counters.completed} / "
+            f"연결 해제로 취소 {counters.cancelled}  |  수면/발달 스텁 취소 {result['server_cancelled']}"
+        )
+
+    def _install_stubs(self, latency: float, blocking: bool, counters: StubCounters):
+        stub = StubChatModel(latency=latency, blocking=blocking, counters=counters)
+        chains.llm = stub  # ChatSession이 새로 만드는 ConversationChain에 적용
+        chains.non_parenting_chain = chains.non_parenting_prompt | stub | StrOutputParser()
+        chains.question_router.chain = chains.routing_prompt | stub | StrOutputParser()
+        chains.session_manager.sessions.clear()
+        self._server_cancelled = 0
+
+        async def call_sleep_development_server(question, chat_history, category):
+            try:
+                if blocking:
+                    time.sleep(latency)
+                else:
+                    await asyncio.sleep(latency)
+            except asyncio.CancelledError:
+                self._server_cancelled += 1
+                raise
+            return f"{category} 전문 서버 스텁 응답입니다."
+
+        chains.call_sleep_development_server = call_sleep_development_server
+
+    async def _soak(self, options, questions: List[str]):
+        application = URLRouter(routing.websocket_urlpatterns)
+        lags: List[float] = []
+        latencies: List[float] = []
+        failures = 0
+        running = True
+
+        async def monitor():
+            # 10ms마다 깨어나도록 예약하고 실제로 늦게 깨어난 만큼을 루프 지연으로 기록
+            while running:
+                started = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - started - 0.01)
+
+        async def receive_response(communicator):
+            while True:
+                event = json.loads(await communicator.receive_from(timeout=120))
+                if event["type"] in ("ai_response", "error"):
+                    return event
+
+        async def client(index: int):
+            nonlocal failures
+            session_id = f"soak-{uuid.uuid4()}"
+            cache.set(f"websocket_session_{session_id}", {"type": "ai_expert", "category": "general"}, timeout=600)
+            communicator = WebsocketCommunicator(application, f"/ws/chat/{session_id}/")
+            connected, _ = await communicator.connect(timeout=60)
+            if not connected:
+                failures += 1
+                return
+            await communicator.receive_from(timeout=60)  # 환영 메시지
+
+            if random.random() < options["disconnect_ratio"]:
+                # 질문을 보내고 LLM / 전문 서버 응답을 기다리는 도중에 연결 해제
+                await communicator.send_to(text_data=json.dumps({"type": "chat", "message": random.choice(questions)}))
+                await communicator.receive_from(timeout=60)  # typing
+                await asyncio.sleep(options["llm_ms"] / 1000 / 2)
+                await communicator.disconnect(timeout=60)
+                return
+
+            for _ in range(options["messages"]):
+                started = time.perf_counter()
+                await communicator.send_to(text_data=json.dumps({"type": "chat", "message": random.choice(questions)}))
+                event = await receive_response(communicator)
+                if event["type"] == "error":
+                    failures += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+            await communicator.disconnect(timeout=60)
+
+        monitor_task = asyncio.ensure_future(monitor())
+        started = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(options["clients"])))
+        elapsed = time.perf_counter() - started
+        running = False
+        await monitor_task
+        return {
+            "lags": lags,
+            "latencies": latencies,
+            "failures": failures,
+            "elapsed": elapsed,
+            "server_cancelled": self._server_cancelled,
+        }
@@ -0,0 +1,74 @@
+"""
+질문 라우터의 로컬 의도 분류 모델 학습
+
+라벨링 질문(chatbot/data/router_examples.json) + vector_db_final.json 문서 메타데이터로
+카테고리 중심 분류기를 학습하고 새 버전으로 게시합니다 (chatbot/data/router_models/CURRENT 교체).
+
+LLM 대체 기준(threshold)은 라벨링 질문 k-fold 교차 검증 결과에서
+목표 정확도(--target-accuracy)를 만족하는 가장 낮은 확신도로 정합니다.
+
+사용법:
+    python manage.py train_router
+    python manage.py train_router --target-accuracy 0.95 --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from chatbot.intent_model import (
+    EXAMPLES_PATH, SOURCE_PATH, choose_threshold, create_intent_model, create_intent_model_store,
+    cross_validate, document_examples, label_of, load_examples, threshold_sweep, train_intent_model,
+)
+
+THRESHOLDS = [round(0.40 + 0.05 * i, 2) for i in range(12)]
+
+
+class Command(BaseCommand):
+    help = "질문 라우터 의도 분류 모델 학습 및 게시"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--examples", default=EXAMPLES_PATH, help="라벨링 질문 JSON")
+        parser.add_argument("--source", default=SOURCE_PATH, help="vector_db_final.json (빈 값이면 문서 미사용)")
+        parser.add_argument("--folds", type=int, default=5, help="교차 검증 fold 수")
+        parser.add_argument("--target-accuracy", type=float, default=0.95, help="모델이 답할 질문의 목표 정확도")
+        parser.add_argument("--dim", type=int, default=1 << 14, help="해싱 벡터 차원")
+        parser.add_argument("--scale", type=float, default=20.0, help="softmax 온도(코사인 유사도 배율)")
+        parser.add_argument("--document-weight", type=float, default=0.3, help="문서 예시 가중치")
+        parser.add_argument("--dry-run", action="store_true", help="평가만 하고 게시하지 않음")
+
+    def handle(self, *args, **options):
+        examples = load_examples(options["examples"])
+        documents = document_examples(options["source"]) if options["source"] else []
+        params = {"dim": options["dim"], "scale": options["scale"], "document_weight": options["document_weight"]}
+
+        self.stdout.write(
+            f"=== 라우터 모델 학습: 라벨링 질문 {len(examples)}개, 문서 {len(documents)}개, "
+            f"{options['folds']}-fold 교차 검증 ==="
+        )
+        predictions = cross_validate(examples, documents, folds=options["folds"], **params)
+        sweep = threshold_sweep(predictions, THRESHOLDS)
+        accuracy = sum(correct for correct, _ in predictions) / len(predictions)
+        self.stdout.write(f"전체 정확도(기준 없이 모두 모델로 판단): {accuracy:.2f}")
+        for row in sweep:
+            self.stdout.write(
+                f"  threshold={row['threshold']:.2f}  모델 처리 {row['coverage']:>5.0%}  정확도 {row['accuracy']:.2f}"
+            )
+
+        threshold = choose_threshold(sweep, options["target_accuracy"])
+        self.stdout.write(f"선택한 threshold: {threshold:.2f} (목표 정확도 {options['target_accuracy']:.2f})")
+
+        model = train_intent_model(
+            [(row["question"], label_of(row)) for row in examples],
+            documents=documents, threshold=threshold, **params
+        )
+        if options["dry_run"]:
+            self.stdout.write("--dry-run: 모델을 게시하지 않았습니다.")
+            return
+
+        store = create_intent_model_store()
+        version = store.publish(model)
+        self.stdout.write(self.style.SUCCESS(f"✅ 라우터 모델 게시: {store.model_path(version)}"))
+
+        # 게시한 모델이 서비스 시작 때와 같은 방식으로 다시 읽히는지 확인
+        loaded = create_intent_model()
+        if loaded is None or loaded.version != version:
+            self.stdout.write(self.style.WARNING("⚠️ 게시한 모델을 다시 읽지 못했습니다. ROUTER_MODEL_ENABLED 설정을 확인하세요."))
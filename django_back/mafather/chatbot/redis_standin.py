@@ -0,0 +1,551 @@
+"""
+로컬 Redis 프로토콜(RESP2) 스탠드인 서버
+
+Redis 없이 개발 / 검증할 때 REDIS_URL이 가리킬 수 있는 프로세스 내 asyncio 서버입니다.
+이 프로젝트가 쓰는 명령만 구현합니다.
+- Django RedisCache: GET / SET(EX, PX, NX, XX) / MGET / MSET / DEL / EXISTS / EXPIRE / PERSIST / INCRBY / FLUSHDB / RENAME
+- channels_redis RedisPubSubChannelLayer: SUBSCRIBE / UNSUBSCRIBE / PUBLISH
+- 리스트 / 집합 / 해시: RPUSH / LRANGE / LTRIM / LLEN / SADD / SREM / SMEMBERS / HINCRBY / HMGET / HGETALL ...
+- MULTI / EXEC (명령을 한 번에 실행, 서버가 단일 스레드이므로 원자적). WATCH는 받기만 함
+
+Lua 스크립트(EVAL)는 지원하지 않으므로 channels_redis의 RedisChannelLayer(core)는 실제 Redis가 필요합니다.
+데이터는 메모리에만 있으며 서버를 내리면 사라집니다.
+
+    python manage.py redis_standin --port 6379
+    REDIS_URL=redis://127.0.0.1:6379/0 CHANNEL_LAYER_BACKEND=pubsub daphne -p 8000 mafather.asgi:application
+
+동기 코드(테스트 등)에서는 백그라운드 스레드에서 띄우는 ThreadedRedisStandin을 씁니다.
+"""
+
+import time
+import fnmatch
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class CommandError(Exception):
+    pass
+
+
+WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+class _Connection:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.channels: Set[bytes] = set()
+        self.patterns: Set[bytes] = set()
+        self.queued: Optional[List[List[bytes]]] = None  # MULTI 중인 명령
+
+
+def _encode(value: Any) -> bytes:
+    """파이썬 값을 RESP2로 인코딩"""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, CommandError):
+        return b"-" + str(value).encode() + b"\r\n"
+    if isinstance(value, _Status):
+        return b"+" + value.text + b"\r\n"
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d\r\n" % len(value) + value + b"\r\n"
+
+
+class _Status:
+    def __init__(self, text: bytes):
+        self.text = text
+
+
+OK = _Status(b"OK")
+QUEUED = _Status(b"QUEUED")
+
+
+class RedisStandin:
+    """단일 데이터베이스를 가진 최소 Redis 호환 서버"""
+
+    def __init__(self):
+        self._data: Dict[bytes, Any] = {}
+        self._expires: Dict[bytes, float] = {}
+        self._subscribers: Dict[bytes, Set[_Connection]] = defaultdict(set)
+        self._pattern_subscribers: Dict[bytes, Set[_Connection]] = defaultdict(set)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict[asyncio.Task, _Connection] = {}
+        self.host = "127.0.0.1"
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        logger.info(f"[RedisStandin] Listening on {self.url}")
+        return self.url
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # 열려 있는 클라이언트 연결도 닫고 핸들러가 끝날 때까지 기다림
+        handlers = list(self._handlers.items())
+        for _, conn in handlers:
+            conn.writer.close()
+        await asyncio.gather(*(task for task, _ in handlers), return_exceptions=True)
+
+    # --- 프로토콜 -------------------------------------------------------
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # 인라인 명령 (redis-cli / telnet)
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            header = await reader.readline()
+            length = int(header[1:])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = _Connection(writer)
+        task = asyncio.current_task()
+        self._handlers[task] = conn
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                for reply in self._dispatch(conn, args):
+                    writer.write(_encode(reply))
+                await writer.drain()
+                if args[0].upper() == b"QUIT":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            self._handlers.pop(task, None)
+            self._unsubscribe_all(conn)
+            writer.close()
+
+    def _dispatch(self, conn: _Connection, args: List[bytes]) -> List[Any]:
+        name = args[0].upper().decode()
+        if conn.queued is not None and name not in ("EXEC", "DISCARD", "MULTI", "WATCH"):
+            conn.queued.append(args)
+            return [QUEUED]
+        if name in ("SUBSCRIBE", "PSUBSCRIBE", "UNSUBSCRIBE", "PUNSUBSCRIBE"):
+            return getattr(self, f"_cmd_{name.lower()}")(conn, *args[1:])
+        if name == "PING" and (conn.channels or conn.patterns):
+            return [[b"pong", args[1] if len(args) > 1 else b""]]
+        if name == "MULTI":
+            conn.queued = []
+            return [OK]
+        if name == "DISCARD":
+            conn.queued = None
+            return [OK]
+        if name == "EXEC":
+            if conn.queued is None:
+                return [CommandError("ERR EXEC without MULTI")]
+            queued, conn.queued = conn.queued, None
+            return [[self._execute(conn, command) for command in queued]]
+        return [self._execute(conn, args)]
+
+    def _execute(self, conn: _Connection, args: List[bytes]) -> Any:
+        handler = getattr(self, f"_cmd_{args[0].decode().lower()}", None)
+        if handler is None:
+            return CommandError(f"ERR unknown command '{args[0].decode()}'")
+        try:
+            return handler(*args[1:])
+        except CommandError as e:
+            return e
+        except (TypeError, ValueError):
+            return CommandError(f"ERR wrong number of arguments or invalid value for '{args[0].decode()}'")
+
+    # --- 키 공간 ---------------------------------------------------------
+
+    def _alive(self, key: bytes) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _get(self, key: bytes, kind: type) -> Any:
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        if not isinstance(value, kind):
+            raise CommandError(WRONGTYPE)
+        return value
+
+    def _get_or_create(self, key: bytes, kind: type) -> Any:
+        value = self._get(key, kind)
+        if value is None:
+            value = self._data[key] = kind()
+        return value
+
+    def _drop_if_empty(self, key: bytes):
+        if not self._data.get(key):
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+
+    def _cmd_ping(self, message: bytes = None):
+        return message if message is not None else _Status(b"PONG")
+
+    def _cmd_echo(self, message: bytes):
+        return message
+
+    def _cmd_select(self, index: bytes):
+        return OK
+
+    def _cmd_client(self, *args):
+        return OK
+
+    def _cmd_watch(self, *keys):
+        return OK
+
+    def _cmd_unwatch(self):
+        return OK
+
+    def _cmd_quit(self):
+        return OK
+
+    def _cmd_flushdb(self, *args):
+        self._data.clear()
+        self._expires.clear()
+        return OK
+
+    _cmd_flushall = _cmd_flushdb
+
+    def _cmd_dbsize(self):
+        return sum(1 for key in list(self._data) if self._alive(key))
+
+    def _cmd_keys(self, pattern: bytes):
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    def _cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._alive(key))
+
+    def _cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    _cmd_unlink = _cmd_del
+
+    def _cmd_rename(self, key: bytes, new_key: bytes):
+        if not self._alive(key):
+            raise CommandError("ERR no such key")
+        self._data[new_key] = self._data.pop(key)
+        self._expires.pop(new_key, None)
+        if key in self._expires:
+            self._expires[new_key] = self._expires.pop(key)
+        return OK
+
+    def _cmd_type(self, key: bytes):
+        if not self._alive(key):
+            return _Status(b"none")
+        names = {bytes: b"string", list: b"list", set: b"set", dict: b"hash"}
+        return _Status(names[type(self._data[key])])
+
+    def _cmd_expire(self, key: bytes, seconds: bytes):
+        return self._cmd_pexpire(key, str(int(seconds) * 1000).encode())
+
+    def _cmd_pexpire(self, key: bytes, milliseconds: bytes):
+        if not self._alive(key):
+            return 0
+        if int(milliseconds) <= 0:
+            return self._cmd_del(key)
+        self._expires[key] = time.monotonic() + int(milliseconds) / 1000
+        return 1
+
+    def _cmd_persist(self, key: bytes):
+        if not self._alive(key) or key not in self._expires:
+            return 0
+        del self._expires[key]
+        return 1
+
+    def _cmd_pttl(self, key: bytes):
+        if not self._alive(key):
+            return -2
+        if key not in self._expires:
+            return -1
+        return int((self._expires[key] - time.monotonic()) * 1000)
+
+    def _cmd_ttl(self, key: bytes):
+        ttl = self._cmd_pttl(key)
+        return ttl if ttl < 0 else (ttl + 999) // 1000
+
+    # --- 문자열 ---------------------------------------------------------
+
+    def _cmd_get(self, key: bytes):
+        return self._get(key, bytes)
+
+    def _cmd_mget(self, *keys):
+        return [self._data[key] if self._alive(key) and isinstance(self._data[key], bytes) else None
+                for key in keys]
+
+    def _cmd_set(self, key: bytes, value: bytes, *options):
+        options = [option.upper() for option in options]
+        expire_ms = None
+        keep_ttl = b"KEEPTTL" in options
+        for flag, scale in ((b"EX", 1000), (b"PX", 1)):
+            if flag in options:
+                expire_ms = int(options[options.index(flag) + 1]) * scale
+        exists = self._alive(key)
+        if (b"NX" in options and exists) or (b"XX" in options and not exists):
+            return None
+        self._data[key] = value
+        if expire_ms is not None:
+            self._expires[key] = time.monotonic() + expire_ms / 1000
+        elif not keep_ttl:
+            self._expires.pop(key, None)
+        return OK
+
+    def _cmd_mset(self, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise ValueError("MSET requires key/value pairs")
+        for key, value in zip(pairs[::2], pairs[1::2]):
+            self._cmd_set(key, value)
+        return OK
+
+    def _cmd_setex(self, key: bytes, seconds: bytes, value: bytes):
+        return self._cmd_set(key, value, b"EX", seconds)
+
+    def _cmd_incrby(self, key: bytes, delta: bytes):
+        current = self._get(key, bytes)
+        try:
+            value = int(current or b"0") + int(delta)
+        except ValueError:
+            raise CommandError("ERR value is not an integer or out of range")
+        self._data[key] = str(value).encode()
+        return value
+
+    def _cmd_incr(self, key: bytes):
+        return self._cmd_incrby(key, b"1")
+
+    def _cmd_decrby(self, key: bytes, delta: bytes):
+        return self._cmd_incrby(key, str(-int(delta)).encode())
+
+    def _cmd_decr(self, key: bytes):
+        return self._cmd_incrby(key, b"-1")
+
+    # --- 리스트 ---------------------------------------------------------
+
+    def _cmd_rpush(self, key: bytes, *values):
+        items = self._get_or_create(key, list)
+        items.extend(values)
+        return len(items)
+
+    def _cmd_lpush(self, key: bytes, *values):
+        items = self._get_or_create(key, list)
+        items[:0] = reversed(values)
+        return len(items)
+
+    def _cmd_llen(self, key: bytes):
+        return len(self._get(key, list) or [])
+
+    @staticmethod
+    def _slice(length: int, start: bytes, stop: bytes) -> slice:
+        start, stop = int(start), int(stop)
+        if start < 0:
+            start = max(0, length + start)
+        if stop < 0:
+            stop = length + stop
+        return slice(start, stop + 1)
+
+    def _cmd_lrange(self, key: bytes, start: bytes, stop: bytes):
+        items = self._get(key, list) or []
+        return items[self._slice(len(items), start, stop)]
+
+    def _cmd_ltrim(self, key: bytes, start: bytes, stop: bytes):
+        items = self._get(key, list)
+        if items is not None:
+            items[:] = items[self._slice(len(items), start, stop)]
+            self._drop_if_empty(key)
+        return OK
+
+    # --- 집합 -----------------------------------------------------------
+
+    def _cmd_sadd(self, key: bytes, *members):
+        members_set = self._get_or_create(key, set)
+        before = len(members_set)
+        members_set.update(members)
+        return len(members_set) - before
+
+    def _cmd_srem(self, key: bytes, *members):
+        members_set = self._get(key, set)
+        if members_set is None:
+            return 0
+        before = len(members_set)
+        members_set.difference_update(members)
+        removed = before - len(members_set)
+        self._drop_if_empty(key)
+        return removed
+
+    def _cmd_smembers(self, key: bytes):
+        return sorted(self._get(key, set) or ())
+
+    def _cmd_scard(self, key: bytes):
+        return len(self._get(key, set) or ())
+
+    def _cmd_sismember(self, key: bytes, member: bytes):
+        return int(member in (self._get(key, set) or ()))
+
+    # --- 해시 -----------------------------------------------------------
+
+    def _cmd_hset(self, key: bytes, *pairs):
+        fields = self._get_or_create(key, dict)
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in fields
+            fields[field] = value
+        return added
+
+    def _cmd_hget(self, key: bytes, field: bytes):
+        return (self._get(key, dict) or {}).get(field)
+
+    def _cmd_hmget(self, key: bytes, *fields):
+        values = self._get(key, dict) or {}
+        return [values.get(field) for field in fields]
+
+    def _cmd_hlen(self, key: bytes):
+        return len(self._get(key, dict) or {})
+
+    def _cmd_hgetall(self, key: bytes):
+        return [item for pair in (self._get(key, dict) or {}).items() for item in pair]
+
+    def _cmd_hdel(self, key: bytes, *fields):
+        values = self._get(key, dict)
+        if values is None:
+            return 0
+        removed = sum(1 for field in fields if values.pop(field, None) is not None)
+        self._drop_if_empty(key)
+        return removed
+
+    def _cmd_hincrby(self, key: bytes, field: bytes, delta: bytes):
+        fields = self._get_or_create(key, dict)
+        value = int(fields.get(field, b"0")) + int(delta)
+        fields[field] = str(value).encode()
+        return value
+
+    # --- pub/sub --------------------------------------------------------
+
+    def _cmd_publish(self, channel: bytes, message: bytes):
+        receivers = 0
+        for conn in list(self._subscribers.get(channel, ())):
+            conn.writer.write(_encode([b"message", channel, message]))
+            receivers += 1
+        for pattern, conns in list(self._pattern_subscribers.items()):
+            if fnmatch.fnmatchcase(channel, pattern):
+                for conn in list(conns):
+                    conn.writer.write(_encode([b"pmessage", pattern, channel, message]))
+                    receivers += 1
+        return receivers
+
+    def _subscription_count(self, conn: _Connection) -> int:
+        return len(conn.channels) + len(conn.patterns)
+
+    def _cmd_subscribe(self, conn: _Connection, *channels):
+        replies = []
+        for channel in channels:
+            conn.channels.add(channel)
+            self._subscribers[channel].add(conn)
+            replies.append([b"subscribe", channel, self._subscription_count(conn)])
+        return replies
+
+    def _cmd_psubscribe(self, conn: _Connection, *patterns):
+        replies = []
+        for pattern in patterns:
+            conn.patterns.add(pattern)
+            self._pattern_subscribers[pattern].add(conn)
+            replies.append([b"psubscribe", pattern, self._subscription_count(conn)])
+        return replies
+
+    def _cmd_unsubscribe(self, conn: _Connection, *channels):
+        replies = []
+        for channel in channels or sorted(conn.channels):
+            conn.channels.discard(channel)
+            self._subscribers.get(channel, set()).discard(conn)
+            if not self._subscribers.get(channel):
+                self._subscribers.pop(channel, None)
+            replies.append([b"unsubscribe", channel, self._subscription_count(conn)])
+        return replies or [[b"unsubscribe", None, 0]]
+
+    def _cmd_punsubscribe(self, conn: _Connection, *patterns):
+        replies = []
+        for pattern in patterns or sorted(conn.patterns):
+            conn.patterns.discard(pattern)
+            self._pattern_subscribers.get(pattern, set()).discard(conn)
+            if not self._pattern_subscribers.get(pattern):
+                self._pattern_subscribers.pop(pattern, None)
+            replies.append([b"punsubscribe", pattern, self._subscription_count(conn)])
+        return replies or [[b"punsubscribe", None, 0]]
+
+    def _unsubscribe_all(self, conn: _Connection):
+        for channel in conn.channels:
+            self._subscribers.get(channel, set()).discard(conn)
+        for pattern in conn.patterns:
+            self._pattern_subscribers.get(pattern, set()).discard(conn)
+        conn.channels.clear()
+        conn.patterns.clear()
+
+
+class ThreadedRedisStandin:
+    """백그라운드 스레드의 이벤트 루프에서 도는 스탠드인 (동기 코드 / 테스트용)
+
+        standin = ThreadedRedisStandin()
+        url = standin.start()
+        ...
+        standin.stop()
+    """
+
+    def __init__(self):
+        self.server = RedisStandin()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _call(self, coro) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="redis-standin", daemon=True)
+        self._thread.start()
+        return self._call(self.server.start(host, port))
+
+    def flushdb(self):
+        """모든 키 삭제 (테스트 사이 초기화)"""
+        async def flush():
+            self.server._cmd_flushdb()
+        self._call(flush())
+
+    def stop(self):
+        if self._loop is None:
+            return
+
+        self._call(self.server.stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
@@ -0,0 +1,264 @@
+"""
+질문 라우터: 육아 관련 여부 + 세부 카테고리(sleep / development / other)를 한 번에 판단
+
+이전에는 육아 관련성 판단과 카테고리 판단을 LLM에 차례로 두 번 물어봤습니다.
+이제는 한 단계로 합쳐서
+1. 로컬 키워드 분류기(빠른 경로)가 확신할 때는 LLM 호출 없이 바로 결정하고
+2. 그다음 로컬 의도 분류 모델(intent_model.py)이 기준 이상으로 확신하면 그 결과를 쓰고
+3. 둘 다 확신하지 못할 때만 LLM을 한 번 호출해 {"is_parenting", "category"} JSON을 받습니다.
+
+키워드 분류기는 카테고리별 키워드 묶음을 중심(centroid)으로 보고 질문과 겹치는 키워드 수가
+가장 많은 카테고리를 고릅니다. 1등과 2등의 차이(margin)가 기준 이상이고, 질문에 육아 키워드가 있거나
+1등 카테고리 키워드가 2개 이상일 때만 확신한 것으로 봅니다 ("새벽 배송", "프로그래밍 언어"처럼
+카테고리 키워드 하나만 겹치는 비육아 질문은 의도 분류 모델이나 LLM이 판단).
+키워드는 글자 포함이 아니라 어절 단위로 비교합니다: 명사 키워드는 어절 전체이거나 뒤에 조사만 붙은 경우
+("아기가", "잠을"), 동사 어간 키워드는 어절 앞부분("재우는", "잠들어요")일 때만 일치로 봅니다
+("잠실", "성장률", "아이폰"은 일치하지 않음).
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("sleep", "development", "other")
+
+# 육아 관련 키워드 (RAGChatbotService._is_parenting_related와 공유)
+PARENTING_KEYWORDS = [
+    "아기", "아이", "신생아", "영아", "유아", "육아", "양육",
+    "수유", "모유", "분유", "이유식", "기저귀", "잠", "수면",
+    "발달", "성장", "걷기", "기어가기", "울음", "우유",
+    "예방접종", "백신", "열", "기침", "감기", "변비", "설사",
+    "목욕", "안전", "놀이", "장난감", "책", "노래",
+    "개월", "돌", "출산", "임신", "산후", "젖니", "이가",
+    "엄마", "아빠", "부모", "가족", "형제", "자매"
+]
+
+# 카테고리별 키워드 (육아 질문에서만 쓰이는 표현 위주, "키"/"열"처럼 다른 뜻이 많은 한 글자는 제외)
+CATEGORY_KEYWORDS = {
+    "sleep": [
+        "수면", "수면교육", "잠", "밤잠", "낮잠", "잠투정", "통잠", "잠들", "재우", "재워",
+        "깨요", "깨서", "깨는", "밤중", "새벽", "자장가", "졸려", "뒤척",
+    ],
+    "development": [
+        "발달", "성장", "월령", "언어", "옹알이", "뒤집기", "뒤집", "배밀이",
+        "기어가기", "기어", "걷기", "걸음", "앉기", "말하", "말을", "단어",
+        "몸무게", "체중", "대근육", "소근육", "인지", "발육", "또래",
+    ],
+    "other": [
+        "수유", "모유", "분유", "젖병", "이유식", "기저귀", "예방접종", "백신",
+        "열이", "발열", "기침", "감기", "변비", "설사", "구토", "목욕", "안전",
+        "놀이", "장난감", "젖니", "치아", "훈육", "떼쓰", "분리불안", "애착",
+        "카시트", "유모차", "황달", "태열", "아토피", "배앓이", "트림", "간식", "우유",
+    ],
+}
+
+# 어절 앞부분으로 비교하는 동사 어간 키워드 (뒤에 어미가 붙음)
+STEM_KEYWORDS = frozenset([
+    "잠들", "재우", "재워", "깨요", "깨서", "깨는", "졸려", "뒤척", "뒤집",
+    "기어", "말하", "말을", "떼쓰", "열이",
+])
+# 명사 키워드 뒤에 붙어도 같은 단어로 보는 조사 / 서술격 조사
+PARTICLES = frozenset([
+    "이", "가", "은", "는", "을", "를", "도", "만", "에", "에서", "에게", "한테", "께", "으로", "로",
+    "와", "과", "랑", "이랑", "하고", "의", "까지", "부터", "보다", "처럼", "마다", "이나", "나",
+    "에는", "에도", "에서는", "으로는", "로는", "이랑은", "만은", "까지는", "부터는",
+    "요", "이요", "이에요", "예요", "인데", "인데요", "인가요", "이라", "라", "이라서", "라서", "이야",
+])
+_MONTH_RE = re.compile(r"\d+\s*개월")
+_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+_PARENTING_SET = frozenset(PARENTING_KEYWORDS)
+_CATEGORY_KEYWORD_SETS = {category: frozenset(keywords) for category, keywords in CATEGORY_KEYWORDS.items()}
+_CATEGORY_SET = frozenset().union(*_CATEGORY_KEYWORD_SETS.values())
+
+
+@dataclass
+class RouteDecision:
+    """라우팅 결과"""
+    is_parenting: bool
+    category: Optional[str]  # 비육아 질문이면 None
+    confidence: float
+    source: str  # keyword / model / llm / fallback
+    seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def tokenize(question: str) -> List[str]:
+    """질문 → 어절 목록 (소문자, 문장 부호 제거)"""
+    return _TOKEN_RE.findall(question.lower())
+
+
+def matched_keywords(question: str, keywords: FrozenSet[str]) -> Set[str]:
+    """어절 경계에 맞게 들어 있는 키워드 (명사는 어절 전체 / 어절 + 조사, 동사 어간은 어절 앞부분)"""
+    matched = set()
+    for token in tokenize(question):
+        for end in range(1, len(token) + 1):
+            prefix = token[:end]
+            if prefix in keywords and (end == len(token) or prefix in STEM_KEYWORDS or token[end:] in PARTICLES):
+                matched.add(prefix)
+    return matched
+
+
+def has_parenting_keyword(question: str) -> bool:
+    """육아 관련 키워드 또는 "N개월" 표현이 있는지 확인"""
+    return bool(matched_keywords(question, _PARENTING_SET)) or bool(_MONTH_RE.search(question))
+
+
+def category_scores(question: str) -> Dict[str, int]:
+    """카테고리별로 질문에 들어 있는 키워드 수"""
+    matched = matched_keywords(question, _CATEGORY_SET)
+    return {
+        category: len(matched & keywords)
+        for category, keywords in _CATEGORY_KEYWORD_SETS.items()
+    }
+
+
+def parse_route_response(response_text: str) -> Dict[str, Any]:
+    """LLM의 라우팅 JSON 응답 파싱 → {"is_parenting": bool, "category": str | None}"""
+    try:
+        data = json.loads(response_text)
+    except (TypeError, ValueError):
+        match = re.search(r"\{[^}]*\}", response_text or "")
+        data = json.loads(match.group()) if match else {}
+
+    is_parenting = data.get("is_parenting") is True or str(data.get("is_parenting")).lower() == "true"
+    category = data.get("category")
+    if not is_parenting:
+        return {"is_parenting": False, "category": None}
+    return {"is_parenting": True, "category": category if category in CATEGORIES else "other"}
+
+
+class QuestionRouter:
+    """로컬 키워드 분류기 → 의도 분류 모델 → (확신하지 못할 때만) LLM 한 번"""
+
+    def __init__(self, chain=None, keyword_margin: int = 1, fast_path: bool = True, model=None,
+                 timeout: Optional[float] = None):
+        self.chain = chain  # 입력 {"question"} → JSON 문자열을 반환하는 LangChain Runnable
+        self.keyword_margin = keyword_margin
+        self.fast_path = fast_path
+        self.model = model  # intent_model.IntentModel (없으면 키워드 → LLM)
+        self.timeout = timeout  # 비동기 LLM 호출 제한 시간(초), 넘으면 취소하고 키워드로 판단
+        self._lock = threading.Lock()
+        self._counts = {"keyword": 0, "model": 0, "llm": 0, "fallback": 0}
+        self._llm_seconds = 0.0
+
+    def classify_keywords(self, question: str) -> Optional[RouteDecision]:
+        """키워드 분류기가 확신하는 경우에만 결과 반환, 아니면 None
+
+        카테고리 키워드 하나만으로는 육아 질문인지 알 수 없으므로("새벽 배송") 육아 키워드가 함께 있거나
+        1등 카테고리 키워드가 2개 이상일 때만 확신합니다.
+        """
+        scores = category_scores(question)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best, best_score), (_, second_score) = ranked[0], ranked[1]
+        if best_score == 0 or best_score - second_score < self.keyword_margin:
+            return None
+        if best_score < 2 and not has_parenting_keyword(question):
+            return None
+        return RouteDecision(
+            is_parenting=True,
+            category=best,
+            confidence=best_score / (best_score + second_score),
+            source="keyword"
+        )
+
+    def classify_model(self, question: str) -> Optional[RouteDecision]:
+        """의도 분류 모델의 확신도가 모델 기준(threshold) 이상일 때만 결과 반환"""
+        if self.model is None:
+            return None
+        label, confidence = self.model.predict(question)
+        if confidence < self.model.threshold:
+            return None
+        is_parenting = label in CATEGORIES
+        return RouteDecision(is_parenting, label if is_parenting else None, confidence, "model")
+
+    def classify_local(self, question: str) -> Optional[RouteDecision]:
+        """로컬 분류(키워드 → 의도 분류 모델)로 확신할 수 있으면 결과 반환, 아니면 None"""
+        return self.classify_keywords(question) or self.classify_model(question)
+
+    def _fallback(self, question: str) -> RouteDecision:
+        """LLM 호출 실패 시 키워드만으로 판단"""
+        scores = category_scores(question)
+        best = max(scores, key=scores.get)
+        if scores[best] > 0:
+            return RouteDecision(True, best, 0.0, "fallback")
+        if has_parenting_keyword(question):
+            return RouteDecision(True, "other", 0.0, "fallback")
+        return RouteDecision(False, None, 0.0, "fallback")
+
+    def _record(self, decision: RouteDecision, started: float) -> RouteDecision:
+        decision.seconds = time.perf_counter() - started
+        with self._lock:
+            self._counts[decision.source] += 1
+            if decision.source == "llm":
+                self._llm_seconds += decision.seconds
+        logger.info(
+            f"라우팅 결과: is_parenting={decision.is_parenting}, category={decision.category}, "
+            f"source={decision.source}, {decision.seconds * 1000:.1f}ms"
+        )
+        return decision
+
+    def _from_llm(self, response_text: str) -> RouteDecision:
+        data = parse_route_response(response_text)
+        return RouteDecision(data["is_parenting"], data["category"], 1.0, "llm")
+
+    def route(self, question: str) -> RouteDecision:
+        """동기 라우팅"""
+        started = time.perf_counter()
+        decision = self.classify_local(question) if self.fast_path else None
+        if decision is None:
+            try:
+                decision = self._from_llm(self.chain.invoke({"question": question}))
+            except Exception as e:
+                logger.error(f"라우팅 LLM 호출 실패, 키워드로 판단: {str(e)}")
+                decision = self._fallback(question)
+        return self._record(decision, started)
+
+    async def aroute(self, question: str) -> RouteDecision:
+        """비동기 라우팅 (LLM 호출 중 이벤트 루프를 막지 않음)"""
+        started = time.perf_counter()
+        decision = self.classify_local(question) if self.fast_path else None
+        if decision is None:
+            try:
+                response = await asyncio.wait_for(self.chain.ainvoke({"question": question}), self.timeout)
+                decision = self._from_llm(response)
+            except asyncio.TimeoutError:
+                logger.error(f"라우팅 LLM 응답 시간 초과({self.timeout}s), 키워드로 판단")
+                decision = self._fallback(question)
+            except Exception as e:
+                logger.error(f"라우팅 LLM 호출 실패, 키워드로 판단: {str(e)}")
+                decision = self._fallback(question)
+        return self._record(decision, started)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self._counts.values())
+            return {
+                **self._counts,
+                "total": total,
+                "llm_skipped_ratio": ((self._counts["keyword"] + self._counts["model"]) / total) if total else 0.0,
+                "llm_avg_ms": (self._llm_seconds / self._counts["llm"] * 1000) if self._counts["llm"] else 0.0,
+            }
+
+
+def create_question_router(chain, model=None) -> QuestionRouter:
+    """환경 변수 설정으로 라우터 생성
+
+    ROUTER_FAST_PATH_ENABLED=0 이면 항상 LLM으로 판단
+    ROUTER_KEYWORD_MARGIN: 1등 카테고리가 2등보다 키워드가 몇 개 더 많아야 확신할지 (기본 1)
+    ROUTER_LLM_TIMEOUT_SECONDS: 라우팅 LLM 호출 제한 시간 (기본 8초)
+    """
+    fast_path = os.getenv("ROUTER_FAST_PATH_ENABLED", "1").lower() not in ("0", "false", "no")
+    margin = int(os.getenv("ROUTER_KEYWORD_MARGIN", "1"))
+    timeout = float(os.getenv("ROUTER_LLM_TIMEOUT_SECONDS", "8"))
+    return QuestionRouter(chain, keyword_margin=max(1, margin), fast_path=fast_path, model=model,
+                          timeout=timeout)
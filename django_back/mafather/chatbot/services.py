@@ -1,49 +1,53 @@
 import os
 import pickle
+import threading
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import ChatOpenAI
 from langchain_community.vectorstores import FAISS
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
+from .embedding_cache import create_cached_embeddings
+from .router import has_parenting_keyword
 
 load_dotenv()
 
+FAISS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vectordb", "vector_store", "faiss_db")
+# 프롬프트에 넣는 최근 메시지 수 (user + assistant 쌍으로 5개 대화)
+HISTORY_MESSAGES = 10
+
 
 class RAGChatbotService:
-    """FAISS + GPT-4o 기반 RAG 챗봇 서비스 (간단한 체인 구성)"""
+    """FAISS + GPT-4o 기반 RAG 챗봇 서비스 (간단한 체인 구성)
+
+    대화 기록을 인스턴스에 두지 않으므로 프로세스에서 하나의 인스턴스를 여러 요청 / 스레드가
+    함께 사용합니다 (get_chatbot_service). 히스토리는 chat 호출마다 넘깁니다.
+    """
     
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.embedding_model = None
         self.vectorstore = None
+        self.retriever = None
         self.llm = None
         self.chain = None
-        self.chat_history = []  # 간단한 메모리 관리
         self._initialize()
 
     def _initialize(self):
         """RAG 시스템 초기화"""
         try:
-            # OpenAI 임베딩 모델 초기화
-            self.embedding_model = OpenAIEmbeddings(
-                model="text-embedding-3-small",
-                openai_api_key=self.openai_api_key
-            )
+            # OpenAI 임베딩 모델 초기화 (같은 질문은 임베딩 캐시에서 재사용)
+            self.embedding_model = create_cached_embeddings(self.openai_api_key)
             
             # FAISS 벡터스토어 로드
-            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            faiss_dir = os.path.join(app_dir, "vectordb", "vector_store", "faiss_db")
-            print(app_dir)
-            print(faiss_dir)
-            if os.path.exists(faiss_dir):
+            if os.path.exists(FAISS_DIR):
                 self.vectorstore = FAISS.load_local(
-                    faiss_dir, 
+                    FAISS_DIR, 
                     self.embedding_model,
                 )
             else:
                 raise FileNotFoundError("FAISS DB가 존재하지 않습니다.")
-            print(1)
+            self.retriever = self.vectorstore.as_retriever(search_kwargs={"k": 5})
             # GPT-4o 모델 초기화
             self.llm = ChatOpenAI(
                 model="gpt-4o",
@@ -86,8 +90,9 @@ class RAGChatbotService:
             print(f"RAG 시스템 초기화 오류: {str(e)}")
             raise
 
-    def chat(self, question: str, session_id: Optional[str] = None) -> Dict[str, Any]:
-        """채팅 메시지 처리"""
+    def chat(self, question: str, chat_history: Optional[List[Dict[str, str]]] = None,
+             session_id: Optional[str] = None) -> Dict[str, Any]:
+        """채팅 메시지 처리 (chat_history: [{"role": "user" | "assistant", "content"}, ...])"""
         try:
             # 육아 관련성 체크
             if not self._is_parenting_related(question):
@@ -98,14 +103,13 @@ class RAGChatbotService:
                 }
             
             # 벡터스토어에서 관련 문서 검색
-            retriever = self.vectorstore.as_retriever(search_kwargs={"k": 5})
-            relevant_docs = retriever.get_relevant_documents(question)
+            relevant_docs = self.retriever.get_relevant_documents(question)
             
             # 검색된 문서를 컨텍스트로 변환
             context = "\n\n".join([doc.page_content for doc in relevant_docs])
             
             # 이전 대화 기록을 문자열로 변환
-            history_text = self._format_chat_history()
+            history_text = self._format_chat_history(chat_history or [])
             
             # 체인 실행
             response = self.chain.invoke({
@@ -114,14 +118,6 @@ class RAGChatbotService:
                 "question": question
             })
             
-            # 대화 기록에 추가 (최근 10개만 유지)
-            self.chat_history.append({"role": "user", "content": question})
-            self.chat_history.append({"role": "assistant", "content": response})
-            
-            # 최근 20개 메시지만 유지 (user + assistant 쌍으로 10개 대화)
-            if len(self.chat_history) > 20:
-                self.chat_history = self.chat_history[-20:]
-            
             return {
                 "answer": response,
                 "source_documents": relevant_docs,
@@ -135,13 +131,13 @@ class RAGChatbotService:
                 "is_parenting_related": True
             }
 
-    def _format_chat_history(self) -> str:
+    def _format_chat_history(self, chat_history: List[Dict[str, str]]) -> str:
         """채팅 히스토리를 문자열로 포맷팅"""
-        if not self.chat_history:
+        if not chat_history:
             return "이전 대화가 없습니다."
         
         formatted_history = []
-        for message in self.chat_history[-10:]:  # 최근 10개 메시지만
+        for message in chat_history[-HISTORY_MESSAGES:]:  # 최근 10개 메시지만
             if message["role"] == "user":
                 formatted_history.append(f"사용자: {message['content']}")
             elif message["role"] == "assistant":
@@ -150,31 +146,8 @@ class RAGChatbotService:
         return "\n".join(formatted_history)
 
     def _is_parenting_related(self, question: str) -> bool:
-        """육아 관련 질문인지 확인"""
-        parenting_keywords = [
-            "아기", "아이", "신생아", "영아", "유아", "육아", "양육",
-            "수유", "모유", "분유", "이유식", "기저귀", "잠", "수면",
-            "발달", "성장", "걷기", "기어가기", "울음", "우유", 
-            "예방접종", "백신", "열", "기침", "감기", "변비", "설사",
-            "목욕", "안전", "놀이", "장난감", "책", "노래",
-            "개월", "돌", "출산", "임신", "산후", "젖니", "이가",
-            "엄마", "아빠", "부모", "가족", "형제", "자매"
-        ]
-        
-        question_lower = question.lower()
-        
-        # 한국어 키워드 체크
-        for keyword in parenting_keywords:
-            if keyword in question_lower:
-                return True
-        
-        # 숫자 + 개월 패턴 체크 (1개월, 3개월 등)
-        import re
-        month_pattern = r'\d+개월'
-        if re.search(month_pattern, question):
-            return True
-        
-        return False
+        """육아 관련 질문인지 확인 (키워드 / "N개월" 표현, chatbot/router.py와 같은 목록)"""
+        return has_parenting_keyword(question)
 
     def _get_redirect_message(self) -> str:
         """육아 외 질문에 대한 안내 메시지"""
@@ -192,18 +165,19 @@ class RAGChatbotService:
 
             어떤 육아 고민이 있으신가요?"""
 
-    def clear_memory(self):
-        """대화 메모리 초기화"""
-        self.chat_history = []
 
-    def get_chat_history(self) -> List[Dict[str, str]]:
-        """현재 세션의 채팅 히스토리 반환"""
-        return self.chat_history.copy()
+_shared_service: Optional[RAGChatbotService] = None
+_shared_lock = threading.Lock()
 
-    def set_memory_from_history(self, chat_history: List[Dict[str, str]]):
-        """기존 채팅 히스토리로 메모리 설정"""
-        self.chat_history = chat_history.copy()
-        
-        # 최근 20개 메시지만 유지
-        if len(self.chat_history) > 20:
-            self.chat_history = self.chat_history[-20:]
\ No newline at end of file
+
+def get_chatbot_service() -> RAGChatbotService:
+    """프로세스에서 공유하는 RAGChatbotService (처음 호출할 때 한 번만 초기화)
+
+    초기화에 실패하면 저장하지 않으므로 다음 호출에서 다시 시도합니다.
+    """
+    global _shared_service
+    if _shared_service is None:
+        with _shared_lock:
+            if _shared_service is None:
+                _shared_service = RAGChatbotService()
+    return _shared_service
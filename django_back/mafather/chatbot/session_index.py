@@ -0,0 +1,74 @@
+"""
+사용자별 웹소켓 세션 인덱스
+
+사용자 id → 웹소켓 세션 id 집합을 유지해서 새 세션을 만들 때 같은 사용자의 이전 세션을
+cache.keys('websocket_session_*') 전체 스캔 없이 바로 찾습니다.
+- Redis 캐시(REDIS_URL): SADD / SREM / SMEMBERS (원자적, 여러 워커에서 안전)
+- 로컬 메모리 캐시: 캐시에 set을 저장하고 프로세스 락으로 읽기-수정-쓰기를 보호 (단일 프로세스 전용)
+
+세션 생성(create_websocket_session) 시 추가하고, 연결 해제(ChatbotConsumer.disconnect) 시 제거합니다.
+인덱스에도 세션 메타데이터와 같은 만료 시간을 걸어 정리되지 않은 세션 id가 쌓이지 않게 합니다.
+"""
+
+import threading
+from typing import Any, List
+
+from django.core.cache import caches
+
+from mafather.cache import get_redis_client
+
+SESSION_TIMEOUT = 3600
+
+_lock = threading.Lock()
+
+
+def _index_key(user_id: Any) -> str:
+    return f"user_websocket_sessions_{user_id}"
+
+
+def add_user_session(user_id: Any, session_id: str, timeout: int = SESSION_TIMEOUT):
+    """사용자 인덱스에 세션 추가 (인덱스 만료 시간 갱신)"""
+    key = _index_key(user_id)
+    client = get_redis_client()
+    if client is not None:
+        redis_key = caches['default'].make_key(key)
+        pipeline = client.pipeline()
+        pipeline.sadd(redis_key, session_id)
+        pipeline.expire(redis_key, timeout)
+        pipeline.execute()
+        return
+    backend = caches['default']
+    with _lock:
+        session_ids = backend.get(key, set())
+        session_ids.add(session_id)
+        backend.set(key, session_ids, timeout=timeout)
+
+
+def remove_user_sessions(user_id: Any, *session_ids: str):
+    """사용자 인덱스에서 세션 제거"""
+    if not session_ids:
+        return
+    key = _index_key(user_id)
+    client = get_redis_client()
+    if client is not None:
+        client.srem(caches['default'].make_key(key), *session_ids)
+        return
+    backend = caches['default']
+    with _lock:
+        current = backend.get(key)
+        if current is None:
+            return
+        current.difference_update(session_ids)
+        if current:
+            backend.set(key, current, timeout=SESSION_TIMEOUT)
+        else:
+            backend.delete(key)
+
+
+def get_user_sessions(user_id: Any) -> List[str]:
+    """사용자의 웹소켓 세션 id 목록"""
+    key = _index_key(user_id)
+    client = get_redis_client(write=False)
+    if client is not None:
+        return [session_id.decode() for session_id in client.smembers(caches['default'].make_key(key))]
+    return list(caches['default'].get(key, set()))
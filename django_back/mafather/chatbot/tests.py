@@ -0,0 +1,480 @@
+import os
+import json
+import asyncio
+import tempfile
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from api_service.models import User
+from chatbot import history_store, http_client, transcript_writer as transcript_writer_module
+from chatbot.intent_model import (
+    IntentModel, IntentModelStore, create_intent_model_store, is_stale, label_of, load_examples, train_intent_model,
+)
+from chatbot.models import ChatMessage, ChatSession
+from chatbot.redis_standin import ThreadedRedisStandin
+from chatbot.router import QuestionRouter, parse_route_response
+from chatbot.session_index import add_user_session, get_user_sessions, remove_user_sessions
+from chatbot.transcript_writer import TranscriptWriter, write_transcripts
+from chatbot.views import create_websocket_session
+
+class IntentModelTrainingDataTest(SimpleTestCase):
+    """게시된 라우터 모델이 현재 학습 데이터로 학습되었는지 (training_sha256)"""
+
+    def test_current_model_matches_training_data(self):
+        model = create_intent_model_store().load_current()
+        self.assertIsNotNone(model)
+        self.assertFalse(
+            is_stale(model),
+            f"라우터 모델 {model.version}이 현재 router_examples.json로 학습되지 않았습니다. "
+            "python manage.py train_router 로 다시 학습하세요."
+        )
+
+    def test_changed_examples_make_model_stale(self):
+        examples = load_examples()
+        model = train_intent_model([(row["question"], label_of(row)) for row in examples])
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "router_examples.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(examples, f, ensure_ascii=False)
+            self.assertFalse(is_stale(model, examples_path=path, source_path=""))
+
+            examples.append({"question": "주식 투자 방법", "is_parenting": False, "category": None})
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(examples, f, ensure_ascii=False)
+            self.assertTrue(is_stale(model, examples_path=path, source_path=""))
+
+
+
+class IntentModelTest(SimpleTestCase):
+    """의도 분류 모델 학습 / 예측 / 저장소 (CURRENT 교체, 오래된 버전 정리)"""
+
+    SAMPLES = [
+        ("아기가 밤에 자꾸 깨요", "sleep"), ("낮잠을 안 자요", "sleep"), ("통잠은 언제 자나요", "sleep"),
+        ("뒤집기를 안 해요", "development"), ("말이 늦어요", "development"), ("걸음마는 언제", "development"),
+        ("주식 투자 방법", "non_parenting"), ("오늘 날씨 어때", "non_parenting"), ("맛집 추천", "non_parenting"),
+    ]
+
+    def test_predicts_training_labels_and_round_trips(self):
+        model = train_intent_model(self.SAMPLES)
+        self.assertEqual(model.predict("밤에 자꾸 깨요")[0], "sleep")
+        self.assertEqual(model.predict("주식 투자")[0], "non_parenting")
+        self.assertAlmostEqual(sum(model.predict_proba("말이 늦어요").values()), 1.0, places=5)
+
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "model.npz")
+            model.save(path)
+            loaded = IntentModel.load(path)
+        self.assertEqual(loaded.version, model.version)
+        self.assertEqual(loaded.predict("낮잠을 안 자요"), model.predict("낮잠을 안 자요"))
+
+    def test_store_publishes_current_and_keeps_latest(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = IntentModelStore(root, keep=2)
+            self.assertIsNone(store.load_current())
+            versions = []
+            for i in range(3):
+                model = train_intent_model(self.SAMPLES[:len(self.SAMPLES) - i])
+                model.metadata["version"] = model.version = f"2026010{i}-000000-{i:08d}"
+                versions.append(store.publish(model))
+
+            self.assertEqual(store.current_version(), versions[-1])
+            self.assertEqual(store.list_versions(), versions[-2:])
+            self.assertEqual(store.load_current().version, versions[-1])
+
+class FakeIntentModel:
+    """고정된 (label, 확신도)를 돌려주는 의도 분류 모델"""
+
+    def __init__(self, label, confidence, threshold=0.7):
+        self.label = label
+        self.confidence = confidence
+        self.threshold = threshold
+        self.calls = []
+
+    def predict(self, question):
+        self.calls.append(question)
+        return self.label, self.confidence
+
+
+class QuestionRouterTest(SimpleTestCase):
+    """라우팅 순서: 키워드 → 의도 분류 모델 → LLM → (LLM 실패 시) 키워드 fallback"""
+
+    def create_router(self, model=None, response='{"is_parenting": true, "category": "development"}', **kwargs):
+        chain = mock.Mock()
+        chain.invoke.return_value = response
+        chain.ainvoke = mock.AsyncMock(return_value=response)
+        return QuestionRouter(chain, model=model, **kwargs), chain
+
+    def test_keyword_fast_path_skips_model_and_llm(self):
+        model = FakeIntentModel("non_parenting", 0.99)
+        router, chain = self.create_router(model)
+        decision = router.route("아기가 밤에 잠을 안 자요")
+
+        self.assertEqual((decision.is_parenting, decision.category, decision.source), (True, "sleep", "keyword"))
+        self.assertEqual(model.calls, [])
+        chain.invoke.assert_not_called()
+
+    def test_single_category_keyword_without_parenting_keyword_goes_to_model(self):
+        model = FakeIntentModel("non_parenting", 0.9)
+        router, chain = self.create_router(model)
+        decision = router.route("새벽 배송 언제 와요")
+
+        self.assertEqual((decision.is_parenting, decision.category, decision.source), (False, None, "model"))
+        self.assertEqual(model.calls, ["새벽 배송 언제 와요"])
+        chain.invoke.assert_not_called()
+
+    def test_keywords_match_whole_words_only(self):
+        router, _ = self.create_router()
+        self.assertIsNone(router.classify_keywords("잠실 맛집 추천"))
+        self.assertEqual(router.classify_keywords("아이가 잠들어요").category, "sleep")
+
+    def test_unconfident_model_falls_through_to_llm(self):
+        model = FakeIntentModel("sleep", 0.5)
+        router, chain = self.create_router(model)
+        decision = router.route("오늘 날씨 어때")
+
+        self.assertEqual((decision.is_parenting, decision.category, decision.source), (True, "development", "llm"))
+        chain.invoke.assert_called_once_with({"question": "오늘 날씨 어때"})
+
+    def test_llm_failure_falls_back_to_keywords(self):
+        router, chain = self.create_router()
+        chain.invoke.side_effect = RuntimeError("rate limited")
+        decision = router.route("새벽 배송 언제 와요")
+        self.assertEqual((decision.is_parenting, decision.category, decision.source), (True, "sleep", "fallback"))
+
+        decision = router.route("오늘 날씨 어때")
+        self.assertEqual((decision.is_parenting, decision.category, decision.source), (False, None, "fallback"))
+
+    def test_async_llm_timeout_falls_back_to_keywords(self):
+        router, chain = self.create_router(timeout=0.01)
+
+        async def slow(_):
+            await asyncio.sleep(1)
+
+        chain.ainvoke = slow
+        decision = asyncio.run(router.aroute("오늘 날씨 어때"))
+        self.assertEqual(decision.source, "fallback")
+
+    def test_fast_path_disabled_always_asks_llm(self):
+        router, chain = self.create_router(FakeIntentModel("sleep", 0.99), fast_path=False)
+        decision = asyncio.run(router.aroute("아기가 밤에 잠을 안 자요"))
+        self.assertEqual(decision.source, "llm")
+        chain.ainvoke.assert_awaited_once()
+
+    def test_stats_count_each_path(self):
+        router, _ = self.create_router(FakeIntentModel("non_parenting", 0.9))
+        for question in ["아기가 밤에 잠을 안 자요", "6개월 아기 이유식 시작", "새벽 배송 언제 와요"]:
+            router.route(question)
+        stats = router.stats()
+        self.assertEqual((stats["keyword"], stats["model"], stats["llm"], stats["total"]), (2, 1, 0, 3))
+        self.assertEqual(stats["llm_skipped_ratio"], 1.0)
+
+    def test_parse_route_response(self):
+        self.assertEqual(
+            parse_route_response('결과: {"is_parenting": "true", "category": "sleep"}'),
+            {"is_parenting": True, "category": "sleep"},
+        )
+        self.assertEqual(
+            parse_route_response('{"is_parenting": true, "category": "food"}'),
+            {"is_parenting": True, "category": "other"},
+        )
+        self.assertEqual(
+            parse_route_response('{"is_parenting": false, "category": "sleep"}'),
+            {"is_parenting": False, "category": None},
+        )
+
+
+class RedisStandinTestMixin:
+    """기본 캐시를 Redis 스탠드인(RedisCache)으로 바꿔서 REDIS_URL 경로를 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = ThreadedRedisStandin()
+        cls.settings_override = override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": cls.standin.start()},
+        })
+        cls.settings_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.settings_override.disable()
+        cls.standin.stop()
+
+    def setUp(self):
+        super().setUp()
+        self.standin.flushdb()
+
+
+class HistoryStoreTest(SimpleTestCase):
+    """채팅 히스토리: 역할 변환, 최근 MAX_MESSAGES개로 자르기, 동시 append (로컬 메모리 캐시)"""
+
+    def setUp(self):
+        super().setUp()
+        caches["default"].clear()
+        patcher = mock.patch.object(history_store, "MAX_MESSAGES", 4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def contents(self, session_id="s1", limit=None):
+        return [entry["content"] for entry in history_store.recent(session_id, limit)]
+
+    def test_append_keeps_order_and_roles(self):
+        history_store.append("s1", ("user", "질문"), ("ai", "답변"))
+        entries = history_store.recent("s1")
+
+        self.assertEqual([(e["role"], e["content"]) for e in entries], [("user", "질문"), ("assistant", "답변")])
+        self.assertEqual(
+            [m["type"] for m in history_store.as_chat_messages(entries)], ["user", "ai"]
+        )
+        self.assertEqual(history_store.recent("other"), [])
+
+    def test_history_is_trimmed_to_max_messages(self):
+        for i in range(3):
+            history_store.append("s1", ("user", f"질문 {i}"), ("assistant", f"답변 {i}"))
+
+        self.assertEqual(history_store.count("s1"), 4)
+        self.assertEqual(self.contents(), ["질문 1", "답변 1", "질문 2", "답변 2"])
+        self.assertEqual(self.contents(limit=2), ["질문 2", "답변 2"])
+
+    def test_replace_and_clear(self):
+        history_store.append("s1", ("user", "이전 질문"))
+        history_store.replace("s1", [("user", f"복원 {i}") for i in range(6)])
+        self.assertEqual(self.contents(), ["복원 2", "복원 3", "복원 4", "복원 5"])
+
+        history_store.replace("s1", [])
+        self.assertEqual(self.contents(), [])
+        history_store.append("s1", ("user", "질문"))
+        history_store.clear("s1")
+        self.assertEqual(history_store.count("s1"), 0)
+
+    def test_concurrent_appends_are_not_lost(self):
+        with mock.patch.object(history_store, "MAX_MESSAGES", 100):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda i: history_store.append("s1", ("user", f"질문 {i}")), range(40)))
+            self.assertEqual(sorted(self.contents()), sorted(f"질문 {i}" for i in range(40)))
+
+
+class RedisHistoryStoreTest(RedisStandinTestMixin, HistoryStoreTest):
+    """같은 동작을 Redis 경로(RPUSH + LTRIM + EXPIRE, LRANGE)로 확인"""
+
+
+class SessionIndexTest(SimpleTestCase):
+    """사용자별 웹소켓 세션 인덱스 (로컬 메모리 캐시)"""
+
+    def setUp(self):
+        super().setUp()
+        caches["default"].clear()
+
+    def test_add_get_remove(self):
+        add_user_session(1, "a")
+        add_user_session(1, "b")
+        add_user_session(2, "c")
+        self.assertEqual(sorted(get_user_sessions(1)), ["a", "b"])
+
+        remove_user_sessions(1, "a", "missing")
+        self.assertEqual(get_user_sessions(1), ["b"])
+        remove_user_sessions(1, "b")
+        self.assertEqual(get_user_sessions(1), [])
+        remove_user_sessions(1, "b")
+        self.assertEqual(get_user_sessions(2), ["c"])
+
+    def test_concurrent_adds_are_not_lost(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: add_user_session(1, f"session-{i}"), range(40)))
+        self.assertEqual(len(get_user_sessions(1)), 40)
+
+    def test_new_websocket_session_disconnects_previous_ones(self):
+        def create():
+            request = RequestFactory().post("/", "{}", content_type="application/json")
+            request.user = SimpleNamespace(id=7, is_authenticated=True)
+            return json.loads(create_websocket_session(request).content)["session_id"]
+
+        first = create()
+        self.assertEqual(get_user_sessions(7), [first])
+        second = create()
+
+        self.assertEqual(get_user_sessions(7), [second])
+        self.assertEqual(caches["default"].get(f"websocket_session_{first}")["status"], "disconnected")
+        self.assertEqual(caches["default"].get(f"websocket_session_{second}")["status"], "pending")
+
+
+class RedisSessionIndexTest(RedisStandinTestMixin, SessionIndexTest):
+    """같은 동작을 Redis 경로(SADD / SREM / SMEMBERS)로 확인"""
+
+
+def message(role, content, tokens=0, **extra):
+    return {"role": role, "content": content, "tokens": tokens, "created_at": timezone.now(), **extra}
+
+
+class WriteTranscriptsTest(TestCase):
+    """대화 내역 일괄 저장: 세션 행 생성, 역할 변환, 세션 집계, 익명 세션"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="parent@example.com", name="부모", auth_provider="google")
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_creates_session_from_websocket_metadata_and_updates_totals(self):
+        caches["default"].set("websocket_session_s1", {"user_id": self.user.pk, "category": "sleep", "type": "doc"})
+        written = write_transcripts({
+            "s1": {"messages": [message("user", "아기가 밤에 자주 깨요", 5),
+                                message("ai", "수면 의식을 만들어 보세요", 12, category="sleep")], "close": False},
+        })
+
+        self.assertEqual(written, 2)
+        session = ChatSession.objects.get(session_id="s1")
+        self.assertEqual((session.user_id, session.category, session.websocket_type), (self.user.pk, "sleep", "doc"))
+        self.assertEqual(session.title, "아기가 밤에 자주 깨요")
+        self.assertEqual((session.total_tokens, session.is_active), (17, True))
+        self.assertEqual(
+            list(session.messages.order_by("created_at").values_list("role", "category")),
+            [("user", None), ("assistant", "sleep")],
+        )
+
+        write_transcripts({"s1": {"messages": [message("user", "낮잠은요?", 3)], "close": True}})
+        session.refresh_from_db()
+        self.assertEqual((session.total_tokens, session.is_active), (20, False))
+        self.assertEqual(session.messages.count(), 3)
+
+    def test_anonymous_session_is_skipped(self):
+        written = write_transcripts({
+            "anonymous": {"messages": [message("user", "질문")], "close": True},
+        })
+        self.assertEqual(written, 0)
+        self.assertFalse(ChatSession.objects.filter(session_id="anonymous").exists())
+        self.assertEqual(ChatMessage.objects.count(), 0)
+
+
+class TranscriptWriterTest(SimpleTestCase):
+    """대기열을 모아서 한 번에 저장하는지 (write_transcripts는 기록만 하는 가짜로 교체)"""
+
+    def setUp(self):
+        self.batches = []
+        patcher = mock.patch.object(transcript_writer_module, "write_transcripts", side_effect=self.record)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, batch):
+        self.batches.append({session_id: (len(entry["messages"]), entry["close"]) for session_id, entry in batch.items()})
+        return sum(len(entry["messages"]) for entry in batch.values())
+
+    def test_sessions_enqueued_within_interval_share_one_flush(self):
+        writer = TranscriptWriter(flush_interval=0.05, max_messages=100)
+
+        async def run():
+            writer.enqueue("s1", [message("user", "질문")])
+            writer.enqueue("s2", [message("user", "질문"), message("ai", "답변")])
+            writer.enqueue("s1", [message("ai", "답변")], close=True)
+            await asyncio.sleep(0.2)
+            await writer.aclose()
+
+        async_to_sync(run)()
+        self.assertEqual(self.batches, [{"s1": (2, True), "s2": (2, False)}])
+        self.assertEqual(writer.stats()["written"], 4)
+
+    def test_full_queue_is_written_without_waiting(self):
+        writer = TranscriptWriter(flush_interval=60, max_messages=2)
+
+        async def run():
+            writer.enqueue("s1", [message("user", "질문"), message("ai", "답변")])
+            await asyncio.sleep(0.1)
+            self.assertEqual(len(self.batches), 1)
+            writer.enqueue("s2", [message("user", "질문")])
+            await writer.aclose()
+
+        async_to_sync(run)()
+        self.assertEqual(self.batches, [{"s1": (2, False)}, {"s2": (1, False)}])
+
+    def test_failed_batch_is_counted_as_dropped(self):
+        writer = TranscriptWriter()
+        writer.enqueue("s1", [message("user", "질문")])
+        with mock.patch.object(transcript_writer_module, "write_transcripts", side_effect=RuntimeError("db down")):
+            writer.flush_sync()
+        self.assertEqual((writer.stats()["dropped"], writer.stats()["pending_messages"]), (1, 0))
+
+
+class SharedHttpClientTest(SimpleTestCase):
+    """FastAPI 호출 공유 클라이언트: 이벤트 루프당 하나, 지수 백오프 상한"""
+
+    def test_client_is_shared_within_a_loop_and_recreated_for_a_new_loop(self):
+        async def clients():
+            first, second = http_client.get_http_client(), http_client.get_http_client()
+            return first, second
+
+        first, second = asyncio.run(clients())
+        self.assertIs(first, second)
+        third, _ = asyncio.run(clients())
+        self.assertIsNot(third, first)
+
+        asyncio.run(http_client.aclose_http_client())
+        self.assertTrue(third.is_closed)
+
+    def test_backoff_delay_is_capped(self):
+        for attempt in range(10):
+            delay = http_client.backoff_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(http_client.BACKOFF_MAX, http_client.BACKOFF_BASE * 2 ** attempt))
+
+
+class HttpClientRetryTest(SimpleTestCase):
+    """엔드포인트 정책에 따른 재시도 (연결 오류 / 502·503·504만, 생성 중 읽기 타임아웃은 재시도 안 함)"""
+
+    def setUp(self):
+        self.requests = []
+        self.responses = []
+        for target, value in (("backoff_delay", lambda attempt: 0), ("get_http_client", self.mock_client)):
+            patcher = mock.patch.object(http_client, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def mock_client(self):
+        def handler(request):
+            self.requests.append(request.url.path)
+            outcome = self.responses.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        return httpx.AsyncClient(base_url="http://fastapi.test", transport=httpx.MockTransport(handler))
+
+    def test_post_json_retries_unavailable_then_succeeds(self):
+        self.responses = [httpx.Response(503), httpx.ConnectError("refused"), httpx.Response(200, json={"ok": True})]
+        response = asyncio.run(http_client.post_json("/vector", {"message": "질문"}))
+        self.assertEqual(response.json(), {"ok": True})
+        self.assertEqual(self.requests, ["/vector"] * 3)
+
+    def test_post_json_does_not_retry_server_errors_or_read_timeouts(self):
+        self.responses = [httpx.Response(500)]
+        with self.assertRaises(httpx.HTTPStatusError):
+            asyncio.run(http_client.post_json("/vector", {}))
+        self.responses = [httpx.ReadTimeout("slow generation")]
+        with self.assertRaises(httpx.ReadTimeout):
+            asyncio.run(http_client.post_json("/tuning", {}))
+        self.assertEqual(len(self.requests), 2)
+
+    def test_post_json_gives_up_after_policy_retries(self):
+        retries = http_client.get_policy("/vector").retries
+        self.responses = [httpx.Response(503)] * (retries + 1)
+        with self.assertRaises(httpx.HTTPStatusError):
+            asyncio.run(http_client.post_json("/vector", {}))
+        self.assertEqual(len(self.requests), retries + 1)
+
+    def test_stream_post_retries_before_headers(self):
+        self.responses = [httpx.Response(503), httpx.Response(200, text="첫 줄\n둘째 줄\n")]
+
+        async def read_lines():
+            async with http_client.stream_post("/tuning/stream", json={"message": "질문"}) as response:
+                return [line async for line in response.aiter_lines()]
+
+        self.assertEqual(asyncio.run(read_lines()), ["첫 줄", "둘째 줄"])
+        self.assertEqual(self.requests, ["/tuning/stream"] * 2)
@@ -0,0 +1,222 @@
+"""
+채팅 대화 내역 write-behind 저장
+
+웹소켓 상담의 대화 내역을 바로 DB에 쓰지 않고 대기열에 모았다가 짧은 주기로 한 번에 저장합니다.
+- 여러 세션의 메시지를 한 번의 flush로 모아 ChatMessage.objects.bulk_create 한 번에 저장
+  (ChatMessage.save가 메시지마다 세션을 두 번 다시 저장하던 비용이 없음)
+- 세션 집계(total_tokens, last_message_at, is_active)는 세션당 UPDATE 한 번, F 표현식으로 갱신
+- ORM 호출은 sync_to_async로 이벤트 루프 밖 스레드에서 실행
+- DB에 세션 행이 없으면 웹소켓 세션 메타데이터(cache: websocket_session_<id>)의 user_id로 생성
+  (user_id가 없는 익명 세션은 ChatSession.user가 필수라 저장하지 않음)
+
+    transcript_writer.enqueue(session_id, messages, close=False)
+    await transcript_writer.flush()
+
+서버 종료 시 mafather.lifespan이 aclose로 남은 대기열을 저장하고, 이벤트 루프 밖에서 종료되는 경우를 위해
+flush_sync도 atexit에 등록합니다 (이미 비어 있으면 아무것도 하지 않음).
+
+환경 변수:
+    TRANSCRIPT_FLUSH_INTERVAL_SECONDS  대기열을 모으는 시간(초) (기본 0.5)
+    TRANSCRIPT_FLUSH_MAX_MESSAGES      이만큼 쌓이면 주기를 기다리지 않고 바로 저장 (기본 500)
+"""
+
+import os
+import atexit
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from mafather.lifespan import on_shutdown
+from .models import ChatMessage, ChatSession
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv("TRANSCRIPT_FLUSH_INTERVAL_SECONDS", "0.5"))
+FLUSH_MAX_MESSAGES = int(os.getenv("TRANSCRIPT_FLUSH_MAX_MESSAGES", "500"))
+
+# chains.ChatSession은 AI 응답을 'ai'로 기록하지만 ChatMessage.role 선택지는 'assistant'
+ROLE_MAP = {'ai': 'assistant'}
+CATEGORIES = {value for value, _ in ChatSession.CATEGORY_CHOICES}
+
+
+def _create_missing_sessions(session_ids: List[str], batch: Dict[str, Dict[str, Any]]) -> List[ChatSession]:
+    """웹소켓 세션 메타데이터로 DB 세션 행 생성 (user_id가 없는 세션은 건너뜀)"""
+    metadata = cache.get_many([f"websocket_session_{session_id}" for session_id in session_ids])
+    created = []
+    for session_id in session_ids:
+        session_data = metadata.get(f"websocket_session_{session_id}") or {}
+        user_id = session_data.get('user_id')
+        if not user_id:
+            logger.warning(f"세션 {session_id}의 사용자 정보가 없어 대화 내역을 저장하지 않습니다.")
+            continue
+        first_question = next(
+            (msg['content'] for msg in batch[session_id]['messages'] if msg['role'] == 'user'), '새로운 상담'
+        )
+        category = session_data.get('category')
+        created.append(ChatSession(
+            session_id=session_id,
+            user_id=user_id,
+            title=first_question[:50] + ('...' if len(first_question) > 50 else ''),
+            category=category if category in CATEGORIES else 'general',
+            websocket_type=session_data.get('type', 'ai_expert'),
+        ))
+    ChatSession.objects.bulk_create(created, ignore_conflicts=True)
+    return created
+
+
+def write_transcripts(batch: Dict[str, Dict[str, Any]]) -> int:
+    """대기열 한 묶음을 한 트랜잭션으로 저장하고 저장한 메시지 수를 반환"""
+    with transaction.atomic():
+        session_pks = dict(
+            ChatSession.objects.filter(session_id__in=list(batch)).values_list('session_id', 'pk')
+        )
+        missing = [session_id for session_id in batch if session_id not in session_pks]
+        if missing and _create_missing_sessions(missing, batch):
+            session_pks.update(
+                ChatSession.objects.filter(session_id__in=missing).values_list('session_id', 'pk')
+            )
+
+        rows = []
+        for session_id, entry in batch.items():
+            pk = session_pks.get(session_id)
+            if pk is None:
+                continue
+            for msg in entry['messages']:
+                rows.append(ChatMessage(
+                    session_id=pk,
+                    role=ROLE_MAP.get(msg['role'], msg['role']),
+                    content=msg['content'],
+                    tokens=msg.get('tokens', 0),
+                    category=msg.get('category'),
+                    is_parenting_related=msg.get('is_parenting_related', True),
+                ))
+        ChatMessage.objects.bulk_create(rows, batch_size=FLUSH_MAX_MESSAGES)
+
+        # 세션 집계는 세션당 한 번만 갱신
+        for session_id, entry in batch.items():
+            pk = session_pks.get(session_id)
+            if pk is None:
+                continue
+            updates = {}
+            if entry['messages']:
+                updates['total_tokens'] = F('total_tokens') + sum(msg.get('tokens', 0) for msg in entry['messages'])
+                updates['last_message_at'] = max(msg['created_at'] for msg in entry['messages'])
+            if entry['close']:
+                updates['is_active'] = False
+            if updates:
+                ChatSession.objects.filter(pk=pk).update(**updates)
+    return len(rows)
+
+
+class TranscriptWriter:
+    """세션별 대화 내역 대기열 + 주기적 일괄 저장"""
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL_SECONDS, max_messages: int = FLUSH_MAX_MESSAGES):
+        self.flush_interval = flush_interval
+        self.max_messages = max_messages
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_messages = 0
+        self._flusher: Optional[asyncio.Task] = None
+        self._has_pending: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+
+    def enqueue(self, session_id: str, messages: List[Dict[str, Any]], close: bool = False):
+        """세션의 메시지를 저장 대기열에 추가 (close=True면 저장 후 세션을 비활성화)"""
+        if not messages and not close:
+            return
+        entry = self._pending.setdefault(session_id, {'messages': [], 'close': False})
+        entry['messages'].extend(messages)
+        entry['close'] = entry['close'] or close
+        self._pending_messages += len(messages)
+        if not self._ensure_flusher():
+            # 이벤트 루프 밖(종료 중 atexit 등)에서 추가된 메시지는 flush_sync가 저장
+            return
+        self._has_pending.set()
+        if self._pending_messages >= self.max_messages:
+            self._batch_full.set()
+
+    def _ensure_flusher(self) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._flusher is None or self._flusher.done() or self._flusher.get_loop() is not loop:
+            self._has_pending = asyncio.Event()
+            self._batch_full = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._flusher = loop.create_task(self._flush_forever())
+        return True
+
+    async def _flush_forever(self):
+        while True:
+            await self._has_pending.wait()
+            # flush_interval 동안 다른 세션의 메시지를 더 모음 (대기열이 가득 차면 바로 저장)
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self):
+        """대기 중인 메시지를 모두 저장 (실패한 묶음은 로그를 남기고 버림)"""
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            batch, count = self._take_batch()
+            if batch:
+                await sync_to_async(self._write_batch)(batch, count)
+
+    def flush_sync(self):
+        """이벤트 루프 밖에서 남은 대기열 저장 (프로세스 종료 시 atexit에서 호출)"""
+        batch, count = self._take_batch()
+        if batch:
+            self._write_batch(batch, count)
+
+    def _take_batch(self):
+        batch, self._pending = self._pending, {}
+        count, self._pending_messages = self._pending_messages, 0
+        if self._has_pending is not None:
+            self._has_pending.clear()
+            self._batch_full.clear()
+        return batch, count
+
+    def _write_batch(self, batch: Dict[str, Dict[str, Any]], count: int):
+        try:
+            written = write_transcripts(batch)
+            self.flushes += 1
+            self.written += written
+            logger.info(f"대화 내역 저장: 세션 {len(batch)}개, 메시지 {written}개")
+        except Exception as e:
+            self.dropped += count
+            logger.error(f"대화 내역 저장 중 오류 발생 (세션 {len(batch)}개, 메시지 {count}개): {str(e)}")
+
+    async def aclose(self):
+        """flush 작업을 멈추고 남은 대기열을 저장 (서버 종료 시 mafather.lifespan에서 호출)"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending_sessions": len(self._pending),
+            "pending_messages": self._pending_messages,
+            "flushes": self.flushes,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+transcript_writer = TranscriptWriter()
+on_shutdown(transcript_writer.aclose)
+atexit.register(transcript_writer.flush_sync)
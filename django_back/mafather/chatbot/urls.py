@@ -24,6 +24,7 @@ urlpatterns = [
     # 웹소켓 챗봇 API 엔드포인트 (세션 관리용)
     path('api/websocket/session/', views.create_websocket_session, name='create_websocket_session'),
     path('api/websocket/session/<str:session_id>/info/', views.get_websocket_session_info, name='get_websocket_session_info'),
+    path('api/websocket/metrics/', views.get_session_metrics, name='get_session_metrics'),
     
     # 테스트 페이지 (DB 불필요)
     path('test/', views.test_rag, name='test_rag'),
@@ -10,7 +10,9 @@ from django.utils.decorators import method_decorator
 from django.views import View
 from django.core.cache import cache
 from django.utils import timezone
-from .services import RAGChatbotService
+from .services import HISTORY_MESSAGES, get_chatbot_service
+from .session_index import add_user_session, get_user_sessions, remove_user_sessions
+from . import history_store
 
 # DB 사용하는 경우만 임포트 (오류 방지)
 try:
@@ -21,30 +23,20 @@ except Exception as e:
     DB_AVAILABLE = False
 
 
-def get_chat_history_from_cache(session_id: str) -> list:
-    """캐시에서 채팅 히스토리 가져오기"""
-    cache_key = f"chat_history_{session_id}"
-    history = cache.get(cache_key, [])
-    return history
+def get_chat_history_from_cache(session_id: str, limit: int = None) -> list:
+    """캐시에서 채팅 히스토리 가져오기 (limit이 있으면 최근 limit개만)"""
+    return history_store.recent(session_id, limit)
 
 
 def save_chat_history_to_cache(session_id: str, history: list):
-    """캐시에 채팅 히스토리 저장"""
-    cache_key = f"chat_history_{session_id}"
-    # 1시간 동안 유지
-    cache.set(cache_key, history, timeout=3600)
+    """캐시의 채팅 히스토리를 주어진 목록으로 교체 (1시간 동안 유지)"""
+    history_store.replace(session_id, [(msg['role'], msg['content']) for msg in history])
 
 
-def create_chatbot_with_history(session_id: str) -> RAGChatbotService:
-    """히스토리가 복원된 챗봇 서비스 생성"""
-    chatbot_service = RAGChatbotService()
-    
-    # 캐시에서 히스토리 가져와서 메모리에 설정
-    history = get_chat_history_from_cache(session_id)
-    if history:
-        chatbot_service.set_memory_from_history(history)
-    
-    return chatbot_service
+def chat_with_history(question: str, session_id: str) -> dict:
+    """캐시의 최근 히스토리와 함께 공유 챗봇 서비스로 응답 생성"""
+    history = get_chat_history_from_cache(session_id, limit=HISTORY_MESSAGES)
+    return get_chatbot_service().chat(question, history, session_id)
 
 
 class ChatbotView(View):
@@ -125,17 +117,19 @@ def create_websocket_session(request):
         session_id = str(uuid.uuid4())
         logger.info(f"Generated new session ID: {session_id}")
         
-        # 이전 세션 정리 (같은 사용자의 활성 세션)
+        # 이전 세션 정리 (같은 사용자의 활성 세션, 사용자별 세션 인덱스로 조회)
         if user_id:
-            all_sessions = cache.keys('websocket_session_*')
-            logger.info(f"Found {len(all_sessions)} existing sessions for user {user_id}")
-            for session_key in all_sessions:
-                session_data = cache.get(session_key)
-                if session_data and session_data.get('user_id') == user_id:
+            previous_ids = get_user_sessions(user_id)
+            logger.info(f"Found {len(previous_ids)} existing sessions for user {user_id}")
+            if previous_ids:
+                previous = cache.get_many([f"websocket_session_{sid}" for sid in previous_ids])
+                disconnected_at = timezone.now().isoformat()
+                for session_data in previous.values():
                     session_data['status'] = 'disconnected'
-                    session_data['disconnected_at'] = timezone.now().isoformat()
-                    cache.set(session_key, session_data, timeout=3600)
-                    logger.info(f"Marked session {session_key} as disconnected")
+                    session_data['disconnected_at'] = disconnected_at
+                cache.set_many(previous, timeout=3600)
+                remove_user_sessions(user_id, *previous_ids)
+                logger.info(f"Marked {len(previous)} sessions as disconnected")
         
         # 새 세션 메타데이터 생성
         session_metadata = {
@@ -163,9 +157,8 @@ def create_websocket_session(request):
                 
             logger.info(f"Successfully saved session metadata to cache with key: {cache_key}")
             
-            # 응답 전송 전에 잠시 대기 (캐시 동기화 시간 확보)
-            import time
-            time.sleep(0.1)
+            if user_id:
+                add_user_session(user_id, session_id)
             
             return JsonResponse({
                 'success': True,
@@ -210,14 +203,10 @@ def get_websocket_session_info(request, session_id):
                 'error': '세션을 찾을 수 없습니다.'
             }, status=404)
         
-        # 세션 히스토리 가져오기
-        history_key = f"chat_history_{session_id}"
-        chat_history = cache.get(history_key, [])
-        
         return JsonResponse({
             'success': True,
             'session_info': session_metadata,
-            'message_count': len(chat_history),
+            'message_count': history_store.count(session_id),
             'last_activity': session_metadata.get('created_at')
         })
         
@@ -228,6 +217,21 @@ def get_websocket_session_info(request, session_id):
         }, status=500)
 
 
+@require_http_methods(["GET"])
+async def get_session_metrics(request):
+    """웹소켓 상담 메모리 세션 지표 (살아 있는 세션 수, 대략적인 메모리 사용량)
+
+    컨슈머와 같은 이벤트 루프에서 읽도록 async 뷰로 둡니다.
+    """
+    from .chains import session_manager
+    from .transcript_writer import transcript_writer
+    return JsonResponse({
+        'success': True,
+        'sessions': session_manager.stats(),
+        'transcript_writer': transcript_writer.stats()
+    })
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def memory_chat_api(request):
@@ -247,21 +251,13 @@ def memory_chat_api(request):
         if not session_id:
             session_id = str(uuid.uuid4())
         
-        # 히스토리가 복원된 챗봇 서비스 생성
-        chatbot_service = create_chatbot_with_history(session_id)
-        
-        # AI 응답 생성
-        response = chatbot_service.chat(message_content, session_id)
+        # AI 응답 생성 (캐시 히스토리 사용)
+        response = chat_with_history(message_content, session_id)
         ai_response = response['answer']
         source_docs = response.get('source_documents', [])
         
-        # 현재 대화 히스토리 가져와서 새 메시지 추가
-        current_history = get_chat_history_from_cache(session_id)
-        current_history.append({"role": "user", "content": message_content})
-        current_history.append({"role": "assistant", "content": ai_response})
-        
-        # 캐시에 업데이트된 히스토리 저장
-        save_chat_history_to_cache(session_id, current_history)
+        # 새 메시지만 히스토리에 추가
+        history_store.append(session_id, ("user", message_content), ("assistant", ai_response))
         
         # 참고 문서 정보 생성
         sources = []
@@ -303,8 +299,7 @@ def clear_memory(request):
             }, status=400)
         
         # 캐시에서 해당 세션의 히스토리 삭제
-        cache_key = f"chat_history_{session_id}"
-        cache.delete(cache_key)
+        history_store.clear(session_id)
         
         return JsonResponse({
             'success': True,
@@ -425,9 +420,6 @@ def send_message(request):
             content=message_content
         )
         
-        # 히스토리가 복원된 챗봇 서비스 생성
-        chatbot_service = create_chatbot_with_history(str(session.id))
-        
         # 기존 대화 히스토리 로드 (DB에서)
         existing_messages = ChatMessage.objects.filter(
             session=session
@@ -440,12 +432,8 @@ def send_message(request):
                 "content": msg.content
             })
         
-        # 메모리에 히스토리 설정
-        if chat_history:
-            chatbot_service.set_memory_from_history(chat_history)
-        
-        # AI 응답 생성
-        response = chatbot_service.chat(message_content, str(session.id))
+        # AI 응답 생성 (DB 히스토리 사용)
+        response = get_chatbot_service().chat(message_content, chat_history, str(session.id))
         ai_response = response['answer']
         source_docs = response.get('source_documents', [])
         
@@ -549,8 +537,7 @@ def end_session(request, session_id):
         session.complete_session()
         
         # 캐시에서도 삭제
-        cache_key = f"chat_history_{session_id}"
-        cache.delete(cache_key)
+        history_store.clear(session_id)
         return JsonResponse({
             'success': True,
             'message': '세션이 종료되었습니다.',
@@ -577,8 +564,7 @@ def test_rag(request):
             test_session_id = "test_session"
             
             # RAG 테스트
-            chatbot_service = create_chatbot_with_history(test_session_id)
-            response = chatbot_service.chat(question)
+            response = chat_with_history(question, test_session_id)
             
             return render(request, 'chatbot/test.html', {
                 'question': question,
@@ -7,9 +7,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.session_id = str(uuid.uuid4())
         await self.accept()
+        session_manager.attach(self.session_id)
 
     async def disconnect(self, close_code):
         # 연결이 끊어질 때 세션 저장
+        session_manager.detach(self.session_id)
         await session_manager.save_session(self.session_id)
 
     async def receive(self, text_data):
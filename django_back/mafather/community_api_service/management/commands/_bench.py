@@ -0,0 +1,78 @@
+"""
+커뮤니티 벤치마크 / 부하 테스트 공용 도구
+
+벤치마크 명령은 설정된 DB에 전용 사용자 / 카테고리(이름이 BENCH_PREFIX로 시작)를 만들어 쓰고
+끝나면 cleanup()으로 그 사용자와 카테고리에 딸린 데이터를 모두 지웁니다.
+
+대량 INSERT / 삭제를 하므로 BenchCommand를 상속한 명령은 로컬 / 테스트 DB(SQLite, 이름이 test로 시작,
+호스트가 로컬)에서만 실행되고, 그 밖의 DB(운영 MySQL 등)는 --allow-remote-db를 줘야 실행됩니다.
+"""
+
+import uuid
+from typing import List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api_service.models import User
+from community_api_service.models import Category
+
+BENCH_PREFIX = "[bench]"
+LOCAL_HOSTS = {"", "localhost", "127.0.0.1", "::1"}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def create_bench_users(count: int) -> List[User]:
+    """벤치마크용 사용자 생성"""
+    run_id = uuid.uuid4().hex[:8]
+    users = [
+        User(email=f"bench-{run_id}-{i}@example.com", name=f"{BENCH_PREFIX} 사용자 {i}", auth_provider="google")
+        for i in range(count)
+    ]
+    User.objects.bulk_create(users)
+    return users
+
+
+def create_bench_category(post_type: str = "story") -> Category:
+    return Category.objects.create(name=f"{BENCH_PREFIX} 카테고리", post_type=post_type)
+
+
+def cleanup():
+    """벤치마크 사용자 / 카테고리와 연결된 게시물, 댓글, 좋아요 삭제 (CASCADE)"""
+    Category.objects.filter(name__startswith=BENCH_PREFIX).delete()
+    User.objects.filter(name__startswith=BENCH_PREFIX).delete()
+
+
+def is_local_database(alias: str = "default") -> bool:
+    """벤치마크 데이터를 만들어도 되는 DB인지 (SQLite / 이름이 test로 시작 / 로컬 호스트)"""
+    connection = connections[alias]
+    if connection.vendor == "sqlite":
+        return True
+    settings_dict = connection.settings_dict
+    return str(settings_dict.get("NAME") or "").startswith("test") or (settings_dict.get("HOST") or "") in LOCAL_HOSTS
+
+
+class BenchCommand(BaseCommand):
+    """설정된 DB에 벤치마크 데이터를 만드는 명령 (로컬 / 테스트 DB가 아니면 --allow-remote-db 필요)"""
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            "--allow-remote-db", action="store_true",
+            help="로컬 / 테스트 DB가 아니어도 실행 (운영 DB에 대량 데이터를 만들고 지우므로 주의)",
+        )
+        return parser
+
+    def execute(self, *args, **options):
+        if not options.get("allow_remote_db") and not is_local_database():
+            settings_dict = connections["default"].settings_dict
+            raise CommandError(
+                f"로컬 / 테스트 DB가 아닙니다 ({settings_dict.get('NAME')}@{settings_dict.get('HOST')}). "
+                "벤치마크 데이터를 만들고 지우므로 정말 이 DB에서 실행하려면 --allow-remote-db를 주세요."
+            )
+        return super().execute(*args, **options)
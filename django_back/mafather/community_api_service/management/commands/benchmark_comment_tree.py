@@ -0,0 +1,143 @@
+"""
+게시물 상세 댓글 트리 벤치마크 / 쿼리 수 회귀 점검
+
+댓글이 많은 게시물 하나를 만들고 게시물 조회 + PostDetailSerializer 직렬화를 두 방식으로 측정합니다.
+- 이전 방식: 최상위 댓글 조회 후 댓글마다 작성자 / 대댓글(과 대댓글 작성자)을 따로 조회 (N+1)
+- 트리 로더: Post.get_comment_tree가 삭제되지 않은 댓글 전체를 작성자와 함께 한 번에 가져와 트리 구성
+
+트리 로더의 쿼리 수가 댓글 수와 상관없이 일정한지(댓글 몇 개짜리 게시물과 같은지) 확인하고,
+늘어나면 CommandError로 종료합니다. 설정된 DB에 벤치마크 전용 데이터를 만들고 끝나면 지웁니다.
+
+사용법:
+    python manage.py benchmark_comment_tree --comments 3000 --reply-ratio 0.6
+"""
+
+import time
+import random
+import statistics
+from datetime import timedelta
+
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+
+from community_api_service.models import Comment, Post
+from community_api_service.serializers import CommentSerializer, PostDetailSerializer
+from community_api_service.views import PostDetailView
+from ._bench import BenchCommand, cleanup, create_bench_category, create_bench_users, percentile
+
+
+class LegacyCommentSerializer(CommentSerializer):
+    """이전 CommentSerializer.get_replies (댓글마다 대댓글 조회)"""
+
+    def get_replies(self, obj):
+        if obj.depth == 0:
+            replies = obj.replies.filter(deleted_at__isnull=True).order_by('created_at')
+            return LegacyCommentSerializer(replies, many=True, context=self.context).data
+        return []
+
+
+class LegacyPostDetailSerializer(PostDetailSerializer):
+    """이전 PostDetailSerializer.get_comments"""
+
+    def get_comments(self, obj):
+        top_level_comments = obj.comments.filter(
+            parent__isnull=True,
+            deleted_at__isnull=True
+        ).order_by('created_at')
+        return LegacyCommentSerializer(top_level_comments, many=True, context=self.context).data
+
+
+def legacy_detail(post_id):
+    post = Post.objects.select_related('user', 'category').prefetch_related(
+        'images', 'comments__user', 'comments__replies__user'
+    ).get(id=post_id, deleted_at__isnull=True)
+    return LegacyPostDetailSerializer(post).data
+
+
+def tree_detail(post_id):
+    post = PostDetailView().get_object(post_id)
+    return PostDetailSerializer(post).data
+
+
+class Command(BenchCommand):
+    help = "게시물 상세 댓글 N+1 조회 vs 한 번에 불러온 댓글 트리 (쿼리 수 / 지연 시간)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--comments", type=int, default=3000, help="게시물의 댓글 수 (대댓글 포함)")
+        parser.add_argument("--reply-ratio", type=float, default=0.6, help="대댓글 비율")
+        parser.add_argument("--users", type=int, default=50, help="댓글 작성자 수")
+        parser.add_argument("--repeat", type=int, default=5, help="방식별 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        cleanup()
+        try:
+            rng = random.Random(options["seed"])
+            users = create_bench_users(options["users"])
+            category = create_bench_category()
+            small = self._create_post(users, category, 10, options["reply_ratio"], rng)
+            large = self._create_post(users, category, options["comments"], options["reply_ratio"], rng)
+
+            if legacy_detail(large.pk)["comments"] != tree_detail(large.pk)["comments"]:
+                raise CommandError("트리 로더의 댓글 응답이 이전 방식과 다릅니다.")
+
+            for name, detail in (("이전 방식", legacy_detail), ("트리 로더", tree_detail)):
+                queries, latencies = self._measure(detail, large.pk, options["repeat"])
+                self.stdout.write(
+                    f"{name}: 쿼리 {queries}개 / p50 {statistics.median(latencies):.1f}ms / "
+                    f"max {percentile(latencies, 100):.1f}ms"
+                )
+
+            small_queries, _ = self._measure(tree_detail, small.pk, 1)
+            large_queries, _ = self._measure(tree_detail, large.pk, 1)
+            if large_queries != small_queries:
+                raise CommandError(
+                    f"트리 로더 쿼리 수가 댓글 수에 따라 늘어납니다: 댓글 10개 {small_queries}개 / "
+                    f"댓글 {options['comments']}개 {large_queries}개"
+                )
+            self.stdout.write(self.style.SUCCESS(f"트리 로더 쿼리 수 일정: {large_queries}개"))
+        finally:
+            cleanup()
+
+    def _create_post(self, users, category, count: int, reply_ratio: float, rng: random.Random) -> Post:
+        post = Post.objects.create(user=users[0], category=category, post_type="story", title="댓글 많은 게시물", content="내용")
+        created_at = timezone.now() - timedelta(days=1)
+        top_level, comments = [], []
+        for i in range(count):
+            comment = Comment(
+                post=post,
+                user=rng.choice(users),
+                content=f"댓글 {i}",
+                deleted_at=created_at if rng.random() < 0.05 else None,
+            )
+            if top_level and rng.random() < reply_ratio:
+                comment.parent = rng.choice(top_level)
+                comment.depth = 1
+            else:
+                top_level.append(comment)
+            comments.append(comment)
+        # bulk_create는 Comment.save(댓글 수 갱신)를 거치지 않으므로 작성 시간을 직접 지정하고 댓글 수는 한 번만 갱신
+        Comment.objects.bulk_create(comments, batch_size=1000)
+        for i, comment in enumerate(comments):
+            comment.created_at = created_at + timedelta(seconds=i)
+        Comment.objects.bulk_update(comments, ["created_at"], batch_size=1000)
+        post.update_comment_count()
+        return post
+
+    def _measure(self, detail, post_id, repeat: int):
+        # CaptureQueriesContext는 쿼리 로그가 9000개에서 잘려 N+1 쪽 쿼리 수를 셀 수 없으므로 직접 셈
+        executed = []
+
+        def count_queries(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        latencies = []
+        with connection.execute_wrapper(count_queries):
+            for _ in range(repeat):
+                executed.clear()
+                start = time.perf_counter()
+                detail(post_id)
+                latencies.append((time.perf_counter() - start) * 1000)
+        return len(executed), latencies
@@ -0,0 +1,135 @@
+"""
+게시물 목록 페이지네이션 벤치마크 (OFFSET vs 커서)
+
+게시물을 대량으로 만들고 PostListCreateView GET을 페이지 깊이별로 두 방식으로 측정합니다.
+- 페이지 번호: ?page=N (CustomPageNumberPagination, 매 요청 COUNT(*) + OFFSET 스캔)
+- 커서: ?cursor=<N번째 페이지 직전 커서> (PostFeedCursorPagination, WHERE (정렬 키) < 커서 LIMIT)
+
+측정 전에 두 방식의 앞쪽 페이지를 끝까지 따라가서 같은 게시물이 같은 순서로 나오는지 확인합니다.
+설정된 DB에 벤치마크 전용 데이터를 만들고 끝나면 지웁니다.
+
+사용법:
+    python manage.py benchmark_post_feed --posts 1000000 --depths 1,100,1000,10000,45000
+"""
+
+import time
+import random
+import statistics
+from datetime import timedelta
+
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from community_api_service.models import Post
+from community_api_service.pagination import FEED_ORDERING, encode_cursor
+from community_api_service.views import PostListCreateView
+from ._bench import BenchCommand, cleanup, create_bench_category, create_bench_users
+
+
+class Command(BenchCommand):
+    help = "게시물 목록 OFFSET 페이지네이션 vs 커서 페이지네이션 깊이별 지연 시간"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=100000, help="게시물 수")
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--depths", default="1,100,1000,10000,45000", help="측정할 페이지 번호 (쉼표 구분)")
+        parser.add_argument("--repeat", type=int, default=3, help="깊이별 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        cleanup()
+        category = None
+        try:
+            users = create_bench_users(20)
+            category = create_bench_category()
+            start = time.perf_counter()
+            self._create_posts(users, category, options["posts"], random.Random(options["seed"]))
+            self.stdout.write(f"게시물 {options['posts']}개 생성 ({time.perf_counter() - start:.1f}s)")
+
+            # 페이지 번호 방식은 next / previous 절대 URL을 만들므로 ALLOWED_HOSTS에 있는 호스트로 요청
+            self.factory = APIRequestFactory(SERVER_NAME="localhost")
+            self.view = PostListCreateView.as_view()
+            self.category_id = str(category.pk)
+            page_size = options["page_size"]
+            self._check_same_order(page_size)
+
+            queryset = Post.objects.filter(category=category, status="published", deleted_at__isnull=True)
+            total_pages = (queryset.count() + page_size - 1) // page_size
+            for depth in [int(depth) for depth in options["depths"].split(",")]:
+                if depth > total_pages:
+                    continue
+                offset_ms = self._time({"page": depth}, page_size, options["repeat"])
+                params = {"cursor": ""}
+                if depth > 1:
+                    last = queryset.order_by(*FEED_ORDERING)[(depth - 1) * page_size - 1]
+                    params["cursor"] = encode_cursor(last)
+                cursor_ms = self._time(params, page_size, options["repeat"])
+                self.stdout.write(f"{depth}페이지: 페이지 번호 {offset_ms:.1f}ms / 커서 {cursor_ms:.1f}ms")
+
+            estimate_ms = self._time({"cursor": "", "count": "estimate"}, page_size, options["repeat"])
+            self.stdout.write(f"커서 첫 페이지 + count=estimate: {estimate_ms:.1f}ms ({connection.vendor})")
+        finally:
+            if category is not None:
+                # 수십만 행을 ORM CASCADE로 지우면 느리므로 게시물은 직접 삭제
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DELETE FROM {Post._meta.db_table} WHERE category_id = %s", [str(category.pk)])
+            cleanup()
+
+    def _create_posts(self, users, category, count: int, rng: random.Random):
+        created_at = Post._meta.get_field("created_at")
+        now = timezone.now()
+        created_at.auto_now_add = False  # 작성 시간을 흩어 놓기 위해 잠시 끔
+        try:
+            batch = []
+            for i in range(count):
+                batch.append(Post(
+                    user=users[i % len(users)],
+                    category=category,
+                    post_type="story",
+                    title=f"게시물 {i}",
+                    content="내용",
+                    status="hidden" if rng.random() < 0.02 else "published",
+                    is_pinned=i < 10,
+                    # 같은 시간의 게시물도 생기도록 초 단위
+                    created_at=now - timedelta(seconds=rng.randrange(count * 10)),
+                ))
+                if len(batch) == 5000:
+                    Post.objects.bulk_create(batch)
+                    batch = []
+            Post.objects.bulk_create(batch)
+        finally:
+            created_at.auto_now_add = True
+        with connection.cursor() as cursor:
+            if connection.vendor in ("sqlite", "postgresql"):
+                cursor.execute(f"ANALYZE {Post._meta.db_table}")
+            elif connection.vendor == "mysql":
+                cursor.execute(f"ANALYZE TABLE {Post._meta.db_table}")
+
+    def _get(self, params, page_size: int):
+        query = {"categoryId": self.category_id, "limit": page_size, **params}
+        response = self.view(self.factory.get("/community/posts", query))
+        if response.status_code != 200:
+            raise CommandError(f"목록 조회 실패 {params}: {response.data}")
+        return response.data
+
+    def _time(self, params, page_size: int, repeat: int) -> float:
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            self._get(params, page_size)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return statistics.median(latencies)
+
+    def _check_same_order(self, page_size: int, pages: int = 5):
+        """앞쪽 pages개 페이지를 두 방식으로 따라가 결과 비교"""
+        by_offset, by_cursor = [], []
+        cursor = ""
+        for page in range(1, pages + 1):
+            by_offset += [post["id"] for post in self._get({"page": page}, page_size)["data"]]
+            data = self._get({"cursor": cursor}, page_size)
+            by_cursor += [post["id"] for post in data["data"]]
+            cursor = data["pagination"]["next_cursor"]
+        if by_offset != by_cursor:
+            raise CommandError("커서 페이지네이션 결과가 페이지 번호 방식과 다릅니다.")
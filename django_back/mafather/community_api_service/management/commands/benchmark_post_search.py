@@ -0,0 +1,151 @@
+"""
+게시물 검색 벤치마크 (icontains vs 전문 검색 인덱스)
+
+일반 단어 사이에 육아 주제어가 드문드문 섞인 게시물을 대량으로 만들고 PostListCreateView GET ?search=를 두 방식으로 측정합니다.
+- icontains: 이전 방식 (title / content 앞뒤 와일드카드 LIKE, 인덱스 없음)
+- 전문 검색: community_api_service.search.search_posts (MySQL FULLTEXT ngram, 관련도순)
+
+전문 검색 인덱스는 MySQL에만 있으므로 MySQL에서만 실행합니다 (다른 DB에서는 두 방식 모두 icontains라 비교할 것이 없음).
+검색어마다 EXPLAIN으로 posts 조회가 FULLTEXT 인덱스(type=fulltext)를 쓰는지 확인하고,
+인덱스로 찾는 한 단어 검색은 두 방식의 결과 게시물 집합이 같은지 확인합니다.
+설정된 DB에 벤치마크 전용 데이터를 만들고 끝나면 지웁니다.
+
+사용법:
+    python manage.py benchmark_post_search --posts 100000
+"""
+
+import time
+import random
+import statistics
+
+from django.core.management.base import CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from community_api_service import views
+from community_api_service.models import Post
+from community_api_service.search import (
+    FULLTEXT_INDEX, search_index_available, search_log_writer, search_posts, search_terms, _icontains,
+)
+from ._bench import BenchCommand, cleanup, create_bench_category, create_bench_users
+
+WORDS = [
+    "아기", "신생아", "이유식", "분유", "모유수유", "수면교육", "밤잠", "낮잠", "예방접종", "발열",
+    "기저귀", "뒤집기", "배밀이", "걸음마", "옹알이", "젖병", "트림", "영양제", "어린이집", "분리불안",
+    "장난감", "그림책", "목욕", "피부", "아토피", "변비", "설사", "감기", "콧물", "기침",
+    "체중", "키", "성장", "발달", "언어", "놀이", "훈육", "떼쓰기", "엄마", "아빠",
+]
+QUERIES = ["이유식", "수면교육", "예방접종 발열", "아토피 피부 목욕", "분리불안"]
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후기니디리미비시이지치키티피히"
+
+
+def filler_words(rng: random.Random, count: int):
+    """주제어와 겹치지 않는 두세 글자 일반 단어"""
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))))
+    return sorted(words - set(WORDS))
+
+
+def icontains_search(queryset, query):
+    """이전 검색 (검색어 전체를 한 번에 icontains)"""
+    return _icontains(queryset, [query]), False
+
+
+class Command(BenchCommand):
+    help = "게시물 검색 icontains vs 전문 검색 인덱스 지연 시간"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=100000, help="게시물 수")
+        parser.add_argument("--repeat", type=int, default=5, help="검색어별 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "mysql":
+            raise CommandError(f"전문 검색 인덱스는 MySQL에만 있습니다 (현재 DB: {connection.vendor}).")
+        if not search_index_available():
+            raise CommandError(f"{FULLTEXT_INDEX} 인덱스가 없습니다. migrate를 먼저 실행하세요.")
+        cleanup()
+        category = None
+        try:
+            users = create_bench_users(20)
+            category = create_bench_category()
+            start = time.perf_counter()
+            self._create_posts(users, category, options["posts"], random.Random(options["seed"]))
+            self.stdout.write(f"게시물 {options['posts']}개 생성 ({time.perf_counter() - start:.1f}s)")
+
+            queryset = Post.objects.filter(category=category, deleted_at__isnull=True, status="published")
+            for query in QUERIES:
+                indexed, ranked = search_posts(queryset, query)
+                self._check_plan(indexed, query)
+                if len(search_terms(query)) == 1:
+                    if ranked and set(indexed.values_list("id", flat=True)) != set(
+                            icontains_search(queryset, query)[0].values_list("id", flat=True)):
+                        raise CommandError(f"'{query}' 검색 결과가 icontains와 다릅니다.")
+
+            self.factory = APIRequestFactory(SERVER_NAME="localhost")
+            self.view = views.PostListCreateView.as_view()
+            self.category_id = str(category.pk)
+            original = views.search_posts
+            for query in QUERIES:
+                results = {}
+                for name, search in (("icontains", icontains_search), ("전문 검색", search_posts)):
+                    views.search_posts = search
+                    try:
+                        results[name] = self._time(query, options["repeat"])
+                    finally:
+                        views.search_posts = original
+                self.stdout.write(
+                    f"'{query}': 결과 {results['icontains'][1]}개 / icontains {results['icontains'][0]:.1f}ms / "
+                    f"전문 검색 {results['전문 검색'][0]:.1f}ms (결과 {results['전문 검색'][1]}개)"
+                )
+            search_log_writer.flush()
+            self.stdout.write(f"검색 로그: {search_log_writer.stats()} ({connection.vendor})")
+        finally:
+            if category is not None:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DELETE FROM {Post._meta.db_table} WHERE category_id = %s", [str(category.pk)])
+            cleanup()
+
+    def _create_posts(self, users, category, count: int, rng: random.Random):
+        # 게시물마다 일반 단어 20~80개 + 주제어 1~3개 (주제어 하나가 게시물의 몇 % 정도에만 나오도록)
+        filler = filler_words(rng, 20000)
+        batch = []
+        for i in range(count):
+            topics = rng.sample(WORDS, rng.randint(1, 3))
+            words = [rng.choice(filler) for _ in range(rng.randint(20, 80))] + topics[1:]
+            rng.shuffle(words)
+            batch.append(Post(
+                user=users[i % len(users)],
+                category=category,
+                post_type="question",
+                title=f"{topics[0]} {rng.choice(filler)} 질문입니다",
+                content=" ".join(words),
+            ))
+            if len(batch) == 5000:
+                Post.objects.bulk_create(batch)
+                batch = []
+        Post.objects.bulk_create(batch)
+
+    def _check_plan(self, queryset, query: str):
+        """EXPLAIN에서 posts 조회가 FULLTEXT 인덱스를 쓰는지 확인"""
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0] for column in cursor.description]
+            plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        table = Post._meta.db_table
+        if not any(row["table"] == table and row["type"] == "fulltext" and row["key"] == FULLTEXT_INDEX for row in plan):
+            raise CommandError(f"'{query}' 검색이 {FULLTEXT_INDEX} 인덱스를 쓰지 않습니다: {plan}")
+
+    def _time(self, query: str, repeat: int):
+        latencies = []
+        count = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = self.view(self.factory.get("/community/posts", {"categoryId": self.category_id, "search": query}))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"'{query}' 검색 실패: {response.data}")
+            count = response.data["pagination"]["count"]
+        return statistics.median(latencies), count
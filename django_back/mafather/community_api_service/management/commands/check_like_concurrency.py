@@ -0,0 +1,122 @@
+"""
+좋아요 토글 동시성 점검
+
+여러 스레드가 같은 게시물 / 댓글에 동시에 Like.toggle을 호출한 뒤 확인합니다.
+- 사용자별: 성공한 토글 횟수가 홀수면 좋아요 행이 있고, 짝수면 없음
+- 대상별: 비정규화된 like_count == 실제 Like 행 수
+- 같은 사용자가 동시에 토글하는 단계에서도 like_count == Like 행 수 (중복 INSERT는 고유 키로 막힘)
+
+DB 잠금 등으로 실패한 토글은 트랜잭션이 롤백되므로 횟수에서 제외합니다.
+하나라도 어긋나면 CommandError로 종료합니다. 설정된 DB에 벤치마크 전용 데이터를 만들고 끝나면 지웁니다.
+
+사용법:
+    python manage.py check_like_concurrency --users 20 --toggles 25 --threads 16
+"""
+
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import CommandError
+from django.db import close_old_connections, connection
+from django.test.utils import CaptureQueriesContext
+
+from community_api_service.models import Comment, Like, Post
+from ._bench import BenchCommand, cleanup, create_bench_category, create_bench_users
+
+DATA_STATEMENTS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+class Command(BenchCommand):
+    help = "동시 좋아요 토글 후 like_count가 Like 행 수와 정확히 같은지 점검"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="토글하는 사용자 수")
+        parser.add_argument("--toggles", type=int, default=25, help="사용자별 대상당 토글 횟수")
+        parser.add_argument("--threads", type=int, default=16, help="동시 스레드 수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        cleanup()
+        try:
+            failures = self._check(options)
+        finally:
+            cleanup()
+        if failures:
+            raise CommandError(f"좋아요 수 불일치 {failures}건")
+        self.stdout.write(self.style.SUCCESS("좋아요 수 불일치 0건"))
+
+    def _check(self, options) -> int:
+        users = create_bench_users(options["users"])
+        category = create_bench_category()
+        post = Post.objects.create(user=users[0], category=category, post_type="story", title="좋아요 점검", content="내용")
+        comment = Comment.objects.create(user=users[0], post=post, content="댓글")
+        targets = [(post.pk, "post"), (comment.pk, "comment")]
+
+        # 토글 한 번의 쿼리 수 (BEGIN / SAVEPOINT / COMMIT 제외)
+        counts = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                Like.toggle(users[0], post.pk, "post")
+            counts.append(sum(1 for query in queries.captured_queries if query["sql"].split()[0] in DATA_STATEMENTS))
+        self.stdout.write(f"토글 1회 쿼리 수: 추가 {counts[0]}개 / 취소 {counts[1]}개")
+
+        # 1단계: 사용자마다 순서대로 토글, 사용자끼리는 동시에
+        rng = random.Random(options["seed"])
+        jobs = [(user, targets[rng.randrange(2)]) for user in users for _ in range(options["toggles"] * 2)]
+        rng.shuffle(jobs)
+        by_user = {}
+        for user, target in jobs:
+            by_user.setdefault(user.pk, (user, []))[1].append(target)
+        succeeded = Counter()
+        errors = Counter()
+
+        def run_user(item):
+            user, user_targets = item
+            for target_id, target_type in user_targets:
+                try:
+                    Like.toggle(user, target_id, target_type)
+                    succeeded[(user.pk, target_id)] += 1
+                except Exception as e:
+                    errors[type(e).__name__] += 1
+            close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            list(executor.map(run_user, by_user.values()))
+
+        failures = 0
+        liked = set(Like.objects.filter(target_id__in=[post.pk, comment.pk]).values_list("user_id", "target_id"))
+        for user in users:
+            for target_id, _ in targets:
+                expected = succeeded[(user.pk, target_id)] % 2 == 1
+                if ((user.pk, target_id) in liked) != expected:
+                    failures += 1
+        failures += self._report("1단계 (사용자별 순차, 사용자 간 동시)", targets, errors)
+
+        # 2단계: 같은 사용자가 같은 대상을 동시에 토글
+        errors = Counter()
+
+        def run_same_user(target):
+            try:
+                Like.toggle(users[0], *target)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+            close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            list(executor.map(run_same_user, [targets[i % 2] for i in range(options["toggles"] * options["threads"])]))
+        failures += self._report("2단계 (같은 사용자 동시)", targets, errors)
+        return failures
+
+    def _report(self, name, targets, errors) -> int:
+        failures = 0
+        for target_id, target_type in targets:
+            model = Like.target_model(target_type)
+            stored = model.objects.values_list("like_count", flat=True).get(pk=target_id)
+            actual = Like.objects.filter(target_id=target_id, target_type=target_type).count()
+            if stored != actual:
+                failures += 1
+            self.stdout.write(f"{name} {target_type}: like_count {stored} / Like 행 {actual}")
+        if errors:
+            self.stdout.write(f"{name} 실패한 토글 (롤백됨): {dict(errors)}")
+        return failures
@@ -0,0 +1,88 @@
+"""
+게시물 조회수 카운터 부하 테스트 (인기 게시물 동시 조회)
+
+소수의 인기 게시물에 여러 스레드가 동시에 PostDetailView GET을 보내고 두 방식을 비교합니다.
+- 이전 방식: 조회마다 view_count += 1; save() (행을 읽고-더하고-저장, 동시 조회끼리 증가분이 사라짐)
+- write-behind: community_api_service.view_counter에 모았다가 UPDATE ... view_count = view_count + n
+
+처리량 / 지연 시간과 함께, 끝난 뒤 DB의 view_count 합계를 실제 조회 수와 비교해 사라진 조회수를 출력합니다.
+설정된 DB에 벤치마크 전용 데이터를 만들고 끝나면 지웁니다.
+
+사용법:
+    python manage.py loadtest_view_counter --posts 5 --threads 16 --requests 2000
+"""
+
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+from rest_framework.test import APIRequestFactory
+
+from community_api_service.models import Post
+from community_api_service.view_counter import view_counter
+from community_api_service.views import PostDetailView
+from ._bench import BenchCommand, cleanup, create_bench_category, create_bench_users, percentile
+
+
+def legacy_increment_view_count(self):
+    """이전 Post.increment_view_count (읽고-더하고-저장)"""
+    self.view_count += 1
+    self.save(update_fields=['view_count'])
+
+
+class Command(BenchCommand):
+    help = "조회마다 저장 vs write-behind 조회수 카운터 처리량 / 유실 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=5, help="인기 게시물 수")
+        parser.add_argument("--threads", type=int, default=16, help="동시 요청 스레드 수")
+        parser.add_argument("--requests", type=int, default=2000, help="방식별 총 요청 수")
+
+    def handle(self, *args, **options):
+        cleanup()
+        try:
+            user = create_bench_users(1)[0]
+            category = create_bench_category()
+            variants = [("조회마다 저장", legacy_increment_view_count), ("write-behind", Post.increment_view_count)]
+            for name, increment in variants:
+                posts = Post.objects.bulk_create([
+                    Post(user=user, category=category, post_type="story", title=f"인기 게시물 {i}", content="내용")
+                    for i in range(options["posts"])
+                ])
+                original = Post.increment_view_count
+                Post.increment_view_count = increment
+                try:
+                    latencies, elapsed, errors = self._run(posts, options["threads"], options["requests"])
+                finally:
+                    Post.increment_view_count = original
+                view_counter.flush()
+
+                stored = sum(Post.objects.filter(pk__in=[post.pk for post in posts]).values_list("view_count", flat=True))
+                served = options["requests"] - errors
+                self.stdout.write(
+                    f"{name}: {options['requests'] / elapsed:.0f} req/s / p50 {statistics.median(latencies):.2f}ms / "
+                    f"p99 {percentile(latencies, 99):.2f}ms / 오류 {errors}개 / "
+                    f"DB 조회수 {stored} (응답 {served}개, 유실 {served - stored}개)"
+                )
+            self.stdout.write(f"view_counter: {view_counter.stats()}")
+        finally:
+            cleanup()
+
+    def _run(self, posts, threads: int, total: int):
+        factory = APIRequestFactory()
+        view = PostDetailView.as_view()
+
+        def timed(i):
+            post = posts[i % len(posts)]
+            start = time.perf_counter()
+            response = view(factory.get(f"/community/posts/{post.pk}"), post_id=post.pk)
+            latency = (time.perf_counter() - start) * 1000
+            close_old_connections()
+            return latency, response.status_code != 200
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(timed, range(total)))
+        elapsed = time.perf_counter() - start
+        return [latency for latency, _ in results], elapsed, sum(failed for _, failed in results)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.2 on 2026-10-17 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("community_api_service", "0004_alter_post_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["status", "is_pinned", "created_at", "id"],
+                name="posts_feed_keyset_idx",
+            ),
+        ),
+    ]
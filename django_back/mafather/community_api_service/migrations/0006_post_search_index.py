@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-17 18:05
+
+from django.db import migrations
+
+# MySQL: 한국어도 검색되도록 ngram 파서를 쓰는 FULLTEXT 인덱스
+# (SQLite 개발 환경은 인덱스 없이 icontains 검색을 씀 - community_api_service/search.py)
+MYSQL_CREATE = "ALTER TABLE posts ADD FULLTEXT INDEX posts_title_content_ft (title, content) WITH PARSER ngram"
+MYSQL_DROP = "ALTER TABLE posts DROP INDEX posts_title_content_ft"
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(MYSQL_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(MYSQL_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("community_api_service", "0005_post_feed_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
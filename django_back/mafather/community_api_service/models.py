@@ -1,5 +1,6 @@
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.utils import timezone
 from api_service.models import User
 
@@ -81,6 +82,8 @@ class Post(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
             models.Index(fields=['is_pinned']),
+            # 게시물 목록 커서 페이지네이션 (status 필터 + -is_pinned, -created_at, -id 정렬)
+            models.Index(fields=['status', 'is_pinned', 'created_at', 'id'], name='posts_feed_keyset_idx'),
         ]
         permissions = [
             ('can_manage_posts', '게시물 관리 권한'),
@@ -96,9 +99,32 @@ class Post(models.Model):
         self.save()
 
     def increment_view_count(self):
-        """조회수 증가"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """조회수 증가 (view_counter에 모았다가 일괄 반영, 이 객체에는 반영 전 증가분까지 더해 둠)"""
+        from community_api_service.view_counter import view_counter
+        view_counter.increment(self.pk)
+        view_counter.apply_pending([self])
+
+    def get_comment_tree(self):
+        """삭제되지 않은 댓글을 한 번의 쿼리(작성자 포함)로 가져와 트리로 구성
+
+        최상위 댓글 목록을 반환하고, 각 최상위 댓글의 tree_replies에 대댓글을 작성 순으로 담습니다.
+        (CommentSerializer가 tree_replies가 있으면 대댓글을 다시 조회하지 않음)
+        """
+        comments = list(
+            Comment.objects.filter(post_id=self.pk, deleted_at__isnull=True)
+            .select_related('user')
+            .order_by('created_at')
+        )
+        top_level = {}
+        for comment in comments:
+            if comment.parent_id is None:
+                comment.tree_replies = []
+                top_level[comment.pk] = comment
+        for comment in comments:
+            parent = top_level.get(comment.parent_id)
+            if parent is not None:
+                parent.tree_replies.append(comment)
+        return list(top_level.values())
 
     def update_comment_count(self):
         """댓글 수 업데이트"""
@@ -106,8 +132,8 @@ class Post(models.Model):
         self.save(update_fields=['comment_count'])
 
     def update_like_count(self):
-        """좋아요 수 업데이트"""
-        self.like_count = self.likes.count()
+        """좋아요 수 재계산 (Like 행 수로 비정규화된 like_count 복구)"""
+        self.like_count = Like.objects.filter(target_id=self.pk, target_type='post').count()
         self.save(update_fields=['like_count'])
 
 
@@ -164,9 +190,9 @@ class Comment(models.Model):
             self.post.update_comment_count()
 
     def update_like_count(self):
-        """좋아요 수 업데이트"""
-        self.like_count = self.likes.count()
-        self.save(update_fields=['like_count'])
+        """좋아요 수 재계산 (Like 행 수로 비정규화된 like_count 복구)"""
+        self.like_count = Like.objects.filter(target_id=self.pk, target_type='comment').count()
+        Comment.objects.filter(pk=self.pk).update(like_count=self.like_count)
 
 
 class PostImage(models.Model):
@@ -237,16 +263,54 @@ class Like(models.Model):
                 return None
         return None
 
+    @staticmethod
+    def target_model(target_type):
+        return {'post': Post, 'comment': Comment}[target_type]
+
+    @classmethod
+    def adjust_like_count(cls, target_id, target_type, delta):
+        """대상의 like_count를 UPDATE ... like_count = like_count + delta로 조정 (대상이 없으면 DoesNotExist)"""
+        model = cls.target_model(target_type)
+        if not model.objects.filter(pk=target_id).update(like_count=F('like_count') + delta):
+            raise model.DoesNotExist(f"{target_type} {target_id}")
+
+    @classmethod
+    def toggle(cls, user, target_id, target_type):
+        """좋아요 토글 → (is_liked, like_count)
+
+        한 트랜잭션 안에서 고유 키(user, target_id, target_type)로 DELETE를 먼저 시도하고,
+        지운 행이 없으면 INSERT합니다. 대상의 like_count는 F 표현식으로 ±1 하므로 동시 토글에도 정확합니다.
+        같은 사용자의 동시 INSERT가 고유 키에 걸리면 이미 좋아요된 상태로 봅니다.
+        """
+        model = cls.target_model(target_type)
+        with transaction.atomic():
+            deleted, _ = cls.objects.filter(user=user, target_id=target_id, target_type=target_type).delete()
+            if deleted:
+                cls.adjust_like_count(target_id, target_type, -1)
+                is_liked = False
+            else:
+                try:
+                    with transaction.atomic():
+                        cls(user=user, target_id=target_id, target_type=target_type).save()
+                except IntegrityError:
+                    pass
+                is_liked = True
+            like_count = model.objects.values_list('like_count', flat=True).get(pk=target_id)
+        return is_liked, like_count
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # 좋아요 생성 시 대상 객체의 좋아요 수 업데이트
-        target_obj = self.target_object
-        if target_obj and hasattr(target_obj, 'update_like_count'):
-            target_obj.update_like_count()
+        # 좋아요 생성 시 대상 객체의 좋아요 수를 같은 트랜잭션에서 +1
+        adding = self._state.adding
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if adding:
+                self.adjust_like_count(self.target_id, self.target_type, 1)
 
     def delete(self, *args, **kwargs):
-        target_obj = self.target_object
-        super().delete(*args, **kwargs)
-        # 좋아요 삭제 시 대상 객체의 좋아요 수 업데이트
-        if target_obj and hasattr(target_obj, 'update_like_count'):
-            target_obj.update_like_count()
+        # 좋아요 삭제 시 대상 객체의 좋아요 수를 같은 트랜잭션에서 -1
+        with transaction.atomic(savepoint=False):
+            result = super().delete(*args, **kwargs)
+            # 다른 요청이 이미 지운 행이면 (삭제된 행 0개) 좋아요 수를 건드리지 않음
+            if result[0]:
+                self.adjust_like_count(self.target_id, self.target_type, -1)
+        return result
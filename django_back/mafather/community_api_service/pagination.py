@@ -0,0 +1,124 @@
+"""
+게시물 목록 커서(keyset) 페이지네이션
+
+CustomPageNumberPagination은 페이지마다 COUNT(*)와 OFFSET 스캔을 하므로 뒤쪽 페이지일수록 느려집니다.
+커서 방식은 정렬 키 (is_pinned, created_at, id)의 마지막 값을 불투명한 커서로 넘기고
+다음 페이지를 WHERE (정렬 키) < (커서) ... LIMIT n으로 가져오므로 깊이와 상관없이 일정합니다.
+- 정렬: -is_pinned, -created_at, -id (id로 같은 시간의 게시물 순서를 고정)
+- 인덱스: posts (status, is_pinned, created_at, id)
+- 전체 개수는 기본으로 세지 않고, count=estimate면 실행 계획의 예상 행 수(MySQL / PostgreSQL),
+  count=exact면 COUNT(*)
+
+    GET /community/posts?cursor=            첫 페이지
+    GET /community/posts?cursor=<next_cursor>&count=estimate
+"""
+
+import json
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from django.db import connections
+from django.db.models import Q
+
+from api_service.utils import StandardResponse
+from community_api_service.models import Post
+
+FEED_ORDERING = ['-is_pinned', '-created_at', '-id']
+
+
+class InvalidCursor(ValueError):
+    """잘못된 커서 문자열"""
+
+
+def encode_cursor(post: Post) -> str:
+    data = json.dumps([int(post.is_pinned), post.created_at.isoformat(), post.id.hex], separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        is_pinned, created_at, post_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return bool(is_pinned), datetime.fromisoformat(created_at), uuid.UUID(post_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursor(str(e))
+
+
+def after_cursor(is_pinned: bool, created_at: datetime, post_id: uuid.UUID) -> Q:
+    """(is_pinned, created_at, id) 내림차순에서 커서 다음에 오는 행 조건"""
+    # 인덱스 (status, is_pinned, created_at, id)로 범위 탐색이 되도록
+    # - is_pinned는 __in으로 비교 (SQLite는 is_pinned=False를 "NOT is_pinned"로 만들어 인덱스 등호 조건이 안 됨)
+    # - created_at <= 커서를 OR 밖에 따로 둠
+    same_pin_after = Q(is_pinned__in=[is_pinned], created_at__lte=created_at) & (
+        Q(created_at__lt=created_at) | Q(id__lt=post_id)
+    )
+    if is_pinned:
+        # 고정 게시물 다음에는 고정되지 않은 게시물 전체가 옴
+        return same_pin_after | Q(is_pinned=False)
+    return same_pin_after
+
+
+def estimate_count(queryset) -> Optional[int]:
+    """실행 계획의 예상 행 수 (지원하지 않는 DB면 None)"""
+    connection = connections[queryset.db]
+    sql, params = queryset.values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0] for column in cursor.description]
+            return int(cursor.fetchone()[columns.index('rows')])
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+    return None
+
+
+class PostFeedCursorPagination:
+    """게시물 목록 커서 페이지네이션 (CustomPageNumberPagination과 같은 StandardResponse 형식)"""
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def __init__(self):
+        self.page: List[Post] = []
+        self.has_next = False
+        self.count = None
+        self.count_is_estimate = False
+
+    def paginate_queryset(self, queryset, request) -> List[Post]:
+        """queryset은 필터만 적용된 상태로 넘김 (정렬은 여기서 FEED_ORDERING으로 고정)"""
+        cursor = request.GET.get(self.cursor_query_param)
+        count_mode = request.GET.get(self.count_query_param)
+
+        if count_mode == 'estimate':
+            self.count = estimate_count(queryset)
+            self.count_is_estimate = self.count is not None
+        if count_mode == 'exact' or (count_mode == 'estimate' and self.count is None):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*FEED_ORDERING)
+        if cursor:
+            queryset = queryset.filter(after_cursor(*decode_cursor(cursor)))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        pagination_info = {
+            'page_size': self.page_size,
+            'has_next': self.has_next,
+            'next_cursor': encode_cursor(self.page[-1]) if self.has_next else None,
+        }
+        if self.count is not None:
+            pagination_info['count'] = self.count
+            pagination_info['count_is_estimate'] = self.count_is_estimate
+        return StandardResponse.paginated_success(data=data, pagination_info=pagination_info)
@@ -0,0 +1,180 @@
+"""
+게시물 전문 검색
+
+게시물 목록 검색(title / content)을 앞뒤 와일드카드 LIKE(icontains) 대신 DB의 전문 검색 인덱스로 처리하고
+관련도 순으로 정렬합니다. 인덱스는 migrations/0006_post_search_index.py에서 만듭니다.
+- MySQL(운영): FULLTEXT (title, content) WITH PARSER ngram, WHERE 절에 MATCH ... AGAINST (BOOLEAN MODE)를
+  그대로 두어 FULLTEXT 인덱스로 찾고 같은 식을 relevance로 정렬 (ngram_token_size 기본 2 → 두 글자 한국어 단어도 검색됨)
+- 그 외 DB(SQLite 개발 환경 등) / 인덱스가 없으면 기존 icontains
+검색어는 공백으로 나눈 단어를 모두 포함(AND)하는 게시물을 찾고, 인덱스 토큰보다 짧은 단어는 icontains로 거릅니다.
+
+검색 로그(api_service.SearchLog)는 요청 안에서 저장하지 않고 search_log_writer가 모아서 한 번에 저장합니다.
+
+    queryset, ranked = search_posts(queryset, "이유식 거부")
+    search_log_writer.log(request, "이유식 거부", results_count)
+
+환경 변수:
+    SEARCH_LOG_FLUSH_INTERVAL_SECONDS  검색 로그를 모으는 시간(초) (기본 2)
+    SEARCH_LOG_FLUSH_MAX_ENTRIES       이만큼 쌓이면 주기를 기다리지 않고 바로 저장 (기본 200)
+"""
+
+import os
+import re
+import atexit
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from api_service.models import SearchLog
+from api_service.utils import get_client_ip, get_user_agent
+from mafather.lifespan import on_shutdown
+from community_api_service.models import Post
+
+logger = logging.getLogger(__name__)
+
+FULLTEXT_INDEX = 'posts_title_content_ft'
+# 인덱스로 찾을 수 있는 최소 단어 길이 (MySQL ngram_token_size)
+MIN_TERM_LENGTH = 2
+MAX_TERMS = 10
+# MySQL BOOLEAN MODE 쿼리 문법 문자
+_SPECIAL_CHARS = re.compile(r'[+\-<>()~*"@\'^:{}\[\]]')
+
+SEARCH_LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("SEARCH_LOG_FLUSH_INTERVAL_SECONDS", "2"))
+SEARCH_LOG_FLUSH_MAX_ENTRIES = int(os.getenv("SEARCH_LOG_FLUSH_MAX_ENTRIES", "200"))
+
+_index_available: Dict[str, bool] = {}
+
+
+def search_terms(query: str) -> List[str]:
+    """검색어를 단어 목록으로 (문법 문자 제거, 중복 제거)"""
+    terms = []
+    for term in _SPECIAL_CHARS.sub(' ', query).split():
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def search_index_available(alias: str = 'default') -> bool:
+    """전문 검색 인덱스가 있는지 (DB 별칭마다 한 번만 확인)"""
+    if alias not in _index_available:
+        connection = connections[alias]
+        available = False
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1",
+                    [Post._meta.db_table, FULLTEXT_INDEX]
+                )
+                available = cursor.fetchone() is not None
+        _index_available[alias] = available
+    return _index_available[alias]
+
+
+def _icontains(queryset, terms: List[str]):
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
+    return queryset
+
+
+def search_posts(queryset, query: str) -> Tuple[object, bool]:
+    """검색 조건을 적용한 queryset과 관련도(relevance) 주석 여부를 반환"""
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none(), False
+
+    if not search_index_available(queryset.db):
+        return _icontains(queryset, terms), False
+
+    indexed = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    queryset = _icontains(queryset, [term for term in terms if len(term) < MIN_TERM_LENGTH])
+    if not indexed:
+        return queryset, False
+
+    # relevance > 0 같은 비교식 대신 MATCH를 WHERE 절에 그대로 두어야 FULLTEXT 인덱스 검색(type=fulltext)이 됨
+    table = Post._meta.db_table
+    match = f"MATCH ({table}.title, {table}.content) AGAINST (%s IN BOOLEAN MODE)"
+    against = ' '.join(f'+"{term}"' for term in indexed)
+    queryset = queryset.extra(where=[match], params=[against])
+    return queryset.annotate(relevance=RawSQL(match, [against])), True
+
+
+class SearchLogWriter:
+    """검색 로그 대기열 + 주기적 bulk_create (로그 저장 실패는 기록만 하고 버림)"""
+
+    def __init__(self, flush_interval: float = SEARCH_LOG_FLUSH_INTERVAL_SECONDS,
+                 max_entries: int = SEARCH_LOG_FLUSH_MAX_ENTRIES):
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self._pending: List[SearchLog] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+
+    def log(self, request, query: str, results_count: int, search_type: str = 'posts'):
+        """검색 로그 추가 (DB 저장은 flusher 스레드에서)"""
+        user = getattr(request, 'user', None)
+        entry = SearchLog(
+            user=user if user is not None and user.is_authenticated else None,
+            query=query[:255],
+            search_type=search_type,
+            results_count=results_count,
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request),
+        )
+        with self._lock:
+            self._pending.append(entry)
+            full = len(self._pending) >= self.max_entries
+        self._ensure_flusher()
+        if full:
+            self._wakeup.set()
+
+    def _ensure_flusher(self):
+        if self._flusher is None or not self._flusher.is_alive():
+            with self._lock:
+                if self._flusher is None or not self._flusher.is_alive():
+                    self._flusher = threading.Thread(target=self._flush_forever, name="search-log", daemon=True)
+                    self._flusher.start()
+
+    def _flush_forever(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if not entries:
+                return
+            try:
+                SearchLog.objects.bulk_create(entries, batch_size=self.max_entries)
+                self.written += len(entries)
+            except Exception as e:
+                self.dropped += len(entries)
+                logger.error(f"검색 로그 저장 중 오류 발생 ({len(entries)}개): {str(e)}")
+
+    async def aclose(self):
+        """남은 로그 저장 (서버 종료 시 mafather.lifespan에서 호출)"""
+        await sync_to_async(self.flush)()
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": len(self._pending), "written": self.written, "dropped": self.dropped}
+
+
+search_log_writer = SearchLogWriter()
+on_shutdown(search_log_writer.aclose)
+atexit.register(search_log_writer.flush)
@@ -35,7 +35,10 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_replies(self, obj):
         """대댓글 조회"""
         if obj.depth == 0:  # 최상위 댓글만 대댓글 포함
-            replies = obj.replies.filter(deleted_at__isnull=True).order_by('created_at')
+            # Post.get_comment_tree로 미리 구성된 대댓글이 있으면 그대로 사용
+            replies = getattr(obj, 'tree_replies', None)
+            if replies is None:
+                replies = obj.replies.filter(deleted_at__isnull=True).select_related('user').order_by('created_at')
             return CommentSerializer(replies, many=True, context=self.context).data
         return []
 
@@ -69,11 +72,8 @@ class PostDetailSerializer(PostSerializer):
     
     def get_comments(self, obj):
         """댓글 목록 조회 (트리 구조)"""
-        # 최상위 댓글만 가져오기 (대댓글은 replies에서 처리)
-        top_level_comments = obj.comments.filter(
-            parent__isnull=True,
-            deleted_at__isnull=True
-        ).order_by('created_at')
+        # 댓글 전체를 한 번에 가져와 트리 구성 (최상위 댓글의 대댓글은 tree_replies)
+        top_level_comments = obj.get_comment_tree()
         
         return CommentSerializer(top_level_comments, many=True, context=self.context).data
 
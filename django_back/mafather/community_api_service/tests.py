@@ -1,3 +1,336 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from django.db import IntegrityError, OperationalError, close_old_connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_service.models import User
+from chatbot.redis_standin import ThreadedRedisStandin
+from community_api_service.models import Category, Comment, Like, Post
+from community_api_service.pagination import InvalidCursor, decode_cursor, encode_cursor
+from community_api_service.serializers import PostDetailSerializer
+from community_api_service import view_counter as view_counter_module
+from community_api_service.view_counter import ViewCounter, view_counter
+from community_api_service.views import PostDetailView
+
+
+def create_user(index: int = 0) -> User:
+    return User.objects.create(email=f"user{index}@example.com", name=f"사용자 {index}", auth_provider="google")
+
+
+class PostDetailQueryCountTest(TestCase):
+    """게시물 상세 조회 쿼리 수 회귀 테스트 (댓글 / 대댓글이 늘어도 쿼리 수가 그대로인지)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [create_user(i) for i in range(3)]
+        cls.category = Category.objects.create(name="육아 질문", post_type="question")
+        cls.post = Post.objects.create(
+            user=cls.users[0], category=cls.category, post_type="question", title="이유식 질문", content="내용"
+        )
+        cls.add_comments(top_level=3, replies=2)
+
+    @classmethod
+    def add_comments(cls, top_level: int, replies: int):
+        for i in range(top_level):
+            parent = Comment.objects.create(user=cls.users[i % 3], post=cls.post, content=f"댓글 {i}")
+            for j in range(replies):
+                Comment.objects.create(user=cls.users[j % 3], post=cls.post, parent=parent, content=f"대댓글 {i}-{j}")
+
+    def setUp(self):
+        # 조회수 flusher 스레드를 띄우지 않고 증가분은 테스트마다 비움
+        patcher = mock.patch.object(view_counter, "_ensure_flusher")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(view_counter._pending.clear)
+
+    def test_serializer_loads_comment_tree_in_one_query(self):
+        post = PostDetailView().get_object(self.post.pk)
+        with self.assertNumQueries(1):
+            comments = PostDetailSerializer(post).data["comments"]
+
+        self.assertEqual(len(comments), 3)
+        self.assertEqual([len(comment["replies"]) for comment in comments], [2, 2, 2])
+        self.assertEqual(comments[0]["replies"][1]["content"], "대댓글 0-1")
+
+        self.add_comments(top_level=5, replies=4)
+        post = PostDetailView().get_object(self.post.pk)
+        with self.assertNumQueries(1):
+            PostDetailSerializer(post).data
+
+    def test_view_query_count_does_not_grow_with_replies(self):
+        client = APIClient()
+        url = f"/community/posts/{self.post.pk}"
+        # 게시물(작성자 / 카테고리) + 이미지 + 댓글 트리
+        with self.assertNumQueries(3):
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]["comments"]), 3)
+
+        self.add_comments(top_level=5, replies=4)
+        with self.assertNumQueries(3):
+            response = client.get(url)
+        self.assertEqual(len(response.data["data"]["comments"]), 8)
+        self.assertEqual(response.data["data"]["view_count"], 2)
+
+
+class PostFeedCursorTest(TestCase):
+    """게시물 목록 커서 페이지네이션 (커서 인코딩, 고정 게시물 / 같은 작성 시각이 섞여도 빠짐·중복 없이 이어지는지)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = create_user()
+        category = Category.objects.create(name="육아 이야기", post_type="story")
+        now = timezone.now()
+        for i in range(7):
+            post = Post.objects.create(
+                user=user, category=category, post_type="story", title=f"게시물 {i}", content="내용",
+                is_pinned=i in (2, 5),
+            )
+            # 작성 시각이 같은 게시물끼리는 id 순서로 이어져야 함
+            Post.objects.filter(pk=post.pk).update(created_at=now - timedelta(minutes=i // 3))
+        cls.posts = list(Post.objects.order_by("-is_pinned", "-created_at", "-id"))
+
+    def setUp(self):
+        patcher = mock.patch.object(view_counter, "_ensure_flusher")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cursor_round_trip(self):
+        post = self.posts[0]
+        cursor = encode_cursor(post)
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), (post.is_pinned, post.created_at, post.id))
+        for invalid in ("", "not-a-cursor", encode_cursor(post)[:-4], "W10"):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(invalid)
+
+    def test_pages_follow_feed_order_without_gaps(self):
+        client = APIClient()
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            response = client.get("/community/posts", {"cursor": cursor, "limit": 2})
+            self.assertEqual(response.status_code, 200)
+            seen.extend(post["id"] for post in response.data["data"])
+            cursor = response.data["pagination"]["next_cursor"]
+            self.assertEqual(response.data["pagination"]["has_next"], cursor is not None)
+
+        self.assertEqual(seen, [str(post.id) for post in self.posts])
+
+    def test_invalid_cursor_is_bad_request(self):
+        response = APIClient().get("/community/posts", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ViewCounterFlushTest(TestCase):
+    """조회수 flush 중에도 반영 전 증가분이 응답에 보이는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = create_user()
+        category = Category.objects.create(name="육아 이야기", post_type="story")
+        cls.post = Post.objects.create(user=user, category=category, post_type="story", title="조회수", content="내용")
+
+    def setUp(self):
+        self.counter = ViewCounter()
+        patcher = mock.patch.object(self.counter, "_ensure_flusher")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def view_count(self) -> int:
+        post = Post.objects.get(pk=self.post.pk)
+        self.counter.apply_pending([post])
+        return post.view_count
+
+    def test_pending_views_stay_visible_until_commit(self):
+        self.counter.increment(self.post.pk, 3)
+        write = view_counter_module.write_view_counts
+        seen = []
+
+        def write_and_observe(deltas):
+            seen.append(self.view_count())
+            write(deltas)
+            # 쓰는 도중 들어온 조회는 이번 flush가 끝나도 대기열에 남아야 함
+            self.counter.increment(self.post.pk)
+
+        with mock.patch.object(view_counter_module, "write_view_counts", side_effect=write_and_observe):
+            self.counter.flush()
+
+        self.assertEqual(seen, [3])
+        self.assertEqual(self.counter.pending(self.post.pk), 1)
+        self.assertEqual(self.view_count(), 4)
+
+    def test_failed_flush_keeps_pending(self):
+        self.counter.increment(self.post.pk, 2)
+        with mock.patch.object(view_counter_module, "write_view_counts", side_effect=RuntimeError("db down")):
+            self.counter.flush()
+        self.assertEqual(self.counter.pending(self.post.pk), 2)
+        self.assertEqual(self.counter.failures, 1)
+
+        self.counter.flush()
+        self.assertEqual(self.counter.pending(self.post.pk), 0)
+        self.assertEqual(self.counter.stats()["pending_posts"], 0)
+        self.assertEqual(self.view_count(), 2)
+
+
+class SharedViewCounterTest(TestCase):
+    """REDIS_URL 구성: 워커(ViewCounter 인스턴스)끼리 증가분을 공유하고 한 워커만 반영하는지 (Redis 스탠드인 사용)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = ThreadedRedisStandin()
+        cls.settings_override = override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": cls.standin.start()},
+        })
+        cls.settings_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.settings_override.disable()
+        cls.standin.stop()
+
+    @classmethod
+    def setUpTestData(cls):
+        user = create_user()
+        category = Category.objects.create(name="육아 이야기", post_type="story")
+        cls.post = Post.objects.create(user=user, category=category, post_type="story", title="조회수", content="내용")
+
+    def setUp(self):
+        self.workers = [ViewCounter(), ViewCounter()]
+        for worker in self.workers:
+            patcher = mock.patch.object(worker, "_ensure_flusher")
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.standin.flushdb()
+
+    def view_count(self, worker: ViewCounter) -> int:
+        post = Post.objects.get(pk=self.post.pk)
+        worker.apply_pending([post])
+        return post.view_count
+
+    def test_pending_views_are_shared_between_workers(self):
+        self.workers[0].increment(self.post.pk, 2)
+        self.workers[1].increment(self.post.pk)
+        self.assertEqual([self.view_count(worker) for worker in self.workers], [3, 3])
+
+        write = view_counter_module.write_view_counts
+        seen = []
+
+        def write_and_observe(deltas):
+            # 반영하는 동안 다른 워커의 flush는 락에 막히고, 응답에는 증가분이 그대로 보임
+            self.workers[0].flush()
+            seen.append(self.view_count(self.workers[0]))
+            write(deltas)
+            self.workers[0].increment(self.post.pk)
+
+        with mock.patch.object(view_counter_module, "write_view_counts", side_effect=write_and_observe):
+            self.workers[1].flush()
+
+        self.assertEqual(seen, [3])
+        self.assertEqual(self.workers[1].written, 3)
+        self.assertEqual(self.workers[0].written, 0)
+        self.assertEqual(self.workers[0].pending(self.post.pk), 1)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).view_count, 3)
+        self.assertEqual([self.view_count(worker) for worker in self.workers], [4, 4])
+
+    def test_failed_flush_is_retried_by_any_worker(self):
+        self.workers[0].increment(self.post.pk, 2)
+        with mock.patch.object(view_counter_module, "write_view_counts", side_effect=RuntimeError("db down")):
+            self.workers[0].flush()
+        self.workers[0].increment(self.post.pk)
+        self.assertEqual(self.view_count(self.workers[1]), 3)
+
+        # 남은 처리용 해시(2)를 먼저 반영하고, 그 뒤에 들어온 증가분(1)은 다음 flush에서 반영
+        self.workers[1].flush()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).view_count, 2)
+        self.workers[1].flush()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).view_count, 3)
+        self.assertEqual(self.workers[1].stats()["pending_views"], 0)
+        self.assertEqual(self.view_count(self.workers[0]), 3)
+
+
+class LikeToggleTest(TransactionTestCase):
+    """좋아요 토글 (커밋된 트랜잭션 기준: 토글 홀짝, like_count == Like 행 수, 없는 대상)"""
+
+    def setUp(self):
+        self.users = [create_user(i) for i in range(8)]
+        category = Category.objects.create(name="육아 이야기", post_type="story")
+        self.post = Post.objects.create(
+            user=self.users[0], category=category, post_type="story", title="좋아요 점검", content="내용"
+        )
+        self.comment = Comment.objects.create(user=self.users[0], post=self.post, content="댓글")
+        self.targets = [(self.post.pk, "post"), (self.comment.pk, "comment")]
+
+    def assertLikeCountsMatchRows(self):
+        for target_id, target_type in self.targets:
+            stored = Like.target_model(target_type).objects.values_list("like_count", flat=True).get(pk=target_id)
+            rows = Like.objects.filter(target_id=target_id, target_type=target_type).count()
+            self.assertEqual(stored, rows, f"{target_type} like_count {stored} != Like 행 {rows}")
+
+    def test_toggle_parity(self):
+        for target_id, target_type in self.targets:
+            for i in range(1, 6):
+                is_liked, like_count = Like.toggle(self.users[1], target_id, target_type)
+                self.assertEqual(is_liked, i % 2 == 1)
+                self.assertEqual(like_count, i % 2)
+                self.assertEqual(
+                    Like.objects.filter(user=self.users[1], target_id=target_id, target_type=target_type).exists(),
+                    is_liked,
+                )
+        self.assertLikeCountsMatchRows()
+
+    def test_deleting_already_deleted_like_keeps_count(self):
+        Like.toggle(self.users[1], self.post.pk, "post")
+        like = Like.objects.get(user=self.users[1], target_id=self.post.pk, target_type="post")
+        stale = Like.objects.get(pk=like.pk)
+        like.delete()
+        # 다른 요청이 이미 지운 행을 다시 지워도 좋아요 수가 음수로 내려가지 않음
+        self.assertEqual(stale.delete()[0], 0)
+        self.assertLikeCountsMatchRows()
+
+    def test_like_count_matches_rows_after_concurrent_toggles(self):
+        # 사용자마다 두 대상을 번갈아 순서대로 토글하고, 사용자끼리는 동시에 (DB 잠금으로 실패한 토글은 롤백되므로 횟수에서 제외)
+        succeeded = Counter()
+
+        def run_user(user):
+            try:
+                for i in range(10):
+                    target_id, target_type = self.targets[i % 2]
+                    try:
+                        Like.toggle(user, target_id, target_type)
+                        succeeded[(user.pk, target_id)] += 1
+                    except (OperationalError, IntegrityError):
+                        # SQLite 잠금(database is locked) / 동시 INSERT 충돌만 허용하고 그 밖의 오류는 테스트 실패로
+                        pass
+            finally:
+                close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=len(self.users)) as executor:
+            list(executor.map(run_user, self.users))
+
+        self.assertGreater(sum(succeeded.values()), 0)
+        for user in self.users:
+            for target_id, target_type in self.targets:
+                self.assertEqual(
+                    Like.objects.filter(user=user, target_id=target_id, target_type=target_type).exists(),
+                    succeeded[(user.pk, target_id)] % 2 == 1,
+                )
+        self.assertLikeCountsMatchRows()
+
+    def test_toggle_missing_target_returns_404(self):
+        client = APIClient()
+        client.force_authenticate(self.users[1])
+        missing = uuid.uuid4()
+        for target_type in ("post", "comment"):
+            response = client.post("/community/likes/", {"target_id": str(missing), "target_type": target_type})
+            self.assertEqual(response.status_code, 404)
+        # 대상이 없으면 INSERT한 Like도 같은 트랜잭션에서 롤백됨
+        self.assertFalse(Like.objects.filter(target_id=missing).exists())
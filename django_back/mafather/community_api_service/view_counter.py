@@ -0,0 +1,230 @@
+"""
+게시물 조회수 write-behind 카운터
+
+PostDetailView가 조회할 때마다 게시물 행을 읽고-더하고-저장(Post.increment_view_count)하지 않고
+증가분만 모았다가 짧은 주기로 한 번에 DB에 반영합니다.
+- flush는 UPDATE posts SET view_count = view_count + n (F 표현식), 같은 n인 게시물끼리 한 문장으로 묶어 한 트랜잭션
+- 조회 응답에는 아직 반영 전인 증가분을 더해서 보여줌 (apply_pending)
+- 증가분은 커밋된 뒤에야 대기열에서 빠짐 (쓰는 동안의 응답도 조회수가 줄어 보이지 않음)
+- flush에 실패하면 증가분이 대기열에 그대로 남아 다음 주기에 다시 시도
+
+증가분 대기열:
+- Redis 캐시(REDIS_URL): 모든 워커가 같은 해시(HINCRBY)에 더하므로 어느 워커의 응답에도 전체 증가분이 보임.
+  flush는 락(SET NX EX)을 잡은 워커 하나만 대기열 해시를 처리용 해시로 RENAME해서 반영하고 지움.
+  apply_pending은 대기열 + 처리 중 해시를 함께 읽음. 반영 후 처리용 해시를 지우기 전에 워커가 죽으면
+  다음 flush가 다시 반영하므로 그만큼 조회수가 더 세어질 수 있음 (유실보다 중복을 택함)
+- 로컬 메모리(단일 프로세스): 프로세스 락 안에서 dict 값만 더함
+
+    view_counter.increment(post.id)
+    view_counter.apply_pending([post])
+
+환경 변수:
+    VIEW_COUNT_FLUSH_INTERVAL_SECONDS  증가분을 모으는 시간(초) (기본 5)
+    VIEW_COUNT_FLUSH_MAX_POSTS         대기 중인 게시물이 이만큼이면 주기를 기다리지 않고 바로 반영 (기본 1000)
+"""
+
+import os
+import uuid
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from mafather.cache import get_redis_client, make_key
+from mafather.lifespan import on_shutdown
+from community_api_service.models import Post
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL_SECONDS", "5"))
+FLUSH_MAX_POSTS = int(os.getenv("VIEW_COUNT_FLUSH_MAX_POSTS", "1000"))
+
+PENDING_KEY = "view_counts:pending"
+FLUSHING_KEY = "view_counts:flushing"
+FLUSH_LOCK_KEY = "view_counts:flush_lock"
+# flush 락 만료 시간(초): 락을 잡은 워커가 죽어도 이 시간이 지나면 다른 워커가 이어서 반영
+FLUSH_LOCK_SECONDS = 30
+
+
+def write_view_counts(deltas: Dict[Any, int]):
+    """게시물별 증가분을 한 트랜잭션으로 반영 (증가분이 같은 게시물은 UPDATE 한 번)"""
+    by_delta = defaultdict(list)
+    for post_id, delta in deltas.items():
+        by_delta[delta].append(post_id)
+    with transaction.atomic():
+        for delta, post_ids in by_delta.items():
+            Post.objects.filter(pk__in=post_ids).update(view_count=F('view_count') + delta)
+
+
+def _decode_counts(raw: Dict[bytes, bytes]) -> Dict[str, int]:
+    counts = {}
+    for field, value in raw.items():
+        if int(value):
+            counts[field.decode()] = int(value)
+    return counts
+
+
+class ViewCounter:
+    """게시물 조회수 증가분 버퍼 + 주기적 일괄 반영"""
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL_SECONDS, max_posts: int = FLUSH_MAX_POSTS):
+        self.flush_interval = flush_interval
+        self.max_posts = max_posts
+        self._pending: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.flushes = 0
+        self.written = 0
+        self.failures = 0
+
+    def increment(self, post_id: Any, amount: int = 1):
+        """조회수 증가분 추가"""
+        client = get_redis_client()
+        if client is not None:
+            pipeline = client.pipeline(transaction=False)
+            pipeline.hincrby(make_key(PENDING_KEY), str(post_id), amount)
+            pipeline.hlen(make_key(PENDING_KEY))
+            full = pipeline.execute()[1] >= self.max_posts
+        else:
+            with self._lock:
+                self._pending[post_id] = self._pending.get(post_id, 0) + amount
+                full = len(self._pending) >= self.max_posts
+        self._ensure_flusher()
+        if full:
+            self._wakeup.set()
+
+    def _shared_pending(self, client, post_ids: List[Any]) -> List[int]:
+        """Redis 대기열 + 처리 중 해시의 증가분 합계 (post_ids 순서)"""
+        fields = [str(post_id) for post_id in post_ids]
+        pipeline = client.pipeline(transaction=False)
+        pipeline.hmget(make_key(PENDING_KEY), fields)
+        pipeline.hmget(make_key(FLUSHING_KEY), fields)
+        pending, flushing = pipeline.execute()
+        return [int(a or 0) + int(b or 0) for a, b in zip(pending, flushing)]
+
+    def pending(self, post_id: Any) -> int:
+        """아직 DB에 반영되지 않은 증가분"""
+        client = get_redis_client(write=False)
+        if client is not None:
+            return self._shared_pending(client, [post_id])[0]
+        return self._pending.get(post_id, 0)
+
+    def apply_pending(self, posts: Iterable[Post]):
+        """게시물 객체의 view_count에 반영 전 증가분을 더함 (응답용)"""
+        client = get_redis_client(write=False)
+        if client is not None:
+            posts = list(posts)
+            if posts:
+                for post, delta in zip(posts, self._shared_pending(client, [post.pk for post in posts])):
+                    post.view_count += delta
+            return
+        for post in posts:
+            post.view_count += self._pending.get(post.pk, 0)
+
+    def _ensure_flusher(self):
+        if self._flusher is None or not self._flusher.is_alive():
+            with self._lock:
+                if self._flusher is None or not self._flusher.is_alive():
+                    self._flusher = threading.Thread(target=self._flush_forever, name="view-counter", daemon=True)
+                    self._flusher.start()
+
+    def _flush_forever(self):
+        while True:
+            # flush_interval 동안 증가분을 모음 (대기열이 가득 차면 바로 반영)
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """대기 중인 증가분을 모두 반영"""
+        with self._flush_lock:
+            client = get_redis_client()
+            if client is not None:
+                self._flush_shared(client)
+            else:
+                self._flush_local()
+
+    def _flush_local(self):
+        # 반영하는 동안에도 apply_pending이 증가분을 더할 수 있도록 대기열은 그대로 두고 복사본을 쓰며,
+        # 커밋된 뒤에 쓴 만큼만 대기열에서 뺌 (그 사이 들어온 증가분은 남음). 실패하면 대기열을 건드리지 않음
+        with self._lock:
+            deltas = dict(self._pending)
+        if not deltas:
+            return
+        if not self._write(deltas):
+            return
+        with self._lock:
+            for post_id, delta in deltas.items():
+                remaining = self._pending.get(post_id, 0) - delta
+                if remaining:
+                    self._pending[post_id] = remaining
+                else:
+                    self._pending.pop(post_id, None)
+
+    def _flush_shared(self, client):
+        # 락을 잡은 워커 하나만 반영 (다른 워커는 이번 주기를 건너뜀)
+        token = uuid.uuid4().hex
+        lock_key = make_key(FLUSH_LOCK_KEY)
+        if not client.set(lock_key, token, nx=True, ex=FLUSH_LOCK_SECONDS):
+            return
+        try:
+            pending_key, flushing_key = make_key(PENDING_KEY), make_key(FLUSHING_KEY)
+            # 이전 flush가 반영하지 못하고 남긴 처리용 해시가 있으면 그것부터 반영
+            if not client.exists(flushing_key):
+                if not client.exists(pending_key):
+                    return
+                client.rename(pending_key, flushing_key)
+            deltas = _decode_counts(client.hgetall(flushing_key))
+            if deltas and not self._write(deltas):
+                return
+            client.delete(flushing_key)
+        finally:
+            if client.get(lock_key) == token.encode():
+                client.delete(lock_key)
+
+    def _write(self, deltas: Dict[Any, int]) -> bool:
+        try:
+            write_view_counts(deltas)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"조회수 반영 중 오류 발생 (게시물 {len(deltas)}개): {str(e)}")
+            return False
+        self.flushes += 1
+        self.written += sum(deltas.values())
+        return True
+
+    async def aclose(self):
+        """남은 증가분 반영 (서버 종료 시 mafather.lifespan에서 호출)"""
+        await sync_to_async(self.flush)()
+
+    def stats(self) -> Dict[str, int]:
+        client = get_redis_client(write=False)
+        if client is not None:
+            pending = _decode_counts(client.hgetall(make_key(PENDING_KEY)))
+            for post_id, delta in _decode_counts(client.hgetall(make_key(FLUSHING_KEY))).items():
+                pending[post_id] = pending.get(post_id, 0) + delta
+        else:
+            pending = dict(self._pending)
+        return {
+            "pending_posts": len(pending),
+            "pending_views": sum(pending.values()),
+            "flushes": self.flushes,
+            "written": self.written,
+            "failures": self.failures,
+        }
+
+
+view_counter = ViewCounter()
+on_shutdown(view_counter.aclose)
+atexit.register(view_counter.flush)
@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework import status
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from community_api_service.models import Category, Post, Comment, Like
 from community_api_service.serializers import (
@@ -18,6 +18,9 @@ from community_api_service.serializers import (
     CommunityStatsSerializer
 )
 from api_service.utils import StandardResponse, CustomPageNumberPagination
+from community_api_service.view_counter import view_counter
+from community_api_service.pagination import InvalidCursor, PostFeedCursorPagination
+from community_api_service.search import search_log_writer, search_posts
 from api_service.exceptions import NotFoundError
 import logging
 
@@ -81,7 +84,7 @@ class PostListCreateView(APIView):
             queryset = Post.objects.filter(
                 deleted_at__isnull=True,
                 status=status_filter
-            ).select_related('user', 'category').prefetch_related('images', 'comments')
+            ).select_related('user', 'category').prefetch_related('images')
             
             # 필터링
             if post_type:
@@ -94,23 +97,51 @@ class PostListCreateView(APIView):
                         message="잘못된 카테고리 ID 형식입니다.",
                         status_code=status.HTTP_400_BAD_REQUEST
                     )
+            ranked = False
             if search:
-                queryset = queryset.filter(
-                    Q(title__icontains=search) | Q(content__icontains=search)
-                )
+                # 전문 검색 인덱스 (MySQL FULLTEXT ngram), 없으면 icontains
+                queryset, ranked = search_posts(queryset, search)
             if is_pinned is not None:
                 queryset = queryset.filter(is_pinned=is_pinned.lower() == 'true')
             if is_solved is not None and post_type == 'question':
                 queryset = queryset.filter(is_solved=is_solved.lower() == 'true')
             
-            # 정렬 (핀된 게시물 우선, 최신순)
-            queryset = queryset.order_by('-is_pinned', '-created_at')
+            # 커서 페이지네이션 (cursor 파라미터가 있을 때, 첫 페이지는 cursor=)
+            if 'cursor' in request.GET:
+                paginator = PostFeedCursorPagination()
+                paginator.page_size = min(int(limit), 100)  # 최대 100개로 제한
+                try:
+                    paginated_posts = paginator.paginate_queryset(queryset, request)
+                except InvalidCursor:
+                    return StandardResponse.error(
+                        message="잘못된 커서 형식입니다.",
+                        status_code=status.HTTP_400_BAD_REQUEST
+                    )
+                view_counter.apply_pending(paginated_posts)
+                if search:
+                    results_count = paginator.count if paginator.count is not None else len(paginated_posts)
+                    search_log_writer.log(request, search, results_count)
+                serializer = PostSerializer(paginated_posts, many=True)
+                return paginator.get_paginated_response(serializer.data)
+            
+            # 정렬 (검색이면 관련도순, 아니면 핀된 게시물 우선 최신순)
+            if ranked:
+                queryset = queryset.order_by('-relevance', '-created_at')
+            else:
+                queryset = queryset.order_by('-is_pinned', '-created_at')
             
             # 페이지네이션
             paginator = CustomPageNumberPagination()
             paginator.page_size = min(int(limit), 100)  # 최대 100개로 제한
             paginated_posts = paginator.paginate_queryset(queryset, request)
             
+            # 아직 DB에 반영되지 않은 조회수 포함
+            view_counter.apply_pending(paginated_posts)
+            
+            # 검색 로그 (요청 밖에서 모아서 저장)
+            if search:
+                search_log_writer.log(request, search, paginator.page.paginator.count)
+            
             serializer = PostSerializer(paginated_posts, many=True)
             return paginator.get_paginated_response(serializer.data)
             
@@ -164,8 +195,9 @@ class PostDetailView(APIView):
     def get_object(self, post_id):
         """게시물 객체 가져오기"""
         try:
+            # 댓글은 PostDetailSerializer가 Post.get_comment_tree로 한 번에 가져옴
             return Post.objects.select_related('user', 'category').prefetch_related(
-                'images', 'comments__user', 'comments__replies__user'
+                'images'
             ).get(
                 id=post_id,
                 deleted_at__isnull=True
@@ -178,7 +210,7 @@ class PostDetailView(APIView):
         try:
             post = self.get_object(post_id)
             
-            # 조회수 증가
+            # 조회수 증가 (DB에는 view_counter가 주기적으로 반영)
             post.increment_view_count()
             
             serializer = PostDetailSerializer(post, context={'request': request})
@@ -454,33 +486,9 @@ class LikeToggleView(APIView):
                 target_id = serializer.validated_data['target_id']
                 target_type = serializer.validated_data['target_type']
                 
-                # 기존 좋아요 확인
-                existing_like = Like.objects.filter(
-                    user=request.user,
-                    target_id=target_id,
-                    target_type=target_type
-                ).first()
-                
-                if existing_like:
-                    # 좋아요 취소
-                    existing_like.delete()
-                    is_liked = False
-                    message = "좋아요가 취소되었습니다."
-                else:
-                    # 좋아요 추가
-                    Like.objects.create(
-                        user=request.user,
-                        target_id=target_id,
-                        target_type=target_type
-                    )
-                    is_liked = True
-                    message = "좋아요가 추가되었습니다."
-                
-                # 좋아요 수 조회
-                like_count = Like.objects.filter(
-                    target_id=target_id,
-                    target_type=target_type
-                ).count()
+                # 좋아요 추가/취소 + 대상의 좋아요 수 갱신 (한 트랜잭션)
+                is_liked, like_count = Like.toggle(request.user, target_id, target_type)
+                message = "좋아요가 추가되었습니다." if is_liked else "좋아요가 취소되었습니다."
                 
                 response_data = {
                     'is_liked': is_liked,
@@ -498,6 +506,11 @@ class LikeToggleView(APIView):
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
                 
+        except (Post.DoesNotExist, Comment.DoesNotExist):
+            return StandardResponse.error(
+                message="좋아요 대상을 찾을 수 없습니다.",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
         except Exception as e:
             logger.error(f"Like toggle error for user {request.user.id}: {str(e)}")
             return StandardResponse.error(
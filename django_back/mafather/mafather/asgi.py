@@ -24,9 +24,12 @@ from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 from chatbot import routing
+from mafather.lifespan import install_daphne_shutdown_hook, lifespan_app
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
+    # 종료 시 공유 HTTP 클라이언트 등 프로세스 전역 자원 정리 (uvicorn / hypercorn)
+    "lifespan": lifespan_app,
     "websocket": 
         AuthMiddlewareStack(
             AllowedHostsOriginValidator(
@@ -36,3 +39,6 @@ application = ProtocolTypeRouter({
         ),
     ),
 })
+
+# Daphne는 lifespan 이벤트를 보내지 않으므로 reactor 종료 트리거로 같은 종료 콜백 실행
+install_daphne_shutdown_hook()
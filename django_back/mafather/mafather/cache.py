@@ -0,0 +1,23 @@
+"""
+공유 캐시 도우미
+
+REDIS_URL이 설정되어 기본 캐시가 Django RedisCache이면 여러 워커가 같은 Redis를 보므로
+원자적 명령(RPUSH, SADD, HINCRBY 등)을 직접 쓰는 모듈은 이 클라이언트를 사용하고,
+아니면(로컬 메모리 캐시, 단일 프로세스) 각 모듈이 프로세스 락으로 처리합니다.
+"""
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+
+def get_redis_client(write: bool = True):
+    """기본 캐시가 Redis면 redis-py 클라이언트, 아니면 None"""
+    backend = caches['default']
+    if isinstance(backend, RedisCache):
+        return backend._cache.get_client(write=write)
+    return None
+
+
+def make_key(key: str) -> str:
+    """기본 캐시의 KEY_PREFIX / VERSION을 붙인 Redis 키"""
+    return caches['default'].make_key(key)
@@ -0,0 +1,82 @@
+"""
+ASGI 종료 처리
+
+프로세스 전역 자원(공유 HTTP 클라이언트, write-behind 대기열 등)은 on_shutdown으로 종료 콜백을 등록해 두면
+서버가 내려갈 때 이벤트 루프가 살아 있는 동안 등록 역순으로 한 번만 정리됩니다.
+
+    from mafather.lifespan import on_shutdown
+    on_shutdown(aclose_http_client)
+
+서버별 연결 방법 (mafather/asgi.py):
+- Daphne(운영, requirements.txt): ASGI lifespan 이벤트를 보내지 않으므로 install_daphne_shutdown_hook()으로
+  Twisted reactor의 "before shutdown" 트리거에 등록합니다. SIGTERM / SIGINT로 reactor가 멈출 때
+  asyncio 루프가 아직 돌고 있는 상태에서 콜백이 끝날 때까지 기다립니다.
+- uvicorn / hypercorn: Django의 ASGIHandler는 lifespan 이벤트를 처리하지 않으므로
+  ProtocolTypeRouter에 lifespan_app을 "lifespan"으로 연결합니다.
+두 경로 모두 run_shutdown_callbacks를 부르며 먼저 실행된 쪽만 콜백을 실행합니다.
+이벤트 루프 밖에서 종료되는 경우(관리 명령, 비정상 종료)를 위해 대기열을 가진 모듈은
+동기 flush도 atexit에 따로 등록합니다.
+"""
+
+import sys
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+_shutdown_callbacks: List[Callable[[], Awaitable[None]]] = []
+_shutdown_started = False
+
+
+def on_shutdown(callback: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """ASGI 종료 시 실행할 비동기 콜백 등록 (중복 등록은 무시)"""
+    if callback not in _shutdown_callbacks:
+        _shutdown_callbacks.append(callback)
+    return callback
+
+
+async def run_shutdown_callbacks():
+    """등록 역순으로 종료 콜백 실행 (하나가 실패해도 나머지는 계속 정리, 두 번째 호출은 무시)"""
+    global _shutdown_started
+    if _shutdown_started:
+        return
+    _shutdown_started = True
+    for callback in reversed(_shutdown_callbacks):
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"[Lifespan] Shutdown callback {callback.__name__} failed: {str(e)}")
+
+
+async def lifespan_app(scope, receive, send):
+    """ASGI lifespan 프로토콜 앱 (uvicorn / hypercorn 등 lifespan을 지원하는 서버에서 호출됨)"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await run_shutdown_callbacks()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+def install_daphne_shutdown_hook() -> bool:
+    """Daphne(Twisted reactor)가 멈추기 전에 종료 콜백을 실행하도록 등록
+
+    이미 reactor가 설치된 경우(daphne가 asyncioreactor를 설치한 뒤 앱을 불러온 경우)에만 등록합니다.
+    여기서 twisted.internet.reactor를 먼저 import하면 기본 reactor가 설치되어 버리므로 확인만 합니다.
+    """
+    if "twisted.internet.reactor" not in sys.modules:
+        return False
+
+    from twisted.internet import reactor
+    from twisted.internet.defer import Deferred
+
+    def before_shutdown():
+        # Deferred를 돌려주면 reactor는 콜백이 끝날 때까지 종료를 미룸
+        return Deferred.fromFuture(asyncio.ensure_future(run_shutdown_callbacks()))
+
+    reactor.addSystemEventTrigger("before", "shutdown", before_shutdown)
+    logger.info("[Lifespan] Shutdown callbacks registered with the Twisted reactor")
+    return True
@@ -216,12 +216,44 @@ LOGIN_REDIRECT_URL = 'http://localhost:3000/auth/callback'
 LOGOUT_REDIRECT_URL = 'http://localhost:3000'
 
 
-# Channels 설정
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer'
-    },
-}
+# Channels / 캐시 설정
+# REDIS_URL이 있으면 여러 Daphne 워커가 채널 레이어와 캐시(웹소켓 세션 메타데이터, 채팅 히스토리)를 공유
+# CHANNEL_LAYER_BACKEND: core(기본, RedisChannelLayer, 실제 Redis 필요) 또는 pubsub(RedisPubSubChannelLayer)
+# 로컬에서는 python manage.py redis_standin 으로 Redis 프로토콜 스탠드인을 띄워 검증 가능
+# (스탠드인은 Lua 스크립트를 지원하지 않으므로 CHANNEL_LAYER_BACKEND=pubsub 와 함께 사용)
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': (
+                'channels_redis.pubsub.RedisPubSubChannelLayer'
+                if os.getenv('CHANNEL_LAYER_BACKEND', 'core') == 'pubsub'
+                else 'channels_redis.core.RedisChannelLayer'
+            ),
+            'CONFIG': {
+                'hosts': [REDIS_URL],
+            },
+        },
+    }
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+else:
+    # 단일 프로세스 전용
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer'
+        },
+    }
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
 
 AUTH_PASSWORD_VALIDATORS = [
     {
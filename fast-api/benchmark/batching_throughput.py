@@ -0,0 +1,120 @@
+"""
+/tuning 마이크로 배칭 처리량 벤치마크 (오프라인)
+
+무작위 가중치의 작은 causal LM과 즉석에서 학습한 BPE 토크나이저로
+LGExaoneAdvancedChatbot을 구성한 뒤, 동시 요청 N개를 배칭 없이(배치 크기 1)
+처리할 때와 마이크로 배칭으로 처리할 때의 처리량과 큐 대기 시간을 비교합니다.
+모델 다운로드가 필요 없으므로 네트워크 없이 실행됩니다.
+
+사용법 (fast-api 디렉토리에서):
+    python benchmark/batching_throughput.py --requests 32 --max-new-tokens 32
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import torch
+from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service.chatbot import LGExaoneAdvancedChatbot
+from service.batching import MicroBatchScheduler
+
+SAMPLE_QUESTIONS = [
+    "3개월 아기 수유 간격이 궁금해요",
+    "밤에 자주 깨는 아기 어떻게 재워야 하나요",
+    "6개월 아기 이유식은 언제 시작하나요",
+    "돌 아기 낮잠은 몇 번 자나요",
+    "신생아 황달은 언제 사라지나요",
+    "아기가 뒤집기를 안 해요 괜찮을까요",
+    "18개월 아기 말이 늦어요",
+    "수면 교육은 몇 개월부터 하나요",
+]
+
+
+def build_tiny_model(vocab_size: int, layers: int, hidden: int):
+    """무작위 가중치 GPT-2 구조 모델 + 샘플 문장으로 학습한 BPE 토크나이저"""
+    raw = Tokenizer(models.BPE(unk_token="[UNK]"))
+    raw.pre_tokenizer = pre_tokenizers.Whitespace()
+    trainer = trainers.BpeTrainer(vocab_size=vocab_size, special_tokens=["[UNK]", "[PAD]", "[EOS]"])
+    corpus = SAMPLE_QUESTIONS + ["당신은 아이의 발달 및 수면에 조언을 주는 소아과 전문의 AI입니다. 사용자: AI:"]
+    raw.train_from_iterator(corpus * 10, trainer=trainer)
+
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=raw, unk_token="[UNK]", pad_token="[PAD]", eos_token="[EOS]"
+    )
+
+    torch.manual_seed(0)
+    config = GPT2Config(
+        vocab_size=len(tokenizer),
+        n_positions=512,
+        n_embd=hidden,
+        n_layer=layers,
+        n_head=max(1, hidden // 64),
+        bos_token_id=tokenizer.eos_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+    )
+    model = GPT2LMHeadModel(config)
+    model.eval()
+    return tokenizer, model
+
+
+async def run(chatbot: LGExaoneAdvancedChatbot, label: str, requests: int, max_new_tokens: int):
+    questions = [SAMPLE_QUESTIONS[i % len(SAMPLE_QUESTIONS)] for i in range(requests)]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        chatbot.agenerate_response(question, max_new_tokens=max_new_tokens) for question in questions
+    ))
+    elapsed = time.perf_counter() - started
+
+    metrics = chatbot.get_batch_metrics()
+    print(
+        f"{label:<22} 소요={elapsed:>6.2f}s  요청/s={requests / elapsed:>6.2f}  "
+        f"tokens/s={metrics['tokens_per_second']:>8.1f}  평균배치={metrics['avg_batch_size']:>4.1f}  "
+        f"큐대기 p50={metrics['queue_wait_ms_p50']:>8.1f}ms p95={metrics['queue_wait_ms_p95']:>8.1f}ms"
+    )
+
+
+async def main(args):
+    tokenizer, model = build_tiny_model(args.vocab_size, args.layers, args.hidden)
+    print(
+        f"=== 배칭 처리량 벤치마크: 동시 요청 {args.requests}개, max_new_tokens={args.max_new_tokens}, "
+        f"모델 {args.layers}층/{args.hidden}차원 (무작위 가중치, CPU) ==="
+    )
+
+    for label, batch_size, wait_ms in [
+        ("배칭 없음 (batch=1)", 1, 0.0),
+        (f"배칭 (batch≤{args.batch_size}, {args.wait_ms:.0f}ms)", args.batch_size, args.wait_ms),
+    ]:
+        chatbot = LGExaoneAdvancedChatbot()
+        chatbot.device = torch.device("cpu")
+        chatbot.tokenizer = tokenizer
+        chatbot.model = model
+        chatbot._is_model_loaded = True
+        chatbot.batcher = MicroBatchScheduler(
+            chatbot._generate_batch_job,
+            executor=chatbot._executor,
+            max_batch_size=batch_size,
+            max_wait_ms=wait_ms,
+            max_concurrent_batches=chatbot.max_workers
+        )
+        await run(chatbot, label, args.requests, args.max_new_tokens)
+        await chatbot.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exaone 마이크로 배칭 처리량 벤치마크")
+    parser.add_argument("--requests", type=int, default=32, help="동시 요청 수")
+    parser.add_argument("--max-new-tokens", type=int, default=32, help="요청당 생성 토큰 수")
+    parser.add_argument("--batch-size", type=int, default=8, help="최대 배치 크기")
+    parser.add_argument("--wait-ms", type=float, default=20.0, help="배치 수집 대기 시간(ms)")
+    parser.add_argument("--vocab-size", type=int, default=500, help="토크나이저 어휘 수")
+    parser.add_argument("--layers", type=int, default=4, help="모델 층 수")
+    parser.add_argument("--hidden", type=int, default=256, help="모델 은닉 차원")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,139 @@
+"""
+FastAPI 콜드 스타트 시간 벤치마크 (FAISS 시작 처리 비교)
+
+임시 디렉토리에 vector_store/faiss_db를 복사하고 서버 프로세스를 새로 띄워
+import + lifespan 시작까지 걸린 시간을 측정합니다.
+- 이전 방식: 시작할 때마다 전체 문서를 다시 임베딩해서 인덱스 재구축 (FAISS_STARTUP_MODE=rebuild, 빈 캐시)
+- validate: 원본 JSON 해시가 같으면 기존 스냅샷을 메모리 매핑으로 바로 사용
+
+OpenAI 임베딩 API와 Exaone 모델 로드는 스텁으로 대체합니다.
+(임베딩 지연 = 요청당 고정 지연 + 문서당 지연, 모델 로드는 측정에서 제외)
+
+사용법 (fast-api 디렉토리에서):
+    python benchmark/cold_start.py --runs 3 --embed-ms-per-doc 20
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_child(args):
+    """서버 프로세스 역할: 스텁 설치 후 main의 lifespan 시작까지 실행"""
+    import asyncio
+    from langchain_core.embeddings import Embeddings
+
+    sys.path.insert(0, APP_DIR)
+    from service import embedding_cache
+    from service.chatbot import LGExaoneAdvancedChatbot
+
+    class StubOpenAIEmbeddings(Embeddings):
+        def __init__(self, model: str, openai_api_key: str):
+            self.dim = 1536
+
+        def _vector(self, text: str) -> List[float]:
+            seed = hashlib.sha256(text.encode("utf-8")).digest()
+            return [seed[i % len(seed)] / 255 for i in range(self.dim)]
+
+        def embed_documents(self, texts: List[str]) -> List[List[float]]:
+            time.sleep(args.embed_ms_per_call / 1000 + len(texts) * args.embed_ms_per_doc / 1000)
+            return [self._vector(text) for text in texts]
+
+        def embed_query(self, text: str) -> List[float]:
+            return self.embed_documents([text])[0]
+
+    def load_model(self):
+        self._is_model_loaded = True
+        return True
+
+    embedding_cache.OpenAIEmbeddings = StubOpenAIEmbeddings
+    LGExaoneAdvancedChatbot.load_model = load_model
+
+    import main as main_module
+
+    async def start():
+        async with main_module.lifespan(main_module.app):
+            pass
+
+    asyncio.run(start())
+    print("RESULT " + json.dumps(main_module.startup_state, ensure_ascii=False))
+
+
+def start_server_process(env: Dict[str, str], args) -> Dict:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [
+            sys.executable, os.path.abspath(__file__), "--child",
+            "--embed-ms-per-doc", str(args.embed_ms_per_doc),
+            "--embed-ms-per-call", str(args.embed_ms_per_call),
+        ],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    result_lines = [line for line in completed.stdout.splitlines() if line.startswith("RESULT ")]
+    if completed.returncode != 0 or not result_lines:
+        print(completed.stdout[-2000:])
+        print(completed.stderr[-2000:])
+        raise RuntimeError("서버 프로세스 시작 실패")
+    state = json.loads(result_lines[-1][len("RESULT "):])
+    state["wall_seconds"] = elapsed
+    return state
+
+
+def main(args):
+    print(
+        f"=== 콜드 스타트 벤치마크: {args.runs}회, 임베딩 스텁 지연 "
+        f"{args.embed_ms_per_call}ms/요청 + {args.embed_ms_per_doc}ms/문서 ==="
+    )
+    results = {"이전 방식 (매번 재구축)": [], "validate (해시 일치)": []}
+
+    for _ in range(args.runs):
+        workdir = tempfile.mkdtemp(prefix="cold_start_")
+        try:
+            shutil.copytree(os.path.join(APP_DIR, "vector_store", "faiss_db"),
+                            os.path.join(workdir, "vector_store", "faiss_db"))
+            env = {
+                **os.environ,
+                "OPENAI_API_KEY": "sk-benchmark",
+                "VECTOR_STORE_DIR": os.path.join(workdir, "vector_store"),
+                "EMBEDDING_CACHE_PATH": os.path.join(workdir, "embedding_cache.sqlite3"),
+            }
+            results["이전 방식 (매번 재구축)"].append(
+                start_server_process({**env, "FAISS_STARTUP_MODE": "rebuild"}, args)
+            )
+            results["validate (해시 일치)"].append(
+                start_server_process({**env, "FAISS_STARTUP_MODE": "validate"}, args)
+            )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    for label, states in results.items():
+        wall = sorted(state["wall_seconds"] for state in states)
+        faiss_seconds = sorted(state["faiss_seconds"] for state in states)
+        print(
+            f"{label:<22} 프로세스 시작~준비 median={wall[len(wall) // 2]:>6.2f}s  "
+            f"FAISS 단계 median={faiss_seconds[len(faiss_seconds) // 2]:>6.2f}s  "
+            f"({states[-1]['faiss_action']})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FastAPI 콜드 스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=3, help="반복 횟수")
+    parser.add_argument("--embed-ms-per-doc", type=float, default=20.0, help="임베딩 스텁 문서당 지연(ms)")
+    parser.add_argument("--embed-ms-per-call", type=float, default=300.0, help="임베딩 스텁 요청당 지연(ms)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parsed = parser.parse_args()
+    if parsed.child:
+        run_child(parsed)
+    else:
+        main(parsed)
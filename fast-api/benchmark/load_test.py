@@ -0,0 +1,237 @@
+"""
+/vector, /openai, /tuning 동시 접속 부하 테스트 (LLM 스텁 사용)
+
+실제 OpenAI / Exaone 호출 대신 지연 시간만 흉내 내는 스텁을 끼워 넣고,
+동시 클라이언트 N명이 요청을 보낼 때의 p50/p99 지연 시간을 측정합니다.
+부하 중에 `/` 엔드포인트 지연도 함께 측정하여 이벤트 루프가 막히는지 확인합니다.
+
+사용법 (fast-api 디렉토리에서):
+    python benchmark/load_test.py --clients 50 --requests 4 --llm-latency 0.5
+    python benchmark/load_test.py --baseline   # 기존 동기 호출 방식과 비교
+"""
+
+import os
+import sys
+import time
+import random
+import socket
+import asyncio
+import argparse
+import threading
+from typing import Dict, List
+
+import httpx
+import uvicorn
+from langchain.schema import Document
+from langchain_core.runnables import RunnableLambda
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service import chatbot as exaone_module
+from service import faiss_chatbot as faiss_module
+from service import openai_chatbot as memory_module
+
+
+class StubVectorStore:
+    """임베딩 API 지연만 흉내 내는 FAISS 스텁"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.doc = Document(
+            page_content="3개월 아기는 보통 3~4시간 간격으로 수유합니다.",
+            metadata={"category_name": "1~3개월", "section_title": "수유"}
+        )
+
+    def similarity_search_with_score(self, query: str, k: int = 8):
+        time.sleep(self.latency)
+        return [(self.doc, 0.2)]
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 8):
+        await asyncio.sleep(self.latency)
+        return [(self.doc, 0.2)]
+
+    def similarity_search_with_score_by_vector(self, embedding, k: int = 8):
+        return [(self.doc, 0.2)]
+
+    async def asimilarity_search_with_score_by_vector(self, embedding, k: int = 8):
+        return [(self.doc, 0.2)]
+
+
+class StubEmbeddings:
+    """임베딩 API 지연만 흉내 내는 스텁 (질문마다 다른 무작위 벡터 → 의미 캐시 미적중)"""
+
+    def __init__(self, latency: float, dim: int = 64):
+        self.latency = latency
+        self.dim = dim
+
+    def _vector(self, text: str):
+        rng = random.Random(text)
+        return [rng.uniform(-1, 1) for _ in range(self.dim)]
+
+    def embed_query(self, text: str):
+        time.sleep(self.latency)
+        return self._vector(text)
+
+    async def aembed_query(self, text: str):
+        await asyncio.sleep(self.latency)
+        return self._vector(text)
+
+
+def install_stubs(llm_latency: float, embed_latency: float):
+    """서비스 초기화 과정을 스텁으로 교체 (main 임포트 전에 호출)"""
+
+    def llm_sync(_inputs):
+        time.sleep(llm_latency)
+        return "스텁 응답입니다."
+
+    async def llm_async(_inputs):
+        await asyncio.sleep(llm_latency)
+        return "스텁 응답입니다."
+
+    stub_chain = RunnableLambda(llm_sync, afunc=llm_async)
+
+    def faiss_initialize(self):
+        self.embedding_model = StubEmbeddings(embed_latency)
+        self.faiss_vectorstore = StubVectorStore(embed_latency)
+        self.chain = stub_chain
+
+    def memory_initialize(self):
+        self.chain = stub_chain
+
+    def generate_batch(self, user_inputs, *args, **kwargs):
+        # torch generate와 마찬가지로 스레드를 점유하는 블로킹 호출 (배치당 1회)
+        time.sleep(llm_latency)
+        return ["스텁 응답입니다."] * len(user_inputs), 0
+
+    faiss_module.FAISSChatbotService._initialize = faiss_initialize
+    memory_module.MemoryChatbotService._initialize = memory_initialize
+    exaone_module.LGExaoneAdvancedChatbot.generate_batch = generate_batch
+
+
+def register_baseline_routes(app, main_module):
+    """변경 전과 같은 방식(이벤트 루프에서 동기 호출)의 비교용 라우트"""
+
+    @app.post("/_baseline/vector")
+    async def baseline_vector(payload: main_module.ChatRequest):
+        return {"response": main_module.faiss_chatbot_service.chat(payload.message)["answer"]}
+
+    @app.post("/_baseline/openai")
+    async def baseline_openai(payload: main_module.ChatRequest):
+        return {"response": main_module.memory_chatbot_service.chat(payload.message)["answer"]}
+
+    @app.post("/_baseline/tuning")
+    async def baseline_tuning(payload: main_module.ChatRequest):
+        return {"response": main_module.chatbot.generate_response(payload.message)}
+
+
+def start_server(app) -> tuple:
+    """실제 소켓으로 요청이 들어오도록 별도 스레드에서 uvicorn 실행 (lifespan 생략)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_endpoint(client: httpx.AsyncClient, path: str, clients: int, requests_per_client: int) -> Dict:
+    latencies: List[float] = []
+    probe_latencies: List[float] = []
+    errors = 0
+    done = asyncio.Event()
+
+    async def worker(worker_id: int):
+        nonlocal errors
+        for i in range(requests_per_client):
+            started = time.perf_counter()
+            response = await client.post(path, json={"message": f"3개월 아기 수유 간격 {worker_id}-{i}"})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    async def probe():
+        # 부하 중 가벼운 요청의 지연 = 이벤트 루프 정체 정도
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/")
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.05)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "probe_p99": percentile(probe_latencies, 99),
+        "probe_max": max(probe_latencies) if probe_latencies else 0.0,
+    }
+
+
+def print_result(result: Dict):
+    print(
+        f"{result['path']:<20} req={result['requests']:<5} err={result['errors']:<3} "
+        f"rps={result['rps']:>7.1f}  p50={result['p50'] * 1000:>8.1f}ms  "
+        f"p99={result['p99'] * 1000:>8.1f}ms  "
+        f"'/' p99={result['probe_p99'] * 1000:>8.1f}ms max={result['probe_max'] * 1000:>8.1f}ms"
+    )
+
+
+async def main(args):
+    install_stubs(args.llm_latency, args.embed_latency)
+
+    import main as main_module
+
+    paths = ["/vector", "/openai", "/tuning"]
+    if args.baseline:
+        register_baseline_routes(main_module.app, main_module)
+        paths += ["/_baseline/vector", "/_baseline/openai", "/_baseline/tuning"]
+
+    print(
+        f"=== 부하 테스트: 동시 클라이언트 {args.clients}명 x {args.requests}회, "
+        f"LLM 지연 {args.llm_latency}s, 임베딩 지연 {args.embed_latency}s, "
+        f"EXAONE_MAX_WORKERS={main_module.chatbot.max_workers} ==="
+    )
+
+    server, thread, base_url = start_server(main_module.app)
+    limits = httpx.Limits(max_connections=args.clients + 1)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+            for path in paths:
+                print_result(await run_endpoint(client, path, args.clients, args.requests))
+    finally:
+        server.should_exit = True
+        thread.join()
+        await main_module.chatbot.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FastAPI 챗봇 엔드포인트 부하 테스트")
+    parser.add_argument("--clients", type=int, default=50, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=4, help="클라이언트당 요청 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="스텁 LLM 응답 지연(초)")
+    parser.add_argument("--embed-latency", type=float, default=0.05, help="스텁 임베딩 지연(초)")
+    parser.add_argument("--baseline", action="store_true", help="동기 호출 방식 라우트도 함께 측정")
+    asyncio.run(main(parser.parse_args()))
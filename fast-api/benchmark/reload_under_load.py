@@ -0,0 +1,114 @@
+"""
+FAISS 스냅샷 무중단 교체 벤치마크
+
+임시 디렉토리에 스냅샷 두 개를 만든 뒤, 동시 검색 요청을 계속 보내면서
+주기적으로 두 스냅샷을 번갈아 교체(areload_index)하고 검색 지연과 실패 수를 측정합니다.
+교체가 없을 때와 비교해 p99 / 최대 지연이 튀지 않고 실패가 0이어야 합니다.
+
+사용법 (fast-api 디렉토리에서):
+    python benchmark/reload_under_load.py --seconds 5 --concurrency 32 --reload-interval 0.2
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_searches(service, seconds: float, concurrency: int, reload_interval: float) -> Dict:
+    latencies: List[float] = []
+    failures = 0
+    reloads = 0
+    deadline = time.perf_counter() + seconds
+    rng = np.random.default_rng(0)
+    dim = service.faiss_vectorstore.index.d
+    versions = service.index_store.list_versions()
+
+    async def searcher():
+        nonlocal failures
+        while time.perf_counter() < deadline:
+            query = rng.random(dim, dtype=np.float32).tolist()
+            started = time.perf_counter()
+            results = await service.asearch_faiss_with_scores("", k=8, embedding=query)
+            latencies.append(time.perf_counter() - started)
+            if len(results) != 8:
+                failures += 1
+
+    async def reloader():
+        nonlocal reloads
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(reload_interval)
+            await service.areload_index(versions[reloads % len(versions)])
+            reloads += 1
+
+    tasks = [searcher() for _ in range(concurrency)]
+    if reload_interval > 0:
+        tasks.append(reloader())
+    await asyncio.gather(*tasks)
+    return {
+        "searches": len(latencies),
+        "failures": failures,
+        "reloads": reloads,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else 0.0,
+    }
+
+
+async def main(args):
+    workdir = tempfile.mkdtemp(prefix="reload_bench_")
+    os.environ["VECTOR_STORE_DIR"] = os.path.join(workdir, "vector_store")
+    os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(workdir, "embedding_cache.sqlite3")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+
+    from service.index_store import create_index_store, load_snapshot
+    from service.faiss_chatbot import FAISSChatbotService
+
+    try:
+        # 원본 faiss_db로 스냅샷 두 개 게시 → 번갈아 교체
+        store = create_index_store()
+        shutil.copytree(os.path.join(APP_DIR, "vector_store", "faiss_db"), store.legacy_dir)
+        legacy = load_snapshot(store.legacy_dir, None, mmap=False)
+        for _ in range(2):
+            store.publish(legacy, {"documents": {}})
+
+        service = FAISSChatbotService()
+        print(
+            f"=== 스냅샷 교체 벤치마크: 동시 검색 {args.concurrency}개, {args.seconds}s, "
+            f"교체 주기 {args.reload_interval}s, 문서 수 {service.faiss_vectorstore.index.ntotal} ==="
+        )
+        for label, interval in [("교체 없음", 0.0), ("검색 중 교체", args.reload_interval)]:
+            result = await run_searches(service, args.seconds, args.concurrency, interval)
+            print(
+                f"{label:<10} 검색={result['searches']:<6} 실패={result['failures']:<3} 교체={result['reloads']:<4} "
+                f"p50={result['p50'] * 1000:>7.2f}ms  p99={result['p99'] * 1000:>7.2f}ms  "
+                f"max={result['max'] * 1000:>7.2f}ms"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FAISS 스냅샷 무중단 교체 벤치마크")
+    parser.add_argument("--seconds", type=float, default=5.0, help="측정 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 검색 수")
+    parser.add_argument("--reload-interval", type=float, default=0.2, help="스냅샷 교체 주기(초)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+검색 방식별 recall@k / 지연 시간 벤치마크
+
+benchmark/data/retrieval_queries.json의 라벨링된 질문(정답 = 월령 범위 + 섹션 제목)으로
+dense(FAISS) / sparse(BM25) / hybrid(RRF) 검색의 recall@k, hit@k, 질문당 지연 시간을 비교합니다.
+
+- sparse는 로컬 인덱스만 사용하므로 항상 측정합니다.
+- dense / hybrid는 질문 임베딩이 필요하므로 OPENAI_API_KEY가 있을 때만 측정합니다.
+  (임베딩 캐시를 사용하므로 두 번째 실행부터는 API를 다시 호출하지 않습니다.
+   --no-embedding-cache로 첫 실행과 같은 네트워크 지연을 포함해 측정할 수 있습니다.)
+
+사용법 (fast-api 디렉토리에서):
+    python benchmark/retrieval_recall.py --k 1 3 5 8
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Dict, List, Set, Tuple
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+QUERIES_PATH = os.path.join(APP_DIR, "benchmark", "data", "retrieval_queries.json")
+
+
+def relevant_keys(entry: Dict) -> Set[Tuple[str, str]]:
+    return {(category, section) for category, section in entry["relevant"]}
+
+
+def doc_label(doc) -> Tuple[str, str]:
+    return doc.metadata.get("category_name", ""), doc.metadata.get("section_title", "")
+
+
+def evaluate(service, mode: str, queries: List[Dict], ks: List[int], use_cache: bool) -> Dict:
+    service.retrieval_mode = mode
+    max_k = max(ks)
+    recalls = {k: [] for k in ks}
+    hits = {k: [] for k in ks}
+    latencies = []
+
+    for entry in queries:
+        question = entry["query"]
+        started = time.perf_counter()
+        embedding = None
+        if mode != "sparse":
+            embedder = service.embedding_model if use_cache else service.embedding_model.underlying
+            embedding = embedder.embed_query(question)
+        results, _ = service.retrieve(question, k=max_k, embedding=embedding)
+        latencies.append(time.perf_counter() - started)
+
+        relevant = relevant_keys(entry)
+        labels = [doc_label(doc) for doc, _ in results]
+        for k in ks:
+            found = relevant & set(labels[:k])
+            recalls[k].append(len(found) / len(relevant))
+            hits[k].append(1.0 if found else 0.0)
+
+    return {
+        "recall": {k: statistics.mean(values) for k, values in recalls.items()},
+        "hit": {k: statistics.mean(values) for k, values in hits.items()},
+        "latency_ms_p50": statistics.median(latencies) * 1000,
+        "latency_ms_max": max(latencies) * 1000,
+    }
+
+
+def main(args):
+    has_api_key = bool(os.getenv("OPENAI_API_KEY"))
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+
+    from service.faiss_chatbot import FAISSChatbotService
+
+    with open(QUERIES_PATH, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+
+    service = FAISSChatbotService()
+    modes = ["sparse"]
+    if has_api_key:
+        modes += ["dense", "hybrid"]
+
+    print(f"=== 검색 recall 벤치마크: 라벨링 질문 {len(queries)}개, 문서 {len(service.sparse_index)}개 ===")
+    if not has_api_key:
+        print("ℹ️ OPENAI_API_KEY가 없어 dense / hybrid 측정은 건너뜁니다.")
+
+    for mode in modes:
+        result = evaluate(service, mode, queries, args.k, use_cache=not args.no_embedding_cache)
+        recall = "  ".join(f"R@{k}={result['recall'][k]:.2f}" for k in args.k)
+        hit = "  ".join(f"H@{k}={result['hit'][k]:.2f}" for k in args.k)
+        print(
+            f"{mode:<7} {recall}  |  {hit}  |  "
+            f"p50={result['latency_ms_p50']:>7.1f}ms max={result['latency_ms_max']:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검색 방식별 recall@k / 지연 시간 벤치마크")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 8], help="recall@k의 k 목록")
+    parser.add_argument("--no-embedding-cache", action="store_true", help="임베딩 캐시 없이 API 직접 호출")
+    main(parser.parse_args())
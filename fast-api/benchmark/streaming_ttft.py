@@ -0,0 +1,78 @@
+"""
+/tuning 첫 토큰 지연(TTFT) 벤치마크 (오프라인)
+
+batching_throughput.py와 같은 무작위 가중치 소형 모델로 LGExaoneAdvancedChatbot을 구성하고,
+전체 생성 후 한 번에 반환하는 방식(agenerate_response)과
+토큰 스트리밍 방식(astream_response)의 첫 응답 도착 시간을 비교합니다.
+
+사용법 (fast-api 디렉토리에서):
+    python benchmark/streaming_ttft.py --max-new-tokens 128 --runs 5
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service.chatbot import LGExaoneAdvancedChatbot
+from benchmark.batching_throughput import SAMPLE_QUESTIONS, build_tiny_model
+
+
+async def measure_blocking(chatbot: LGExaoneAdvancedChatbot, question: str, max_new_tokens: int) -> float:
+    started = time.perf_counter()
+    await chatbot.agenerate_response(question, max_new_tokens=max_new_tokens)
+    return time.perf_counter() - started
+
+
+async def measure_streaming(chatbot: LGExaoneAdvancedChatbot, question: str, max_new_tokens: int):
+    started = time.perf_counter()
+    first_token = None
+    async for _ in chatbot.astream_response(question, max_new_tokens=max_new_tokens):
+        if first_token is None:
+            first_token = time.perf_counter() - started
+    return first_token or 0.0, time.perf_counter() - started
+
+
+async def main(args):
+    tokenizer, model = build_tiny_model(args.vocab_size, args.layers, args.hidden)
+    chatbot = LGExaoneAdvancedChatbot()
+    chatbot.device = torch.device("cpu")
+    chatbot.tokenizer = tokenizer
+    chatbot.model = model
+    chatbot._is_model_loaded = True
+
+    print(
+        f"=== TTFT 벤치마크: max_new_tokens={args.max_new_tokens}, {args.runs}회, "
+        f"모델 {args.layers}층/{args.hidden}차원 (무작위 가중치, CPU) ==="
+    )
+
+    blocking, streaming_first, streaming_total = [], [], []
+    for i in range(args.runs):
+        question = SAMPLE_QUESTIONS[i % len(SAMPLE_QUESTIONS)]
+        blocking.append(await measure_blocking(chatbot, question, args.max_new_tokens))
+        first, total = await measure_streaming(chatbot, question, args.max_new_tokens)
+        streaming_first.append(first)
+        streaming_total.append(total)
+
+    print(f"{'일괄 반환 (/tuning)':<24} 첫 응답 median={statistics.median(blocking) * 1000:>8.1f}ms")
+    print(
+        f"{'스트리밍 (/tuning/stream)':<24} 첫 토큰 median={statistics.median(streaming_first) * 1000:>8.1f}ms  "
+        f"전체 median={statistics.median(streaming_total) * 1000:>8.1f}ms"
+    )
+    await chatbot.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exaone 스트리밍 첫 토큰 지연 벤치마크")
+    parser.add_argument("--max-new-tokens", type=int, default=128, help="요청당 생성 토큰 수")
+    parser.add_argument("--runs", type=int, default=5, help="반복 횟수")
+    parser.add_argument("--vocab-size", type=int, default=500, help="토크나이저 어휘 수")
+    parser.add_argument("--layers", type=int, default=4, help="모델 층 수")
+    parser.add_argument("--hidden", type=int, default=256, help="모델 은닉 차원")
+    asyncio.run(main(parser.parse_args()))
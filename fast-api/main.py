@@ -1,10 +1,15 @@
+import json
 import logging
 import sys
+import time
 import traceback
 import os
+import secrets
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional
 from pydantic import BaseModel
 from service.chatbot import LGExaoneAdvancedChatbot
 from service.vectordb import FaissCommand
@@ -34,6 +39,23 @@ logger = logging.getLogger(__name__)
 chatbot = LGExaoneAdvancedChatbot()
 faiss_db = FaissCommand()
 
+# 시작 시 FAISS 인덱스 처리 방식
+#   validate: 원본 JSON 해시가 현재 스냅샷과 같으면 재구축 없이 기존 인덱스 사용 (기본)
+#   rebuild : 항상 FaissCommand 실행 (바뀐 문서만 증분 반영)
+#   skip    : 인덱스 확인 없이 바로 시작
+FAISS_STARTUP_MODE = os.getenv("FAISS_STARTUP_MODE", "validate").lower()
+# 새 FAISS 스냅샷(CURRENT 변경) 확인 주기(초), 0이면 자동 교체 안 함
+FAISS_WATCH_INTERVAL = float(os.getenv("FAISS_WATCH_INTERVAL", "10"))
+# /admin 엔드포인트에 필요한 X-Admin-Token 값 (설정하지 않으면 /admin 엔드포인트는 모두 404)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+startup_state = {
+    "ready": False,
+    "faiss_startup_mode": FAISS_STARTUP_MODE,
+    "faiss_action": None,
+    "faiss_seconds": None,
+    "model_seconds": None,
+}
+
 # 이모지 대체 함수
 def replace_emoji(text: str) -> str:
     emoji_map = {
@@ -53,16 +75,48 @@ def replace_emoji(text: str) -> str:
 async def lifespan(app: FastAPI):
     # ⏳ 서버 시작 시 실행
     print('서버 실행')
+    started = time.perf_counter()
     chatbot.load_model()
+    startup_state["model_seconds"] = round(time.perf_counter() - started, 3)
     print('모델 로드')
-    faiss_db.handle()
-    print('파이어스')
+
+    started = time.perf_counter()
+    prepare_faiss_index()
+    startup_state["faiss_seconds"] = round(time.perf_counter() - started, 3)
+    startup_state["ready"] = True
+    print(f'FAISS 준비 완료: {startup_state["faiss_action"]} ({startup_state["faiss_seconds"]}s)')
+    faiss_chatbot_service.start_index_watcher(FAISS_WATCH_INTERVAL)
 
     yield
 
+    # 🧹 서버 종료 시 실행
+    await faiss_chatbot_service.stop_index_watcher()
+    await chatbot.shutdown()
+
 faiss_chatbot_service = FAISSChatbotService()
 memory_chatbot_service = MemoryChatbotService()
 
+def prepare_faiss_index():
+    """FAISS_STARTUP_MODE에 따라 인덱스를 확인/재구축하고 서비스 인덱스를 최신 스냅샷으로 맞춤"""
+    if FAISS_STARTUP_MODE == "skip":
+        startup_state["faiss_action"] = "skipped"
+        return
+
+    if FAISS_STARTUP_MODE == "rebuild":
+        faiss_db.handle()
+        startup_state["faiss_action"] = "rebuilt"
+    else:
+        up_to_date, reason = faiss_db.is_up_to_date()
+        if up_to_date:
+            startup_state["faiss_action"] = f"validated ({reason})"
+        else:
+            faiss_db.handle()
+            startup_state["faiss_action"] = f"rebuilt ({reason})"
+
+    # import 시점에 로드한 인덱스가 방금 게시된 스냅샷과 다르면 다시 로드
+    if faiss_chatbot_service.index_version != faiss_chatbot_service.index_store.current_version():
+        faiss_chatbot_service.reload_index()
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="Enhanced Special Chat API",
@@ -85,8 +139,13 @@ app.add_middleware(
 )
 
 # 요청 스키마 정의
+class ReloadRequest(BaseModel):
+    version: Optional[str] = None  # 없으면 CURRENT가 가리키는 스냅샷
+
 class ChatRequest(BaseModel):
     message: str
+    # 대화 기록을 이어갈 세션 ID (없으면 이전 대화 없이 단발성 질문으로 처리)
+    session_id: Optional[str] = None
 
 @app.get("/")
 async def root():
@@ -109,8 +168,8 @@ async def chatbot_response(payload: ChatRequest):
         raise HTTPException(status_code=400, detail="메시지가 비어 있습니다.")
 
     try:
-        # 모델을 통해 응답 생성
-        bot_response = chatbot.generate_response(user_input)
+        # 모델을 통해 응답 생성 (동시 요청과 배치로 묶여 전용 스레드 풀에서 실행)
+        bot_response = await chatbot.agenerate_response(user_input)
 
         return {
             "response": bot_response
@@ -121,11 +180,99 @@ async def chatbot_response(payload: ChatRequest):
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail="AI 응답 생성 중 오류가 발생했습니다.")
     
+@app.post("/tuning/stream")
+async def chatbot_stream_response(payload: ChatRequest):
+    """
+    Exaone 응답을 토큰 단위로 스트리밍 (Server-Sent Events)
+    이벤트 형식: data: {"type": "token" | "done" | "error", "content": "..."}
+    """
+    user_input = payload.message.strip()
+
+    if not user_input:
+        raise HTTPException(status_code=400, detail="메시지가 비어 있습니다.")
+
+    async def event_stream():
+        try:
+            async for chunk in chatbot.astream_response(user_input):
+                yield f"data: {json.dumps({'type': 'token', 'content': chunk}, ensure_ascii=False)}\n\n"
+            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        except Exception as e:
+            logger.error(f"스트리밍 응답 생성 실패: {str(e)}")
+            logger.error(traceback.format_exc())
+            error = {'type': 'error', 'content': "AI 응답 생성 중 오류가 발생했습니다."}
+            yield f"data: {json.dumps(error, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/ready")
+async def readiness():
+    """준비 상태 확인 (모델 + FAISS 인덱스가 모두 준비되면 200, 아니면 503)"""
+    faiss_status = faiss_chatbot_service.get_service_status()
+    ready = (
+        startup_state["ready"]
+        and chatbot._is_model_loaded
+        and faiss_status.get("faiss_available", False)
+    )
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            **startup_state,
+            "ready": ready,
+            "model_loaded": chatbot._is_model_loaded,
+            "faiss_index_version": faiss_status.get("faiss_index_version"),
+            "faiss_document_count": faiss_status.get("faiss_document_count"),
+        }
+    )
+
+def check_admin_token(token: Optional[str]):
+    """ADMIN_TOKEN이 없으면 관리자 엔드포인트를 닫아 둠 (404), 토큰은 상수 시간 비교"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token is None or not secrets.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+
+@app.post("/admin/faiss/reload")
+async def reload_faiss_index(payload: Optional[ReloadRequest] = None,
+                             x_admin_token: Optional[str] = Header(default=None)):
+    """
+    FAISS 스냅샷 무중단 교체 (백그라운드 로드 후 참조 교체)
+    요청 예시: {} 또는 { "version": "20250101-120000-123456789" } (보관 중인 스냅샷으로 롤백)
+    """
+    check_admin_token(x_admin_token)
+    version = payload.version if payload else None
+    try:
+        return await faiss_chatbot_service.areload_index(version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"FAISS 스냅샷 교체 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="FAISS 스냅샷 교체 중 오류가 발생했습니다.")
+
+@app.get("/admin/faiss/versions")
+async def list_faiss_versions(x_admin_token: Optional[str] = Header(default=None)):
+    """보관 중인 FAISS 스냅샷 목록과 현재 서비스 중인 버전"""
+    check_admin_token(x_admin_token)
+    store = faiss_chatbot_service.index_store
+    return {
+        "current": store.current_version(),
+        "serving": faiss_chatbot_service.index_version,
+        "versions": store.list_versions()
+    }
+
+@app.get("/tuning/metrics")
+async def tuning_metrics():
+    """/tuning 배치 처리 지표 (tokens/sec, 큐 대기 시간, 평균 배치 크기)"""
+    return chatbot.get_batch_metrics()
+    
 @app.post("/vector")
 async def faiss_chat_endpoint(payload: ChatRequest):
     """
     POST 방식으로 FAISS 기반 GPT-4o 챗봇 응답 반환
-    요청 예시: { "message": "3개월 아기 수유 간격 알려줘요" }
+    요청 예시: { "message": "3개월 아기 수유 간격 알려줘요", "session_id": "abc-123" }
     """
     user_input = payload.message.strip()
 
@@ -135,17 +282,23 @@ async def faiss_chat_endpoint(payload: ChatRequest):
             "status": "fail"
         }
 
-    result = faiss_chatbot_service.chat(user_input)
+    result = await faiss_chatbot_service.async_chat(user_input, payload.session_id)
 
     return {
-        "response": result.get("answer")
+        "response": result.get("answer"),
+        "session_id": payload.session_id
     }
 
+@app.get("/vector/metrics")
+async def faiss_cache_metrics():
+    """/vector 의미 캐시 지표 (적중률, 절약한 LLM 호출 수)"""
+    return faiss_chatbot_service.get_cache_metrics()
+
 @app.post("/openai")
 async def memory_chat_endpoint(payload: ChatRequest):
     """
     POST 방식으로 GPT-4o Memory 챗봇 응답 반환
-    요청 예시: { "message": "3개월 아기 수면시간이 궁금해요" }
+    요청 예시: { "message": "3개월 아기 수면시간이 궁금해요", "session_id": "abc-123" }
     """
     user_input = payload.message.strip()
 
@@ -155,8 +308,9 @@ async def memory_chat_endpoint(payload: ChatRequest):
             "status": "fail"
         }
 
-    result = memory_chatbot_service.chat(user_input)
+    result = await memory_chatbot_service.async_chat(user_input, payload.session_id)
 
     return {
-        "response": result.get("answer")
+        "response": result.get("answer"),
+        "session_id": payload.session_id
     }
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+동시 요청 마이크로 배칭 스케줄러
+
+짧은 시간(max_wait_ms) 동안 들어온 요청을 최대 max_batch_size개까지 모아
+한 번의 배치 함수 호출로 처리한 뒤, 각 요청을 기다리는 호출자에게 결과를 돌려줍니다.
+배치 함수는 블로킹 함수여도 되며 지정한 executor에서 실행됩니다.
+
+    scheduler = MicroBatchScheduler(batch_fn, executor=executor, max_batch_size=8, max_wait_ms=20)
+    result = await scheduler.submit(payload, key=generation_params)
+
+batch_fn(payloads, key) -> (results, generated_tokens)
+같은 key(예: 생성 파라미터)를 가진 요청끼리만 하나의 배치로 묶입니다.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BatchFn = Callable[[List[Any], Hashable], Tuple[List[Any], int]]
+
+
+class BatchMetrics:
+    """배치 처리량 / 대기 시간 지표"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.generated_tokens = 0
+        self.generation_seconds = 0.0
+        self._queue_waits: Deque[float] = deque(maxlen=window)
+        self._batch_sizes: Deque[int] = deque(maxlen=window)
+
+    def record_batch(self, size: int, queue_waits: List[float], tokens: int, seconds: float, failed: bool = False):
+        with self._lock:
+            self.requests += size
+            self.batches += 1
+            if failed:
+                self.failed_batches += 1
+            self.generated_tokens += tokens
+            self.generation_seconds += seconds
+            self._queue_waits.extend(queue_waits)
+            self._batch_sizes.append(size)
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = list(self._queue_waits)
+            sizes = list(self._batch_sizes)
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "avg_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else 0.0,
+                "generated_tokens": self.generated_tokens,
+                "tokens_per_second": round(self.generated_tokens / self.generation_seconds, 2)
+                if self.generation_seconds else 0.0,
+                "queue_wait_ms_avg": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+                "queue_wait_ms_p50": round(self._percentile(waits, 50) * 1000, 2),
+                "queue_wait_ms_p95": round(self._percentile(waits, 95) * 1000, 2),
+            }
+
+
+class _PendingRequest:
+    __slots__ = ("payload", "key", "future", "enqueued_at")
+
+    def __init__(self, payload: Any, key: Hashable, future: asyncio.Future, enqueued_at: float):
+        self.payload = payload
+        self.key = key
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class MicroBatchScheduler:
+    """시간 창 기반 동적 배칭 스케줄러"""
+
+    def __init__(self, batch_fn: BatchFn, executor: Optional[Executor] = None,
+                 max_batch_size: int = 8, max_wait_ms: float = 20.0,
+                 max_concurrent_batches: int = 1):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.metrics = BatchMetrics()
+
+        self._pending: Deque[_PendingRequest] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running_batches: Set[asyncio.Task] = set()
+
+    async def submit(self, payload: Any, key: Hashable = None) -> Any:
+        """요청을 큐에 넣고 배치 처리 결과를 기다림"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(_PendingRequest(payload, key, future, loop.time()))
+        self._wakeup.set()
+        return await future
+
+    def queue_size(self) -> int:
+        return len(self._pending)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self.metrics.snapshot()
+        metrics.update({
+            "queue_size": self.queue_size(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        })
+        return metrics
+
+    async def close(self):
+        """디스패처 종료 (대기 중인 요청은 취소)"""
+        if self._dispatcher and not self._dispatcher.done():
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        while self._pending:
+            request = self._pending.popleft()
+            if not request.future.done():
+                request.future.cancel()
+        self._dispatcher = None
+
+    def _ensure_started(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def _dispatch_loop(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # 실행 중인 배치가 끝날 때까지 기다리는 동안 들어온 요청은 다음 배치에 합류
+            await self._slots.acquire()
+            batch = await self._collect_batch()
+            if not batch:
+                self._slots.release()
+                continue
+
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running_batches.add(task)
+            task.add_done_callback(self._running_batches.discard)
+
+    def _take_matching(self, batch: List[_PendingRequest], key: Hashable):
+        """대기열에서 같은 key의 요청을 순서대로 꺼내 배치에 추가"""
+        remaining: Deque[_PendingRequest] = deque()
+        while self._pending:
+            request = self._pending.popleft()
+            if request.future.done():
+                continue  # 호출자가 이미 취소한 요청
+            if request.key == key and len(batch) < self.max_batch_size:
+                batch.append(request)
+            else:
+                remaining.append(request)
+        self._pending = remaining
+
+    async def _collect_batch(self) -> List[_PendingRequest]:
+        loop = asyncio.get_running_loop()
+        first = None
+        while self._pending and first is None:
+            candidate = self._pending.popleft()
+            if not candidate.future.done():
+                first = candidate
+        if first is None:
+            return []
+
+        batch = [first]
+        # 첫 요청이 큐에 들어온 시점부터 max_wait까지만 기다림
+        deadline = first.enqueued_at + self.max_wait
+        while True:
+            self._take_matching(batch, first.key)
+            remaining = deadline - loop.time()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                self._take_matching(batch, first.key)
+                break
+        return batch
+
+    async def _run_batch(self, batch: List[_PendingRequest]):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        queue_waits = [started - request.enqueued_at for request in batch]
+        perf_started = time.perf_counter()
+        try:
+            results, tokens = await loop.run_in_executor(
+                self.executor, self.batch_fn, [request.payload for request in batch], batch[0].key
+            )
+            if len(results) != len(batch):
+                raise ValueError(f"배치 결과 수 불일치: 요청 {len(batch)}개, 결과 {len(results)}개")
+            self.metrics.record_batch(len(batch), queue_waits, tokens, time.perf_counter() - perf_started)
+            for request, result in zip(batch, results):
+                if not request.future.done():
+                    request.future.set_result(result)
+        except Exception as e:
+            logger.error(f"[배치] 배치 처리 실패 (크기 {len(batch)}): {e}")
+            self.metrics.record_batch(len(batch), queue_waits, 0, time.perf_counter() - perf_started, failed=True)
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._slots.release()
@@ -3,8 +3,20 @@ import os
 import gc
 import logging
 import sys
+import asyncio
 import traceback
-from transformers import AutoTokenizer, AutoModelForCausalLM
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, List, Tuple
+from transformers import (
+    AutoTokenizer,
+    AutoModelForCausalLM,
+    AsyncTextIteratorStreamer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+)
+from service.batching import MicroBatchScheduler
 
 # 로깅 설정
 log_dir = "log"
@@ -38,6 +50,16 @@ def check_gpu_status():
         logger.info("[시스템] GPU 사용 불가, CPU로 실행")
         return False, "cpu"
 
+class StopOnEvent(StoppingCriteria):
+    """외부에서 이벤트를 설정하면 생성을 중단 (스트리밍 클라이언트 연결 종료 시)"""
+
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device)
+
+
 class LGExaoneAdvancedChatbot:
     def __init__(self, model_name="Snowfall0601/results_exaone_lora_sleep_dev"):
         logger.info("[초기화] LGExaoneAdvancedChatbot 인스턴스 생성 중...")
@@ -49,7 +71,26 @@ class LGExaoneAdvancedChatbot:
 
         self.has_gpu, device_str = check_gpu_status()
         self.device = torch.device(device_str)
-        logger.info(f"[초기화 완료] 디바이스: {self.device}")
+
+        # model.generate는 블로킹 호출이므로 전용 스레드 풀에서 실행 (동시 실행 수 제한)
+        self.max_workers = int(os.getenv("EXAONE_MAX_WORKERS", "1"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="exaone-generate"
+        )
+
+        # 동시에 들어온 /tuning 요청을 짧은 시간 창 안에서 모아 한 번의 generate로 처리
+        self.batcher = MicroBatchScheduler(
+            self._generate_batch_job,
+            executor=self._executor,
+            max_batch_size=int(os.getenv("EXAONE_BATCH_MAX_SIZE", "8")),
+            max_wait_ms=float(os.getenv("EXAONE_BATCH_MAX_WAIT_MS", "20")),
+            max_concurrent_batches=self.max_workers
+        )
+        logger.info(
+            f"[초기화 완료] 디바이스: {self.device}, 생성 워커 수: {self.max_workers}, "
+            f"배치 크기: {self.batcher.max_batch_size}, 배치 대기: {self.batcher.max_wait * 1000:.0f}ms"
+        )
 
     def load_model(self) -> bool:
         if self._is_model_loaded:
@@ -82,18 +123,85 @@ class LGExaoneAdvancedChatbot:
             logger.error(traceback.format_exc())
             return False
 
+    def _build_prompt(self, user_input: str) -> str:
+        system_prompt = "당신은 아이의 발달 및 수면에 조언을 주는 소아과 전문의 AI입니다."
+        return f"{system_prompt}\n사용자: {user_input}\nAI:"
+
+    def generate_batch(self, user_inputs: List[str], max_new_tokens=512, temperature=0.7, top_p=0.9) -> Tuple[List[str], int]:
+        """여러 입력을 왼쪽 패딩으로 묶어 한 번의 generate 호출로 응답 생성
+
+        Returns:
+            (입력 순서대로의 응답 목록, 생성된 토큰 수)
+        """
+        logger.info(f"[요청 처리] {len(user_inputs)}개 입력 배치 응답 생성 중...")
+        prompts = [self._build_prompt(user_input) for user_input in user_inputs]
+
+        logger.info("[프롬프트] 토크나이즈 시작")
+        # decoder-only 모델은 생성이 오른쪽 끝에서 이어지므로 왼쪽 패딩 사용
+        self.tokenizer.padding_side = "left"
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.device)
+        prompt_length = inputs["input_ids"].shape[1]
+
+        logger.info("[모델] 응답 생성 중...")
+        with torch.no_grad():
+            output = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                do_sample=True,
+                pad_token_id=self.tokenizer.pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id
+            )
+        logger.info("[모델] 응답 생성 완료")
+
+        new_tokens = output[:, prompt_length:]
+        generated_tokens = int((new_tokens != self.tokenizer.pad_token_id).sum().item())
+        responses = [
+            text.strip()
+            for text in self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+        ]
+
+        for user_input, response in zip(user_inputs, responses):
+            self.chat_history.append({
+                "user": user_input,
+                "assistant": response
+            })
+        logger.info("[응답 완료] 응답 반환 중...")
+        return responses, generated_tokens
+
     def generate_response(self, user_input: str, max_new_tokens=512, temperature=0.7, top_p=0.9) -> str:
-        logger.info("[요청 처리] 사용자 입력 수신 및 응답 생성 중...")
         try:
-            system_prompt = "당신은 아이의 발달 및 수면에 조언을 주는 소아과 전문의 AI입니다."
-            prompt = f"{system_prompt}\n사용자: {user_input}\nAI:"
-            logger.info("[프롬프트] 토크나이즈 시작")
-            inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
+            responses, _ = self.generate_batch([user_input], max_new_tokens, temperature, top_p)
+            return responses[0]
+        except Exception as e:
+            logger.error(f"[오류] 응답 생성 실패: {e}")
+            logger.error(traceback.format_exc())
+            return "죄송합니다. 응답 생성 중 오류가 발생했습니다."
+
+    def _generate_batch_job(self, user_inputs: List[str], params: Tuple[int, float, float]) -> Tuple[List[str], int]:
+        """MicroBatchScheduler에서 호출하는 배치 작업 (실패 시 모든 요청에 오류 메시지 반환)"""
+        max_new_tokens, temperature, top_p = params
+        try:
+            return self.generate_batch(user_inputs, max_new_tokens, temperature, top_p)
+        except Exception as e:
+            logger.error(f"[오류] 배치 응답 생성 실패: {e}")
+            logger.error(traceback.format_exc())
+            return ["죄송합니다. 응답 생성 중 오류가 발생했습니다."] * len(user_inputs), 0
+
+    async def agenerate_response(self, user_input: str, max_new_tokens=512, temperature=0.7, top_p=0.9) -> str:
+        """동시 요청과 함께 배치로 묶어 전용 스레드 풀에서 응답 생성 (이벤트 루프 비차단)"""
+        return await self.batcher.submit(user_input, key=(max_new_tokens, temperature, top_p))
 
-            logger.info("[모델] 응답 생성 중...")
+    def _stream_generate(self, inputs, streamer, stop_event: threading.Event,
+                         max_new_tokens: int, temperature: float, top_p: float):
+        """스트리머로 토큰을 흘려보내며 generate 실행 (생성 스레드 풀에서 호출)"""
+        try:
             with torch.no_grad():
-                output = self.model.generate(
+                self.model.generate(
                     **inputs,
+                    streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList([StopOnEvent(stop_event)]),
                     max_new_tokens=max_new_tokens,
                     temperature=temperature,
                     top_p=top_p,
@@ -101,21 +209,53 @@ class LGExaoneAdvancedChatbot:
                     pad_token_id=self.tokenizer.pad_token_id,
                     eos_token_id=self.tokenizer.eos_token_id
                 )
-            logger.info("[모델] 응답 생성 완료")
+        except Exception:
+            # 소비 측이 끝없이 기다리지 않도록 스트림 종료 신호 전송
+            streamer.end()
+            raise
 
-            decoded = self.tokenizer.decode(output[0], skip_special_tokens=True)
-            response = decoded.replace(prompt, "").strip()
-            logger.info("[응답 완료] 응답 반환 중...")
+    async def astream_response(self, user_input: str, max_new_tokens=512, temperature=0.7, top_p=0.9) -> AsyncIterator[str]:
+        """디코딩 단계마다 생성된 텍스트 조각을 순서대로 반환하는 비동기 제너레이터
 
-            self.chat_history.append({
-                "user": user_input,
-                "assistant": response
-            })
+        소비 측이 중간에 반복을 멈추면(클라이언트 연결 종료) 다음 디코딩 단계에서 생성을 중단합니다.
+        """
+        logger.info("[스트리밍] 사용자 입력 수신 및 스트리밍 응답 생성 중...")
+        prompt = self._build_prompt(user_input)
+        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
 
-            logger.info(self.chat_history)
+        streamer = AsyncTextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        stop_event = threading.Event()
+        loop = asyncio.get_running_loop()
+        generation = loop.run_in_executor(
+            self._executor,
+            partial(self._stream_generate, inputs, streamer, stop_event, max_new_tokens, temperature, top_p)
+        )
 
-            return response
-        except Exception as e:
-            logger.error(f"[오류] 응답 생성 실패: {e}")
-            logger.error(traceback.format_exc())
-            return "죄송합니다. 응답 생성 중 오류가 발생했습니다."
\ No newline at end of file
+        chunks = []
+        try:
+            async for text in streamer:
+                if text:
+                    chunks.append(text)
+                    yield text
+            await generation
+        finally:
+            stop_event.set()
+            if not generation.done():
+                # 연결이 끊긴 경우: 생성 스레드가 멈춘 뒤 정리되도록 결과만 소비
+                generation.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        response = "".join(chunks).strip()
+        self.chat_history.append({
+            "user": user_input,
+            "assistant": response
+        })
+        logger.info("[스트리밍] 응답 스트리밍 완료")
+
+    def get_batch_metrics(self):
+        """배치 처리량(tokens/sec) 및 큐 대기 시간 지표"""
+        return self.batcher.get_metrics()
+
+    async def shutdown(self):
+        """배치 스케줄러 및 생성 스레드 풀 정리"""
+        await self.batcher.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,227 @@
+"""
+OpenAI 임베딩 결과 캐시
+
+같은 텍스트(질문 / 문서 청크)를 다시 임베딩하지 않도록 OpenAIEmbeddings를 감싸는 캐시입니다.
+키는 "모델 이름 + 텍스트"의 SHA-256 해시이며 두 단계로 조회합니다.
+- 1단계: 프로세스 내 LRU (OrderedDict)
+- 2단계: SQLite 파일 (float32 BLOB) — 서버를 재시작해도 유지
+
+    embeddings = create_cached_embeddings(openai_api_key=api_key)
+    FAISS.load_local(faiss_dir, embeddings)
+
+Django 서버와 FastAPI 서버는 따로 배포되므로(FastAPI 이미지는 fast-api/만 복사) 같은 내용의 파일을
+두 곳에 둡니다: django_back/mafather/chatbot/embedding_cache.py, fast-api/service/embedding_cache.py
+한쪽을 고치면 다른 쪽도 똑같이 고쳐야 합니다 (캐시 키와 테이블 형식이 같아야 EMBEDDING_CACHE_PATH로 같은 파일을 공유할 수 있음).
+
+환경 변수:
+    EMBEDDING_CACHE_PATH         SQLite 파일 경로 (기본 data/embedding_cache.sqlite3)
+    EMBEDDING_CACHE_MEMORY_SIZE  메모리 LRU 최대 항목 수 (기본 10000)
+"""
+
+import os
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+# SQLite 한 번의 IN 조회에 넣을 최대 키 수
+_SQLITE_BATCH = 500
+
+
+class CachedEmbeddings(Embeddings):
+    """메모리 LRU + SQLite 2단계 임베딩 캐시"""
+
+    def __init__(self, underlying: Embeddings, model_name: str, path: Optional[str] = None,
+                 max_memory_entries: int = 10000):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        # 메모리 LRU와 SQLite 연결은 잠금을 따로 둠 (디스크 I/O 중에도 이벤트 루프의 메모리 조회가 기다리지 않도록)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    vector BLOB NOT NULL
+                )
+            """)
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup_memory(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.memory_hits += len(found)
+        return found
+
+    def _lookup_disk(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        if self._conn is None or not keys:
+            return found
+        with self._db_lock:
+            for start in range(0, len(keys), _SQLITE_BATCH):
+                chunk = keys[start:start + _SQLITE_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        with self._lock:
+            for key, vector in found.items():
+                self._remember(key, vector)
+            self.disk_hits += len(found)
+        return found
+
+    def _remember(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _save_memory(self, items: Dict[str, List[float]]):
+        with self._lock:
+            self.misses += len(items)
+            for key, vector in items.items():
+                self._remember(key, vector)
+
+    def _save_disk(self, items: Dict[str, List[float]]):
+        if self._conn is None or not items:
+            return
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+            )
+
+    def _disk_keys(self, keys: List[str], found: Dict[str, List[float]]) -> List[str]:
+        return [key for key in dict.fromkeys(keys) if key not in found]
+
+    def _split(self, texts: List[str]):
+        """메모리 → 디스크 순서로 조회해서 (키, 찾은 임베딩, 캐시에 없는 텍스트) 반환"""
+        keys = [self._key(text) for text in texts]
+        found = self._lookup_memory(keys)
+        found.update(self._lookup_disk(self._disk_keys(keys, found)))
+        # 캐시에 없는 텍스트만 (중복 제거) 임베딩 API로 보냄
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        return keys, found, missing
+
+    def _save(self, items: Dict[str, List[float]]):
+        self._save_memory(items)
+        self._save_disk(items)
+
+    async def _asplit(self, texts: List[str]):
+        """_split과 같지만 SQLite 조회는 스레드 풀에서 실행 (메모리 적중이면 스레드 전환 없음)"""
+        keys = [self._key(text) for text in texts]
+        found = self._lookup_memory(keys)
+        disk_keys = self._disk_keys(keys, found)
+        if self._conn is not None and disk_keys:
+            found.update(await asyncio.to_thread(self._lookup_disk, disk_keys))
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        return keys, found, missing
+
+    async def _asave(self, items: Dict[str, List[float]]):
+        self._save_memory(items)
+        if self._conn is not None and items:
+            await asyncio.to_thread(self._save_disk, items)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._split(texts)
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._save(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._split([text])
+        if missing:
+            vector = self.underlying.embed_query(text)
+            self._save({keys[0]: vector})
+            return vector
+        return found[keys[0]]
+
+    # 비동기 경로는 이벤트 루프에서 SQLite 파일 I/O를 하지 않음 (조회 / 저장 모두 asyncio.to_thread)
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = await self._asplit(texts)
+        if missing:
+            vectors = await self.underlying.aembed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            await self._asave(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, found, missing = await self._asplit([text])
+        if missing:
+            vector = await self.underlying.aembed_query(text)
+            await self._asave({keys[0]: vector})
+            return vector
+        return found[keys[0]]
+
+    def stats(self) -> Dict[str, int]:
+        disk_entries = None
+        if self._conn is not None:
+            with self._db_lock:
+                disk_entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        with self._lock:
+            return {
+                "model": self.model_name,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses
+            }
+
+
+_shared_instances: Dict[tuple, CachedEmbeddings] = {}
+_shared_lock = threading.Lock()
+
+
+def create_cached_embeddings(openai_api_key: Optional[str],
+                             model: str = "text-embedding-3-small") -> CachedEmbeddings:
+    """OpenAIEmbeddings를 환경 변수 설정에 맞는 캐시로 감싸서 반환
+
+    같은 모델 / 캐시 파일이면 프로세스 안에서 하나의 인스턴스를 공유하므로
+    서비스 객체를 여러 번 만들어도 메모리 LRU가 유지됩니다.
+    """
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    default_path = os.path.join(app_dir, "data", "embedding_cache.sqlite3")
+    path = os.getenv("EMBEDDING_CACHE_PATH", default_path)
+
+    key = (model, openai_api_key, path)
+    with _shared_lock:
+        if key not in _shared_instances:
+            _shared_instances[key] = CachedEmbeddings(
+                OpenAIEmbeddings(model=model, openai_api_key=openai_api_key),
+                model_name=model,
+                path=path,
+                max_memory_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "10000"))
+            )
+        return _shared_instances[key]
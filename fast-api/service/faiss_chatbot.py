@@ -5,37 +5,62 @@ FAISS만을 사용하는 독립적인 챗봇 서비스
 """
 
 import os
+import time
 import asyncio
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
-from langchain_community.vectorstores import FAISS
 from langchain.schema import Document
+from service.session_store import SessionHistoryStore, create_session_store
+from service.embedding_cache import create_cached_embeddings
+from service.index_store import create_index_store, load_snapshot
+from service.semantic_cache import SemanticResponseCache, create_semantic_cache
+from service.sparse_index import BM25Index, document_key, reciprocal_rank_fusion
 
 load_dotenv()
 
 class FAISSChatbotService:
     """FAISS 전용 RAG 챗봇 서비스"""
     
-    def __init__(self):
+    def __init__(self, history_store: Optional[SessionHistoryStore] = None,
+                 semantic_cache: Optional[SemanticResponseCache] = None):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.embedding_model = None
         self.faiss_vectorstore = None
+        # 서비스 중인 스냅샷 문서로 만든 키워드(BM25) 인덱스
+        self.sparse_index: Optional[BM25Index] = None
+        # hybrid: 벡터 + 키워드 RRF 병합 (기본) / dense: 벡터만 / sparse: 키워드만 (임베딩 API 미사용)
+        self.retrieval_mode = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+        # 임베딩 API가 이 시간 안에 응답하지 않으면 키워드 검색만으로 답변
+        self.embedding_timeout = float(os.getenv("EMBEDDING_TIMEOUT_SECONDS", "3"))
         self.llm = None
         self.chain = None
-        self.chat_history = []
+        # 세션 ID별 대화 기록 (다른 사용자의 대화가 프롬프트에 섞이지 않도록 분리)
+        self.history_store = history_store or create_session_store(namespace="faiss")
+        # 반복 질문 응답 캐시 (원본 데이터나 인덱스 파일이 바뀌면 자동 무효화)
+        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.index_store = create_index_store()
+        self.index_version = None
+        # 스냅샷 교체 작업끼리만 직렬화 (검색 요청은 잠금 없이 현재 참조를 사용)
+        self._reload_lock = threading.Lock()
+        self._watched_version = None
+        self._watcher_task: Optional[asyncio.Task] = None
+        self.semantic_cache = semantic_cache or create_semantic_cache(watch_paths=[
+            os.path.join(app_dir, "data", "vector_db_final.json"),
+            self.index_store.current_file,
+            os.path.join(self.index_store.legacy_dir, "index.faiss")
+        ])
         self._initialize()
 
     def _initialize(self):
         """FAISS 전용 RAG 시스템 초기화"""
         try:
-            # OpenAI 임베딩 모델 초기화
-            self.embedding_model = OpenAIEmbeddings(
-                model="text-embedding-3-small",
-                openai_api_key=self.openai_api_key
-            )
+            # OpenAI 임베딩 모델 초기화 (같은 질문은 임베딩 캐시에서 재사용)
+            self.embedding_model = create_cached_embeddings(self.openai_api_key)
             
             # FAISS 로드
             self._load_faiss()
@@ -96,67 +121,222 @@ class FAISSChatbotService:
     def _load_faiss(self):
         """FAISS 벡터스토어 로드"""
         try:
-            # vectordb 앱의 faiss_db 경로
-            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            faiss_dir = os.path.join(app_dir, "vector_store","faiss_db")
-            print(os.path.exists(faiss_dir))
-            if os.path.exists(faiss_dir):
-                self.faiss_vectorstore = FAISS.load_local(
-                    faiss_dir, 
-                    self.embedding_model
-                )
-                doc_count = self._get_faiss_doc_count()
-                print(f"✅ FAISS 로드 성공: {faiss_dir} (문서 수: {doc_count})")
-            else:
-                print(f"⚠️ FAISS를 찾을 수 없습니다: {faiss_dir}")
-                raise FileNotFoundError(f"FAISS 경로가 존재하지 않습니다: {faiss_dir}")
-                
+            self.reload_index()
         except Exception as e:
             print(f"❌ FAISS 로드 오류: {str(e)}")
             raise
 
+    def reload_index(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """스냅샷을 새로 로드한 뒤 참조만 교체 (read-copy-update)
+
+        새 인덱스는 서비스 중인 인덱스와 별도로 로드/예열하고, 마지막에 참조 하나만 바꿉니다.
+        이미 진행 중인 검색은 시작할 때 잡은 이전 벡터스토어로 끝까지 처리되고
+        이전 인덱스는 마지막 참조가 사라질 때 해제됩니다.
+        version을 지정하면 보관 중인 해당 스냅샷으로 교체합니다 (롤백).
+        """
+        with self._reload_lock:
+            if version:
+                faiss_dir = self.index_store.snapshot_dir(version)
+                if not os.path.isdir(faiss_dir):
+                    raise FileNotFoundError(f"FAISS 스냅샷이 존재하지 않습니다: {version}")
+            else:
+                # CURRENT가 가리키는 스냅샷 (없으면 이전 방식의 faiss_db)
+                version = self.index_store.current_version()
+                faiss_dir = self.index_store.current_dir()
+                if faiss_dir == self.index_store.legacy_dir:
+                    version = None
+                self._watched_version = self.index_store.current_version()
+            if not faiss_dir:
+                print(f"⚠️ FAISS를 찾을 수 없습니다: {self.index_store.root}")
+                raise FileNotFoundError(f"FAISS 경로가 존재하지 않습니다: {self.index_store.root}")
+
+            started = time.perf_counter()
+            vectorstore = load_snapshot(faiss_dir, self.embedding_model)
+            self._warm_up(vectorstore)
+            sparse_index = BM25Index.from_vectorstore(vectorstore)
+            load_seconds = time.perf_counter() - started
+
+            previous_version = self.index_version
+            replaced = self.faiss_vectorstore is not None
+            self.faiss_vectorstore = vectorstore
+            self.sparse_index = sparse_index
+            self.index_version = version
+
+            if replaced and self.semantic_cache is not None:
+                self.semantic_cache.invalidate("index_reloaded")
+
+            doc_count = vectorstore.index.ntotal
+            print(f"✅ FAISS 로드 성공: {faiss_dir} (문서 수: {doc_count}, {load_seconds:.2f}s)")
+            return {
+                "previous_version": previous_version,
+                "version": version,
+                "document_count": doc_count,
+                "load_seconds": round(load_seconds, 3)
+            }
+
+    async def areload_index(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """이벤트 루프를 막지 않도록 별도 스레드에서 스냅샷 교체"""
+        return await asyncio.to_thread(self.reload_index, version)
+
+    @staticmethod
+    def _warm_up(vectorstore):
+        """교체 직후 첫 검색이 느려지지 않도록 메모리 매핑된 인덱스 페이지를 미리 읽음"""
+        index = vectorstore.index
+        if index.ntotal:
+            index.search(np.zeros((1, index.d), dtype=np.float32), 1)
+
+    def start_index_watcher(self, interval: float):
+        """CURRENT 파일을 주기적으로 확인해서 새 스냅샷이 게시되면 자동 교체"""
+        if interval <= 0 or self._watcher_task is not None:
+            return
+        self._watcher_task = asyncio.create_task(self._watch_index(interval))
+
+    async def stop_index_watcher(self):
+        if self._watcher_task is None:
+            return
+        self._watcher_task.cancel()
+        try:
+            await self._watcher_task
+        except asyncio.CancelledError:
+            pass
+        self._watcher_task = None
+
+    async def _watch_index(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            current = self.index_store.current_version()
+            if not current or current == self._watched_version:
+                continue
+            print(f"🔄 새 FAISS 스냅샷 감지: {self._watched_version} → {current}")
+            try:
+                await self.areload_index()
+            except Exception as e:
+                # 같은 버전을 계속 재시도하지 않도록 기록하고 이전 인덱스로 계속 서비스
+                self._watched_version = current
+                print(f"❌ FAISS 스냅샷 교체 실패 (이전 인덱스 유지): {e}")
+
     def _get_faiss_doc_count(self) -> int:
         """FAISS 문서 수 조회"""
         try:
-            if self.faiss_vectorstore:
-                return self.faiss_vectorstore.index.ntotal
+            vectorstore = self.faiss_vectorstore
+            if vectorstore:
+                return vectorstore.index.ntotal
         except:
             pass
         return 0
 
     def search_faiss(self, query: str, k: int = 8) -> List[Document]:
         """FAISS에서 문서 검색"""
-        if not self.faiss_vectorstore:
+        vectorstore = self.faiss_vectorstore
+        if not vectorstore:
             print("⚠️ FAISS가 로드되지 않았습니다.")
             return []
         
         try:
-            results = self.faiss_vectorstore.similarity_search(query, k=k)
+            results = vectorstore.similarity_search(query, k=k)
             print(f"🔍 FAISS 검색 결과: {len(results)}개 문서")
             return results
         except Exception as e:
             print(f"❌ FAISS 검색 오류: {e}")
             return []
 
-    def search_faiss_with_scores(self, query: str, k: int = 8) -> List[tuple]:
-        """FAISS에서 점수와 함께 문서 검색"""
-        if not self.faiss_vectorstore:
+    def search_faiss_with_scores(self, query: str, k: int = 8,
+                                 embedding: Optional[List[float]] = None) -> List[tuple]:
+        """FAISS에서 점수와 함께 문서 검색 (embedding이 있으면 임베딩 API를 다시 호출하지 않음)"""
+        # 검색 도중 인덱스가 교체되어도 시작할 때 잡은 벡터스토어로 끝까지 처리
+        vectorstore = self.faiss_vectorstore
+        if not vectorstore:
             print("⚠️ FAISS가 로드되지 않았습니다.")
             return []
         
         try:
-            results = self.faiss_vectorstore.similarity_search_with_score(query, k=k)
+            if embedding is not None:
+                results = vectorstore.similarity_search_with_score_by_vector(embedding, k=k)
+            else:
+                results = vectorstore.similarity_search_with_score(query, k=k)
             print(f"🔍 FAISS 점수 검색 결과: {len(results)}개 문서")
             return results
         except Exception as e:
             print(f"❌ FAISS 점수 검색 오류: {e}")
             return []
 
-    def chat(self, question: str) -> Dict[str, Any]:
-        """FAISS 기반 채팅"""
+    async def asearch_faiss_with_scores(self, query: str, k: int = 8,
+                                        embedding: Optional[List[float]] = None) -> List[tuple]:
+        """FAISS에서 점수와 함께 문서 검색 (비동기 임베딩 호출)"""
+        vectorstore = self.faiss_vectorstore
+        if not vectorstore:
+            print("⚠️ FAISS가 로드되지 않았습니다.")
+            return []
+        
+        try:
+            if embedding is not None:
+                results = await vectorstore.asimilarity_search_with_score_by_vector(embedding, k=k)
+            else:
+                results = await vectorstore.asimilarity_search_with_score(query, k=k)
+            print(f"🔍 FAISS 비동기 점수 검색 결과: {len(results)}개 문서")
+            return results
+        except Exception as e:
+            print(f"❌ FAISS 비동기 점수 검색 오류: {e}")
+            return []
+
+    def search_sparse(self, query: str, k: int = 8) -> List[tuple]:
+        """키워드(BM25) 검색 (점수가 높을수록 관련 있음)"""
+        sparse_index = self.sparse_index
+        if sparse_index is None:
+            return []
+        results = sparse_index.search(query, k=k)
+        print(f"🔍 BM25 검색 결과: {len(results)}개 문서")
+        return results
+
+    def retrieve(self, question: str, k: int = 8,
+                 embedding: Optional[List[float]] = None) -> Tuple[List[tuple], str]:
+        """검색 모드에 맞게 문서 검색 → (결과, 검색 방식)"""
+        dense_results = []
+        if embedding is not None:
+            candidates = k * 2 if self.retrieval_mode == "hybrid" else k
+            dense_results = self.search_faiss_with_scores(question, k=candidates, embedding=embedding)
+        return self._merge_results(question, k, dense_results)
+
+    async def aretrieve(self, question: str, k: int = 8,
+                        embedding: Optional[List[float]] = None) -> Tuple[List[tuple], str]:
+        """검색 모드에 맞게 문서 검색 (비동기)"""
+        dense_results = []
+        if embedding is not None:
+            candidates = k * 2 if self.retrieval_mode == "hybrid" else k
+            dense_results = await self.asearch_faiss_with_scores(question, k=candidates, embedding=embedding)
+        return self._merge_results(question, k, dense_results)
+
+    def _merge_results(self, question: str, k: int, dense_results: List[tuple]) -> Tuple[List[tuple], str]:
+        """벡터 / 키워드 결과 병합
+
+        반환하는 점수는 FAISS 거리(낮을수록 유사)이며, 키워드 검색으로만 찾은 문서는 None입니다.
+        """
+        if dense_results and self.retrieval_mode == "dense":
+            return dense_results[:k], "faiss"
+
+        sparse_results = self.search_sparse(question, k=k * 2)
+        if not dense_results:
+            # sparse 모드이거나 임베딩 API가 느리거나 실패한 경우
+            return [(doc, None) for doc, _ in sparse_results[:k]], "bm25"
+
+        distances = {document_key(doc): score for doc, score in dense_results}
+        fused = reciprocal_rank_fusion([dense_results, sparse_results])[:k]
+        return [(doc, distances.get(document_key(doc))) for doc, _ in fused], "hybrid"
+
+    def chat(self, question: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """FAISS 기반 채팅 (session_id가 없으면 대화 기록 없이 단발성 질문으로 처리)"""
         try:
-            # FAISS 검색 (점수와 함께)
-            search_results = self.search_faiss_with_scores(question, k=8)
+            chat_history = self.get_chat_history(session_id)
+            
+            # 질문 임베딩은 한 번만 계산해서 의미 캐시 조회와 FAISS 검색에 함께 사용
+            query_embedding = self._embed_query(question)
+            cached = self._lookup_cache(question, query_embedding, chat_history)
+            if cached:
+                self._add_to_history(session_id, question, cached["answer"])
+                return cached
+            
+            # 벡터 + 키워드 검색 (점수와 함께)
+            search_results, search_method = self.retrieve(question, k=8, embedding=query_embedding)
             
             if not search_results:
                 return {
@@ -174,7 +354,7 @@ class FAISSChatbotService:
             context = self._build_context_with_scores(search_results)
             
             # 대화 기록 포맷팅
-            history_text = self._format_chat_history()
+            history_text = self._format_chat_history(chat_history)
             
             # LLM 호출
             response = self.chain.invoke({
@@ -183,15 +363,16 @@ class FAISSChatbotService:
                 "question": question
             })
             
-            # 대화 기록에 추가
-            self._add_to_history(question, response)
+            # 대화 기록 및 의미 캐시에 추가
+            self._add_to_history(session_id, question, response)
+            self._store_cache(query_embedding, chat_history, question, response, search_results)
             
             return {
                 "answer": response,
                 "source_documents": relevant_docs,
                 "similarity_scores": scores,
                 "is_parenting_related": True,
-                "search_method": "faiss",
+                "search_method": search_method,
                 "context_length": len(context),
                 "vectordb_type": "FAISS"
             }
@@ -207,14 +388,20 @@ class FAISSChatbotService:
                 "vectordb_type": "FAISS"
             }
 
-    async def async_chat(self, question: str) -> Dict[str, Any]:
-        """비동기 FAISS 기반 채팅"""
+    async def async_chat(self, question: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """비동기 FAISS 기반 채팅 (session_id가 없으면 대화 기록 없이 단발성 질문으로 처리)"""
         try:
-            # 비동기 FAISS 검색
-            loop = asyncio.get_event_loop()
-            search_results = await loop.run_in_executor(
-                None, self.search_faiss_with_scores, question, 8
-            )
+            chat_history = await self.aget_chat_history(session_id)
+            
+            # 질문 임베딩은 한 번만 계산해서 의미 캐시 조회와 FAISS 검색에 함께 사용
+            query_embedding = await self._aembed_query(question)
+            cached = self._lookup_cache(question, query_embedding, chat_history)
+            if cached:
+                await self._aadd_to_history(session_id, question, cached["answer"])
+                return cached
+            
+            # 비동기 벡터 + 키워드 검색
+            search_results, search_method = await self.aretrieve(question, k=8, embedding=query_embedding)
             
             if not search_results:
                 return {
@@ -231,27 +418,25 @@ class FAISSChatbotService:
             
             # 컨텍스트 구성
             context = self._build_context_with_scores(search_results)
-            history_text = self._format_chat_history()
+            history_text = self._format_chat_history(chat_history)
             
             # 비동기 LLM 호출
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.chain.invoke({
-                    "context": context,
-                    "chat_history": history_text,
-                    "question": question
-                })
-            )
+            response = await self.chain.ainvoke({
+                "context": context,
+                "chat_history": history_text,
+                "question": question
+            })
             
-            # 대화 기록에 추가
-            self._add_to_history(question, response)
+            # 대화 기록 및 의미 캐시에 추가
+            await self._aadd_to_history(session_id, question, response)
+            self._store_cache(query_embedding, chat_history, question, response, search_results)
             
             return {
                 "answer": response,
                 "source_documents": relevant_docs,
                 "similarity_scores": scores,
                 "is_parenting_related": True,
-                "search_method": "faiss_async",
+                "search_method": f"{search_method}_async",
                 "context_length": len(context),
                 "vectordb_type": "FAISS"
             }
@@ -267,6 +452,73 @@ class FAISSChatbotService:
                 "vectordb_type": "FAISS"
             }
 
+    def _embed_query(self, question: str) -> Optional[List[float]]:
+        """질문 임베딩 계산 (FAISS가 없거나 sparse 모드, 임베딩 API 실패 시 None → 키워드 검색)"""
+        if not self.faiss_vectorstore or self.retrieval_mode == "sparse":
+            return None
+        try:
+            return self.embedding_model.embed_query(question)
+        except Exception as e:
+            print(f"⚠️ 임베딩 API 오류, 키워드 검색으로 대체: {e}")
+            return None
+
+    async def _aembed_query(self, question: str) -> Optional[List[float]]:
+        """질문 임베딩 계산 (비동기, embedding_timeout 초과 시 키워드 검색으로 대체)"""
+        if not self.faiss_vectorstore or self.retrieval_mode == "sparse":
+            return None
+        try:
+            return await asyncio.wait_for(
+                self.embedding_model.aembed_query(question), timeout=self.embedding_timeout
+            )
+        except asyncio.TimeoutError:
+            print(f"⚠️ 임베딩 API 응답 지연({self.embedding_timeout}s 초과), 키워드 검색으로 대체")
+            return None
+        except Exception as e:
+            print(f"⚠️ 임베딩 API 오류, 키워드 검색으로 대체: {e}")
+            return None
+
+    def _lookup_cache(self, question: str, query_embedding: Optional[List[float]],
+                      chat_history: List[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        """의미 캐시 조회 (이전 대화가 있으면 답변이 달라지므로 캐시를 사용하지 않음)"""
+        if self.semantic_cache is None or query_embedding is None or chat_history:
+            return None
+        
+        cached = self.semantic_cache.lookup(query_embedding, question)
+        if cached is None:
+            return None
+        
+        entry, similarity = cached
+        print(f"⚡ 의미 캐시 적중 (유사도 {similarity:.3f}): {entry.question}")
+        return {
+            "answer": entry.answer,
+            "source_documents": entry.source_documents,
+            "similarity_scores": entry.scores,
+            "is_parenting_related": True,
+            "search_method": "semantic_cache",
+            "cache_similarity": similarity,
+            "cached_question": entry.question,
+            "vectordb_type": "FAISS"
+        }
+
+    def _store_cache(self, query_embedding: Optional[List[float]], chat_history: List[Dict[str, str]],
+                     question: str, response: str, search_results: List[tuple]):
+        """이전 대화 없이 생성된 답변만 의미 캐시에 저장"""
+        if self.semantic_cache is None or query_embedding is None or chat_history:
+            return
+        self.semantic_cache.store(
+            query_embedding,
+            question,
+            response,
+            [doc for doc, score in search_results],
+            [score for doc, score in search_results]
+        )
+
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """의미 캐시 적중/미스 지표"""
+        if self.semantic_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.semantic_cache.stats()}
+
     def _build_context_with_scores(self, search_results: List[tuple]) -> str:
         """FAISS 검색 결과(점수 포함)로부터 컨텍스트 구성"""
         if not search_results:
@@ -278,10 +530,13 @@ class FAISSChatbotService:
             category = metadata.get('category_name', '')
             section = metadata.get('section_title', '')
             
-            # 유사도 점수를 백분율로 변환 (낮을수록 유사함)
-            similarity_percentage = max(0, (1 - score) * 100)
-            
-            header = f"[FAISS 자료 {i} (유사도: {similarity_percentage:.1f}%)"
+            if score is None:
+                # 키워드 검색으로만 찾은 문서
+                header = f"[FAISS 자료 {i} (키워드 일치)"
+            else:
+                # 유사도 점수를 백분율로 변환 (낮을수록 유사함)
+                similarity_percentage = max(0, (1 - score) * 100)
+                header = f"[FAISS 자료 {i} (유사도: {similarity_percentage:.1f}%)"
             if category:
                 header += f" - {category}"
             if section:
@@ -314,22 +569,31 @@ class FAISSChatbotService:
         
         return "\n\n".join(context_parts)
 
-    def _add_to_history(self, question: str, response: str):
-        """대화 기록에 추가"""
-        self.chat_history.append({"role": "user", "content": question})
-        self.chat_history.append({"role": "assistant", "content": response})
-        
-        # 최근 20개 메시지만 유지
-        if len(self.chat_history) > 20:
-            self.chat_history = self.chat_history[-20:]
-
-    def _format_chat_history(self) -> str:
+    def _add_to_history(self, session_id: Optional[str], question: str, response: str):
+        """세션 대화 기록에 추가 (최근 20개 메시지만 유지)"""
+        if not session_id:
+            return
+        self.history_store.append(session_id, [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": response}
+        ])
+
+    async def _aadd_to_history(self, session_id: Optional[str], question: str, response: str):
+        """세션 대화 기록에 추가 (비동기 경로, 저장소 I/O가 이벤트 루프를 막지 않도록)"""
+        if not session_id:
+            return
+        await self.history_store.aappend(session_id, [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": response}
+        ])
+
+    def _format_chat_history(self, chat_history: List[Dict[str, str]]) -> str:
         """채팅 히스토리를 문자열로 포맷팅"""
-        if not self.chat_history:
+        if not chat_history:
             return "이전 대화가 없습니다."
         
         formatted_history = []
-        for message in self.chat_history[-10:]:
+        for message in chat_history[-10:]:
             if message["role"] == "user":
                 formatted_history.append(f"사용자: {message['content']}")
             elif message["role"] == "assistant":
@@ -337,20 +601,25 @@ class FAISSChatbotService:
         
         return "\n".join(formatted_history)
 
-    def clear_memory(self):
-        """대화 메모리 초기화"""
-        self.chat_history = []
+    def clear_memory(self, session_id: str):
+        """세션 대화 메모리 초기화"""
+        self.history_store.clear(session_id)
 
-    def get_chat_history(self) -> List[Dict[str, str]]:
-        """현재 세션의 채팅 히스토리 반환"""
-        return self.chat_history.copy()
+    def get_chat_history(self, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """세션의 채팅 히스토리 반환"""
+        if not session_id:
+            return []
+        return self.history_store.get(session_id)
 
-    def set_memory_from_history(self, chat_history: List[Dict[str, str]]):
-        """기존 채팅 히스토리로 메모리 설정"""
-        self.chat_history = chat_history.copy()
-        
-        if len(self.chat_history) > 20:
-            self.chat_history = self.chat_history[-20:]
+    async def aget_chat_history(self, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """세션의 채팅 히스토리 반환 (비동기 경로)"""
+        if not session_id:
+            return []
+        return await self.history_store.aget(session_id)
+
+    def set_memory_from_history(self, session_id: str, chat_history: List[Dict[str, str]]):
+        """기존 채팅 히스토리로 세션 메모리 설정"""
+        self.history_store.replace(session_id, chat_history)
 
     def get_service_status(self) -> Dict[str, Any]:
         """FAISS 챗봇 서비스 상태 정보"""
@@ -363,14 +632,18 @@ class FAISSChatbotService:
                 "embedding_model": "text-embedding-3-small",
                 "faiss_available": self.faiss_vectorstore is not None,
                 "faiss_document_count": doc_count,
-                "chat_history_length": len(self.chat_history)
+                "faiss_index_version": self.index_version,
+                "retrieval_mode": self.retrieval_mode,
+                "sparse_document_count": len(self.sparse_index) if self.sparse_index else 0,
+                "session_store": self.history_store.stats(),
+                "semantic_cache": self.get_cache_metrics(),
+                "embedding_cache": self.embedding_model.stats()
             }
         except Exception as e:
             return {
                 "status": "error",
                 "vectordb_type": "FAISS",
-                "error": str(e),
-                "chat_history_length": len(self.chat_history)
+                "error": str(e)
             }
 
 
@@ -381,16 +654,16 @@ def create_faiss_chatbot() -> FAISSChatbotService:
     return FAISSChatbotService()
 
 
-async def async_faiss_chat(question: str) -> Dict[str, Any]:
+async def async_faiss_chat(question: str, session_id: Optional[str] = None) -> Dict[str, Any]:
     """비동기 FAISS RAG 채팅 편의 함수"""
     service = create_faiss_chatbot()
-    return await service.async_chat(question)
+    return await service.async_chat(question, session_id)
 
 
-def sync_faiss_chat(question: str) -> Dict[str, Any]:
+def sync_faiss_chat(question: str, session_id: Optional[str] = None) -> Dict[str, Any]:
     """동기 FAISS RAG 채팅 편의 함수"""
     service = create_faiss_chatbot()
-    return service.chat(question)
+    return service.chat(question, session_id)
 
 
 if __name__ == "__main__":
@@ -414,11 +687,12 @@ if __name__ == "__main__":
         
         for question in test_questions:
             print(f"\n🤔 질문: {question}")
-            result = service.chat(question)
+            result = service.chat(question, session_id="faiss-test")
             print(f"🤖 답변: {result['answer'][:100]}...")
             print(f"📚 FAISS 소스 수: {len(result['source_documents'])}")
-            if 'similarity_scores' in result:
-                avg_score = sum(result['similarity_scores']) / len(result['similarity_scores'])
+            scores = [score for score in result.get('similarity_scores', []) if score is not None]
+            if scores:
+                avg_score = sum(scores) / len(scores)
                 print(f"📈 평균 유사도: {(1-avg_score)*100:.1f}%")
             
     except Exception as e:
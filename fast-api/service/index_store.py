@@ -0,0 +1,168 @@
+"""
+FAISS 인덱스 스냅샷 저장소
+
+    vector_store/
+        CURRENT                  현재 서비스 중인 스냅샷 버전 (한 줄)
+        snapshots/<version>/     index.faiss, index.pkl, manifest.json
+        faiss_db/                이전 방식의 단일 인덱스 (CURRENT가 없을 때만 사용)
+
+새 스냅샷은 임시 디렉토리에 모두 저장한 뒤 rename으로 완성하고,
+CURRENT 파일은 os.replace로 교체합니다. 읽는 쪽은 언제나 완성된 스냅샷 하나를 보게 되며
+인덱스가 없는 순간이나 반쯤 쓰인 인덱스를 보는 일이 없습니다.
+
+환경 변수:
+    VECTOR_STORE_DIR   스냅샷 루트 디렉토리 (기본 vector_store)
+    FAISS_MMAP         1 | 0 — 서비스용 인덱스를 메모리 매핑으로 읽기 (기본 1)
+"""
+
+import os
+import json
+import time
+import shutil
+import pickle
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import faiss
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+SNAPSHOT_DIR = "snapshots"
+LEGACY_DIR = "faiss_db"
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """vector_db_final.json 레코드(텍스트 + 메타데이터)의 내용 해시"""
+    payload = json.dumps(
+        {"text": record["text"], "metadata": record.get("metadata", {})},
+        ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    """원본 JSON 전체의 해시 (변경 여부 빠른 확인용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_snapshot(folder_path: str, embeddings: Embeddings, mmap: Optional[bool] = None) -> FAISS:
+    """스냅샷 디렉토리에서 FAISS 벡터스토어 로드
+
+    검색 전용으로 쓰는 인덱스는 파일을 메모리 매핑으로 열어 시작 시 복사 비용을 줄입니다.
+    (FAISS.load_local과 같은 파일 형식)
+    """
+    if mmap is None:
+        mmap = os.getenv("FAISS_MMAP", "1").lower() not in ("0", "false", "no")
+
+    index_path = os.path.join(folder_path, "index.faiss")
+    index = None
+    if mmap:
+        try:
+            index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP)
+        except RuntimeError as e:
+            print(f"⚠️ FAISS 메모리 매핑 실패, 일반 로드로 대체: {e}")
+    if index is None:
+        index = faiss.read_index(index_path)
+
+    with open(os.path.join(folder_path, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+
+class IndexSnapshotStore:
+    """버전별 FAISS 스냅샷과 CURRENT 포인터 관리"""
+
+    def __init__(self, root: str, keep: int = 3):
+        self.root = root
+        # 롤백 / 아직 이전 버전을 읽는 프로세스를 위해 최근 스냅샷 몇 개는 남겨 둠
+        self.keep = max(2, keep)
+        self.snapshots_dir = os.path.join(root, SNAPSHOT_DIR)
+        self.current_file = os.path.join(root, CURRENT_FILE)
+        self.legacy_dir = os.path.join(root, LEGACY_DIR)
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self.current_file, "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def snapshot_dir(self, version: str) -> str:
+        return os.path.join(self.snapshots_dir, version)
+
+    def current_dir(self) -> Optional[str]:
+        """서비스할 인덱스 디렉토리 (스냅샷이 없으면 이전 방식의 faiss_db)"""
+        version = self.current_version()
+        if version and os.path.isdir(self.snapshot_dir(version)):
+            return self.snapshot_dir(version)
+        if os.path.exists(os.path.join(self.legacy_dir, "index.faiss")):
+            return self.legacy_dir
+        return None
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        """현재 스냅샷의 manifest (이전 방식 인덱스면 None)"""
+        version = self.current_version()
+        if not version:
+            return None
+        try:
+            with open(os.path.join(self.snapshot_dir(version), MANIFEST_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def publish(self, vectorstore, manifest: Dict[str, Any]) -> str:
+        """벡터스토어를 새 스냅샷으로 저장하고 CURRENT를 원자적으로 교체"""
+        # 이름순 정렬 = 생성 순서가 되도록 시각 + 나노초
+        version = time.strftime("%Y%m%d-%H%M%S") + f"-{time.time_ns() % 10**9:09d}"
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+        tmp_dir = os.path.join(self.snapshots_dir, f".tmp-{version}")
+        try:
+            vectorstore.save_local(tmp_dir)
+            manifest = {**manifest, "version": version, "created_at": time.time()}
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.rename(tmp_dir, self.snapshot_dir(version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        tmp_pointer = f"{self.current_file}.tmp-{version}"
+        with open(tmp_pointer, "w", encoding="utf-8") as f:
+            f.write(version + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_pointer, self.current_file)
+
+        self.prune()
+        return version
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.snapshots_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(self.snapshots_dir, name))
+        )
+
+    def prune(self):
+        """최근 keep개와 현재 버전을 제외한 오래된 스냅샷 삭제"""
+        current = self.current_version()
+        versions = self.list_versions()
+        for version in versions[:-self.keep]:
+            if version != current:
+                shutil.rmtree(self.snapshot_dir(version), ignore_errors=True)
+
+
+def create_index_store() -> IndexSnapshotStore:
+    """환경 변수 설정에 맞는 스냅샷 저장소 생성"""
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    root = os.getenv("VECTOR_STORE_DIR", os.path.join(app_dir, "vector_store"))
+    return IndexSnapshotStore(root)
@@ -5,12 +5,12 @@ Memory 기반 GPT-4o 챗봇 서비스
 """
 
 import os
-import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
+from service.session_store import SessionHistoryStore, create_session_store
 
 load_dotenv()
 
@@ -18,11 +18,12 @@ load_dotenv()
 class MemoryChatbotService:
     """Memory 기반 GPT-4o 챗봇 서비스 (DB 미사용, API 전용)"""
     
-    def __init__(self):
+    def __init__(self, history_store: Optional[SessionHistoryStore] = None):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.llm = None
         self.chain = None
-        self.chat_history = []  # 메모리 기반 히스토리 관리
+        # 세션 ID별 대화 기록 (다른 사용자의 대화가 프롬프트에 섞이지 않도록 분리)
+        self.history_store = history_store or create_session_store(namespace="memory")
         self._initialize()
 
     def _initialize(self):
@@ -81,11 +82,11 @@ class MemoryChatbotService:
             print(f"❌ Memory 챗봇 서비스 초기화 오류: {str(e)}")
             raise
 
-    def chat(self, question: str):
-        """Memory 기반 채팅 메시지 처리"""
+    def chat(self, question: str, session_id: Optional[str] = None):
+        """Memory 기반 채팅 메시지 처리 (session_id가 없으면 대화 기록 없이 처리)"""
         try:
             # 이전 대화 기록을 문자열로 변환
-            history_text = self._format_chat_history()
+            history_text = self._format_chat_history(self.get_chat_history(session_id))
             
             # 체인 실행
             response = self.chain.invoke({
@@ -94,7 +95,7 @@ class MemoryChatbotService:
             })
             
             # 대화 기록에 추가
-            self._add_to_history(question, response)
+            self._add_to_history(session_id, question, response)
             
             return {
                 "answer": response,
@@ -117,24 +118,20 @@ class MemoryChatbotService:
                 "vectordb_type": "Memory"
             }
 
-    async def async_chat(self, question: str):
-        """비동기 Memory 기반 채팅 처리 (웹소켓용)"""
+    async def async_chat(self, question: str, session_id: Optional[str] = None):
+        """비동기 Memory 기반 채팅 처리 (session_id가 없으면 대화 기록 없이 처리)"""
         try:
             # 이전 대화 기록을 문자열로 변환
-            history_text = self._format_chat_history()
+            history_text = self._format_chat_history(await self.aget_chat_history(session_id))
             
             # 비동기 LLM 호출
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.chain.invoke({
-                    "chat_history": history_text,
-                    "question": question
-                })
-            )
+            response = await self.chain.ainvoke({
+                "chat_history": history_text,
+                "question": question
+            })
             
             # 대화 기록에 추가
-            self._add_to_history(question, response)
+            await self._aadd_to_history(session_id, question, response)
             
             return {
                 "answer": response,
@@ -157,22 +154,31 @@ class MemoryChatbotService:
                 "vectordb_type": "Memory"
             }
 
-    def _add_to_history(self, question: str, response: str):
-        """대화 기록에 추가"""
-        self.chat_history.append({"role": "user", "content": question})
-        self.chat_history.append({"role": "assistant", "content": response})
-        
-        # 최근 20개 메시지만 유지 (10개 대화)
-        if len(self.chat_history) > 20:
-            self.chat_history = self.chat_history[-20:]
+    def _add_to_history(self, session_id: Optional[str], question: str, response: str):
+        """세션 대화 기록에 추가 (최근 20개 메시지만 유지)"""
+        if not session_id:
+            return
+        self.history_store.append(session_id, [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": response}
+        ])
 
-    def _format_chat_history(self) -> str:
+    async def _aadd_to_history(self, session_id: Optional[str], question: str, response: str):
+        """세션 대화 기록에 추가 (비동기 경로, 저장소 I/O가 이벤트 루프를 막지 않도록)"""
+        if not session_id:
+            return
+        await self.history_store.aappend(session_id, [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": response}
+        ])
+
+    def _format_chat_history(self, chat_history: List[Dict[str, str]]) -> str:
         """채팅 히스토리를 문자열로 포맷팅"""
-        if not self.chat_history:
+        if not chat_history:
             return "이전 대화가 없습니다."
         
         formatted_history = []
-        for message in self.chat_history[-10:]:  # 최근 10개 메시지만
+        for message in chat_history[-10:]:  # 최근 10개 메시지만
             if message["role"] == "user":
                 formatted_history.append(f"사용자: {message['content']}")
             elif message["role"] == "assistant":
@@ -180,21 +186,25 @@ class MemoryChatbotService:
         
         return "\n".join(formatted_history)
 
-    def clear_memory(self):
-        """대화 메모리 초기화"""
-        self.chat_history = []
+    def clear_memory(self, session_id: str):
+        """세션 대화 메모리 초기화"""
+        self.history_store.clear(session_id)
 
-    def get_chat_history(self) -> List[Dict[str, str]]:
-        """현재 세션의 채팅 히스토리 반환"""
-        return self.chat_history.copy()
+    def get_chat_history(self, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """세션의 채팅 히스토리 반환"""
+        if not session_id:
+            return []
+        return self.history_store.get(session_id)
 
-    def set_memory_from_history(self, chat_history: List[Dict[str, str]]):
-        """기존 채팅 히스토리로 메모리 설정"""
-        self.chat_history = chat_history.copy()
-        
-        # 최근 20개 메시지만 유지
-        if len(self.chat_history) > 20:
-            self.chat_history = self.chat_history[-20:]
+    async def aget_chat_history(self, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """세션의 채팅 히스토리 반환 (비동기 경로)"""
+        if not session_id:
+            return []
+        return await self.history_store.aget(session_id)
+
+    def set_memory_from_history(self, session_id: str, chat_history: List[Dict[str, str]]):
+        """기존 채팅 히스토리로 세션 메모리 설정"""
+        self.history_store.replace(session_id, chat_history)
 
     def get_service_status(self):
         """Memory 기반 서비스 상태 정보 반환"""
@@ -206,27 +216,27 @@ class MemoryChatbotService:
                 "embedding_model": "none",
                 "memory_only": True,
                 "api_only": True,
-                "chat_history_length": len(self.chat_history),
-                "max_history_length": 20,
+                "max_history_length": self.history_store.max_messages,
+                "session_store": self.history_store.stats(),
                 "chat_mode": "memory_based"
             }
         except Exception as e:
             return {
                 "status": "error",
                 "vectordb_type": "Memory",
-                "error": str(e),
-                "chat_history_length": len(self.chat_history)
+                "error": str(e)
             }
 
     # 추가 Memory 기반 기능들
 
-    def get_conversation_summary(self) -> str:
-        """현재 세션의 대화 요약 생성"""
-        if not self.chat_history:
+    def get_conversation_summary(self, session_id: str) -> str:
+        """세션의 대화 요약 생성"""
+        chat_history = self.get_chat_history(session_id)
+        if not chat_history:
             return "대화 기록이 없습니다."
         
         # 간단한 대화 요약
-        user_messages = [msg for msg in self.chat_history if msg['role'] == 'user']
+        user_messages = [msg for msg in chat_history if msg['role'] == 'user']
         if user_messages:
             topics = []
             for msg in user_messages[-5:]:  # 최근 5개 사용자 메시지
@@ -237,18 +247,20 @@ class MemoryChatbotService:
         
         return "사용자 메시지가 없습니다."
 
-    def get_memory_stats(self):
-        """Memory 통계 정보"""
-        user_messages = [msg for msg in self.chat_history if msg['role'] == 'user']
-        assistant_messages = [msg for msg in self.chat_history if msg['role'] == 'assistant']
+    def get_memory_stats(self, session_id: str):
+        """세션 Memory 통계 정보"""
+        chat_history = self.get_chat_history(session_id)
+        user_messages = [msg for msg in chat_history if msg['role'] == 'user']
+        assistant_messages = [msg for msg in chat_history if msg['role'] == 'assistant']
+        store_stats = self.history_store.stats()
         
         return {
-            "total_messages": len(self.chat_history),
+            "total_messages": len(chat_history),
             "user_messages": len(user_messages),
             "assistant_messages": len(assistant_messages),
-            "memory_usage": "in_memory_only",
-            "persistence": False,
-            "max_capacity": 20
+            "memory_usage": store_stats["backend"],
+            "persistence": store_stats["backend"] != "memory",
+            "max_capacity": self.history_store.max_messages
         }
 
 
@@ -259,16 +271,16 @@ def create_memory_chatbot() -> MemoryChatbotService:
     return MemoryChatbotService()
 
 
-async def async_memory_chat(question: str):
+async def async_memory_chat(question: str, session_id: Optional[str] = None):
     """비동기 Memory 기반 채팅 편의 함수"""
     service = create_memory_chatbot()
-    return await service.async_chat(question)
+    return await service.async_chat(question, session_id)
 
 
-def sync_memory_chat(question: str):
+def sync_memory_chat(question: str, session_id: Optional[str] = None):
     """동기 Memory 기반 채팅 편의 함수"""
     service = create_memory_chatbot()
-    return service.chat(question)
+    return service.chat(question, session_id)
 
 
 if __name__ == "__main__":
@@ -290,18 +302,19 @@ if __name__ == "__main__":
             "감사합니다. 앞서 말씀해주신 수유 간격을 지키려면 어떻게 해야 할까요?"
         ]
         
+        session_id = "memory-test"
         for i, question in enumerate(test_questions, 1):
             print(f"\n🤔 질문 {i}: {question}")
-            result = service.chat(question)
+            result = service.chat(question, session_id)
             print(f"🤖 답변: {result['answer'][:100]}...")
-            print(f"💾 히스토리 길이: {len(service.chat_history)}")
+            print(f"💾 히스토리 길이: {len(service.get_chat_history(session_id))}")
             
         # 대화 요약
-        summary = service.get_conversation_summary()
+        summary = service.get_conversation_summary(session_id)
         print(f"\n📋 대화 요약: {summary}")
         
         # Memory 통계
-        stats = service.get_memory_stats()
+        stats = service.get_memory_stats(session_id)
         print(f"📈 Memory 통계: {stats}")
             
     except Exception as e:
@@ -0,0 +1,245 @@
+"""
+질문 임베딩 기반 의미 유사도 응답 캐시
+
+비슷한 질문("3개월 아기 수유 간격" / "3개월 아기 수유 간격은?")이 반복될 때
+FAISS 검색과 GPT-4o 호출을 건너뛰고 이전 답변을 재사용합니다.
+
+- 캐시된 질문 임베딩은 별도의 작은 FAISS 내적 인덱스에 정규화해서 보관 (내적 = 코사인 유사도)
+- 유사도가 threshold 이상이고 질문 속 숫자 표현(월령, 양, 횟수 등)이 같은 가장 가까운 질문이 있으면 캐시 적중
+  ("3개월 아기 수유량"과 "4개월 아기 수유량"은 임베딩 유사도가 0.95를 넘어도 다른 질문으로 취급)
+- TTL 만료 + 최대 항목 수 초과 시 LRU 제거
+- 원본 데이터(vector_db_final.json)나 FAISS 인덱스 파일이 바뀌면 전체 무효화
+
+환경 변수:
+    SEMANTIC_CACHE_ENABLED      1 | 0 (기본 1)
+    SEMANTIC_CACHE_THRESHOLD    적중으로 판단할 최소 코사인 유사도 (기본 0.95)
+    SEMANTIC_CACHE_TTL_SECONDS  캐시 항목 유지 시간 (기본 86400)
+    SEMANTIC_CACHE_MAX_ENTRIES  최대 캐시 항목 수 (기본 1000)
+"""
+
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+# 한 번의 조회에서 비교할 이웃 수 (가장 가까운 질문의 숫자가 다르면 그다음 후보 확인)
+LOOKUP_NEIGHBORS = 5
+
+_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(개월|달|살|세|돌|주|일|시간|분|ml|cc|kg|g|도|회|번)?", re.IGNORECASE)
+_KOREAN_NUMBER_RE = re.compile(r"(한|두|세|네|다섯|여섯|일곱|여덟|아홉|열)\s*(달|살)")
+_KOREAN_NUMBERS = {"한": 1, "두": 2, "세": 3, "네": 4, "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10}
+_UNIT_ALIASES = {"달": "개월", "세": "살", "cc": "ml"}
+
+
+def number_signature(question: str) -> Tuple[str, ...]:
+    """질문 속 숫자 + 단위 표현 ("3개월", "두 달" → "2개월", "120ml")을 정렬한 튜플"""
+    tokens = []
+    for number, unit in _NUMBER_RE.findall(question):
+        unit = unit.lower()
+        tokens.append(f"{float(number):g}{_UNIT_ALIASES.get(unit, unit)}")
+    for word, unit in _KOREAN_NUMBER_RE.findall(question):
+        tokens.append(f"{_KOREAN_NUMBERS[word]}{_UNIT_ALIASES.get(unit, unit)}")
+    return tuple(sorted(tokens))
+
+
+class CacheEntry:
+    __slots__ = ("question", "signature", "answer", "source_documents", "scores", "created_at")
+
+    def __init__(self, question: str, answer: str, source_documents: List[Any], scores: List[float]):
+        self.question = question
+        self.signature = number_signature(question)
+        self.answer = answer
+        self.source_documents = source_documents
+        self.scores = scores
+        self.created_at = time.monotonic()
+
+
+class SemanticResponseCache:
+    """질문 임베딩 코사인 유사도로 조회하는 LRU + TTL 응답 캐시"""
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: int = 86400, max_entries: int = 1000,
+                 watch_paths: Sequence[str] = ()):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.watch_paths = list(watch_paths)
+
+        self._lock = threading.Lock()
+        self._index: Optional[faiss.IndexIDMap] = None
+        # 캐시 ID -> 항목 (사용 순서대로 정렬, 맨 앞이 가장 오래 사용되지 않은 항목)
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._next_id = 0
+        self._fingerprint = self._source_fingerprint()
+
+        self.hits = 0
+        self.misses = 0
+        self.number_mismatches = 0
+        self.stores = 0
+        self.evicted = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    def lookup(self, embedding: Sequence[float], question: Optional[str] = None) -> Optional[Tuple[CacheEntry, float]]:
+        """threshold 이상으로 비슷한 캐시 질문 중 가장 가까운 것의 (항목, 유사도) 반환
+
+        question을 넘기면 숫자 표현이 같은 캐시 질문만 적중으로 봅니다.
+        """
+        vector = self._normalize(embedding)
+        signature = number_signature(question) if question is not None else None
+        now = time.monotonic()
+        with self._lock:
+            self._check_source_changed()
+            self._purge_expired(now)
+            if self._index is None or self._index.ntotal == 0 or self._index.d != vector.shape[1]:
+                self.misses += 1
+                return None
+
+            similarities, ids = self._index.search(vector, min(LOOKUP_NEIGHBORS, self._index.ntotal))
+            mismatched = False
+            for similarity, entry_id in zip(similarities[0].tolist(), ids[0].tolist()):
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                if similarity < self.threshold:
+                    break
+                if self._is_expired(entry, now):
+                    # 적중으로 맨 뒤로 옮겨져 앞에서부터 만료 확인할 때 남은 항목
+                    self._drop_expired([entry_id])
+                    continue
+                if signature is not None and entry.signature != signature:
+                    mismatched = True
+                    continue
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                return entry, similarity
+
+            self.misses += 1
+            if mismatched:
+                self.number_mismatches += 1
+            return None
+
+    def store(self, embedding: Sequence[float], question: str, answer: str,
+              source_documents: List[Any], scores: List[float]):
+        """새 응답을 캐시에 추가 (최대 항목 수 초과 시 LRU 제거)"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._check_source_changed()
+            if self._index is None or self._index.d != vector.shape[1]:
+                self._reset_locked()
+                self._index = faiss.IndexIDMap(faiss.IndexFlatIP(vector.shape[1]))
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = CacheEntry(question, answer, source_documents, scores)
+            self.stores += 1
+
+            while len(self._entries) > self.max_entries:
+                old_id, _ = self._entries.popitem(last=False)
+                self._remove_ids([old_id])
+                self.evicted += 1
+
+    def invalidate(self, reason: str = "manual"):
+        """캐시 전체 삭제 (벡터 DB 재구축 등)"""
+        with self._lock:
+            self._invalidate_locked(reason)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._purge_expired(time.monotonic(), full=True)
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                # 임베딩은 충분히 비슷했지만 숫자 표현이 달라 적중으로 보지 않은 횟수
+                "number_mismatches": self.number_mismatches,
+                # 적중 1회 = FAISS 검색 + LLM 호출 1회 절약
+                "llm_calls_saved": self.hits,
+                "stores": self.stores,
+                "evicted": self.evicted,
+                "expired": self.expired,
+                "invalidations": self.invalidations
+            }
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1).copy()
+        faiss.normalize_L2(vector)
+        return vector
+
+    def _source_fingerprint(self) -> Tuple:
+        fingerprint = []
+        for path in self.watch_paths:
+            try:
+                stat = os.stat(path)
+                fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                fingerprint.append((path, None, None))
+        return tuple(fingerprint)
+
+    def _check_source_changed(self):
+        fingerprint = self._source_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self._invalidate_locked("source_changed")
+
+    def _invalidate_locked(self, reason: str):
+        if self._entries:
+            print(f"🧹 의미 캐시 무효화 ({reason}): {len(self._entries)}개 항목 삭제")
+        self._reset_locked()
+        self.invalidations += 1
+
+    def _reset_locked(self):
+        self._entries.clear()
+        if self._index is not None:
+            self._index.reset()
+
+    def _is_expired(self, entry: CacheEntry, now: float) -> bool:
+        return now - entry.created_at > self.ttl_seconds
+
+    def _purge_expired(self, now: float, full: bool = False):
+        """만료된 항목 제거
+
+        조회마다 전체를 훑지 않도록 앞(가장 오래 사용되지 않은 항목)에서부터 만료되지 않은 항목을 만날 때까지만 확인합니다.
+        적중으로 뒤로 옮겨진 오래된 항목은 lookup이 후보로 만났을 때 제거하고, full이면 (stats) 전체를 확인합니다.
+        """
+        expired_ids = []
+        for entry_id, entry in self._entries.items():
+            if self._is_expired(entry, now):
+                expired_ids.append(entry_id)
+            elif not full:
+                break
+        self._drop_expired(expired_ids)
+
+    def _drop_expired(self, entry_ids: List[int]):
+        for entry_id in entry_ids:
+            del self._entries[entry_id]
+        if entry_ids:
+            self._remove_ids(entry_ids)
+            self.expired += len(entry_ids)
+
+    def _remove_ids(self, entry_ids: List[int]):
+        if self._index is not None:
+            self._index.remove_ids(np.array(entry_ids, dtype=np.int64))
+
+
+def create_semantic_cache(watch_paths: Sequence[str] = ()) -> Optional[SemanticResponseCache]:
+    """환경 변수 설정에 맞는 의미 캐시 생성 (비활성화 시 None)"""
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    return SemanticResponseCache(
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+        ttl_seconds=int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400")),
+        max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000")),
+        watch_paths=watch_paths
+    )
@@ -0,0 +1,307 @@
+"""
+세션별 대화 기록 저장소
+
+FAISS / Memory 챗봇이 사용자별 대화 기록을 분리해서 보관하기 위한 저장소입니다.
+- InMemorySessionStore: LRU + TTL 기반 프로세스 내 저장소 (기본값)
+- SQLiteSessionStore: 재시작 후에도 유지되는 로컬 SQLite 저장소
+
+환경 변수:
+    SESSION_STORE_BACKEND   memory | sqlite (기본 memory)
+    SESSION_STORE_PATH      SQLite 파일 경로 (기본 data/session_history.sqlite3)
+    SESSION_MAX_SESSIONS    보관할 최대 세션 수 (기본 1000)
+    SESSION_TTL_SECONDS     마지막 사용 후 세션 유지 시간 (기본 3600)
+    SESSION_MAX_MESSAGES    세션당 보관할 최대 메시지 수 (기본 20)
+    SESSION_MAX_MESSAGE_CHARS  메시지 1개당 최대 글자 수 (기본 2000)
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class SessionHistoryStore(ABC):
+    """세션 ID별 대화 기록 저장소 인터페이스
+
+    비동기 경로에서는 aget / aappend를 사용합니다 (기본 구현은 스레드 풀에서 실행해 이벤트 루프를 막지 않음).
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: int = 3600,
+                 max_messages: int = 20, max_message_chars: int = 2000):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self.max_message_chars = max_message_chars
+
+    @abstractmethod
+    def get(self, session_id: str) -> List[Dict[str, str]]:
+        """세션의 대화 기록 반환 (오래된 순)"""
+
+    @abstractmethod
+    def append(self, session_id: str, messages: List[Dict[str, str]]):
+        """세션에 메시지 추가 (최대 메시지 수 초과분은 제거)"""
+
+    async def aget(self, session_id: str) -> List[Dict[str, str]]:
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def aappend(self, session_id: str, messages: List[Dict[str, str]]):
+        await asyncio.to_thread(self.append, session_id, messages)
+
+    def replace(self, session_id: str, messages: List[Dict[str, str]]):
+        """세션의 대화 기록을 통째로 교체"""
+        self.clear(session_id)
+        self.append(session_id, messages)
+
+    @abstractmethod
+    def clear(self, session_id: str):
+        """세션의 대화 기록 삭제"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """저장소 상태 정보"""
+
+    def _trim_message(self, message: Dict[str, str]) -> Dict[str, str]:
+        return {
+            "role": message["role"],
+            "content": message["content"][:self.max_message_chars]
+        }
+
+
+class InMemorySessionStore(SessionHistoryStore):
+    """LRU + TTL 기반 메모리 저장소
+
+    세션 수와 세션당 메시지 수, 메시지 길이가 모두 상한을 가지므로
+    메모리 사용량은 max_sessions * max_messages * max_message_chars 이내로 제한됩니다.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # session_id -> (마지막 사용 시각, 메시지 목록)
+        self._sessions: "OrderedDict[str, Tuple[float, List[Dict[str, str]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.expired = 0
+
+    def _purge_expired(self, now: float):
+        # OrderedDict는 사용 순으로 정렬되어 있으므로 앞에서부터 만료 확인
+        while self._sessions:
+            session_id, (last_used, _) = next(iter(self._sessions.items()))
+            if now - last_used <= self.ttl_seconds:
+                break
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def get(self, session_id: str) -> List[Dict[str, str]]:
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            self._sessions[session_id] = (now, entry[1])
+            self._sessions.move_to_end(session_id)
+            return list(entry[1])
+
+    def append(self, session_id: str, messages: List[Dict[str, str]]):
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            _, history = self._sessions.pop(session_id, (now, []))
+            history = (history + [self._trim_message(m) for m in messages])[-self.max_messages:]
+            self._sessions[session_id] = (now, history)
+
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+    async def aget(self, session_id: str) -> List[Dict[str, str]]:
+        # 메모리 조회는 짧은 잠금만 잡으므로 스레드 전환 없이 바로 실행
+        return self.get(session_id)
+
+    async def aappend(self, session_id: str, messages: List[Dict[str, str]]):
+        self.append(session_id, messages)
+
+    def clear(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            return {
+                "backend": "memory",
+                "sessions": len(self._sessions),
+                "messages": sum(len(h) for _, h in self._sessions.values()),
+                "max_sessions": self.max_sessions,
+                "max_messages": self.max_messages,
+                "evicted": self.evicted,
+                "expired": self.expired
+            }
+
+
+class SQLiteSessionStore(SessionHistoryStore):
+    """SQLite 기반 저장소 (프로세스 재시작 후에도 대화 기록 유지)
+
+    namespace로 서비스별(FAISS / Memory) 기록을 같은 파일 안에서 분리합니다.
+    """
+
+    def __init__(self, path: str, namespace: str = "default", **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.namespace = namespace
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                namespace TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, session_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_chat_sessions_last_used
+                ON chat_sessions (namespace, last_used);
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_chat_messages_session
+                ON chat_messages (namespace, session_id, id);
+        """)
+
+    def _purge_expired(self, now: float):
+        cutoff = now - self.ttl_seconds
+        self._conn.execute(
+            "DELETE FROM chat_messages WHERE namespace = ? AND session_id IN "
+            "(SELECT session_id FROM chat_sessions WHERE namespace = ? AND last_used < ?)",
+            (self.namespace, self.namespace, cutoff)
+        )
+        self._conn.execute(
+            "DELETE FROM chat_sessions WHERE namespace = ? AND last_used < ?",
+            (self.namespace, cutoff)
+        )
+
+    def get(self, session_id: str) -> List[Dict[str, str]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_used FROM chat_sessions WHERE namespace = ? AND session_id = ?",
+                (self.namespace, session_id)
+            ).fetchone()
+            if row is None:
+                return []
+            if now - row[0] > self.ttl_seconds:
+                self._clear_locked(session_id)
+                return []
+
+            self._conn.execute(
+                "UPDATE chat_sessions SET last_used = ? WHERE namespace = ? AND session_id = ?",
+                (now, self.namespace, session_id)
+            )
+            rows = self._conn.execute(
+                "SELECT role, content FROM chat_messages WHERE namespace = ? AND session_id = ? "
+                "ORDER BY id DESC LIMIT ?",
+                (self.namespace, session_id, self.max_messages)
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def append(self, session_id: str, messages: List[Dict[str, str]]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._purge_expired(now)
+                self._conn.execute(
+                    "INSERT INTO chat_sessions (namespace, session_id, last_used) VALUES (?, ?, ?) "
+                    "ON CONFLICT(namespace, session_id) DO UPDATE SET last_used = excluded.last_used",
+                    (self.namespace, session_id, now)
+                )
+                self._conn.executemany(
+                    "INSERT INTO chat_messages (namespace, session_id, role, content) VALUES (?, ?, ?, ?)",
+                    [
+                        (self.namespace, session_id, m["role"], m["content"])
+                        for m in map(self._trim_message, messages)
+                    ]
+                )
+                # 세션당 최근 max_messages 개만 유지
+                self._conn.execute(
+                    "DELETE FROM chat_messages WHERE namespace = ? AND session_id = ? AND id NOT IN "
+                    "(SELECT id FROM chat_messages WHERE namespace = ? AND session_id = ? "
+                    "ORDER BY id DESC LIMIT ?)",
+                    (self.namespace, session_id, self.namespace, session_id, self.max_messages)
+                )
+                # 최대 세션 수 초과 시 가장 오래 사용되지 않은 세션부터 제거
+                overflow = self._conn.execute(
+                    "SELECT session_id FROM chat_sessions WHERE namespace = ? "
+                    "ORDER BY last_used DESC LIMIT -1 OFFSET ?",
+                    (self.namespace, self.max_sessions)
+                ).fetchall()
+                for (old_session_id,) in overflow:
+                    self._clear_locked(old_session_id)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self, session_id: str):
+        with self._lock:
+            self._clear_locked(session_id)
+
+    def _clear_locked(self, session_id: str):
+        self._conn.execute(
+            "DELETE FROM chat_messages WHERE namespace = ? AND session_id = ?",
+            (self.namespace, session_id)
+        )
+        self._conn.execute(
+            "DELETE FROM chat_sessions WHERE namespace = ? AND session_id = ?",
+            (self.namespace, session_id)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._purge_expired(time.time())
+            sessions = self._conn.execute(
+                "SELECT COUNT(*) FROM chat_sessions WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            messages = self._conn.execute(
+                "SELECT COUNT(*) FROM chat_messages WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "sessions": sessions,
+            "messages": messages,
+            "max_sessions": self.max_sessions,
+            "max_messages": self.max_messages
+        }
+
+
+def create_session_store(namespace: str, backend: Optional[str] = None) -> SessionHistoryStore:
+    """환경 변수 설정에 맞는 세션 저장소 생성"""
+    backend = (backend or os.getenv("SESSION_STORE_BACKEND", "memory")).lower()
+    options = {
+        "max_sessions": int(os.getenv("SESSION_MAX_SESSIONS", "1000")),
+        "ttl_seconds": int(os.getenv("SESSION_TTL_SECONDS", "3600")),
+        "max_messages": int(os.getenv("SESSION_MAX_MESSAGES", "20")),
+        "max_message_chars": int(os.getenv("SESSION_MAX_MESSAGE_CHARS", "2000")),
+    }
+
+    if backend == "sqlite":
+        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        default_path = os.path.join(app_dir, "data", "session_history.sqlite3")
+        path = os.getenv("SESSION_STORE_PATH", default_path)
+        return SQLiteSessionStore(path, namespace=namespace, **options)
+
+    if backend != "memory":
+        print(f"⚠️ 알 수 없는 SESSION_STORE_BACKEND: {backend} (memory 사용)")
+    return InMemorySessionStore(**options)
@@ -0,0 +1,165 @@
+"""
+한국어 키워드(BM25) 검색 인덱스
+
+"6개월", "이유식"처럼 키워드가 분명한 육아 질문은 임베딩 없이도 잘 찾을 수 있으므로
+FAISS 문서 전체로 로컬 BM25 인덱스를 만들어 벡터 검색과 함께(RRF) 또는 단독으로 사용합니다.
+임베딩 API가 느리거나 실패할 때도 이 인덱스만으로 답변할 수 있습니다.
+
+한국어 토큰화 (형태소 분석기 없이 동작):
+- "4~6개월" 같은 범위는 4개월 / 5개월 / 6개월 토큰으로 펼침
+- "6개월", "15개월", "2주" 같은 숫자 + 단위는 하나의 토큰
+- 한글 어절은 끝의 조사 / 어미를 떼고, 복합어 부분 일치를 위해 글자 바이그램도 추가
+"""
+
+import re
+import math
+import heapq
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from langchain.schema import Document
+
+_UNITS = "개월|주차|주|일|세|살|시간|분|회|번|ml|kg|cm"
+_RANGE_RE = re.compile(rf"(\d+)\s*[~\-]\s*(\d+)\s*({_UNITS})")
+_UNIT_RE = re.compile(rf"(\d+)\s*({_UNITS})")
+_WORD_RE = re.compile(r"[가-힣]+|[a-z]+|\d+")
+_HANGUL_RE = re.compile(r"^[가-힣]+$")
+
+# 긴 것부터 떼어냄 (예: "에서는"을 "는"보다 먼저)
+_SUFFIXES = sorted([
+    "은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "와", "과", "만", "요",
+    "에서", "에게", "으로", "하고", "이랑", "랑", "까지", "부터", "처럼", "보다",
+    "에는", "에서는", "으로는", "은요", "는요", "이요",
+    "인가요", "나요", "까요", "가요", "해요", "어요", "아요", "하나요", "할까요", "인데",
+    "하는", "하면", "해야", "했어요", "되나요", "되요", "돼요",
+], key=len, reverse=True)
+
+# 떼어낸 뒤 한 글자만 남아도 되는 조사 ("밤에" → "밤", 반면 "아이"는 그대로)
+_SHORT_STEM_SUFFIXES = {"은", "는", "을", "를", "에", "의", "도", "로", "에서", "에는", "으로"}
+_SUFFIX_SET = set(_SUFFIXES)
+
+# 범위를 펼칠 때 최대 폭 (잘못된 입력으로 토큰이 폭증하지 않도록)
+_MAX_RANGE = 36
+
+
+def _strip_suffix(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if not word.endswith(suffix):
+            continue
+        min_stem = 1 if suffix in _SHORT_STEM_SUFFIXES else 2
+        if len(word) - len(suffix) >= min_stem:
+            return word[:-len(suffix)]
+    return word
+
+
+def _unit_token(number: str, unit: str) -> str:
+    return f"{int(number)}{'주' if unit == '주차' else unit}"
+
+
+def korean_tokenize(text: str) -> List[str]:
+    """BM25용 한국어 토큰화"""
+    text = text.lower()
+    tokens: List[str] = []
+
+    for start, end, unit in _RANGE_RE.findall(text):
+        start, end = int(start), int(end)
+        if 0 <= end - start <= _MAX_RANGE:
+            tokens.extend(_unit_token(str(n), unit) for n in range(start, end + 1))
+    text = _RANGE_RE.sub(" ", text)
+
+    for number, unit in _UNIT_RE.findall(text):
+        tokens.append(_unit_token(number, unit))
+    text = _UNIT_RE.sub(" ", text)
+
+    for word in _WORD_RE.findall(text):
+        if not _HANGUL_RE.match(word):
+            tokens.append(word)
+            continue
+        if word in _SUFFIX_SET:
+            continue
+        stem = _strip_suffix(word)
+        tokens.append(stem)
+        if len(stem) > 2:
+            tokens.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+    return tokens
+
+
+def document_key(doc: Document) -> Tuple[str, str]:
+    """검색 결과 병합용 문서 식별자 (같은 내용의 문서는 하나로 취급)"""
+    return doc.metadata.get("section_title", ""), doc.page_content
+
+
+def document_text(doc: Document) -> str:
+    """색인할 텍스트: 월령 범위 / 섹션 제목 메타데이터 + 본문"""
+    metadata = doc.metadata or {}
+    header = " ".join(
+        str(metadata.get(field, "")) for field in ("category_name", "page_title", "section_title")
+    )
+    return f"{header}\n{doc.page_content}"
+
+
+class BM25Index:
+    """메모리 내 BM25 (Okapi) 역색인"""
+
+    def __init__(self, documents: List[Document], k1: float = 1.5, b: float = 0.75,
+                 tokenizer: Callable[[str], List[str]] = korean_tokenize):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = tokenizer
+
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._doc_lengths: List[int] = []
+        for doc_index, doc in enumerate(documents):
+            counts = Counter(tokenizer(document_text(doc)))
+            self._doc_lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                self._postings[token].append((doc_index, tf))
+
+        total = len(documents)
+        self._avg_length = (sum(self._doc_lengths) / total) if total else 0.0
+        self._idf = {
+            token: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self._postings.items()
+        }
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore, **kwargs) -> "BM25Index":
+        """FAISS 벡터스토어의 docstore 문서로 인덱스 구축 (서비스 중인 스냅샷과 항상 같은 문서)"""
+        documents = []
+        for doc_id in vectorstore.index_to_docstore_id.values():
+            doc = vectorstore.docstore.search(doc_id)
+            if isinstance(doc, Document):
+                documents.append(doc)
+        return cls(documents, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search(self, query: str, k: int = 8) -> List[Tuple[Document, float]]:
+        """BM25 점수 상위 k개 (점수가 높을수록 관련 있음)"""
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(self.tokenizer(query)):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for doc_index, tf in self._postings[token]:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_index] / self._avg_length)
+                scores[doc_index] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.documents[doc_index], score) for doc_index, score in top]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[Tuple[Document, Optional[float]]]],
+                           k: int = 60) -> List[Tuple[Document, float]]:
+    """여러 검색 결과 순위를 RRF(1 / (k + rank))로 합산해서 정렬"""
+    fused: Dict[Tuple[str, str], float] = defaultdict(float)
+    documents: Dict[Tuple[str, str], Document] = {}
+    for ranking in rankings:
+        for rank, (doc, _) in enumerate(ranking, 1):
+            key = document_key(doc)
+            documents.setdefault(key, doc)
+            fused[key] += 1.0 / (k + rank)
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return [(documents[key], score) for key, score in ordered]
@@ -1,16 +1,38 @@
 import os
 import json
-import shutil
 from django.core.management.base import BaseCommand
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain.schema import Document
+from service.embedding_cache import create_cached_embeddings
+from service.index_store import content_hash, create_index_store, file_sha256
 
 
 class FaissCommand(BaseCommand):
     help = "Load vector_db_final.json into FAISS using OpenAI embeddings"
 
+    def source_path(self) -> str:
+        """원본 JSON 파일 경로 (chatbot 앱 폴더 내)"""
+        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(app_dir, "data", "vector_db_final.json")
+
+    def is_up_to_date(self):
+        """현재 스냅샷이 원본 JSON과 일치하는지 확인 → (일치 여부, 사유)"""
+        store = create_index_store()
+        manifest = store.read_manifest()
+        if not manifest:
+            return False, "manifest 없음"
+        json_path = self.source_path()
+        if not os.path.exists(json_path):
+            return False, "원본 JSON 없음"
+        if manifest.get("source_sha256") != file_sha256(json_path):
+            return False, "원본 JSON 변경"
+        snapshot_dir = store.snapshot_dir(manifest["version"])
+        for name in ("index.faiss", "index.pkl"):
+            if not os.path.exists(os.path.join(snapshot_dir, name)):
+                return False, f"{name} 없음"
+        return True, "원본 JSON 해시 일치"
+
     def handle(self, *args, **kwargs):
         load_dotenv()  # .env 파일 로드
         openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -19,9 +41,7 @@ class FaissCommand(BaseCommand):
             print(self.style.ERROR("❌ OPENAI_API_KEY가 올바르게 설정되지 않았습니다."))
             return
 
-        # JSON 파일 경로 (chatbot 앱 폴더 내)
-        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        json_path = os.path.join(app_dir, "data", "vector_db_final.json")
+        json_path = self.source_path()
 
         if not os.path.exists(json_path):
             print(self.style.ERROR(f"❌ vector_db_final.json 파일을 찾을 수 없습니다: {json_path}"))
@@ -32,44 +52,72 @@ class FaissCommand(BaseCommand):
             with open(json_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
-            # Document 변환
-            documents = []
+            # 레코드 id 기준 Document 변환 + 내용 해시
+            documents = {}
+            hashes = {}
             for item in data:
-                doc = Document(
+                doc_id = str(item["id"])
+                documents[doc_id] = Document(
                     page_content=item["text"],
                     metadata=item["metadata"]
                 )
-                documents.append(doc)
+                hashes[doc_id] = content_hash(item)
+
+            print(f"✅ {len(documents)}개의 문서를 로드했습니다.")
 
-            print(f"✅ {len(documents)}개의 문서를 로드했습니다. 임베딩을 생성하는 중...")
+            # 현재 스냅샷의 manifest와 비교해서 바뀐 레코드만 찾기
+            store = create_index_store()
+            manifest = store.read_manifest()
+            source_sha256 = file_sha256(json_path)
+            previous = manifest["documents"] if manifest else {}
+            changed = [doc_id for doc_id, digest in hashes.items() if previous.get(doc_id) != digest]
+            removed = [doc_id for doc_id in previous if doc_id not in hashes]
+
+            if manifest and not changed and not removed:
+                if manifest.get("source_sha256") != source_sha256:
+                    # 내용 외 변경(공백, 순서 등)만 있는 경우: 같은 인덱스를 새 해시로 다시 게시
+                    vectorstore = FAISS.load_local(store.current_dir(), create_cached_embeddings(openai_api_key))
+                    store.publish(vectorstore, {**manifest, "source_sha256": source_sha256})
+                print(self.style.SUCCESS(f"✅ 변경된 문서가 없습니다. 현재 인덱스 유지: {store.current_version()}"))
+                return
 
             # 임베딩 모델 초기화 (GPT-4o와 호환되는 임베딩 모델)
-            embedding_model = OpenAIEmbeddings(
-                model="text-embedding-3-small",
-                openai_api_key=openai_api_key
-            )
-
-            # FAISS 벡터스토어 생성
-            print("🔄 FAISS 벡터스토어를 생성하는 중...")
-            vectorstore = FAISS.from_documents(
-                documents=documents,
-                embedding=embedding_model
-            )
-
-            # FAISS 인덱스 저장
-            faiss_dir = os.path.join(app_dir, "vector_store","faiss_db")
-            os.makedirs(faiss_dir, exist_ok=True)
-
-            if os.path.exists(faiss_dir):
-                shutil.rmtree(faiss_dir)
-                print("🗑️  기존 FAISSDB를 삭제했습니다.")
-                
-            
-            # FAISS 인덱스 저장
-            vectorstore.save_local(faiss_dir)
-            
-            print(self.style.SUCCESS(f"✅ FAISS DB 저장 완료: {faiss_dir}"))
-            
+            # 이전 빌드에서 임베딩한 청크는 캐시에서 재사용하고 바뀐 청크만 API 호출
+            embedding_model = create_cached_embeddings(openai_api_key)
+            stats_before = embedding_model.stats()
+
+            if manifest:
+                # 증분 반영: 현재 스냅샷을 불러와 삭제/변경 레코드를 지우고 변경/추가 레코드만 임베딩
+                print(f"🔄 증분 업데이트: 변경/추가 {len(changed)}개, 삭제 {len(removed)}개")
+                vectorstore = FAISS.load_local(store.current_dir(), embedding_model)
+                stale = [doc_id for doc_id in changed if doc_id in previous] + removed
+                if stale:
+                    vectorstore.delete(stale)
+                if changed:
+                    vectorstore.add_documents([documents[doc_id] for doc_id in changed], ids=changed)
+            else:
+                # manifest가 없는 경우(최초 / 이전 방식 faiss_db)에는 전체 구축
+                print("🔄 FAISS 벡터스토어를 생성하는 중...")
+                vectorstore = FAISS.from_documents(
+                    documents=list(documents.values()),
+                    embedding=embedding_model,
+                    ids=list(documents.keys())
+                )
+
+            # 임시 디렉토리에 저장한 뒤 CURRENT 포인터를 원자적으로 교체
+            version = store.publish(vectorstore, {
+                "source": os.path.basename(json_path),
+                "source_sha256": source_sha256,
+                "embedding_model": embedding_model.model_name,
+                "documents": hashes
+            })
+
+            stats_after = embedding_model.stats()
+            reused = sum(stats_after[k] - stats_before[k] for k in ("memory_hits", "disk_hits"))
+            created = stats_after["misses"] - stats_before["misses"]
+            print(f"📦 임베딩 캐시: 재사용 {reused}개, 신규 임베딩 {created}개")
+            print(self.style.SUCCESS(f"✅ FAISS DB 저장 완료: {store.snapshot_dir(version)}"))
+
         except Exception as e:
             print(self.style.ERROR(f"❌ 오류 발생: {str(e)}"))
             import traceback
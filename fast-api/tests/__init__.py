@@ -0,0 +1,6 @@
+"""
+fast-api 서비스 모듈 단위 테스트 (모델 / OpenAI API 없이 실행)
+
+실행 (fast-api 디렉토리에서):
+    python -m unittest discover tests
+"""
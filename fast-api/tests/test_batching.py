@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import unittest
+
+from service.batching import MicroBatchScheduler
+
+
+class RecordingBatchFn:
+    """받은 배치를 기록하고 payload를 대문자로 돌려주는 배치 함수"""
+
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, payloads, key):
+        self.release.wait(5)
+        self.batches.append((list(payloads), key))
+        return [payload.upper() for payload in payloads], len(payloads)
+
+
+class MicroBatchSchedulerTest(unittest.IsolatedAsyncioTestCase):
+
+    def create_scheduler(self, batch_fn, **kwargs):
+        scheduler = MicroBatchScheduler(batch_fn, **kwargs)
+        self.addAsyncCleanup(scheduler.close)
+        return scheduler
+
+    async def test_concurrent_requests_share_one_batch(self):
+        batch_fn = RecordingBatchFn()
+        scheduler = self.create_scheduler(batch_fn, max_batch_size=8, max_wait_ms=50)
+        results = await asyncio.gather(*(scheduler.submit(p) for p in ["a", "b", "c"]))
+
+        self.assertEqual(results, ["A", "B", "C"])
+        self.assertEqual(batch_fn.batches, [(["a", "b", "c"], None)])
+        metrics = scheduler.get_metrics()
+        self.assertEqual((metrics["requests"], metrics["batches"], metrics["avg_batch_size"]), (3, 1, 3.0))
+
+    async def test_batches_are_split_by_size_and_key(self):
+        batch_fn = RecordingBatchFn()
+        scheduler = self.create_scheduler(batch_fn, max_batch_size=2, max_wait_ms=50)
+        requests = [("a", 1), ("b", 2), ("c", 1), ("d", 1)]
+        results = await asyncio.gather(*(scheduler.submit(p, key=key) for p, key in requests))
+
+        self.assertEqual(results, ["A", "B", "C", "D"])
+        for payloads, key in batch_fn.batches:
+            self.assertLessEqual(len(payloads), 2)
+            self.assertTrue(all(dict(requests)[p] == key for p in payloads))
+        self.assertEqual(sorted(p for payloads, _ in batch_fn.batches for p in payloads), ["a", "b", "c", "d"])
+
+    async def test_cancelled_request_is_left_out_of_the_batch(self):
+        batch_fn = RecordingBatchFn()
+        batch_fn.release.clear()
+        scheduler = self.create_scheduler(batch_fn, max_batch_size=8, max_wait_ms=10)
+
+        # 첫 배치가 실행되는 동안 대기열에 쌓인 요청 중 하나를 호출자가 취소
+        first = asyncio.create_task(scheduler.submit("first"))
+        await asyncio.sleep(0.05)
+        kept = asyncio.create_task(scheduler.submit("kept"))
+        cancelled = asyncio.create_task(scheduler.submit("cancelled"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        batch_fn.release.set()
+
+        self.assertEqual(await first, "FIRST")
+        self.assertEqual(await kept, "KEPT")
+        with self.assertRaises(asyncio.CancelledError):
+            await cancelled
+        self.assertEqual([payloads for payloads, _ in batch_fn.batches], [["first"], ["kept"]])
+
+    async def test_batch_failure_is_raised_to_every_caller(self):
+        def failing(payloads, key):
+            raise RuntimeError("generate failed")
+
+        scheduler = self.create_scheduler(failing, max_batch_size=4, max_wait_ms=20)
+        results = await asyncio.gather(scheduler.submit("a"), scheduler.submit("b"), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(scheduler.get_metrics()["failed_batches"], 1)
+
+    async def test_close_cancels_queued_requests(self):
+        batch_fn = RecordingBatchFn()
+        batch_fn.release.clear()
+        scheduler = self.create_scheduler(batch_fn, max_batch_size=1, max_wait_ms=0)
+        running = asyncio.create_task(scheduler.submit("running"))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(scheduler.submit("queued"))
+        await asyncio.sleep(0)
+
+        await scheduler.close()
+        batch_fn.release.set()
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+        self.assertEqual(await running, "RUNNING")
+        self.assertEqual(scheduler.queue_size(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
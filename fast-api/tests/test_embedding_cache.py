@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+import unittest
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from service.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """텍스트 길이로 만든 벡터를 돌려주고 API 호출 대신 받은 텍스트를 기록"""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def _vector(self, text: str) -> List[float]:
+        return [float(len(text)), 1.0, 0.5]
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return self._vector(text)
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return self.embed_query(text)
+
+
+class CachedEmbeddingsTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "embedding_cache.sqlite3")
+        self.underlying = CountingEmbeddings()
+
+    def create_cache(self, **kwargs):
+        cache = CachedEmbeddings(self.underlying, model_name="test-model", path=self.path, **kwargs)
+        self.addCleanup(cache._conn.close)
+        return cache
+
+    def test_only_missing_texts_are_sent_once(self):
+        cache = self.create_cache()
+        cache.embed_documents(["수유", "수면"])
+        vectors = cache.embed_documents(["수면", "이유식", "이유식", "수유"])
+
+        self.assertEqual(self.underlying.calls, [["수유", "수면"], ["이유식"]])
+        self.assertEqual([v[0] for v in vectors], [2.0, 3.0, 3.0, 2.0])
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_disk_cache_survives_restart(self):
+        self.create_cache().embed_query("밤중 수유")
+        cache = self.create_cache()
+        self.assertEqual(cache.embed_query("밤중 수유"), [5.0, 1.0, 0.5])
+
+        self.assertEqual(len(self.underlying.calls), 1)
+        self.assertEqual((cache.disk_hits, cache.memory_hits), (1, 0))
+        cache.embed_query("밤중 수유")
+        self.assertEqual(cache.memory_hits, 1)
+
+    def test_memory_lru_is_bounded(self):
+        cache = self.create_cache(max_memory_entries=2)
+        cache.embed_documents(["a", "bb", "ccc"])
+        stats = cache.stats()
+        self.assertEqual((stats["memory_entries"], stats["disk_entries"]), (2, 3))
+
+    def test_model_name_is_part_of_the_key(self):
+        self.create_cache().embed_query("수유")
+        other = CachedEmbeddings(self.underlying, model_name="other-model", path=self.path)
+        self.addCleanup(other._conn.close)
+        other.embed_query("수유")
+        self.assertEqual(len(self.underlying.calls), 2)
+
+    async def test_async_paths_share_the_cache(self):
+        cache = self.create_cache()
+        self.assertEqual(await cache.aembed_query("수유"), [2.0, 1.0, 0.5])
+        self.assertEqual(await cache.aembed_documents(["수유", "수면"]), [[2.0, 1.0, 0.5], [2.0, 1.0, 0.5]])
+        self.assertEqual(cache.embed_query("수면"), [2.0, 1.0, 0.5])
+        self.assertEqual(self.underlying.calls, [["수유"], ["수면"]])
+
+
+    async def test_async_paths_do_not_touch_sqlite_on_the_event_loop(self):
+        cache = self.create_cache()
+        cache.embed_documents(["수유"])
+        cache._memory.clear()
+        loop_thread = threading.get_ident()
+        threads = []
+
+        class RecordingConnection:
+            def __init__(self, conn):
+                self._conn = conn
+
+            def __getattr__(self, name):
+                threads.append(threading.get_ident())
+                return getattr(self._conn, name)
+
+        cache._conn = RecordingConnection(cache._conn)
+        await cache.aembed_query("수유")
+        await cache.aembed_documents(["수면", "이유식"])
+
+        self.assertGreater(len(threads), 0)
+        self.assertNotIn(loop_thread, threads)
+        # 메모리에 있으면 SQLite를 거치지 않음
+        threads.clear()
+        await cache.aembed_query("수면")
+        self.assertEqual(threads, [])
+        self.assertEqual(cache.disk_hits, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from service.faiss_chatbot import FAISSChatbotService
+from service.index_store import IndexSnapshotStore, load_snapshot
+
+EMBEDDINGS = FakeEmbeddings(size=8)
+
+
+def build_vectorstore(*texts: str) -> FAISS:
+    return FAISS.from_texts(list(texts), EMBEDDINGS, metadatas=[{"section_title": text} for text in texts])
+
+
+def texts_of(vectorstore: FAISS):
+    return sorted(vectorstore.docstore.search(doc_id).page_content
+                  for doc_id in vectorstore.index_to_docstore_id.values())
+
+
+class IndexSnapshotStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = IndexSnapshotStore(tmp.name, keep=2)
+
+    def test_publish_switches_current_and_keeps_previous(self):
+        first = self.store.publish(build_vectorstore("수유", "수면"), {"documents": 2})
+        second = self.store.publish(build_vectorstore("이유식"), {"documents": 1})
+
+        self.assertLess(first, second)
+        self.assertEqual(self.store.current_version(), second)
+        self.assertEqual(self.store.read_manifest()["documents"], 1)
+        self.assertEqual(self.store.list_versions(), [first, second])
+        for mmap in (True, False):
+            self.assertEqual(texts_of(load_snapshot(self.store.current_dir(), EMBEDDINGS, mmap=mmap)), ["이유식"])
+        # 이전 스냅샷은 롤백용으로 그대로 남아 있음
+        self.assertEqual(texts_of(load_snapshot(self.store.snapshot_dir(first), EMBEDDINGS)), ["수면", "수유"])
+
+    def test_prune_keeps_latest_snapshots(self):
+        versions = [self.store.publish(build_vectorstore(f"문서 {i}"), {}) for i in range(4)]
+        self.assertEqual(self.store.list_versions(), versions[-2:])
+
+    def test_failed_publish_leaves_current_untouched(self):
+        version = self.store.publish(build_vectorstore("수유"), {})
+        broken = build_vectorstore("수면")
+        with mock.patch.object(broken, "save_local", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.store.publish(broken, {})
+
+        self.assertEqual(self.store.current_version(), version)
+        self.assertEqual(os.listdir(self.store.snapshots_dir), [version])
+
+    def test_falls_back_to_legacy_index(self):
+        self.assertIsNone(self.store.current_dir())
+        build_vectorstore("수유").save_local(self.store.legacy_dir)
+        self.assertEqual(self.store.current_dir(), self.store.legacy_dir)
+        self.assertIsNone(self.store.read_manifest())
+
+
+class ReloadIndexTest(unittest.TestCase):
+    """FAISSChatbotService.reload_index: 새 스냅샷으로 교체 / 보관 중인 스냅샷으로 롤백"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = IndexSnapshotStore(tmp.name)
+
+        # OpenAI 클라이언트 / LLM 체인 없이 인덱스 교체에 필요한 속성만 갖춘 서비스
+        self.service = FAISSChatbotService.__new__(FAISSChatbotService)
+        self.service.index_store = self.store
+        self.service.embedding_model = EMBEDDINGS
+        self.service.faiss_vectorstore = None
+        self.service.sparse_index = None
+        self.service.index_version = None
+        self.service.semantic_cache = mock.Mock()
+        self.service._reload_lock = threading.Lock()
+        self.service._watched_version = None
+
+    def test_reload_and_rollback(self):
+        first = self.store.publish(build_vectorstore("수유", "수면"), {})
+        self.service.reload_index()
+        self.service.semantic_cache.invalidate.assert_not_called()
+
+        second = self.store.publish(build_vectorstore("이유식"), {})
+        result = self.service.reload_index()
+        self.assertEqual((result["previous_version"], result["version"]), (first, second))
+        self.assertEqual(texts_of(self.service.faiss_vectorstore), ["이유식"])
+        self.assertEqual(len(self.service.sparse_index), 1)
+        self.service.semantic_cache.invalidate.assert_called_once_with("index_reloaded")
+
+        result = self.service.reload_index(version=first)
+        self.assertEqual((result["previous_version"], result["version"]), (second, first))
+        self.assertEqual(texts_of(self.service.faiss_vectorstore), ["수면", "수유"])
+        self.assertEqual(self.service.sparse_index.search("수유", k=1)[0][0].page_content, "수유")
+
+    def test_unknown_version_keeps_serving_index(self):
+        version = self.store.publish(build_vectorstore("수유"), {})
+        self.service.reload_index()
+        with self.assertRaises(FileNotFoundError):
+            self.service.reload_index(version="20000101-000000-000000000")
+        self.assertEqual(self.service.index_version, version)
+        self.assertEqual(texts_of(self.service.faiss_vectorstore), ["수유"])
+
+
+if __name__ == "__main__":
+    unittest.main()
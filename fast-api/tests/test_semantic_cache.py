@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from service.semantic_cache import SemanticResponseCache, number_signature
+
+
+class NumberSignatureTest(unittest.TestCase):
+
+    def test_units_and_korean_numbers_are_normalized(self):
+        self.assertEqual(number_signature("두 달 아기 수유량"), ("2개월",))
+        self.assertEqual(number_signature("2개월 아기 수유량"), ("2개월",))
+        self.assertEqual(number_signature("120cc 먹고 3번 토해요"), ("120ml", "3번"))
+        self.assertEqual(number_signature("아기가 잠을 안 자요"), ())
+
+
+class SemanticResponseCacheTest(unittest.TestCase):
+
+    def store(self, cache, embedding, question, answer):
+        cache.store(embedding, question, answer, source_documents=[], scores=[])
+
+    def test_hit_requires_similarity_above_threshold(self):
+        cache = SemanticResponseCache(threshold=0.95)
+        self.store(cache, [1.0, 0.0], "아기 수유 간격", "3시간")
+
+        entry, similarity = cache.lookup([0.99, 0.05], "아기 수유 간격은?")
+        self.assertEqual(entry.answer, "3시간")
+        self.assertGreaterEqual(similarity, 0.95)
+        # 코사인 유사도 0.8 → 적중 아님
+        self.assertIsNone(cache.lookup([0.8, 0.6], "밤중 수유 끊기"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_different_numbers_do_not_hit(self):
+        cache = SemanticResponseCache(threshold=0.9)
+        self.store(cache, [1.0, 0.0], "3개월 아기 수유량", "800ml")
+        self.store(cache, [0.98, 0.2], "4개월 아기 수유량", "900ml")
+
+        entry, _ = cache.lookup([1.0, 0.0], "4개월 아기 수유량은?")
+        self.assertEqual(entry.answer, "900ml")
+        self.assertIsNone(cache.lookup([1.0, 0.0], "5개월 아기 수유량"))
+        self.assertEqual(cache.number_mismatches, 1)
+
+    def test_entries_expire_after_ttl(self):
+        cache = SemanticResponseCache(threshold=0.9, ttl_seconds=60)
+        with mock.patch("service.semantic_cache.time") as clock:
+            clock.monotonic.return_value = 1000.0
+            self.store(cache, [1.0, 0.0], "아기 수유 간격", "3시간")
+            clock.monotonic.return_value = 1059.0
+            self.assertIsNotNone(cache.lookup([1.0, 0.0], "아기 수유 간격"))
+            clock.monotonic.return_value = 1061.0
+            self.assertIsNone(cache.lookup([1.0, 0.0], "아기 수유 간격"))
+            stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["expired"]), (0, 1))
+
+    def test_expired_entry_moved_to_the_back_is_not_returned(self):
+        cache = SemanticResponseCache(threshold=0.99, ttl_seconds=60)
+        with mock.patch("service.semantic_cache.time") as clock:
+            clock.monotonic.return_value = 1000.0
+            self.store(cache, [1.0, 0.0], "아기 수유 간격", "3시간")
+            clock.monotonic.return_value = 1030.0
+            self.store(cache, [0.0, 1.0], "아기 수면 시간", "14시간")
+            # 적중한 첫 항목이 LRU 순서상 맨 뒤로 가서 앞쪽 만료 확인에는 걸리지 않음
+            self.assertIsNotNone(cache.lookup([1.0, 0.0], "아기 수유 간격"))
+            clock.monotonic.return_value = 1070.0
+            self.assertIsNone(cache.lookup([1.0, 0.0], "아기 수유 간격"))
+            self.assertEqual((cache.expired, len(cache._entries)), (1, 1))
+            self.assertIsNotNone(cache.lookup([0.0, 1.0], "아기 수면 시간"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SemanticResponseCache(threshold=0.99, max_entries=2)
+        self.store(cache, [1.0, 0.0, 0.0], "수유", "a")
+        self.store(cache, [0.0, 1.0, 0.0], "수면", "b")
+        self.assertIsNotNone(cache.lookup([1.0, 0.0, 0.0], "수유"))
+        self.store(cache, [0.0, 0.0, 1.0], "이유식", "c")
+
+        self.assertIsNone(cache.lookup([0.0, 1.0, 0.0], "수면"))
+        self.assertIsNotNone(cache.lookup([1.0, 0.0, 0.0], "수유"))
+        self.assertEqual(cache.evicted, 1)
+
+    def test_source_change_invalidates(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "vector_db_final.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("[]")
+            cache = SemanticResponseCache(threshold=0.9, watch_paths=[path])
+            self.store(cache, [1.0, 0.0], "아기 수유 간격", "3시간")
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('[{"text": "새 문서"}]')
+            self.assertIsNone(cache.lookup([1.0, 0.0], "아기 수유 간격"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from service.session_store import InMemorySessionStore, SQLiteSessionStore
+
+
+def turn(question: str, answer: str):
+    return [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]
+
+
+class SessionStoreContract:
+    """메모리 / SQLite 저장소 공통 동작 (세션 분리, 메시지 수 / 길이 제한, 세션 수 제한)"""
+
+    def create_store(self, **kwargs):
+        raise NotImplementedError
+
+    def test_sessions_are_isolated(self):
+        store = self.create_store()
+        store.append("a", turn("질문 A", "답변 A"))
+        store.append("b", turn("질문 B", "답변 B"))
+        self.assertEqual([m["content"] for m in store.get("a")], ["질문 A", "답변 A"])
+        self.assertEqual([m["content"] for m in store.get("b")], ["질문 B", "답변 B"])
+        self.assertEqual(store.get("missing"), [])
+
+    def test_keeps_latest_messages_and_trims_content(self):
+        store = self.create_store(max_messages=4, max_message_chars=5)
+        for i in range(3):
+            store.append("a", turn(f"질문 {i}", f"답변 {i} 입니다"))
+        history = store.get("a")
+        self.assertEqual([m["content"] for m in history], ["질문 1", "답변 1 ", "질문 2", "답변 2 "])
+        self.assertEqual([m["role"] for m in history], ["user", "assistant"] * 2)
+
+    def test_evicts_least_recently_used_session(self):
+        store = self.create_store(max_sessions=2)
+        with mock.patch("service.session_store.time") as clock:
+            for now, session_id in enumerate(["a", "b"]):
+                clock.monotonic.return_value = clock.time.return_value = float(now)
+                store.append(session_id, turn("질문", "답변"))
+            # a를 다시 사용했으므로 세 번째 세션이 들어오면 b가 제거됨
+            clock.monotonic.return_value = clock.time.return_value = 2.0
+            store.get("a")
+            clock.monotonic.return_value = clock.time.return_value = 3.0
+            store.append("c", turn("질문", "답변"))
+            self.assertEqual(store.get("b"), [])
+            self.assertNotEqual(store.get("a"), [])
+            self.assertNotEqual(store.get("c"), [])
+
+    def test_expired_session_is_dropped(self):
+        store = self.create_store(ttl_seconds=10)
+        with mock.patch("service.session_store.time") as clock:
+            clock.monotonic.return_value = clock.time.return_value = 100.0
+            store.append("a", turn("질문", "답변"))
+            clock.monotonic.return_value = clock.time.return_value = 111.0
+            self.assertEqual(store.get("a"), [])
+
+    def test_clear(self):
+        store = self.create_store()
+        store.append("a", turn("질문", "답변"))
+        store.clear("a")
+        self.assertEqual(store.get("a"), [])
+        self.assertEqual(store.stats()["sessions"], 0)
+
+
+class InMemorySessionStoreTest(SessionStoreContract, unittest.TestCase):
+
+    def create_store(self, **kwargs):
+        return InMemorySessionStore(**kwargs)
+
+
+class SQLiteSessionStoreTest(SessionStoreContract, unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "sessions.sqlite3")
+
+    def create_store(self, namespace: str = "faiss", **kwargs):
+        store = SQLiteSessionStore(self.path, namespace=namespace, **kwargs)
+        self.addCleanup(store._conn.close)
+        return store
+
+    def test_history_survives_restart_and_namespaces_are_separate(self):
+        self.create_store().append("a", turn("질문", "답변"))
+        self.assertEqual(len(self.create_store().get("a")), 2)
+        self.assertEqual(self.create_store(namespace="memory").get("a"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from unittest import mock
+
+from langchain.schema import Document
+
+from service.faiss_chatbot import FAISSChatbotService
+from service.sparse_index import BM25Index, document_key, korean_tokenize, reciprocal_rank_fusion
+
+
+def doc(section_title: str, content: str, **metadata) -> Document:
+    return Document(page_content=content, metadata={"section_title": section_title, **metadata})
+
+
+DOCUMENTS = [
+    doc("이유식 시작", "이유식은 보통 생후 6개월 무렵 쌀미음으로 시작합니다.", category_name="4~6개월"),
+    doc("밤잠", "밤에 자주 깨는 아기는 낮잠 시간과 수면 의식을 점검합니다."),
+    doc("수유 간격", "신생아는 2~3시간마다 수유합니다."),
+    doc("예방접종", "2개월에 DTaP 1차 접종을 합니다."),
+]
+
+
+class KoreanTokenizeTest(unittest.TestCase):
+
+    def test_ranges_units_and_suffixes(self):
+        self.assertEqual(korean_tokenize("4~6개월"), ["4개월", "5개월", "6개월"])
+        self.assertEqual(korean_tokenize("2주차 신생아"), ["2주", "신생아", "신생", "생아"])
+        self.assertEqual(korean_tokenize("밤에 자주 깨는 아기"), ["밤", "자주", "깨", "아기"])
+        self.assertIn("이유식", korean_tokenize("이유식은 언제 시작하나요"))
+
+    def test_oversized_range_is_not_expanded(self):
+        self.assertEqual(korean_tokenize("1~100개월"), [])
+
+
+class BM25IndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = BM25Index(DOCUMENTS)
+
+    def test_keyword_query_ranks_matching_document_first(self):
+        results = self.index.search("6개월 아기 이유식은 언제 시작하나요", k=2)
+        self.assertEqual(results[0][0].metadata["section_title"], "이유식 시작")
+        self.assertGreater(results[0][1], results[1][1] if len(results) > 1 else 0)
+
+    def test_age_range_metadata_is_searchable(self):
+        titles = [d.metadata["section_title"] for d, _ in self.index.search("5개월", k=4)]
+        self.assertEqual(titles, ["이유식 시작"])
+
+    def test_unknown_terms_return_nothing(self):
+        self.assertEqual(self.index.search("주식 투자", k=4), [])
+
+
+class ReciprocalRankFusionTest(unittest.TestCase):
+
+    def test_documents_found_by_both_rankings_come_first(self):
+        a, b, c, d = DOCUMENTS
+        dense = [(a, 0.1), (b, 0.2), (c, 0.3)]
+        sparse = [(c, 9.0), (a, 5.0), (d, 1.0)]
+        fused = reciprocal_rank_fusion([dense, sparse], k=60)
+
+        self.assertEqual([document_key(x) for x, _ in fused], [document_key(x) for x in (a, c, b, d)])
+        self.assertAlmostEqual(fused[0][1], 1 / 61 + 1 / 62)
+
+    def test_same_content_is_merged(self):
+        a = DOCUMENTS[0]
+        copy = Document(page_content=a.page_content, metadata=dict(a.metadata))
+        fused = reciprocal_rank_fusion([[(a, 0.1)], [(copy, 3.0)]])
+        self.assertEqual(len(fused), 1)
+
+
+class MergeResultsTest(unittest.TestCase):
+    """FAISSChatbotService._merge_results: 검색 모드별 병합과 임베딩 실패 시 BM25 단독 검색"""
+
+    def create_service(self, mode: str) -> FAISSChatbotService:
+        service = FAISSChatbotService.__new__(FAISSChatbotService)
+        service.retrieval_mode = mode
+        service.sparse_index = BM25Index(DOCUMENTS)
+        return service
+
+    def test_hybrid_keeps_faiss_distance_and_none_for_keyword_only_hits(self):
+        service = self.create_service("hybrid")
+        dense = [(DOCUMENTS[1], 0.4), (DOCUMENTS[0], 0.5)]
+        with mock.patch("builtins.print"):
+            results, method = service._merge_results("6개월 이유식", 3, dense)
+
+        self.assertEqual(method, "hybrid")
+        self.assertEqual(results[0], (DOCUMENTS[0], 0.5))
+        self.assertIn((DOCUMENTS[1], 0.4), results)
+
+    def test_falls_back_to_bm25_without_dense_results(self):
+        service = self.create_service("hybrid")
+        with mock.patch("builtins.print"):
+            results, method = service._merge_results("6개월 이유식", 2, [])
+        self.assertEqual(method, "bm25")
+        self.assertEqual(results[0], (DOCUMENTS[0], None))
+
+    def test_dense_mode_skips_keyword_search(self):
+        service = self.create_service("dense")
+        dense = [(DOCUMENTS[1], 0.4)]
+        self.assertEqual(service._merge_results("6개월 이유식", 2, dense), (dense, "faiss"))
+
+
+if __name__ == "__main__":
+    unittest.main()